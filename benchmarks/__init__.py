@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for inventory, dashboard and tax queries.
+
+See benchmarks/README.md; run with `python -m benchmarks.run`.
+"""
@@ -0,0 +1,98 @@
+"""
+Benchmark cases
+
+Query cases call the helpers behind the inventory, fulfillment and dashboard
+pages (and the tax calculator) directly with a generated user's id. Page
+cases request the real routes through the Flask test client, so template
+rendering and per-request queries are included.
+"""
+from datetime import date, timedelta
+
+from qventory.helpers import dashboard_queries, inventory_queries
+from qventory.helpers.tax_calculator import TaxCalculator
+
+
+def _slow_movers_threshold(days=90):
+    return date.today() - timedelta(days=days)
+
+
+def _tax_year():
+    # Generated sales cover the last two years; the previous year is complete
+    return date.today().year - 1
+
+
+QUERY_CASES = {
+    'inventory.active': lambda session, user_id: inventory_queries.fetch_active_items(
+        session, user_id=user_id),
+    'inventory.active.search': lambda session, user_id: inventory_queries.fetch_active_items(
+        session, user_id=user_id, search='vintage'),
+    'inventory.active.location': lambda session, user_id: inventory_queries.fetch_active_items(
+        session, user_id=user_id, A='C', B='4'),
+    'inventory.active.missing_cost': lambda session, user_id: inventory_queries.fetch_active_items(
+        session, user_id=user_id, missing_data='cost'),
+    'inventory.active.sort_price_deep_page': lambda session, user_id: inventory_queries.fetch_active_items(
+        session, user_id=user_id, sort_by='price', sort_dir='asc', offset=2000),
+    'inventory.inactive_by_user': lambda session, user_id: inventory_queries.fetch_inactive_by_user_items(
+        session, user_id=user_id),
+    'inventory.sold': lambda session, user_id: inventory_queries.fetch_sold_items(
+        session, user_id=user_id),
+    'inventory.sold.search': lambda session, user_id: inventory_queries.fetch_sold_items(
+        session, user_id=user_id, search='nike'),
+    'inventory.retired': lambda session, user_id: inventory_queries.fetch_retired_items(
+        session, user_id=user_id),
+    'inventory.ended': lambda session, user_id: inventory_queries.fetch_ended_items(
+        session, user_id=user_id),
+    'inventory.slow_movers': lambda session, user_id: inventory_queries.fetch_slow_movers(
+        session, user_id=user_id, days=90, start_mode='item_added',
+        threshold_date=_slow_movers_threshold()),
+    'inventory.slow_movers.count': lambda session, user_id: inventory_queries.count_slow_movers(
+        session, user_id=user_id, start_mode='item_added', threshold_date=_slow_movers_threshold()),
+    'inventory.thumbnail_mismatches': lambda session, user_id: inventory_queries.detect_thumbnail_mismatches(
+        session, user_id=user_id),
+    'inventory.sale_title_mismatches': lambda session, user_id: inventory_queries.detect_sale_title_mismatches(
+        session, user_id=user_id),
+    'fulfillment.orders': lambda session, user_id: inventory_queries.fetch_fulfillment_orders(
+        session, user_id=user_id, fulfillment_only=True),
+    'fulfillment.in_transit': lambda session, user_id: inventory_queries.fetch_fulfillment_in_transit(
+        session, user_id=user_id),
+    'fulfillment.delivered': lambda session, user_id: inventory_queries.fetch_fulfillment_delivered(
+        session, user_id=user_id),
+    'dashboard.stats_30_days': lambda session, user_id: dashboard_queries.fetch_dashboard_stats(
+        session, user_id=user_id),
+    'dashboard.recent_sales': lambda session, user_id: dashboard_queries.fetch_recent_sales(
+        session, user_id=user_id),
+    'dashboard.recently_listed': lambda session, user_id: dashboard_queries.fetch_recently_listed(
+        session, user_id=user_id),
+    'dashboard.recently_sold_items': lambda session, user_id: dashboard_queries.fetch_recently_sold_items(
+        session, user_id=user_id),
+    'dashboard.recent_fulfillment': lambda session, user_id: dashboard_queries.fetch_recent_fulfillment(
+        session, user_id=user_id),
+    'dashboard.pending_tasks': lambda session, user_id: dashboard_queries.fetch_pending_tasks(
+        session, user_id=user_id),
+    'tax.annual_report': lambda session, user_id: TaxCalculator(
+        user_id, tax_year=_tax_year()).generate_full_report(),
+    'tax.quarterly_report': lambda session, user_id: TaxCalculator(
+        user_id, tax_year=_tax_year(), quarter=4).generate_full_report(),
+}
+
+
+def page_cases():
+    """Route paths timed through the test client (name -> path)."""
+    return {
+        'page.dashboard': '/dashboard',
+        'page.inventory_active': '/inventory/active',
+        'page.inventory_active.search': '/inventory/active?q=vintage',
+        'page.inventory_active.page_50': '/inventory/active?page=50',
+        'page.inventory_sold': '/inventory/sold',
+        'page.fulfillment': '/fulfillment',
+        'page.expenses': '/expenses',
+        'page.analytics': '/analytics',
+        'page.tax_report': f'/tax-reports/{_tax_year()}',
+    }
+
+
+def select_cases(cases, patterns):
+    """Cases whose name starts with any of the given prefixes (all when none given)."""
+    if not patterns:
+        return dict(cases)
+    return {name: case for name, case in cases.items() if any(name.startswith(p) for p in patterns)}
@@ -0,0 +1,322 @@
+"""
+Synthetic data for the benchmark suite
+
+Generates users with items, listings, sales, expenses and eBay finance
+transactions shaped like a real reseller account: most items synced from
+eBay, about a third sold, sales spread over two years with a mix of
+statuses, carriers and fees. Everything is derived from a seeded
+random.Random, so the same DatasetSpec always produces the same rows.
+
+Rows are inserted with executemany in chunks (bulk INSERT ... VALUES on
+Postgres), and benchmark users are namespaced by username prefix so
+drop_dataset() can remove them again.
+"""
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from qventory.models.ebay_finance import EbayFinanceTransaction
+from qventory.models.expense import Expense
+from qventory.models.item import Item
+from qventory.models.listing import Listing
+from qventory.models.sale import Sale
+from qventory.models.user import User
+
+INSERT_CHUNK_SIZE = 5000
+USER_PASSWORD = 'bench-password'
+MAX_ITEMS_PER_USER = 100_000
+
+_BRANDS = ['Nike', 'Levi', 'Pyrex', 'Lego', 'Sony', 'Coach', 'Fossil', 'Carhartt', 'Patagonia', 'Nintendo']
+_NOUNS = ['Jacket', 'Jeans', 'Bowl', 'Set', 'Walkman', 'Handbag', 'Watch', 'Hoodie', 'Fleece', 'Cartridge']
+_ADJECTIVES = ['Vintage', 'Rare', 'New', 'Used', 'Retro', 'Sealed', 'Classic', 'Limited', 'Deadstock', 'Boxed']
+_SUPPLIERS = ['Goodwill', 'Estate Sale', 'Garage Sale', 'Savers', 'Facebook', 'Auction']
+_MARKETPLACES = ['ebay'] * 8 + ['mercari', 'depop']
+_CARRIERS = ['USPS', 'USPS', 'USPS', 'UPS', 'FedEx']
+_SALE_STATUSES = ['completed'] * 6 + ['shipped', 'paid', 'cancelled', 'refunded', 'returned']
+_EXPENSE_CATEGORIES = ['Supplies', 'Shipping', 'Storage', 'Software', 'Mileage', 'Fees']
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and shape of a generated dataset"""
+    users: int = 1
+    items_per_user: int = 10_000
+    sold_ratio: float = 0.35  # Items that sold (one sale each)
+    ebay_ratio: float = 0.8  # Items with an eBay listing
+    expenses_per_user: int = 500
+    seed: int = 42
+    prefix: str = 'bench'
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _chunks(rows, size=INSERT_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _insert(session, model, rows, returning_ids=False):
+    """Bulk insert rows (list of dicts); optionally return their ids in order."""
+    table = model.__table__
+    ids = []
+    for chunk in _chunks(rows):
+        if returning_ids:
+            stmt = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+            ids.extend(session.execute(stmt, chunk).scalars().all())
+        else:
+            session.execute(table.insert(), chunk)
+    return ids
+
+
+def _user_rows(spec, password_hash, now):
+    return [
+        {
+            'username': f'{spec.prefix}_{spec.seed}_{index}',
+            'email': f'{spec.prefix}_{spec.seed}_{index}@bench.qventory.test',
+            'password_hash': password_hash,
+            'role': 'pro',
+            'email_verified': True,
+            'has_used_trial': True,
+            'created_at': now,
+        }
+        for index in range(spec.users)
+    ]
+
+
+def _item_row(rng, spec, user_id, user_index, index, now):
+    created_at = now - timedelta(days=rng.randint(0, 730), minutes=rng.randint(0, 1439))
+    sold = rng.random() < spec.sold_ratio
+    on_ebay = rng.random() < spec.ebay_ratio
+    cost = round(rng.uniform(1, 60), 2) if rng.random() < 0.9 else None
+    price = round((cost or 10) * rng.uniform(1.5, 5), 2)
+    A, B, S, C = rng.choice('ABCDEF'), rng.randint(1, 10), rng.randint(1, 6), rng.randint(1, 20)
+    return {
+        'user_id': user_id,
+        'title': f'{rng.choice(_ADJECTIVES)} {rng.choice(_BRANDS)} {rng.choice(_NOUNS)} {index}',
+        'sku': f'{spec.prefix.upper()}-{spec.seed}-{user_index}-{index:06d}',
+        'A': A,
+        'B': str(B),
+        'S': str(S),
+        'C': str(C),
+        'location_code': f'A{A}B{B}S{S}C{C}',
+        'item_thumb': f'https://i.ebayimg.com/images/bench/{index}.jpg' if rng.random() < 0.95 else None,
+        'supplier': rng.choice(_SUPPLIERS),
+        'item_cost': cost,
+        'item_price': price,
+        'quantity': 0 if sold else 1,
+        'is_active': not sold,
+        'inactive_by_user': (not sold) and rng.random() < 0.02,
+        'listing_date': (created_at + timedelta(days=rng.randint(0, 5))).date(),
+        'purchased_at': (created_at - timedelta(days=rng.randint(0, 30))).date(),
+        'ebay_listing_id': f'9{spec.seed:03d}{user_index:03d}{index:07d}' if on_ebay else None,
+        'synced_from_ebay': on_ebay,
+        'sold_at': None,
+        'sold_price': None,
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+def _sale_row(rng, item, now):
+    listed = datetime.combine(item['listing_date'], datetime.min.time())
+    sold_at = min(listed + timedelta(days=rng.randint(1, 120), hours=rng.randint(0, 23)), now)
+    status = rng.choice(_SALE_STATUSES)
+    price = round(item['item_price'] * rng.uniform(0.7, 1.0), 2)
+    shipped_at = sold_at + timedelta(days=rng.randint(0, 3)) if status in ('shipped', 'completed', 'returned') else None
+    delivered_at = shipped_at + timedelta(days=rng.randint(2, 7)) if shipped_at and status != 'shipped' else None
+    marketplace = 'ebay' if item['ebay_listing_id'] else rng.choice(_MARKETPLACES)
+    marketplace_fee = round(price * 0.1325, 2)
+    shipping_cost = round(rng.uniform(4, 15), 2)
+    return {
+        'user_id': item['user_id'],
+        'marketplace': marketplace,
+        'marketplace_order_id': f'{item["sku"]}-ORDER',
+        'item_title': item['title'],
+        'item_sku': item['sku'],
+        'sale_item_thumb': item['item_thumb'],
+        'sale_ebay_listing_id': item['ebay_listing_id'],
+        'sold_price': price,
+        'item_cost': item['item_cost'],
+        'marketplace_fee': marketplace_fee,
+        'payment_processing_fee': 0.3,
+        'shipping_cost': shipping_cost,
+        'shipping_charged': round(shipping_cost * rng.uniform(0, 1.2), 2),
+        'ad_fee': round(price * 0.02, 2) if rng.random() < 0.3 else 0,
+        'other_fees': 0,
+        'gross_profit': round(price - (item['item_cost'] or 0), 2),
+        'net_profit': round(price - (item['item_cost'] or 0) - marketplace_fee - shipping_cost, 2),
+        'sold_at': sold_at,
+        'paid_at': sold_at,
+        'shipped_at': shipped_at,
+        'delivered_at': delivered_at,
+        'tracking_number': f'94{rng.randrange(10 ** 18):018d}' if shipped_at else None,
+        'carrier': rng.choice(_CARRIERS) if shipped_at else None,
+        'status': status,
+        'refund_amount': price if status == 'refunded' else None,
+        'returned_at': delivered_at if status == 'returned' else None,
+        'created_at': sold_at,
+        'updated_at': delivered_at or sold_at,
+    }
+
+
+def _listing_row(item, item_id, sold_at):
+    return {
+        'user_id': item['user_id'],
+        'item_id': item_id,
+        'marketplace': 'ebay',
+        'marketplace_listing_id': item['ebay_listing_id'],
+        'title': item['title'],
+        'price': item['item_price'],
+        'status': 'sold' if sold_at else 'active',
+        'is_synced': True,
+        'listed_at': datetime.combine(item['listing_date'], datetime.min.time()),
+        'ended_at': sold_at,
+        'created_at': item['created_at'],
+        'updated_at': sold_at or item['created_at'],
+    }
+
+
+def _finance_rows(sale, user_id):
+    order_id = sale['marketplace_order_id']
+    rows = [
+        ('SALE', sale['sold_price'] + sale['shipping_charged'] - sale['marketplace_fee']),
+        ('SHIPPING_LABEL', -sale['shipping_cost']),
+    ]
+    if sale['ad_fee']:
+        rows.append(('NON_SALE_CHARGE', -sale['ad_fee']))
+    if sale['status'] == 'refunded':
+        rows.append(('REFUND', -sale['sold_price']))
+    return [
+        {
+            'user_id': user_id,
+            'external_id': f'{order_id}-{kind}',
+            'transaction_id': f'{order_id}-{kind}',
+            'transaction_date': sale['sold_at'],
+            'transaction_type': kind,
+            'amount': round(amount, 2),
+            'currency': 'USD',
+            'order_id': order_id,
+        }
+        for kind, amount in rows
+    ]
+
+
+def _expense_rows(rng, spec, user_id, now):
+    return [
+        {
+            'user_id': user_id,
+            'description': f'{category} #{index}',
+            'amount': round(rng.uniform(2, 250), 2),
+            'category': category,
+            'expense_date': (now - timedelta(days=rng.randint(0, 730))).date(),
+            'created_at': now,
+        }
+        for index, category in ((index, rng.choice(_EXPENSE_CATEGORIES)) for index in range(spec.expenses_per_user))
+    ]
+
+
+def _generate_user_data(session, rng, spec, user_id, user_index, now, progress):
+    counts = {'items': 0, 'listings': 0, 'sales': 0, 'expenses': 0, 'finance_transactions': 0}
+    for start in range(0, spec.items_per_user, INSERT_CHUNK_SIZE):
+        items, sales = [], []
+        for index in range(start, min(start + INSERT_CHUNK_SIZE, spec.items_per_user)):
+            item = _item_row(rng, spec, user_id, user_index, index, now)
+            sale = None
+            if not item['is_active']:
+                sale = _sale_row(rng, item, now)
+                item['sold_at'], item['sold_price'] = sale['sold_at'], sale['sold_price']
+            items.append(item)
+            sales.append(sale)
+        item_ids = _insert(session, Item, items, returning_ids=True)
+
+        sale_rows, listings, finance = [], [], []
+        for item, item_id, sale in zip(items, item_ids, sales):
+            if sale is not None:
+                sale['item_id'] = item_id
+                sale_rows.append(sale)
+                if sale['marketplace'] == 'ebay':
+                    finance.extend(_finance_rows(sale, user_id))
+            if item['ebay_listing_id']:
+                listings.append(_listing_row(item, item_id, item['sold_at']))
+
+        _insert(session, Listing, listings)
+        _insert(session, Sale, sale_rows)
+        _insert(session, EbayFinanceTransaction, finance)
+        counts['items'] += len(items)
+        counts['listings'] += len(listings)
+        counts['sales'] += len(sale_rows)
+        counts['finance_transactions'] += len(finance)
+        if progress:
+            progress(f"user {user_index + 1}/{spec.users}: {counts['items']}/{spec.items_per_user} items")
+
+    expenses = _expense_rows(rng, spec, user_id, now)
+    _insert(session, Expense, expenses)
+    counts['expenses'] = len(expenses)
+    return counts
+
+
+def generate_dataset(session, spec, *, now=None, progress=None):
+    """
+    Insert the dataset described by spec and commit.
+
+    Args:
+        session: SQLAlchemy session (db.session)
+        spec: DatasetSpec
+        now: Reference "today" for generated dates (defaults to utcnow)
+        progress: Optional callable receiving status strings
+
+    Returns:
+        dict: {'user_ids': [...], 'counts': {...}}
+    """
+    if spec.items_per_user > MAX_ITEMS_PER_USER:
+        raise ValueError(f"items_per_user is limited to {MAX_ITEMS_PER_USER}")
+
+    rng = random.Random(spec.seed)
+    now = now or datetime.utcnow().replace(microsecond=0)
+    password_hash = generate_password_hash(USER_PASSWORD)
+    user_ids = _insert(session, User, _user_rows(spec, password_hash, now), returning_ids=True)
+
+    totals = {}
+    for user_index, user_id in enumerate(user_ids):
+        counts = _generate_user_data(session, rng, spec, user_id, user_index, now, progress)
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+        session.commit()
+
+    return {'user_ids': user_ids, 'counts': totals}
+
+
+def find_dataset_users(session, spec):
+    """Ids of users previously generated for spec (same prefix and seed), in order."""
+    pattern = f'{spec.prefix}\\_{spec.seed}\\_%'
+    rows = session.query(User.id, User.username).filter(User.username.like(pattern, escape='\\')).all()
+    by_index = {int(username.rsplit('_', 1)[1]): user_id for user_id, username in rows}
+    return [by_index[index] for index in sorted(by_index)]
+
+
+def drop_dataset(session, spec):
+    """
+    Delete every generated user for spec's prefix, with all rows that
+    reference them (including settings/notifications created by page runs).
+
+    Returns:
+        int: number of users removed
+    """
+    from qventory.extensions import db
+
+    pattern = f'{spec.prefix}\\_%'
+    user_ids = [
+        user_id for (user_id,) in
+        session.query(User.id).filter(User.username.like(pattern, escape='\\')).all()
+    ]
+    if not user_ids:
+        return 0
+    for table in reversed(db.metadata.sorted_tables):
+        if table.name != User.__tablename__ and 'user_id' in table.c:
+            session.execute(table.delete().where(table.c.user_id.in_(user_ids)))
+    session.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    session.commit()
+    return len(user_ids)
@@ -0,0 +1,231 @@
+"""
+Timing, plan capture and baseline comparison for the benchmark suite
+
+Each case is run `warmup` times untimed and `repeat` times timed. While a
+case runs, an engine listener records the statements it issues; after
+timing, every distinct SELECT is re-run once as
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) with the same parameters and the
+plan is stored next to the timings.
+
+Results are plain JSON so they can be committed as baselines and compared
+by case name.
+"""
+import json
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 1.25  # Median slower than baseline by this factor is a regression
+MIN_REGRESSION_MS = 2.0  # Ignore ratios on cases this close to the baseline in absolute time
+
+
+class StatementRecorder:
+    """Collects the statements issued on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.active = False
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not executemany:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+    @contextmanager
+    def recording(self):
+        self.statements = []
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_timings(timings_ms):
+    return {
+        'runs': len(timings_ms),
+        'min_ms': round(min(timings_ms), 3),
+        'median_ms': round(statistics.median(timings_ms), 3),
+        'p95_ms': round(_percentile(timings_ms, 0.95), 3),
+        'max_ms': round(max(timings_ms), 3),
+    }
+
+
+def _is_select(statement):
+    head = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    return head in ('SELECT', 'WITH')
+
+
+def _plan_summary(plan):
+    root = plan.get('Plan', {})
+    return {
+        'planning_ms': plan.get('Planning Time'),
+        'execution_ms': plan.get('Execution Time'),
+        'root_node': root.get('Node Type'),
+        'rows': root.get('Actual Rows'),
+        'shared_hit_blocks': root.get('Shared Hit Blocks'),
+        'shared_read_blocks': root.get('Shared Read Blocks'),
+    }
+
+
+def explain_statements(engine, statements):
+    """
+    EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) each distinct SELECT (Postgres only).
+
+    Returns:
+        list of {'sql', 'summary', 'plan'} or {'sql', 'error'}
+    """
+    seen, plans = set(), []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if not _is_select(statement) or statement in seen:
+                continue
+            seen.add(statement)
+            try:
+                raw = conn.exec_driver_sql(
+                    f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}', parameters
+                ).scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+                plans.append({'sql': statement.strip(), 'summary': _plan_summary(plan), 'plan': plan})
+            except Exception as exc:
+                conn.rollback()
+                plans.append({'sql': statement.strip(), 'error': str(exc)})
+    return plans
+
+
+def run_case(run, recorder, *, warmup=1, repeat=5, after_run=None):
+    """
+    Time run() and record the statements of its last execution.
+
+    Raises whatever run() raises; after_run (e.g. session rollback) is called
+    after every execution.
+    """
+    for _ in range(warmup):
+        try:
+            run()
+        finally:
+            if after_run:
+                after_run()
+
+    timings = []
+    for _ in range(repeat):
+        with recorder.recording():
+            started = time.perf_counter()
+            try:
+                run()
+            finally:
+                timings.append((time.perf_counter() - started) * 1000)
+                if after_run:
+                    after_run()
+
+    result = summarize_timings(timings)
+    result['queries'] = len(recorder.statements)
+    return result, list(recorder.statements)
+
+
+def git_revision(cwd=None):
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def new_results(meta):
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'meta': meta,
+        'cases': {},
+    }
+
+
+def save_results(results, path):
+    with open(path, 'w') as fh:
+        json.dump(results, fh, indent=2, sort_keys=True, default=str)
+        fh.write('\n')
+
+
+def load_results(path):
+    with open(path) as fh:
+        results = json.load(fh)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {results.get('version')}")
+    return results
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD, min_delta_ms=MIN_REGRESSION_MS):
+    """
+    Compare medians and query counts case by case.
+
+    A case regresses when its median is more than `threshold` times the
+    baseline (and at least min_delta_ms slower), or when it issues more
+    queries than before.
+
+    Returns:
+        list of dicts sorted by ratio: {'case', 'baseline_ms', 'current_ms',
+        'ratio', 'baseline_queries', 'queries', 'status'} where status is
+        'regression', 'improved', 'ok', 'new' or 'missing'
+    """
+    rows = []
+    names = set(current['cases']) | set(baseline['cases'])
+    for name in names:
+        now, before = current['cases'].get(name), baseline['cases'].get(name)
+        if before is None or 'median_ms' not in before:
+            rows.append({'case': name, 'status': 'new', 'current_ms': (now or {}).get('median_ms')})
+            continue
+        if now is None or 'median_ms' not in now:
+            rows.append({'case': name, 'status': 'missing', 'baseline_ms': before['median_ms']})
+            continue
+
+        ratio = now['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        delta = now['median_ms'] - before['median_ms']
+        status = 'ok'
+        if (ratio > threshold and delta >= min_delta_ms) or now.get('queries', 0) > before.get('queries', 0):
+            status = 'regression'
+        elif ratio < 1 / threshold and -delta >= min_delta_ms:
+            status = 'improved'
+        rows.append({
+            'case': name,
+            'baseline_ms': before['median_ms'],
+            'current_ms': now['median_ms'],
+            'ratio': round(ratio, 3),
+            'baseline_queries': before.get('queries'),
+            'queries': now.get('queries'),
+            'status': status,
+        })
+    rows.sort(key=lambda row: (row.get('ratio') is None, -(row.get('ratio') or 0), row['case']))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'case':<42} {'baseline':>10} {'current':>10} {'ratio':>7} {'queries':>9}  status"]
+    for row in rows:
+        baseline = f"{row['baseline_ms']:.1f}" if row.get('baseline_ms') is not None else '-'
+        current = f"{row['current_ms']:.1f}" if row.get('current_ms') is not None else '-'
+        ratio = f"{row['ratio']:.2f}x" if row.get('ratio') is not None else '-'
+        queries = (
+            f"{row['baseline_queries']}->{row['queries']}" if row.get('baseline_queries') is not None else '-'
+        )
+        lines.append(f"{row['case']:<42} {baseline:>10} {current:>10} {ratio:>7} {queries:>9}  {row['status']}")
+    return '\n'.join(lines)
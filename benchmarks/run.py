@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner
+
+Generates (or reuses) a synthetic dataset in a local Postgres database, times
+the inventory/dashboard/tax query helpers and the main pages, captures
+EXPLAIN (ANALYZE, BUFFERS) plans and writes the results as JSON. With
+--baseline the run is compared against a previous result file and exits
+with status 1 on regressions.
+
+Examples:
+    python -m benchmarks.run --database-url postgresql://localhost/qventory_bench \\
+        --items 100000 --output benchmarks/baselines/100k.json
+    python -m benchmarks.run --database-url postgresql://localhost/qventory_bench \\
+        --items 100000 --reuse --baseline benchmarks/baselines/100k.json
+"""
+import argparse
+import os
+import sys
+from urllib.parse import urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Qventory query/page benchmarks")
+    parser.add_argument('--database-url', default=os.environ.get('BENCH_DATABASE_URL'),
+                        help="Postgres URL of a scratch database (default: $BENCH_DATABASE_URL)")
+    parser.add_argument('--allow-any-database', action='store_true',
+                        help="Allow a database whose name does not contain 'bench' or 'test'")
+    parser.add_argument('--users', type=int, default=1)
+    parser.add_argument('--items', type=int, default=10_000, help="Items per user (max 100000)")
+    parser.add_argument('--expenses', type=int, default=500, help="Expenses per user")
+    parser.add_argument('--sold-ratio', type=float, default=0.35)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reuse', action='store_true',
+                        help="Reuse users generated earlier with the same --seed instead of inserting")
+    parser.add_argument('--drop', action='store_true', help="Delete all generated users and exit")
+    parser.add_argument('--create-schema', action='store_true',
+                        help="Create missing tables with db.create_all() (instead of running migrations)")
+    parser.add_argument('--cases', nargs='*', default=[], help="Only run cases starting with these prefixes")
+    parser.add_argument('--no-pages', action='store_true', help="Skip page (test client) cases")
+    parser.add_argument('--no-explain', action='store_true', help="Skip EXPLAIN (ANALYZE, BUFFERS) capture")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Write results JSON here")
+    parser.add_argument('--baseline', help="Compare against this results JSON")
+    parser.add_argument('--threshold', type=float, default=None,
+                        help="Regression factor for median time (default 1.25)")
+    return parser.parse_args(argv)
+
+
+def check_database_url(url, allow_any=False):
+    """Benchmarks insert and delete data: only run against a scratch Postgres database."""
+    if not url:
+        raise SystemExit("❌ --database-url (or BENCH_DATABASE_URL) is required")
+    parsed = urlparse(url)
+    if not parsed.scheme.startswith('postgres'):
+        raise SystemExit("❌ Benchmarks need Postgres (the queries use Postgres-only SQL)")
+    name = parsed.path.lstrip('/')
+    if not allow_any and 'bench' not in name and 'test' not in name:
+        raise SystemExit(
+            f"❌ Refusing to use database '{name}': use a scratch database with 'bench' or 'test' "
+            "in its name, or pass --allow-any-database"
+        )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    check_database_url(args.database_url, args.allow_any_database)
+
+    # Config reads these at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('SQL_QUERY_STATS', '0')
+    os.environ.setdefault('SKIP_AI_TOKEN_SEED', '1')
+    sys.path.insert(0, REPO_ROOT)
+
+    from qventory import create_app, db
+    from benchmarks import cases, datagen, harness
+
+    app = create_app()
+    spec = datagen.DatasetSpec(
+        users=args.users,
+        items_per_user=args.items,
+        sold_ratio=args.sold_ratio,
+        expenses_per_user=args.expenses,
+        seed=args.seed,
+    )
+
+    with app.app_context():
+        if args.create_schema:
+            db.create_all()
+
+        if args.drop:
+            print(f"🗑️  Removed {datagen.drop_dataset(db.session, spec)} benchmark users")
+            return 0
+
+        if args.reuse:
+            user_ids = datagen.find_dataset_users(db.session, spec)
+            if len(user_ids) < spec.users:
+                raise SystemExit(f"❌ Found {len(user_ids)} generated users for seed {spec.seed}, need {spec.users}")
+            counts = None
+            print(f"♻️  Reusing {len(user_ids)} generated users")
+        else:
+            if datagen.find_dataset_users(db.session, spec):
+                raise SystemExit(f"❌ Users for seed {spec.seed} already exist: pass --reuse or --drop first")
+            print(f"🔨 Generating {spec.users} user(s) x {spec.items_per_user} items...")
+            generated = datagen.generate_dataset(db.session, spec, progress=lambda msg: print(f"   {msg}"))
+            user_ids, counts = generated['user_ids'], generated['counts']
+            print(f"✅ Generated {counts}")
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+
+        user_id = user_ids[0]
+        server_version = db.session.execute(db.text('SHOW server_version')).scalar()
+        results = harness.new_results({
+            'git_revision': harness.git_revision(REPO_ROOT),
+            'postgres': server_version,
+            'dataset': spec.as_dict(),
+            'counts': counts,
+            'warmup': args.warmup,
+            'repeat': args.repeat,
+        })
+
+        engine = db.engine
+        with harness.StatementRecorder(engine) as recorder:
+            for name, case in cases.select_cases(cases.QUERY_CASES, args.cases).items():
+                _run_and_record(
+                    results, name, lambda: case(db.session, user_id),
+                    recorder, engine, args, after_run=db.session.rollback,
+                )
+
+            if not args.no_pages:
+                client = app.test_client()
+                with client.session_transaction() as sess:
+                    sess['_user_id'] = str(user_id)
+                    sess['_fresh'] = True
+                for name, path in cases.select_cases(cases.page_cases(), args.cases).items():
+                    _run_and_record(
+                        results, name, lambda: _get_page(client, path),
+                        recorder, engine, args, after_run=db.session.remove, path=path,
+                    )
+
+    if args.output:
+        harness.save_results(results, args.output)
+        print(f"📝 Results written to {args.output}")
+
+    if args.baseline:
+        baseline = harness.load_results(args.baseline)
+        threshold = args.threshold or harness.DEFAULT_THRESHOLD
+        rows = harness.compare_results(results, baseline, threshold=threshold)
+        print()
+        print(harness.format_comparison(rows))
+        regressions = [row['case'] for row in rows if row['status'] == 'regression']
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+def _get_page(client, path):
+    response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return response
+
+
+def _run_and_record(results, name, run, recorder, engine, args, after_run=None, path=None):
+    from benchmarks import harness
+
+    try:
+        entry, statements = harness.run_case(
+            run, recorder, warmup=args.warmup, repeat=args.repeat, after_run=after_run,
+        )
+    except Exception as exc:
+        results['cases'][name] = {'error': str(exc)}
+        print(f"   ✗ {name}: {exc}")
+        return
+
+    if path:
+        entry['path'] = path
+    if not args.no_explain:
+        entry['plans'] = harness.explain_statements(engine, statements)
+    results['cases'][name] = entry
+    print(f"   ✓ {name:<42} median {entry['median_ms']:>9.2f} ms  p95 {entry['p95_ms']:>9.2f} ms  "
+          f"{entry['queries']} queries")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""add sales indexes for auto-relist sale detection
+
+Revision ID: 077_relist_sale_detection_indexes
+Revises: 076_retired_items_archive
+Create Date: 2026-06-02 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "077_relist_sale_detection_indexes"
+down_revision = "076_retired_items_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_sales_user_item_sku_sold_at
+        ON sales (user_id, item_sku, sold_at)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_sales_user_sale_listing_id
+        ON sales (user_id, sale_ebay_listing_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_sales_user_marketplace_order_id
+        ON sales (user_id, marketplace_order_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_sales_user_ebay_transaction_id
+        ON sales (user_id, ebay_transaction_id)
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_sales_user_ebay_transaction_id")
+    op.execute("DROP INDEX IF EXISTS idx_sales_user_marketplace_order_id")
+    op.execute("DROP INDEX IF EXISTS idx_sales_user_sale_listing_id")
+    op.execute("DROP INDEX IF EXISTS idx_sales_user_item_sku_sold_at")
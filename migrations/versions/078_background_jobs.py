@@ -0,0 +1,68 @@
+"""add background jobs table
+
+Revision ID: 078_background_jobs
+Revises: 077_relist_sale_detection_indexes
+Create Date: 2026-06-09 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "078_background_jobs"
+down_revision = "077_relist_sale_detection_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "background_jobs" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("job_type", sa.String(length=50), nullable=False),
+        sa.Column("celery_task_id", sa.String(length=255), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("total_items", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("processed_items", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("succeeded_count", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("failed_count", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("skipped_count", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_background_jobs_user_id"), "background_jobs", ["user_id"], unique=False)
+    op.create_index(op.f("ix_background_jobs_job_type"), "background_jobs", ["job_type"], unique=False)
+    op.create_index(op.f("ix_background_jobs_celery_task_id"), "background_jobs", ["celery_task_id"], unique=False)
+    op.create_index(op.f("ix_background_jobs_status"), "background_jobs", ["status"], unique=False)
+    op.create_index(
+        "idx_background_jobs_user_type_status",
+        "background_jobs",
+        ["user_id", "job_type", "status"],
+        unique=False,
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "background_jobs" not in inspector.get_table_names():
+        return
+
+    op.drop_index("idx_background_jobs_user_type_status", table_name="background_jobs")
+    op.drop_index(op.f("ix_background_jobs_status"), table_name="background_jobs")
+    op.drop_index(op.f("ix_background_jobs_celery_task_id"), table_name="background_jobs")
+    op.drop_index(op.f("ix_background_jobs_job_type"), table_name="background_jobs")
+    op.drop_index(op.f("ix_background_jobs_user_id"), table_name="background_jobs")
+    op.drop_table("background_jobs")
@@ -0,0 +1,42 @@
+"""add cancellation and dedup columns to background jobs
+
+Revision ID: 079_background_job_cancel_dedup
+Revises: 078_background_jobs
+Create Date: 2026-06-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "079_background_job_cancel_dedup"
+down_revision = "078_background_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {col["name"] for col in inspector.get_columns("background_jobs")}
+
+    if "dedup_key" not in columns:
+        op.add_column("background_jobs", sa.Column("dedup_key", sa.String(length=64), nullable=True))
+        op.create_index(op.f("ix_background_jobs_dedup_key"), "background_jobs", ["dedup_key"], unique=False)
+    if "cancel_requested" not in columns:
+        op.add_column(
+            "background_jobs",
+            sa.Column("cancel_requested", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {col["name"] for col in inspector.get_columns("background_jobs")}
+
+    if "cancel_requested" in columns:
+        op.drop_column("background_jobs", "cancel_requested")
+    if "dedup_key" in columns:
+        op.drop_index(op.f("ix_background_jobs_dedup_key"), table_name="background_jobs")
+        op.drop_column("background_jobs", "dedup_key")
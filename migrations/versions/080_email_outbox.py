@@ -0,0 +1,59 @@
+"""add email outbox table
+
+Revision ID: 080_email_outbox
+Revises: 079_background_job_cancel_dedup
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "080_email_outbox"
+down_revision = "079_background_job_cancel_dedup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "email_outbox" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("to_email", sa.String(length=255), nullable=False),
+        sa.Column("subject", sa.String(length=500), nullable=False),
+        sa.Column("html_body", sa.Text(), nullable=True),
+        sa.Column("text_body", sa.Text(), nullable=True),
+        sa.Column("dedup_key", sa.String(length=128), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_email_outbox_to_email"), "email_outbox", ["to_email"], unique=False)
+    op.create_index(op.f("ix_email_outbox_dedup_key"), "email_outbox", ["dedup_key"], unique=False)
+    op.create_index(
+        "idx_email_outbox_status_next_attempt",
+        "email_outbox",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "email_outbox" not in inspector.get_table_names():
+        return
+
+    op.drop_index("idx_email_outbox_status_next_attempt", table_name="email_outbox")
+    op.drop_index(op.f("ix_email_outbox_dedup_key"), table_name="email_outbox")
+    op.drop_index(op.f("ix_email_outbox_to_email"), table_name="email_outbox")
+    op.drop_table("email_outbox")
@@ -26,7 +26,6 @@ from .routes.webhooks import webhook_bp
 from .routes.webhooks_platform import platform_webhook_bp
 # DISABLED: Admin logging/webhooks consoles (reducing server load)
 # from .routes.admin_webhooks import admin_webhooks_bp
-# from .routes.admin_logs import admin_logs_bp
 from .routes.tax_reports import tax_reports_bp
 
 _BOOTSTRAP_DONE = False
@@ -86,6 +85,12 @@ def create_app():
     migrate.init_app(app, db)
     login_manager.init_app(app)
 
+    from .helpers.user_status import register_user_status_publishers
+    register_user_status_publishers()
+
+    from .helpers.query_stats import register_query_stats
+    register_query_stats(app)
+
     @login_manager.unauthorized_handler
     def _handle_unauthorized():
         from flask import jsonify, redirect, request, url_for
@@ -114,7 +119,10 @@ def create_app():
     app.register_blueprint(platform_webhook_bp)
     # DISABLED: Admin logging/webhooks consoles (reducing server load)
     # app.register_blueprint(admin_webhooks_bp)
-    # app.register_blueprint(admin_logs_bp)
+    # Opt in with ADMIN_LOGS_CONSOLE=1 (includes SQL stats at /admin/logs/api/sql-stats)
+    if os.environ.get("ADMIN_LOGS_CONSOLE", "0") == "1":
+        from .routes.admin_logs import admin_logs_bp
+        app.register_blueprint(admin_logs_bp)
     app.register_blueprint(tax_reports_bp)
 
     @app.context_processor
@@ -460,6 +468,14 @@ def create_app():
                         from qventory.models.ai_token import AITokenConfig
                         AITokenConfig.initialize_defaults()
 
+                    # Built-in help articles (no-op unless their content changed)
+                    try:
+                        from qventory.helpers.help_center import seed_help_articles
+                        seed_help_articles()
+                    except Exception as exc:
+                        db.session.rollback()
+                        app.logger.warning("Skipped help article seed: %s", exc)
+
                     _maybe_seed_demo()  # ahora sí existe
                 _BOOTSTRAP_DONE = True
 
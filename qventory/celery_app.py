@@ -9,6 +9,8 @@ from celery.schedules import crontab
 # Get Redis URL from environment or use local default
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 IMAGE_HYDRATION_QUEUE = os.environ.get('IMAGE_HYDRATION_QUEUE', 'imports')
+RECEIPT_OCR_QUEUE = os.environ.get('RECEIPT_OCR_QUEUE', 'receipts')
+AUTO_RELIST_QUEUE = os.environ.get('AUTO_RELIST_QUEUE', 'relist')
 
 # Create Celery instance
 celery = Celery(
@@ -32,6 +34,10 @@ celery.conf.update(
     worker_max_tasks_per_child=100,
 )
 
+# Count SQL statements per task run (see helpers/query_stats.py)
+from qventory.helpers.query_stats import register_celery_query_stats
+register_celery_query_stats()
+
 # Task routing
 celery.conf.task_routes = {
     'qventory.tasks.import_ebay_inventory': {'queue': 'imports'},
@@ -41,7 +47,9 @@ celery.conf.task_routes = {
     'qventory.tasks.reconcile_recent_missing_images': {'queue': 'imports'},
     'qventory.tasks.reconcile_historical_missing_images': {'queue': 'imports'},
     'qventory.tasks.process_ai_research': {'queue': 'ai'},
+    'qventory.tasks.process_receipt_ocr': {'queue': RECEIPT_OCR_QUEUE},
     'qventory.tasks.auto_relist_offers': {'queue': 'celery'},  # Use default 'celery' queue
+    'qventory.tasks.process_auto_relist_batch': {'queue': AUTO_RELIST_QUEUE},
 }
 
 # Celery Beat Schedule (Periodic Tasks)
@@ -60,6 +68,13 @@ celery.conf.beat_schedule = {
             'expires': 60 * 60,  # Expire after 1 hour if not picked up
         }
     },
+    'deliver-email-outbox': {
+        'task': 'qventory.tasks.deliver_email_outbox',
+        'schedule': 60.0,  # Every minute: retries and anything a missed dispatch left behind
+        'options': {
+            'expires': 55,
+        }
+    },
     'poll-ebay-listings': {
         'task': 'qventory.tasks.poll_ebay_new_listings',
         'schedule': 60.0,  # Every 1 minute (adaptive polling filters further per user)
@@ -131,6 +146,14 @@ celery.conf.beat_schedule = {
             'expires': 60 * 60 * 2,
         }
     },
+    'sweep-ebay-feedback-replies-weekly': {
+        'task': 'qventory.tasks.sync_ebay_feedback_global',
+        'schedule': crontab(day_of_week='sun', hour=17, minute=0),  # Replies on feedback older than the cursor
+        'kwargs': {'reply_sweep': True},
+        'options': {
+            'expires': 60 * 60 * 2,
+        }
+    },
     'reconcile-missing-images-hourly': {
         'task': 'qventory.tasks.reconcile_recent_missing_images',
         'schedule': crontab(minute=7),  # Every hour at minute 7
@@ -0,0 +1,222 @@
+"""
+Admin user list queries
+
+The admin user list is one aggregated query (users + per-user item counts +
+subscription + eBay connection) with filtering, search and sorting done in
+SQL, paginated by keyset (sort value, user id) so deep pages cost the same
+as the first. Segment totals come from a short-lived per-process summary.
+"""
+import base64
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import and_, exists, func, or_, tuple_
+
+from qventory.models.item import Item
+from qventory.models.marketplace_credential import MarketplaceCredential
+from qventory.models.subscription import Subscription
+from qventory.models.user import User
+
+ADMIN_USERS_PAGE_SIZE = 100
+ADMIN_SUMMARY_TTL = 60  # Seconds the dashboard/user-list totals are reused
+PAID_PLANS = ("early_adopter", "premium", "plus", "pro", "enterprise", "god")
+USER_FILTERS = ("all", "paid", "new30", "new7")
+USER_SORTS = ("items", "missing_cost", "created", "last_activity", "last_login", "username")
+
+_EPOCH = datetime(1970, 1, 1)
+
+_summary = None
+_summary_at = 0.0
+_summary_lock = threading.Lock()
+
+
+def _item_counts_subquery(session):
+    return (
+        session.query(
+            Item.user_id.label("user_id"),
+            func.count(Item.id).label("item_count"),
+            func.count(Item.id).filter(Item.item_cost.is_(None)).label("missing_cost_count"),
+        )
+        .filter(Item.is_active.is_(True), Item.inactive_by_user.is_(False))
+        .group_by(Item.user_id)
+        .subquery()
+    )
+
+
+def _ebay_connected():
+    return exists().where(and_(
+        MarketplaceCredential.user_id == User.id,
+        MarketplaceCredential.marketplace == "ebay",
+        MarketplaceCredential.is_active.is_(True),
+    ))
+
+
+def _paid_condition():
+    return and_(Subscription.plan.in_(PAID_PLANS), Subscription.status == "active")
+
+
+def _filter_condition(filter_key, now):
+    if filter_key == "paid":
+        return _paid_condition()
+    if filter_key == "new30":
+        return User.created_at >= now - timedelta(days=30)
+    if filter_key == "new7":
+        return User.created_at >= now - timedelta(days=7)
+    return None
+
+
+def _sort_column(sort, counts):
+    if sort == "missing_cost":
+        return func.coalesce(counts.c.missing_cost_count, 0), False
+    if sort == "created":
+        return func.coalesce(User.created_at, _EPOCH), False
+    if sort == "last_activity":
+        return func.coalesce(User.last_activity, _EPOCH), False
+    if sort == "last_login":
+        return func.coalesce(User.last_login, _EPOCH), False
+    if sort == "username":
+        return User.username, True
+    return func.coalesce(counts.c.item_count, 0), False
+
+
+def encode_cursor(value, user_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, user_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(sort, cursor):
+    """Return (sort value, user id) or None for a missing/garbled cursor."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, user_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if sort in ("created", "last_activity", "last_login"):
+            value = datetime.fromisoformat(value)
+        return value, int(user_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def fetch_admin_user_page(session, *, filter_key="all", search=None, sort="items", cursor=None, limit=ADMIN_USERS_PAGE_SIZE):
+    """
+    One page of admin user rows.
+
+    Returns:
+        SimpleNamespace(rows=[dict], next_cursor=str|None, filter_key, sort)
+        Each row has user, item_count, missing_cost_count, has_inventory,
+        subscription_plan, subscription_status, connected_store.
+    """
+    if filter_key not in USER_FILTERS:
+        filter_key = "all"
+    if sort not in USER_SORTS:
+        sort = "items"
+
+    counts = _item_counts_subquery(session)
+    sort_column, ascending = _sort_column(sort, counts)
+    connected = _ebay_connected().label("connected_store")
+
+    query = (
+        session.query(
+            User,
+            func.coalesce(counts.c.item_count, 0),
+            func.coalesce(counts.c.missing_cost_count, 0),
+            Subscription.plan,
+            Subscription.status,
+            connected,
+            sort_column,
+        )
+        .outerjoin(counts, counts.c.user_id == User.id)
+        .outerjoin(Subscription, Subscription.user_id == User.id)
+    )
+
+    condition = _filter_condition(filter_key, datetime.utcnow())
+    if condition is not None:
+        query = query.filter(condition)
+
+    search = (search or "").strip()
+    if search:
+        like = f"%{search}%"
+        query = query.filter(or_(User.username.ilike(like), User.email.ilike(like)))
+
+    position = decode_cursor(sort, cursor)
+    if position is not None:
+        key = tuple_(sort_column, User.id)
+        query = query.filter(key > position if ascending else key < position)
+
+    if ascending:
+        query = query.order_by(sort_column.asc(), User.id.asc())
+    else:
+        query = query.order_by(sort_column.desc(), User.id.desc())
+
+    results = query.limit(limit + 1).all()
+    has_more = len(results) > limit
+    results = results[:limit]
+
+    rows = []
+    for user, item_count, missing_cost_count, plan, status, is_connected, _ in results:
+        rows.append({
+            "user": user,
+            "item_count": item_count,
+            "missing_cost_count": missing_cost_count,
+            "has_inventory": item_count > 0,
+            "subscription_plan": plan or "free",
+            "subscription_status": status or "active",
+            "connected_store": bool(is_connected),
+        })
+
+    next_cursor = None
+    if has_more and results:
+        last = results[-1]
+        next_cursor = encode_cursor(last[-1], last[0].id)
+
+    return SimpleNamespace(rows=rows, next_cursor=next_cursor, filter_key=filter_key, sort=sort)
+
+
+def _compute_admin_user_summary(session):
+    now = datetime.utcnow()
+    users = session.query(
+        func.count(User.id),
+        func.count(User.id).filter(User.created_at >= now - timedelta(days=30)),
+        func.count(User.id).filter(User.created_at >= now - timedelta(days=7)),
+    ).one()
+    paid_count = (
+        session.query(func.count(Subscription.id))
+        .join(User, User.id == Subscription.user_id)
+        .filter(_paid_condition())
+        .scalar()
+    )
+    items = (
+        session.query(func.count(Item.id), func.count(func.distinct(Item.user_id)))
+        .filter(Item.is_active.is_(True), Item.inactive_by_user.is_(False))
+        .one()
+    )
+    return {
+        "total_users": users[0] or 0,
+        "new_30_count": users[1] or 0,
+        "new_7_count": users[2] or 0,
+        "paid_count": paid_count or 0,
+        "total_items": items[0] or 0,
+        "users_with_inventory": items[1] or 0,
+    }
+
+
+def fetch_admin_user_summary(session, force=False):
+    """Account totals for the admin dashboard and user-list segments (cached briefly)."""
+    global _summary, _summary_at
+    with _summary_lock:
+        if force or _summary is None or time.monotonic() - _summary_at >= ADMIN_SUMMARY_TTL:
+            _summary = _compute_admin_user_summary(session)
+            _summary_at = time.monotonic()
+        return dict(_summary)
+
+
+def invalidate_admin_user_summary():
+    global _summary
+    with _summary_lock:
+        _summary = None
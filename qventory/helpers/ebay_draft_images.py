@@ -0,0 +1,323 @@
+"""
+Eager eBay picture uploads for listing drafts
+
+Draft images live in Cloudinary while the user edits; eBay needs them on
+eBay Picture Services before publishing. Instead of uploading every image
+one by one inside the publish request, images are pushed to eBay in the
+background (concurrently) as soon as they are attached to a draft. Each
+entry in images_json carries its own upload state:
+
+    ebay_upload_status: pending | uploading | uploaded | failed
+    ebay_upload_error, ebay_upload_started_at, ebay_upload_attempts,
+    ebay_upload_retry_at
+
+Results are matched back to entries by source URL, so reordering, removing
+or replacing images while an upload runs is safe. Failed uploads are retried
+in the background with backoff, at most MAX_UPLOAD_ATTEMPTS times. Publish
+never waits on in-flight uploads (it reports them so the client can retry)
+and only uploads the stragglers.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from qventory.extensions import db
+from qventory.models.ebay_listing_draft import EbayListingDraft
+
+DRAFT_IMAGE_UPLOAD_WORKERS = int(os.environ.get('EBAY_IMAGE_UPLOAD_WORKERS', '6'))
+UPLOAD_CLAIM_TTL = timedelta(minutes=2)  # An 'uploading' claim older than this is considered abandoned
+MAX_UPLOAD_ATTEMPTS = 3  # Background attempts per image; publish may still retry once more
+UPLOAD_RETRY_BACKOFF = timedelta(seconds=30)  # Doubled after every failed attempt
+PUBLISH_RETRY_AFTER_SECONDS = 2  # Suggested client wait when publish finds uploads in flight
+
+STATUS_PENDING = 'pending'
+STATUS_UPLOADING = 'uploading'
+STATUS_UPLOADED = 'uploaded'
+STATUS_FAILED = 'failed'
+
+_EBAY_UPLOAD_FIELDS = (
+    'ebay_image_url',
+    'ebay_image_location',
+    'ebay_upload_status',
+    'ebay_upload_error',
+    'ebay_upload_started_at',
+    'ebay_upload_attempts',
+    'ebay_upload_retry_at',
+)
+
+
+def log_draft_images(msg):
+    """Helper for logging"""
+    print(f"[EBAY_DRAFT_IMAGES] {msg}", file=sys.stderr, flush=True)
+
+
+def draft_image_source_url(image_entry: dict):
+    return (
+        image_entry.get("cloudinary_url")
+        or image_entry.get("image_url")
+        or image_entry.get("url")
+        or image_entry.get("ebay_image_url")
+    )
+
+
+def _claim_is_fresh(image_entry: dict, now: datetime) -> bool:
+    started = image_entry.get('ebay_upload_started_at')
+    if image_entry.get('ebay_upload_status') != STATUS_UPLOADING or not started:
+        return False
+    try:
+        return now - datetime.fromisoformat(started) < UPLOAD_CLAIM_TTL
+    except (TypeError, ValueError):
+        return False
+
+
+def _retry_allowed(image_entry: dict, now: datetime) -> bool:
+    """Failed images are retried after a backoff, up to MAX_UPLOAD_ATTEMPTS."""
+    if image_entry.get('ebay_upload_status') != STATUS_FAILED:
+        return True
+    if (image_entry.get('ebay_upload_attempts') or 0) >= MAX_UPLOAD_ATTEMPTS:
+        return False
+    retry_at = image_entry.get('ebay_upload_retry_at')
+    if not retry_at:
+        return True
+    try:
+        return now >= datetime.fromisoformat(retry_at)
+    except (TypeError, ValueError):
+        return True
+
+
+def needs_ebay_upload(image_entry: dict) -> bool:
+    return isinstance(image_entry, dict) and not image_entry.get('ebay_image_url')
+
+
+def has_pending_ebay_uploads(images) -> bool:
+    """True if a background upload should be queued (unclaimed or retryable images)."""
+    now = datetime.utcnow()
+    return any(
+        needs_ebay_upload(entry) and not _claim_is_fresh(entry, now) and _retry_allowed(entry, now)
+        for entry in images or []
+    )
+
+
+def count_in_flight_uploads(images) -> int:
+    now = datetime.utcnow()
+    return sum(1 for entry in images or [] if needs_ebay_upload(entry) and _claim_is_fresh(entry, now))
+
+
+def carry_over_ebay_upload_state(old_images, new_images):
+    """
+    Keep eBay upload state when the client saves a stale copy of images_json.
+
+    The wizard PATCHes the full image list from browser state, which does not
+    know about uploads finished (or still running, or failed) in the
+    background. The server's state wins for every image that is still there:
+    finished uploads keep their eBay URL, in-flight claims keep their start
+    time (so they are not uploaded twice) and failures keep their attempt
+    count and backoff.
+    """
+    known = {}
+    for entry in old_images or []:
+        if isinstance(entry, dict) and (entry.get('ebay_image_url') or entry.get('ebay_upload_status')):
+            source = draft_image_source_url(entry)
+            if source:
+                known[source] = entry
+
+    for entry in new_images or []:
+        if not isinstance(entry, dict) or entry.get('ebay_image_url'):
+            continue
+        previous = known.get(draft_image_source_url(entry))
+        if previous:
+            for field in _EBAY_UPLOAD_FIELDS:
+                entry[field] = previous.get(field)
+    return new_images
+
+
+def _lock_draft(draft_id):
+    return (
+        EbayListingDraft.query
+        .filter_by(id=draft_id)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+
+def claim_draft_images(draft_id, retry_failed=False):
+    """
+    Mark images that still need an eBay upload as 'uploading' and commit.
+
+    Returns a list of {'source_url', 'filename'} to upload. Images another
+    worker claimed recently are always skipped; failed images are skipped
+    while backing off or once out of attempts, unless retry_failed is set
+    (publish, an explicit user action).
+    """
+    draft = _lock_draft(draft_id)
+    if not draft:
+        db.session.rollback()
+        return []
+
+    now = datetime.utcnow()
+    images = [dict(entry) if isinstance(entry, dict) else entry for entry in (draft.images_json or [])]
+    claims = []
+    claimed_sources = set()
+    for index, entry in enumerate(images):
+        if not needs_ebay_upload(entry):
+            continue
+        if _claim_is_fresh(entry, now):
+            continue
+        if not retry_failed and not _retry_allowed(entry, now):
+            continue
+        source_url = draft_image_source_url(entry)
+        if not source_url:
+            entry['ebay_upload_status'] = STATUS_FAILED
+            entry['ebay_upload_error'] = 'missing_image_source'
+            continue
+        entry['ebay_upload_status'] = STATUS_UPLOADING
+        entry['ebay_upload_started_at'] = now.isoformat()
+        entry['ebay_upload_attempts'] = (entry.get('ebay_upload_attempts') or 0) + 1
+        entry['ebay_upload_error'] = None
+        if source_url not in claimed_sources:
+            claimed_sources.add(source_url)
+            claims.append({
+                'source_url': source_url,
+                'filename': entry.get('filename') or f"draft-{draft.id}-{index + 1}.jpg",
+            })
+
+    draft.images_json = images
+    db.session.commit()
+    return claims
+
+
+def upload_images_concurrently(user_id, claims, access_token=None):
+    """
+    Upload claimed images to eBay Picture Services in parallel.
+
+    Returns:
+        dict: source_url -> upload result dict
+    """
+    from qventory.helpers.ebay_image_upload import upload_ebay_image_from_url
+    from qventory.helpers.ebay_inventory import get_user_access_token
+
+    if not claims:
+        return {}
+
+    # Resolve the token once here: worker threads have no app context
+    token = access_token or get_user_access_token(user_id)
+    if not token:
+        return {claim['source_url']: {'success': False, 'error': 'missing_access_token'} for claim in claims}
+
+    def _upload(claim):
+        try:
+            return upload_ebay_image_from_url(
+                user_id,
+                claim['source_url'],
+                claim['filename'],
+                access_token=token,
+            )
+        except Exception as exc:
+            return {'success': False, 'error': f'upload_failed:{exc}'}
+
+    workers = max(1, min(DRAFT_IMAGE_UPLOAD_WORKERS, len(claims)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_upload, claims))
+    return {claim['source_url']: result for claim, result in zip(claims, results)}
+
+
+def apply_upload_results(draft_id, results):
+    """Write upload results into the current images_json (matched by source URL) and commit."""
+    if not results:
+        return None
+
+    draft = _lock_draft(draft_id)
+    if not draft:
+        db.session.rollback()
+        return None
+
+    now = datetime.utcnow()
+    images = [dict(entry) if isinstance(entry, dict) else entry for entry in (draft.images_json or [])]
+    for entry in images:
+        if not needs_ebay_upload(entry):
+            continue
+        result = results.get(draft_image_source_url(entry))
+        if result is None:
+            continue
+        if result.get('success') and result.get('image_url'):
+            entry['ebay_image_url'] = result.get('image_url')
+            entry['ebay_image_location'] = result.get('location')
+            entry['ebay_upload_status'] = STATUS_UPLOADED
+            entry['ebay_upload_error'] = None
+        else:
+            attempts = max(entry.get('ebay_upload_attempts') or 1, 1)
+            entry['ebay_upload_status'] = STATUS_FAILED
+            entry['ebay_upload_error'] = str(result.get('error') or 'upload_failed')[:500]
+            entry['ebay_upload_retry_at'] = (now + UPLOAD_RETRY_BACKOFF * (2 ** (attempts - 1))).isoformat()
+
+    draft.images_json = images
+    db.session.commit()
+    return draft
+
+
+def upload_pending_draft_images(draft_id, user_id):
+    """
+    Background entry point: upload every image not yet on eBay.
+
+    Returns:
+        dict: {'uploaded': int, 'failed': int}
+    """
+    claims = claim_draft_images(draft_id)
+    if not claims:
+        return {'uploaded': 0, 'failed': 0}
+
+    started = time.monotonic()
+    results = upload_images_concurrently(user_id, claims)
+    apply_upload_results(draft_id, results)
+
+    uploaded = sum(1 for result in results.values() if result.get('success') and result.get('image_url'))
+    failed = len(results) - uploaded
+    log_draft_images(
+        f"Draft {draft_id}: {uploaded} uploaded, {failed} failed in {time.monotonic() - started:.1f}s"
+    )
+    return {'uploaded': uploaded, 'failed': failed}
+
+
+def ensure_draft_images_on_ebay(draft, user_id):
+    """
+    Publish-time guarantee that every draft image has an eBay URL.
+
+    Never waits inside the request: while background uploads are in flight it
+    returns 'uploads_pending' so the caller can answer 409 and the client can
+    retry. Otherwise the remaining stragglers (never claimed, abandoned or
+    failed) are uploaded concurrently.
+
+    Returns:
+        dict: {'success': True, 'image_urls': [...]},
+              {'success': False, 'pending': True, 'error': 'uploads_pending', 'in_flight': int} or
+              {'success': False, 'error': str, 'image_index': int}
+    """
+    db.session.refresh(draft)
+    in_flight = count_in_flight_uploads(draft.images_json)
+    if not in_flight and any(needs_ebay_upload(entry) for entry in draft.images_json or []):
+        claims = claim_draft_images(draft.id, retry_failed=True)
+        results = upload_images_concurrently(user_id, claims)
+        apply_upload_results(draft.id, results)
+        db.session.refresh(draft)
+        # A background worker may have claimed images in the meantime
+        in_flight = count_in_flight_uploads(draft.images_json)
+
+    if in_flight:
+        return {'success': False, 'pending': True, 'error': 'uploads_pending', 'in_flight': in_flight}
+
+    uploaded = []
+    for index, entry in enumerate(draft.images_json or []):
+        if not isinstance(entry, dict):
+            continue
+        if not entry.get('ebay_image_url'):
+            return {
+                'success': False,
+                'error': entry.get('ebay_upload_error') or 'upload_failed',
+                'image_index': index,
+            }
+        uploaded.append(entry['ebay_image_url'])
+
+    return {'success': True, 'image_urls': uploaded}
@@ -2,6 +2,7 @@ import csv
 from io import TextIOWrapper
 from ..extensions import db
 from ..models.ebay_fee_rule import EbayFeeRule
+from .ebay_fees import invalidate_fee_rule_cache
 
 
 def import_ebay_fee_rules_csv(file_storage):
@@ -46,4 +47,5 @@ def import_ebay_fee_rules_csv(file_storage):
             created += 1
 
     db.session.commit()
+    invalidate_fee_rule_cache()
     return {"created": created, "updated": updated}
@@ -3,12 +3,68 @@ import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 
+from sqlalchemy import func
+
 from qventory.helpers.ebay_inventory import get_user_access_token
 from qventory.helpers.ebay_relist import TRADING_API_URL, TRADING_COMPAT_LEVEL, _XML_NS
 from qventory.models.ebay_fee_snapshot import EbayFeeSnapshot
 from qventory.extensions import db
 
 
+SNAPSHOT_MAX_AGE = timedelta(hours=12)
+FEE_TIER_THRESHOLD = 7500.0  # eBay's final value fee rate changes above this sale amount
+_FLAT_FEE_MARKERS = ("fixed", "insertion")  # Fees that do not scale with price
+
+
+def _is_flat_fee(name):
+    name = (name or "").lower()
+    return any(marker in name for marker in _FLAT_FEE_MARKERS)
+
+
+def _find_rate_snapshot(user_id, category_id, fee_base, has_store, top_rated, max_age=SNAPSHOT_MAX_AGE):
+    """Latest snapshot for this category/seller tier on the same side of the fee tier threshold."""
+    query = EbayFeeSnapshot.query.filter_by(
+        user_id=user_id,
+        category_id=category_id,
+        has_store=bool(has_store),
+        top_rated=bool(top_rated)
+    )
+    snapshot_base = EbayFeeSnapshot.price + func.coalesce(EbayFeeSnapshot.shipping_cost, 0)
+    if fee_base > FEE_TIER_THRESHOLD:
+        query = query.filter(snapshot_base > FEE_TIER_THRESHOLD)
+    else:
+        query = query.filter(snapshot_base <= FEE_TIER_THRESHOLD)
+    if max_age is not None:
+        query = query.filter(EbayFeeSnapshot.created_at >= datetime.utcnow() - max_age)
+    return query.order_by(EbayFeeSnapshot.created_at.desc()).first()
+
+
+def _scale_snapshot(snapshot, fee_base):
+    """Re-price a snapshot's fee lines for a different price + shipping total."""
+    snapshot_base = (snapshot.price or 0) + (snapshot.shipping_cost or 0)
+    ratio = fee_base / snapshot_base if snapshot_base > 0 else 0
+
+    fees = []
+    total_fees = 0.0
+    for fee in snapshot.fee_breakdown or []:
+        amount = float(fee.get("amount") or 0)
+        if not _is_flat_fee(fee.get("name")):
+            amount *= ratio
+        total_fees += amount
+        fees.append({"name": fee.get("name"), "amount": round(amount, 2)})
+
+    if not fees and snapshot.total_fees:
+        total_fees = float(snapshot.total_fees) * ratio
+
+    return {
+        "success": True,
+        "fee_rate_percent": (total_fees / fee_base) * 100 if fee_base > 0 else 0,
+        "total_fees": total_fees,
+        "fees": fees,
+        "cached": True
+    }
+
+
 def _build_verify_add_fixed_price_item_xml(category_id, price, shipping_cost):
     title = "Qventory Fee Estimate"
     description = "Fee estimate request"
@@ -67,23 +123,10 @@ def get_live_fee_estimate(user_id, category_id, price, shipping_cost=0.0, has_st
     if price <= 0:
         return {"success": False, "error": "Price must be > 0"}
 
-    cutoff = datetime.utcnow() - timedelta(hours=12)
-    cached = EbayFeeSnapshot.query.filter_by(
-        user_id=user_id,
-        category_id=category_id,
-        price=price,
-        shipping_cost=shipping_cost,
-        has_store=bool(has_store),
-        top_rated=bool(top_rated)
-    ).filter(EbayFeeSnapshot.created_at >= cutoff).order_by(EbayFeeSnapshot.created_at.desc()).first()
-
+    fee_base = price + shipping_cost
+    cached = _find_rate_snapshot(user_id, category_id, fee_base, has_store, top_rated)
     if cached:
-        return {
-            "success": True,
-            "fee_rate_percent": cached.fee_rate_percent,
-            "total_fees": cached.total_fees,
-            "fees": cached.fee_breakdown or []
-        }
+        return _scale_snapshot(cached, fee_base)
 
     access_token = get_user_access_token(user_id)
     if not access_token:
@@ -130,20 +173,25 @@ def get_live_fee_estimate(user_id, category_id, price, shipping_cost=0.0, has_st
         total_fees += value
         fees.append({"name": name.text, "amount": round(value, 2)})
 
-    fee_rate = (total_fees / (price + shipping_cost)) * 100 if (price + shipping_cost) > 0 else 0
-
-    snapshot = EbayFeeSnapshot(
-        user_id=user_id,
-        category_id=category_id,
-        price=price,
-        shipping_cost=shipping_cost,
-        has_store=bool(has_store),
-        top_rated=bool(top_rated),
-        fee_rate_percent=fee_rate,
-        total_fees=total_fees,
-        fee_breakdown=fees
-    )
-    db.session.add(snapshot)
+    fee_rate = (total_fees / fee_base) * 100 if fee_base > 0 else 0
+
+    # One row per category/seller tier, refreshed in place: later estimates
+    # for any price in the same fee tier are scaled from it.
+    snapshot = _find_rate_snapshot(user_id, category_id, fee_base, has_store, top_rated, max_age=None)
+    if not snapshot:
+        snapshot = EbayFeeSnapshot(
+            user_id=user_id,
+            category_id=category_id,
+            has_store=bool(has_store),
+            top_rated=bool(top_rated),
+        )
+        db.session.add(snapshot)
+    snapshot.price = price
+    snapshot.shipping_cost = shipping_cost
+    snapshot.fee_rate_percent = fee_rate
+    snapshot.total_fees = total_fees
+    snapshot.fee_breakdown = fees
+    snapshot.created_at = datetime.utcnow()
     db.session.commit()
 
     return {
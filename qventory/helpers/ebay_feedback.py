@@ -5,11 +5,18 @@ import xml.etree.ElementTree as ET
 from xml.sax.saxutils import escape
 from datetime import datetime, timedelta
 
+from sqlalchemy import and_, case, func, or_
+
 from qventory.extensions import db
 from qventory.models.ebay_feedback import EbayFeedback
 from qventory.helpers.ebay_inventory import get_user_access_token, TRADING_API_URL, TRADING_COMPAT_LEVEL
 
 _XML_NS = {"ebay": "urn:ebay:apis:eBLBaseComponents"}
+# Re-read feedback this close to the stored cursor (CommentTime has 1s resolution)
+FEEDBACK_CURSOR_OVERLAP = timedelta(hours=1)
+# Incremental runs stop at the cursor, so replies/follow-ups on older feedback
+# are picked up by a periodic non-incremental sweep of this many days
+FEEDBACK_REPLY_SWEEP_DAYS = 30
 
 
 def log_feedback(msg):
@@ -126,17 +133,123 @@ def fetch_feedback_page(user_id, page=1, entries_per_page=200):
         return {"success": False, "error": str(exc)}
 
 
-def sync_ebay_feedback_for_user(user_id, days_back=1, max_pages=10, entries_per_page=200):
+def get_feedback_cursor(user_id):
+    """Comment time of the newest feedback already stored for the user, or None."""
+    return db.session.query(func.max(EbayFeedback.comment_time)).filter(
+        EbayFeedback.user_id == user_id
+    ).scalar()
+
+
+def _feedback_row(user_id, feedback, now):
+    responded = feedback.get("responded", False)
+    return {
+        "user_id": user_id,
+        "feedback_id": feedback["feedback_id"],
+        "comment_type": feedback.get("comment_type"),
+        "comment_text": feedback.get("comment_text"),
+        "comment_time": feedback.get("comment_time"),
+        "commenting_user": feedback.get("commenting_user"),
+        "role": feedback.get("role"),
+        "item_id": feedback.get("item_id"),
+        "transaction_id": feedback.get("transaction_id"),
+        "order_line_item_id": feedback.get("order_line_item_id"),
+        "item_title": feedback.get("item_title"),
+        "response_text": feedback.get("response_text"),
+        "response_type": feedback.get("response_type"),
+        "response_time": feedback.get("response_time"),
+        "responded": responded,
+        "response_source": "ebay" if responded else None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def upsert_feedback_rows(session, rows):
+    """
+    Write one page of feedback with a single INSERT ... ON CONFLICT
+    (user_id, feedback_id) DO UPDATE. Responses made through Qventory are
+    never overwritten by what eBay reports.
+
+    Returns:
+        tuple: (created, updated)
+    """
+    if not rows:
+        return 0, 0
+
+    by_key = {(row["user_id"], row["feedback_id"]): row for row in rows}
+    rows = list(by_key.values())
+    existing = {
+        (user_id, feedback_id)
+        for user_id, feedback_id in session.query(EbayFeedback.user_id, EbayFeedback.feedback_id).filter(
+            EbayFeedback.user_id.in_({user_id for user_id, _ in by_key}),
+            EbayFeedback.feedback_id.in_([feedback_id for _, feedback_id in by_key])
+        )
+    }
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Feedback upserts are not supported on {dialect}")
+
+    table = EbayFeedback.__table__
+    stmt = insert(table).values(rows)
+    excluded = stmt.excluded
+    take_ebay_response = and_(
+        excluded.responded.is_(True),
+        or_(table.c.response_source.is_(None), table.c.response_source != "qventory")
+    )
+    set_ = {
+        column: excluded[column]
+        for column in (
+            "comment_type", "comment_text", "comment_time", "commenting_user", "role",
+            "item_id", "transaction_id", "order_line_item_id", "item_title", "updated_at",
+        )
+    }
+    for column in ("response_text", "response_type", "response_time"):
+        set_[column] = case((take_ebay_response, excluded[column]), else_=table.c[column])
+    set_["responded"] = case((take_ebay_response, True), else_=table.c.responded)
+    set_["response_source"] = case((take_ebay_response, "ebay"), else_=table.c.response_source)
+
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "feedback_id"],
+        set_=set_
+    ))
+
+    updated = sum(1 for key in by_key if key in existing)
+    return len(rows) - updated, updated
+
+
+def sync_ebay_feedback_for_user(user_id, days_back=1, max_pages=10, entries_per_page=200, incremental=True):
+    """
+    Pull seller feedback (newest first) and upsert it page by page.
+
+    Incremental runs stop paging after the page that reaches the newest entry
+    already stored (minus FEEDBACK_CURSOR_OVERLAP); without a stored entry, or
+    with incremental=False, they stop at the days_back window (None =
+    everything). Every entry on a fetched page is upserted. Replies added to
+    feedback older than the cursor are picked up by the periodic
+    FEEDBACK_REPLY_SWEEP_DAYS sweep (incremental=False).
+    """
     since = None
     if days_back is not None:
         since = datetime.utcnow() - timedelta(days=days_back)
+    if incremental:
+        cursor = get_feedback_cursor(user_id)
+        if cursor:
+            since = cursor - FEEDBACK_CURSOR_OVERLAP
 
     created = 0
     updated = 0
     total = 0
+    pages = 0
+    now = datetime.utcnow()
 
     for page in range(1, max_pages + 1):
         result = fetch_feedback_page(user_id, page=page, entries_per_page=entries_per_page)
+        pages += 1
         if not result.get("success"):
             return {"success": False, "error": result.get("error", "Unknown error")}
 
@@ -145,74 +258,25 @@ def sync_ebay_feedback_for_user(user_id, days_back=1, max_pages=10, entries_per_
             break
 
         stop_early = False
+        rows = []
         for feedback in feedbacks:
             comment_time = feedback.get("comment_time")
             if since and comment_time and comment_time < since:
                 stop_early = True
-                continue
-
             if not feedback.get("feedback_id"):
                 continue
+            rows.append(_feedback_row(user_id, feedback, now))
 
-            existing = EbayFeedback.query.filter_by(
-                user_id=user_id,
-                feedback_id=feedback["feedback_id"]
-            ).first()
-
-            responded = feedback.get("responded", False)
-
-            if existing:
-                existing.comment_type = feedback.get("comment_type")
-                existing.comment_text = feedback.get("comment_text")
-                existing.comment_time = comment_time
-                existing.commenting_user = feedback.get("commenting_user")
-                existing.role = feedback.get("role")
-                existing.item_id = feedback.get("item_id")
-                existing.transaction_id = feedback.get("transaction_id")
-                existing.order_line_item_id = feedback.get("order_line_item_id")
-                existing.item_title = feedback.get("item_title")
-                # Only update response fields from eBay if not already responded via Qventory
-                if responded and existing.response_source != "qventory":
-                    existing.response_text = feedback.get("response_text")
-                    existing.response_type = feedback.get("response_type")
-                    existing.response_time = feedback.get("response_time")
-                    existing.responded = True
-                    existing.response_source = "ebay"
-                elif not existing.responded:
-                    existing.responded = responded
-                    if responded:
-                        existing.response_text = feedback.get("response_text")
-                        existing.response_type = feedback.get("response_type")
-                        existing.response_source = "ebay"
-                updated += 1
-            else:
-                db.session.add(EbayFeedback(
-                    user_id=user_id,
-                    feedback_id=feedback.get("feedback_id"),
-                    comment_type=feedback.get("comment_type"),
-                    comment_text=feedback.get("comment_text"),
-                    comment_time=comment_time,
-                    commenting_user=feedback.get("commenting_user"),
-                    role=feedback.get("role"),
-                    item_id=feedback.get("item_id"),
-                    transaction_id=feedback.get("transaction_id"),
-                    order_line_item_id=feedback.get("order_line_item_id"),
-                    item_title=feedback.get("item_title"),
-                    response_text=feedback.get("response_text"),
-                    response_type=feedback.get("response_type"),
-                    response_time=feedback.get("response_time"),
-                    responded=responded,
-                    response_source="ebay" if responded else None
-                ))
-                created += 1
-            total += 1
-
+        page_created, page_updated = upsert_feedback_rows(db.session, rows)
         db.session.commit()
+        created += page_created
+        updated += page_updated
+        total += len(rows)
 
         if stop_early or not result.get("has_more"):
             break
 
-    return {"success": True, "created": created, "updated": updated, "total": total}
+    return {"success": True, "created": created, "updated": updated, "total": total, "pages": pages}
 
 
 def respond_to_feedback(user_id, feedback: EbayFeedback, response_text: str, response_type: str = "Reply"):
@@ -1,8 +1,124 @@
+"""
+eBay fee estimation from EbayFeeRule
+
+Rules are kept in an in-process table together with the eBay category tree
+(category_id -> parent_id), so a category without its own rule inherits the
+closest ancestor's rule before falling back to the default (category_id NULL)
+rule. Resolution is memoized per category and fees for any price are computed
+locally. The table is reloaded every FEE_RULE_CACHE_TTL seconds, or right away
+in the current process via invalidate_fee_rule_cache().
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..extensions import db
 from ..models.ebay_fee_rule import EbayFeeRule
 
+FEE_RULE_CACHE_TTL = 300  # Seconds before the rule table is reloaded from the DB
+MAX_CATEGORY_DEPTH = 20  # Guard against cycles in the category tree
 
-def estimate_ebay_fees(
-    category_id,
+
+@dataclass(frozen=True)
+class FeeRule:
+    """Detached copy of an EbayFeeRule row (safe to share across requests)."""
+    category_id: Optional[str]
+    standard_rate: float
+    store_rate: Optional[float]
+    top_rated_discount: float
+    fixed_fee: float
+
+    @classmethod
+    def from_model(cls, rule):
+        return cls(
+            category_id=rule.category_id,
+            standard_rate=float(rule.standard_rate or 0),
+            store_rate=float(rule.store_rate) if rule.store_rate is not None else None,
+            top_rated_discount=float(rule.top_rated_discount or 0),
+            fixed_fee=float(rule.fixed_fee if rule.fixed_fee is not None else 0.30),
+        )
+
+    # Same fields as the model, so share its rate logic
+    resolve_rate = EbayFeeRule.resolve_rate
+
+
+@dataclass
+class _FeeRuleTable:
+    rules: dict
+    parents: dict
+    loaded_at: float
+    resolved: dict = field(default_factory=dict)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def _load_table():
+    from ..models.ebay_category import EbayCategory
+
+    rules = {}
+    for rule in EbayFeeRule.query.order_by(EbayFeeRule.id.asc()).all():
+        rules.setdefault(rule.category_id, FeeRule.from_model(rule))
+
+    parents = {
+        category_id: parent_id
+        for category_id, parent_id in db.session.query(EbayCategory.category_id, EbayCategory.parent_id)
+        if parent_id
+    }
+    return _FeeRuleTable(rules=rules, parents=parents, loaded_at=time.monotonic())
+
+
+def _get_table():
+    global _table
+    table = _table
+    if table is not None and time.monotonic() - table.loaded_at < FEE_RULE_CACHE_TTL:
+        return table
+    with _table_lock:
+        if _table is None or time.monotonic() - _table.loaded_at >= FEE_RULE_CACHE_TTL:
+            _table = _load_table()
+        return _table
+
+
+def invalidate_fee_rule_cache():
+    """Drop the in-process rule table (call after EbayFeeRule rows change)."""
+    global _table
+    with _table_lock:
+        _table = None
+
+
+def resolve_fee_rule(category_id):
+    """
+    Find the fee rule for a category: its own rule, else the closest
+    ancestor's, else the default rule.
+
+    Returns:
+        FeeRule or None when no rules are configured at all
+    """
+    table = _get_table()
+    key = str(category_id) if category_id else None
+    if key in table.resolved:
+        return table.resolved[key]
+
+    rule = None
+    current = key
+    for _ in range(MAX_CATEGORY_DEPTH):
+        if not current:
+            break
+        rule = table.rules.get(current)
+        if rule:
+            break
+        current = table.parents.get(current)
+    if rule is None:
+        rule = table.rules.get(None)
+
+    table.resolved[key] = rule
+    return rule
+
+
+def calculate_ebay_fees(
+    rule,
     resale_price,
     shipping_cost,
     has_store=False,
@@ -10,15 +126,6 @@ def estimate_ebay_fees(
     include_fixed_fee=False,
     ads_fee_rate=0.0,
 ):
-    rule = None
-    if category_id:
-        rule = EbayFeeRule.query.filter_by(category_id=category_id).first()
-    if not rule:
-        rule = EbayFeeRule.query.filter_by(category_id=None).first()
-
-    if not rule:
-        raise ValueError("Missing eBay fee rules. Please seed default fees.")
-
     fee_rate = rule.resolve_rate(has_store=has_store, top_rated=top_rated)
     fee_base = resale_price + shipping_cost
     marketplace_fee = fee_base * (fee_rate / 100)
@@ -26,14 +133,37 @@ def estimate_ebay_fees(
     ads_fee = resale_price * (ads_fee_rate / 100)
     total_fees = marketplace_fee + fixed_fee + ads_fee
 
-    breakdown = {
+    return {
         "fee_rate_percent": round(fee_rate, 4),
         "fee_base": round(fee_base, 2),
         "marketplace_fee": round(marketplace_fee, 2),
         "fixed_fee": round(fixed_fee, 2),
         "ads_fee": round(ads_fee, 2),
         "total_fees": round(total_fees, 2),
+        "rule_category_id": rule.category_id,
         "source": "ebay_fee_rules",
     }
 
-    return breakdown
+
+def estimate_ebay_fees(
+    category_id,
+    resale_price,
+    shipping_cost,
+    has_store=False,
+    top_rated=False,
+    include_fixed_fee=False,
+    ads_fee_rate=0.0,
+):
+    rule = resolve_fee_rule(category_id)
+    if not rule:
+        raise ValueError("Missing eBay fee rules. Please seed default fees.")
+
+    return calculate_ebay_fees(
+        rule,
+        resale_price,
+        shipping_cost,
+        has_store=has_store,
+        top_rated=top_rated,
+        include_fixed_fee=include_fixed_fee,
+        ads_fee_rate=ads_fee_rate,
+    )
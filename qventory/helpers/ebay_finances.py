@@ -6,6 +6,11 @@ import requests
 
 from qventory.helpers.ebay_inventory import get_user_access_token, EBAY_FINANCES_API_BASE, log_inv
 
+FINANCE_MAX_LOOKBACK_DAYS = 1825  # eBay max: 5 years
+# Re-read this much before the watermark: payouts change status and
+# transactions can post with a slightly earlier transactionDate.
+FINANCE_SYNC_OVERLAP = timedelta(days=2)
+
 
 def _format_iso(dt):
     if not dt:
@@ -108,7 +113,8 @@ def fetch_ebay_payouts(user_id, start_date, end_date, limit=200, offset=0):
 
     params = {
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "sort": "payoutDate"  # Oldest first: a capped run is complete up to its newest row
     }
     if filters:
         params["filter"] = ",".join(filters)
@@ -143,7 +149,8 @@ def fetch_ebay_transactions(user_id, start_date, end_date, limit=200, offset=0,
 
     params = {
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "sort": "transactionDate"  # Oldest first, see fetch_ebay_payouts
     }
     if filters:
         params["filter"] = ",".join(filters)
@@ -171,25 +178,32 @@ def fetch_ebay_transactions(user_id, start_date, end_date, limit=200, offset=0,
     }
 
 
-def fetch_all_ebay_payouts(user_id, start_date, end_date, limit=200, max_pages=10):
-    payouts = []
+def iter_ebay_payout_pages(user_id, start_date, end_date, limit=200, max_pages=10):
+    """
+    Yield fetch_ebay_payouts() results page by page (stops after a failed or short page).
+
+    When max_pages runs out on a full page, that last page has 'truncated': True.
+    """
     offset = 0
-    for _ in range(max_pages):
+    for page_number in range(max_pages):
         result = fetch_ebay_payouts(user_id, start_date, end_date, limit=limit, offset=offset)
-        if not result.get('success'):
-            return {'success': False, 'error': result.get('error'), 'payouts': payouts}
-        page = result.get('payouts', []) or []
-        payouts.extend(page)
-        if len(page) < limit:
-            break
+        done = not result.get('success') or len(result.get('payouts') or []) < limit
+        if not done and page_number == max_pages - 1:
+            result['truncated'] = True
+        yield result
+        if done:
+            return
         offset += limit
-    return {'success': True, 'payouts': payouts}
 
 
-def fetch_all_ebay_transactions(user_id, start_date, end_date, limit=200, max_pages=10, order_id=None):
-    transactions = []
+def iter_ebay_transaction_pages(user_id, start_date, end_date, limit=200, max_pages=10, order_id=None):
+    """
+    Yield fetch_ebay_transactions() results page by page (stops after a failed or short page).
+
+    When max_pages runs out on a full page, that last page has 'truncated': True.
+    """
     offset = 0
-    for _ in range(max_pages):
+    for page_number in range(max_pages):
         result = fetch_ebay_transactions(
             user_id,
             start_date,
@@ -198,11 +212,149 @@ def fetch_all_ebay_transactions(user_id, start_date, end_date, limit=200, max_pa
             offset=offset,
             order_id=order_id
         )
+        done = not result.get('success') or len(result.get('transactions') or []) < limit
+        if not done and page_number == max_pages - 1:
+            result['truncated'] = True
+        yield result
+        if done:
+            return
+        offset += limit
+
+
+def fetch_all_ebay_payouts(user_id, start_date, end_date, limit=200, max_pages=10):
+    payouts = []
+    truncated = False
+    for result in iter_ebay_payout_pages(user_id, start_date, end_date, limit=limit, max_pages=max_pages):
+        if not result.get('success'):
+            return {'success': False, 'error': result.get('error'), 'payouts': payouts}
+        payouts.extend(result.get('payouts', []) or [])
+        truncated = bool(result.get('truncated'))
+    return {'success': True, 'payouts': payouts, 'truncated': truncated}
+
+
+def fetch_all_ebay_transactions(user_id, start_date, end_date, limit=200, max_pages=10, order_id=None):
+    transactions = []
+    truncated = False
+    for result in iter_ebay_transaction_pages(
+        user_id, start_date, end_date, limit=limit, max_pages=max_pages, order_id=order_id
+    ):
         if not result.get('success'):
             return {'success': False, 'error': result.get('error'), 'transactions': transactions}
-        page = result.get('transactions', []) or []
-        transactions.extend(page)
-        if len(page) < limit:
-            break
-        offset += limit
-    return {'success': True, 'transactions': transactions}
+        transactions.extend(result.get('transactions', []) or [])
+        truncated = bool(result.get('truncated'))
+    return {'success': True, 'transactions': transactions, 'truncated': truncated}
+
+
+def _finance_watermark_key(user_id):
+    return f"ebay_finances_synced_{user_id}"
+
+
+def get_finance_sync_watermark(user_id):
+    """End of the last successful finance sync window for the user, or None."""
+    from qventory.models.system_setting import SystemSetting
+
+    setting = SystemSetting.query.filter_by(key=_finance_watermark_key(user_id)).first()
+    if not setting:
+        return None
+    if setting.value_str:
+        try:
+            return datetime.fromisoformat(setting.value_str)
+        except ValueError:
+            return None
+    # Older rows stored epoch seconds
+    return datetime.utcfromtimestamp(setting.value_int) if setting.value_int else None
+
+
+def set_finance_sync_watermark(user_id, synced_until):
+    """Record the watermark (ISO string) in the current transaction (the caller commits)."""
+    from qventory.extensions import db
+    from qventory.models.system_setting import SystemSetting
+
+    key = _finance_watermark_key(user_id)
+    setting = SystemSetting.query.filter_by(key=key).first()
+    if not setting:
+        setting = SystemSetting(key=key)
+        db.session.add(setting)
+    setting.value_str = synced_until.isoformat()
+    setting.value_int = None
+
+
+def finance_synced_until(end_date, *streams):
+    """
+    How far a sync run actually got.
+
+    Each stream is (truncated, newest_row_date) for payouts / transactions.
+    Pages are requested oldest first, so a stream that ran out of pages is
+    only complete up to the newest row it stored.
+
+    Returns:
+        datetime, or None when a truncated stream stored nothing (keep the old watermark)
+    """
+    synced_until = end_date
+    for truncated, newest in streams:
+        if not truncated:
+            continue
+        if newest is None:
+            return None
+        synced_until = min(synced_until, newest)
+    return synced_until
+
+
+def finance_sync_start(user_id, days_back, incremental=True, now=None):
+    """
+    Start of the window to request from the Finances API.
+
+    days_back caps the window (None = eBay's 5 year maximum). Incremental
+    runs start at the watermark minus FINANCE_SYNC_OVERLAP when that is later.
+    """
+    now = now or datetime.utcnow()
+    lookback = FINANCE_MAX_LOOKBACK_DAYS if days_back is None else min(days_back, FINANCE_MAX_LOOKBACK_DAYS)
+    start_date = now - timedelta(days=lookback)
+    if incremental:
+        watermark = get_finance_sync_watermark(user_id)
+        if watermark:
+            start_date = max(start_date, min(watermark, now) - FINANCE_SYNC_OVERLAP)
+    return start_date
+
+
+def upsert_finance_rows(session, model, rows, update_columns):
+    """
+    Write one page of finance rows with a single INSERT ... ON CONFLICT
+    (user_id, external_id) DO UPDATE.
+
+    Returns:
+        tuple: (created, updated)
+    """
+    if not rows:
+        return 0, 0
+
+    # A key may only appear once per statement; keep the last copy
+    by_key = {(row['user_id'], row['external_id']): row for row in rows}
+    rows = list(by_key.values())
+
+    user_ids = {user_id for user_id, _ in by_key}
+    existing = {
+        (user_id, external_id)
+        for user_id, external_id in session.query(model.user_id, model.external_id).filter(
+            model.user_id.in_(user_ids),
+            model.external_id.in_([external_id for _, external_id in by_key])
+        )
+    }
+
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Finance upserts are not supported on {dialect}")
+
+    stmt = insert(model.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'external_id'],
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    session.execute(stmt)
+
+    updated = sum(1 for key in by_key if key in existing)
+    return len(rows) - updated, updated
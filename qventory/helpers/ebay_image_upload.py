@@ -11,11 +11,12 @@ def _media_api_base():
     return "https://apim.sandbox.ebay.com"
 
 
-def upload_ebay_image_file(user_id: int, file_obj, filename: str, content_type: str | None):
+def upload_ebay_image_file(user_id: int, file_obj, filename: str, content_type: str | None, access_token: str | None = None):
     """
     Upload an image to eBay Picture Services and return the EPS URL used by Inventory API listings.
+    Pass access_token when calling from worker threads (no app context for the token lookup).
     """
-    access_token = get_user_access_token(user_id)
+    access_token = access_token or get_user_access_token(user_id)
     if not access_token:
         return {"success": False, "error": "missing_access_token"}
 
@@ -42,10 +43,11 @@ def upload_ebay_image_file(user_id: int, file_obj, filename: str, content_type:
     }
 
 
-def upload_ebay_image_from_url(user_id: int, image_url: str, filename: str | None = None):
+def upload_ebay_image_from_url(user_id: int, image_url: str, filename: str | None = None, access_token: str | None = None):
     """
     Download a persisted draft image and upload it to eBay Picture Services.
-    Draft editing stores images in Cloudinary; eBay upload happens only at publish time.
+    Draft editing stores images in Cloudinary; helpers.ebay_draft_images pushes
+    them to eBay in the background and publish uploads any stragglers.
     """
     if not image_url:
         return {"success": False, "error": "missing_image_url"}
@@ -63,6 +65,7 @@ def upload_ebay_image_from_url(user_id: int, image_url: str, filename: str | Non
             image_file,
             filename or "image.jpg",
             content_type,
+            access_token=access_token,
         )
     except requests.RequestException as exc:
         return {"success": False, "error": f"download_failed:{exc}"}
@@ -10,6 +10,13 @@ from datetime import datetime
 from collections import OrderedDict
 import xml.etree.ElementTree as ET
 from qventory.models.marketplace_credential import MarketplaceCredential
+from qventory.helpers.ebay_listing_snapshot import (
+    KIND_ACTIVE,
+    KIND_TRADING,
+    SNAPSHOT_MAX_AGE_LOOKUP,
+    load_snapshot,
+    store_snapshot,
+)
 
 def log_inv(msg):
     """Helper function for logging"""
@@ -111,56 +118,105 @@ def get_user_access_token(user_id):
     Get valid access token for user's eBay account
     Auto-refreshes if expired
 
+    Tokens are served from ebay_token_cache when possible; the credential is
+    only loaded (and decrypted) on a cache miss, and refreshes are serialized
+    per user so concurrent workers do not refresh the same credential.
+
     Args:
         user_id: Qventory user ID
 
     Returns:
         str: Valid access token or None if not connected
     """
-    from qventory.routes.ebay_auth import refresh_access_token, log
-    from qventory.extensions import db
-    from datetime import timedelta
+    from qventory.helpers.ebay_token_cache import (
+        cache_access_token,
+        get_cached_access_token,
+        token_needs_refresh,
+        token_refresh_lock,
+    )
 
-    # Force refresh from database (avoid stale cache in multi-worker environment)
-    db.session.expire_all()
+    access_token = get_cached_access_token(user_id)
+    if access_token:
+        return access_token
 
-    credential = MarketplaceCredential.query.filter_by(
+    credential = _load_active_ebay_credential(user_id)
+    if not credential:
+        return None
+
+    if not token_needs_refresh(credential):
+        access_token = credential.get_access_token()
+        cache_access_token(credential, access_token)
+        return access_token
+
+    with token_refresh_lock(user_id) as locked:
+        # Another worker may have refreshed while we waited for the lock
+        access_token = get_cached_access_token(user_id)
+        if access_token:
+            return access_token
+
+        credential = _load_active_ebay_credential(user_id, for_update=not locked)
+        if not credential:
+            return None
+
+        if not token_needs_refresh(credential):
+            access_token = credential.get_access_token()
+            cache_access_token(credential, access_token)
+            return access_token
+
+        return _refresh_user_access_token(credential)
+
+
+def _load_active_ebay_credential(user_id, for_update=False):
+    """
+    Load the user's active eBay credential with fresh column values.
+
+    populate_existing() refreshes just this row instead of expiring every
+    object in the session (other workers may have rotated the token).
+    """
+    query = MarketplaceCredential.query.filter_by(
         user_id=user_id,
         marketplace='ebay',
         is_active=True
-    ).first()
+    ).populate_existing()
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
 
-    if not credential:
-        return None
 
-    # Check if token is expired or about to expire (within 5 minutes)
-    if credential.token_expires_at and credential.token_expires_at < datetime.utcnow() + timedelta(minutes=5):
-        log(f"Access token expired for user {user_id}, refreshing...")
+def _refresh_user_access_token(credential):
+    """Refresh an expired access token, persist it and update the cache."""
+    from qventory.routes.ebay_auth import refresh_access_token, log
+    from qventory.helpers.ebay_token_cache import cache_access_token
+    from qventory.extensions import db
+    from datetime import timedelta
 
-        try:
-            # Refresh the token
-            refresh_token = credential.get_refresh_token()
-            if not refresh_token:
-                log("No refresh token available")
-                return None
-
-            tokens = refresh_access_token(refresh_token)
-
-            # Update credential
-            credential.set_access_token(tokens['access_token'])
-            if tokens.get('refresh_token'):
-                credential.set_refresh_token(tokens['refresh_token'])
-            credential.token_expires_at = datetime.utcnow() + timedelta(seconds=tokens['expires_in'])
-            credential.updated_at = datetime.utcnow()
-            db.session.commit()
-
-            log("Token refreshed successfully")
-            return tokens['access_token']
-        except Exception as e:
-            log(f"Failed to refresh token: {str(e)}")
+    user_id = credential.user_id
+    log(f"Access token expired for user {user_id}, refreshing...")
+
+    try:
+        # Refresh the token
+        refresh_token = credential.get_refresh_token()
+        if not refresh_token:
+            log("No refresh token available")
             return None
 
-    return credential.get_access_token()
+        tokens = refresh_access_token(refresh_token)
+
+        # Update credential
+        credential.set_access_token(tokens['access_token'])
+        if tokens.get('refresh_token'):
+            credential.set_refresh_token(tokens['refresh_token'])
+        credential.token_expires_at = datetime.utcnow() + timedelta(seconds=tokens['expires_in'])
+        credential.updated_at = datetime.utcnow()
+        db.session.commit()
+
+        cache_access_token(credential, tokens['access_token'])
+
+        log("Token refreshed successfully")
+        return tokens['access_token']
+    except Exception as e:
+        log(f"Failed to refresh token: {str(e)}")
+        return None
 
 
 def normalize_store_subscription_level(level):
@@ -639,10 +695,11 @@ def get_image_candidates_for_listing(
 
         if include_active_fallback and not _dedupe_image_urls(candidates):
             try:
-                active_items, _failed = get_active_listings_trading_api(
+                active_items = get_active_listings_trading_api(
                     user_id,
                     max_items=active_fallback_max_items,
-                    collect_failures=True
+                    collect_failures=False,
+                    max_age_seconds=SNAPSHOT_MAX_AGE_LOOKUP
                 )
                 for active in active_items:
                     if str(active.get("ebay_listing_id") or "").strip() != listing_id_text:
@@ -1159,18 +1216,245 @@ def get_ebay_orders(user_id, days_back=None, max_orders=5000, start_date=None, e
     return all_orders[:max_orders]
 
 
+TRADING_PAGE_WORKERS = int(os.environ.get('EBAY_TRADING_PAGE_WORKERS', '4'))  # Concurrent GetMyeBaySelling pages
+TRADING_ENTRIES_PER_PAGE = 200  # Max allowed by eBay
+
+
+def _is_trading_rate_limit_error(text: str) -> bool:
+    if not text:
+        return False
+    lowered = text.lower()
+    return (
+        "exceeded usage limit" in lowered
+        or "usage limit" in lowered
+        or "rate limit" in lowered
+        or "call usage" in lowered
+        or "throttle" in lowered
+    )
+
+
+def _normalize_trading_active_item(item_elem):
+    """Convert a GetMyeBaySelling ActiveList <Item> element to the normalized item dict."""
+    ns = _XML_NS
+
+    # Extract item data
+    item_id = item_elem.find('ebay:ItemID', ns)
+    title = item_elem.find('ebay:Title', ns)
+
+    # Price - with robust parsing
+    price = 0
+    try:
+        selling_status = item_elem.find('ebay:SellingStatus', ns)
+        current_price = selling_status.find('ebay:CurrentPrice', ns) if selling_status is not None else None
+        if current_price is not None and current_price.text:
+            price = float(current_price.text.strip())
+    except (ValueError, AttributeError) as e:
+        log_inv(f"Warning: Could not parse price for item, defaulting to 0: {str(e)}")
+        price = 0
+
+    # Quantity - with robust parsing
+    quantity = 1
+    try:
+        quantity_elem = item_elem.find('ebay:Quantity', ns)
+        if quantity_elem is not None and quantity_elem.text:
+            quantity = int(quantity_elem.text.strip())
+    except (ValueError, AttributeError) as e:
+        log_inv(f"Warning: Could not parse quantity for item, defaulting to 1: {str(e)}")
+        quantity = 1
+
+    # SKU (Custom Label). For variations, use first variation SKU.
+    sku_elem = item_elem.find('ebay:SKU', ns)
+    sku = sku_elem.text if sku_elem is not None else ''
+    variation_skus = []
+    if not sku:
+        var_sku_elems = item_elem.findall('.//ebay:Variations/ebay:Variation/ebay:SKU', ns)
+        for var_sku_elem in var_sku_elems:
+            if var_sku_elem is not None and var_sku_elem.text:
+                variation_skus.append(var_sku_elem.text.strip())
+        if variation_skus:
+            sku = variation_skus[0]
+
+    # Image (gallery, explicit picture URLs, and variation picture sets)
+    image_urls = []
+    picture_details = item_elem.find('ebay:PictureDetails', ns)
+    if picture_details is not None:
+        gallery_url = picture_details.find('ebay:GalleryURL', ns)
+        if gallery_url is not None and gallery_url.text:
+            image_urls.append(gallery_url.text.strip())
+
+        gallery_large = picture_details.find('ebay:GalleryURLLarge', ns)
+        if gallery_large is not None and gallery_large.text:
+            image_urls.append(gallery_large.text.strip())
+
+        for pic in picture_details.findall('ebay:PictureURL', ns):
+            if pic is not None and pic.text:
+                image_urls.append(pic.text.strip())
+
+        for ext in picture_details.findall('ebay:ExternalPictureURL', ns):
+            if ext is not None and ext.text:
+                image_urls.append(ext.text.strip())
+
+    variation_picture_urls = item_elem.findall(
+        './/ebay:Variations/ebay:Pictures/ebay:VariationSpecificPictureSet/ebay:PictureURL',
+        ns
+    )
+    for pic in variation_picture_urls:
+        if pic is not None and pic.text:
+            image_urls.append(pic.text.strip())
+
+    deduped_image_urls = []
+    seen_image_urls = set()
+    for url in image_urls:
+        if not url or url in seen_image_urls:
+            continue
+        seen_image_urls.add(url)
+        deduped_image_urls.append(url)
+
+    start_elem = item_elem.find('ebay:ListingDetails/ebay:StartTime', ns)
+    if start_elem is None:
+        start_elem = item_elem.find('ebay:StartTime', ns)
+    end_elem = item_elem.find('ebay:ListingDetails/ebay:EndTime', ns)
+    if end_elem is None:
+        end_elem = item_elem.find('ebay:EndTime', ns)
+    start_time = _parse_ebay_datetime(start_elem.text if start_elem is not None else None)
+    end_time = _parse_ebay_datetime(end_elem.text if end_elem is not None else None)
+
+    # Build normalized item
+    return {
+        'sku': sku,
+        'product': {
+            'title': title.text if title is not None else 'Unknown',
+            'description': '',
+            'imageUrls': deduped_image_urls
+        },
+        'availability': {
+            'shipToLocationAvailability': {
+                'quantity': quantity
+            }
+        },
+        'condition': 'USED_EXCELLENT',
+        'ebay_listing_id': item_id.text if item_id is not None else '',
+        'item_price': price,
+        'ebay_url': f"https://www.ebay.com/itm/{item_id.text}" if item_id is not None else None,
+        'listing_start_time': start_time,
+        'listing_end_time': end_time,
+        'source': 'trading_api',
+        'variation_skus': variation_skus
+    }
+
+
+def _trading_item_failure(item_elem, error, collect_failures):
+    """Log a per-item parse failure and return the failed-item dict (or None)."""
+    ns = _XML_NS
+    try:
+        failed_id_elem = item_elem.find('ebay:ItemID', ns)
+        failed_title_elem = item_elem.find('ebay:Title', ns)
+        failed_sku_elem = item_elem.find('ebay:SKU', ns)
+
+        failed_id = failed_id_elem.text if failed_id_elem is not None else None
+        failed_title = failed_title_elem.text if failed_title_elem is not None else None
+        failed_sku = failed_sku_elem.text if failed_sku_elem is not None else None
+
+        log_inv(f"❌ Error parsing item ID={failed_id or 'Unknown'}, Title={failed_title[:50] if failed_title else 'Unknown'}: {str(error)}")
+
+        # Collect failed item data
+        if collect_failures:
+            import traceback
+            return {
+                'ebay_listing_id': failed_id,
+                'ebay_title': failed_title,
+                'ebay_sku': failed_sku,
+                'error_type': 'parsing_error',
+                'error_message': str(error),
+                'raw_data': ET.tostring(item_elem, encoding='unicode')[:5000],  # Store raw XML (limit to 5KB)
+                'traceback': traceback.format_exc()[:2000]
+            }
+    except Exception as inner_e:
+        log_inv(f"❌ Error parsing item (couldn't extract ID/title): {str(error)}")
+        log_inv(f"❌ Additional error during failure collection: {str(inner_e)}")
+        if collect_failures:
+            return {
+                'ebay_listing_id': None,
+                'ebay_title': None,
+                'ebay_sku': None,
+                'error_type': 'critical_parsing_error',
+                'error_message': f"Primary: {str(error)}, Secondary: {str(inner_e)}",
+                'raw_data': None,
+                'traceback': None
+            }
+    return None
+
+
+def iter_trading_active_list_page(content, page_info, collect_failures=True):
+    """
+    Stream-parse one GetMyeBaySelling response with iterparse.
+
+    Yields ('item', normalized_dict) or ('failed', failure_dict) per ActiveList
+    item; each <Item> subtree is dropped once converted, so no full DOM is kept.
+    Fills page_info with ack, errors, total_pages, total_entries and
+    has_item_array as they are encountered.
+
+    Raises:
+        ET.ParseError on malformed XML
+    """
+    import io
+
+    page_info.setdefault('ack', None)
+    page_info.setdefault('errors', [])
+    page_info.setdefault('total_pages', None)
+    page_info.setdefault('total_entries', None)
+    page_info.setdefault('has_item_array', False)
+
+    path = []
+    elements = []
+    for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+        tag = elem.tag.rsplit('}', 1)[-1]
+        if event == 'start':
+            path.append(tag)
+            elements.append(elem)
+            if path[1:] == ['ActiveList', 'ItemArray']:
+                page_info['has_item_array'] = True
+            continue
+
+        if path[1:] == ['ActiveList', 'ItemArray', 'Item']:
+            try:
+                yield 'item', _normalize_trading_active_item(elem)
+            except Exception as e:
+                failure = _trading_item_failure(elem, e, collect_failures)
+                if failure:
+                    yield 'failed', failure
+            # Drop the processed subtree to keep memory bounded
+            elements[-2].remove(elem)
+        elif path[1:] == ['Ack']:
+            page_info['ack'] = (elem.text or '').strip()
+        elif tag == 'LongMessage' and 'Errors' in path:
+            page_info['errors'].append(elem.text)
+        elif path[1:] == ['ActiveList', 'PaginationResult', 'TotalNumberOfPages'] and elem.text:
+            page_info['total_pages'] = int(elem.text)
+        elif path[1:] == ['ActiveList', 'PaginationResult', 'TotalNumberOfEntries'] and elem.text:
+            page_info['total_entries'] = int(elem.text)
+
+        path.pop()
+        elements.pop()
+
+
 def get_active_listings_trading_api(
     user_id,
     max_items=1000,
     collect_failures=True,
     return_meta=False,
     max_retries=3,
-    backoff_base=1.0
+    backoff_base=1.0,
+    max_age_seconds=None
 ):
     """
     Get active listings using Trading API (legacy but reliable)
     Uses GetMyeBaySelling call which works with all listing types
 
+    Page 1 is fetched first to learn TotalNumberOfPages; the remaining pages
+    are fetched concurrently (EBAY_TRADING_PAGE_WORKERS) and stream-parsed
+    with iterparse. Results keep page order.
+
     Args:
         user_id: Qventory user ID
         max_items: Maximum items to fetch (supports pagination for 200+)
@@ -1178,11 +1462,27 @@ def get_active_listings_trading_api(
         return_meta: If True, include metadata about completeness and pagination.
         max_retries: Max retries per page on rate limit or transient errors.
         backoff_base: Base seconds for exponential backoff.
+        max_age_seconds: Reuse a complete stored snapshot up to this old
+            instead of calling eBay (None always fetches fresh).
 
     Returns:
         If collect_failures=True: tuple (list of items, list of failed items dicts)
         If collect_failures=False: list of items in normalized format
     """
+    from concurrent.futures import ThreadPoolExecutor
+
+    cached = load_snapshot(KIND_TRADING, user_id, max_age_seconds, max_items=max_items)
+    if cached:
+        data, _fetched_at = cached
+        meta = dict(data.get('meta') or {}, cached=True)
+        return _trading_listings_result(
+            (data.get('items') or [])[:max_items],
+            data.get('failed') or [],
+            meta,
+            collect_failures,
+            return_meta
+        )
+
     log_inv(f"Attempting Trading API GetMyeBaySelling for user {user_id}")
 
     access_token = get_user_access_token(user_id)
@@ -1207,13 +1507,11 @@ def get_active_listings_trading_api(
 
     app_id = os.environ.get('EBAY_CLIENT_ID')
 
-    ns = _XML_NS
-
     all_items = []
     failed_items = []  # Track items that failed to parse
-    page_number = 1
-    entries_per_page = 200  # Max allowed by eBay
+    entries_per_page = TRADING_ENTRIES_PER_PAGE
     total_pages = 1  # Will be updated from first response
+    total_entries = None
     terminated_early = False
     terminate_reason = None
     meta = {
@@ -1227,21 +1525,25 @@ def get_active_listings_trading_api(
         'rate_limited': False
     }
 
-    def _is_rate_limit_error(text: str) -> bool:
-        if not text:
-            return False
-        lowered = text.lower()
-        return (
-            "exceeded usage limit" in lowered
-            or "usage limit" in lowered
-            or "rate limit" in lowered
-            or "call usage" in lowered
-            or "throttle" in lowered
-        )
+    headers = {
+        'X-EBAY-API-SITEID': '0',  # 0 = US
+        'X-EBAY-API-COMPATIBILITY-LEVEL': TRADING_COMPAT_LEVEL,
+        'X-EBAY-API-CALL-NAME': 'GetMyeBaySelling',
+        'X-EBAY-API-APP-NAME': app_id,
+        'X-EBAY-API-IAF-TOKEN': access_token,
+        'Content-Type': 'text/xml'
+    }
 
-    # Paginate through all results
-    while page_number <= total_pages and len(all_items) < max_items:
-        log_inv(f"Fetching page {page_number}/{total_pages} (entries per page: {entries_per_page})")
+    def _fetch_page(page_number):
+        """Fetch and stream-parse one ActiveList page, retrying transient errors."""
+        page = {
+            'page_number': page_number,
+            'items': [],
+            'failed': [],
+            'info': {},
+            'error': None,
+            'rate_limited': False
+        }
 
         # Build XML request for GetMyeBaySelling
         xml_request = f'''<?xml version="1.0" encoding="utf-8"?>
@@ -1259,287 +1561,127 @@ def get_active_listings_trading_api(
   <DetailLevel>ReturnAll</DetailLevel>
 </GetMyeBaySellingRequest>'''
 
-        headers = {
-            'X-EBAY-API-SITEID': '0',  # 0 = US
-            'X-EBAY-API-COMPATIBILITY-LEVEL': TRADING_COMPAT_LEVEL,
-            'X-EBAY-API-CALL-NAME': 'GetMyeBaySelling',
-            'X-EBAY-API-APP-NAME': app_id,
-            'X-EBAY-API-IAF-TOKEN': access_token,
-            'Content-Type': 'text/xml'
-        }
-
-        log_inv(f"Calling Trading API: {TRADING_API_URL}")
-        response = None
-        root = None
+        log_inv(f"Fetching page {page_number} (entries per page: {entries_per_page})")
         for attempt in range(max_retries):
+            can_retry = attempt < max_retries - 1
+            sleep_for = backoff_base * (2 ** attempt)
             try:
                 response = requests.post(TRADING_API_URL, data=xml_request, headers=headers, timeout=30)
             except Exception as exc:
-                if attempt < max_retries - 1:
-                    sleep_for = backoff_base * (2 ** attempt)
-                    log_inv(f"Trading API request failed (attempt {attempt + 1}/{max_retries}): {exc}. Retrying in {sleep_for:.1f}s")
+                if can_retry:
+                    log_inv(f"Trading API request failed (page {page_number}, attempt {attempt + 1}/{max_retries}): {exc}. Retrying in {sleep_for:.1f}s")
                     time.sleep(sleep_for)
                     continue
-                terminated_early = True
-                terminate_reason = f"network_error: {exc}"
+                page['error'] = f"network_error: {exc}"
                 log_inv(f"Trading API request failed: {exc}")
-                break
-
-            log_inv(f"Trading API response status: {response.status_code}")
+                return page
 
             if response.status_code != 200:
                 body = response.text or ""
-                if response.status_code == 429 or _is_rate_limit_error(body):
-                    meta['rate_limited'] = True
-                    if attempt < max_retries - 1:
-                        sleep_for = backoff_base * (2 ** attempt)
-                        log_inv(f"Trading API rate limit (attempt {attempt + 1}/{max_retries}). Retrying in {sleep_for:.1f}s")
+                if response.status_code == 429 or _is_trading_rate_limit_error(body):
+                    page['rate_limited'] = True
+                    if can_retry:
+                        log_inv(f"Trading API rate limit (page {page_number}, attempt {attempt + 1}/{max_retries}). Retrying in {sleep_for:.1f}s")
                         time.sleep(sleep_for)
                         continue
-                terminated_early = True
-                terminate_reason = f"http_{response.status_code}"
+                page['error'] = f"http_{response.status_code}"
                 log_inv(f"Trading API error: {body[:500]}")
-                break
+                return page
 
+            info = {}
+            items = []
+            failed = []
             try:
-                root = ET.fromstring(response.content)
+                for kind, payload in iter_trading_active_list_page(response.content, info, collect_failures):
+                    if kind == 'item':
+                        items.append(payload)
+                    else:
+                        failed.append(payload)
             except ET.ParseError as exc:
-                if attempt < max_retries - 1:
-                    sleep_for = backoff_base * (2 ** attempt)
-                    log_inv(f"Trading API XML parse error (attempt {attempt + 1}/{max_retries}): {exc}. Retrying in {sleep_for:.1f}s")
+                if can_retry:
+                    log_inv(f"Trading API XML parse error (page {page_number}, attempt {attempt + 1}/{max_retries}): {exc}. Retrying in {sleep_for:.1f}s")
                     time.sleep(sleep_for)
                     continue
-                terminated_early = True
-                terminate_reason = "xml_parse_error"
+                page['error'] = "xml_parse_error"
                 log_inv(f"XML parsing error: {str(exc)}")
                 log_inv(f"Response content: {response.text[:500]}")
-                break
+                return page
+            except Exception as exc:
+                page['error'] = "processing_error"
+                log_inv(f"Error processing Trading API response: {str(exc)}")
+                return page
 
             # Check for errors
-            ack = root.find('ebay:Ack', ns)
-            if ack is not None and ack.text in ['Failure', 'PartialFailure']:
-                errors = root.findall('.//ebay:Errors', ns)
-                error_texts = []
-                for error in errors:
-                    error_msg = error.find('ebay:LongMessage', ns)
-                    if error_msg is not None:
-                        error_texts.append(error_msg.text)
-                        log_inv(f"Trading API error: {error_msg.text}")
-
-                if any(_is_rate_limit_error(msg or "") for msg in error_texts):
-                    meta['rate_limited'] = True
-                    if attempt < max_retries - 1:
-                        sleep_for = backoff_base * (2 ** attempt)
-                        log_inv(f"Trading API rate limit (attempt {attempt + 1}/{max_retries}). Retrying in {sleep_for:.1f}s")
+            if info.get('ack') in ['Failure', 'PartialFailure']:
+                error_texts = [msg for msg in info.get('errors', []) if msg]
+                for msg in error_texts:
+                    log_inv(f"Trading API error: {msg}")
+                if any(_is_trading_rate_limit_error(msg) for msg in error_texts):
+                    page['rate_limited'] = True
+                    if can_retry:
+                        log_inv(f"Trading API rate limit (page {page_number}, attempt {attempt + 1}/{max_retries}). Retrying in {sleep_for:.1f}s")
                         time.sleep(sleep_for)
                         continue
+                page['error'] = "api_failure"
+                return page
 
-                terminated_early = True
-                terminate_reason = "api_failure"
-                break
-
-            # Successful parse
-            break
-
-        if terminated_early or root is None:
-            break
+            page.update(items=items, failed=failed, info=info)
+            return page
 
-        try:
-            # Get pagination info from response
-            pagination_result = root.find('.//ebay:ActiveList/ebay:PaginationResult', ns)
-            if pagination_result is not None:
-                total_pages_elem = pagination_result.find('ebay:TotalNumberOfPages', ns)
-                total_entries_elem = pagination_result.find('ebay:TotalNumberOfEntries', ns)
-
-                if total_pages_elem is not None:
-                    total_pages = int(total_pages_elem.text)
-                if total_entries_elem is not None:
-                    total_entries = int(total_entries_elem.text)
-                    log_inv(f"Total listings available: {total_entries} across {total_pages} page(s)")
-                    meta['expected_total'] = total_entries
-                    meta['pages_expected'] = total_pages
-
-            # Extract active listings
-            item_array = root.find('.//ebay:ActiveList/ebay:ItemArray', ns)
-
-            if item_array is None:
-                log_inv("No ItemArray found in response")
-                break
+        return page
 
-            items_in_page = 0
-            for item_elem in item_array.findall('ebay:Item', ns):
-                try:
-                    # Extract item data
-                    item_id = item_elem.find('ebay:ItemID', ns)
-                    title = item_elem.find('ebay:Title', ns)
-
-                    # Price - with robust parsing
-                    price = 0
-                    try:
-                        selling_status = item_elem.find('ebay:SellingStatus', ns)
-                        current_price = selling_status.find('ebay:CurrentPrice', ns) if selling_status is not None else None
-                        if current_price is not None and current_price.text:
-                            price = float(current_price.text.strip())
-                    except (ValueError, AttributeError) as e:
-                        log_inv(f"Warning: Could not parse price for item, defaulting to 0: {str(e)}")
-                        price = 0
-
-                    # Quantity - with robust parsing
-                    quantity = 1
-                    try:
-                        quantity_elem = item_elem.find('ebay:Quantity', ns)
-                        if quantity_elem is not None and quantity_elem.text:
-                            quantity = int(quantity_elem.text.strip())
-                    except (ValueError, AttributeError) as e:
-                        log_inv(f"Warning: Could not parse quantity for item, defaulting to 1: {str(e)}")
-                        quantity = 1
-
-                    # SKU (Custom Label). For variations, use first variation SKU.
-                    sku_elem = item_elem.find('ebay:SKU', ns)
-                    sku = sku_elem.text if sku_elem is not None else ''
-                    variation_skus = []
-                    if not sku:
-                        var_sku_elems = item_elem.findall('.//ebay:Variations/ebay:Variation/ebay:SKU', ns)
-                        for var_sku_elem in var_sku_elems:
-                            if var_sku_elem is not None and var_sku_elem.text:
-                                variation_skus.append(var_sku_elem.text.strip())
-                        if variation_skus:
-                            sku = variation_skus[0]
-
-                    # Image (gallery, explicit picture URLs, and variation picture sets)
-                    image_urls = []
-                    picture_details = item_elem.find('ebay:PictureDetails', ns)
-                    if picture_details is not None:
-                        gallery_url = picture_details.find('ebay:GalleryURL', ns)
-                        if gallery_url is not None and gallery_url.text:
-                            image_urls.append(gallery_url.text.strip())
-
-                        gallery_large = picture_details.find('ebay:GalleryURLLarge', ns)
-                        if gallery_large is not None and gallery_large.text:
-                            image_urls.append(gallery_large.text.strip())
-
-                        for pic in picture_details.findall('ebay:PictureURL', ns):
-                            if pic is not None and pic.text:
-                                image_urls.append(pic.text.strip())
-
-                        for ext in picture_details.findall('ebay:ExternalPictureURL', ns):
-                            if ext is not None and ext.text:
-                                image_urls.append(ext.text.strip())
-
-                    variation_picture_urls = item_elem.findall(
-                        './/ebay:Variations/ebay:Pictures/ebay:VariationSpecificPictureSet/ebay:PictureURL',
-                        ns
-                    )
-                    for pic in variation_picture_urls:
-                        if pic is not None and pic.text:
-                            image_urls.append(pic.text.strip())
-
-                    deduped_image_urls = []
-                    seen_image_urls = set()
-                    for url in image_urls:
-                        if not url or url in seen_image_urls:
-                            continue
-                        seen_image_urls.add(url)
-                        deduped_image_urls.append(url)
-
-                    start_elem = item_elem.find('ebay:ListingDetails/ebay:StartTime', ns)
-                    if start_elem is None:
-                        start_elem = item_elem.find('ebay:StartTime', ns)
-                    end_elem = item_elem.find('ebay:ListingDetails/ebay:EndTime', ns)
-                    if end_elem is None:
-                        end_elem = item_elem.find('ebay:EndTime', ns)
-                    start_time = _parse_ebay_datetime(start_elem.text if start_elem is not None else None)
-                    end_time = _parse_ebay_datetime(end_elem.text if end_elem is not None else None)
-
-                    # Build normalized item
-                    normalized = {
-                        'sku': sku,
-                        'product': {
-                            'title': title.text if title is not None else 'Unknown',
-                            'description': '',
-                            'imageUrls': deduped_image_urls
-                        },
-                        'availability': {
-                            'shipToLocationAvailability': {
-                                'quantity': quantity
-                            }
-                        },
-                        'condition': 'USED_EXCELLENT',
-                        'ebay_listing_id': item_id.text if item_id is not None else '',
-                        'item_price': price,
-                        'ebay_url': f"https://www.ebay.com/itm/{item_id.text}" if item_id is not None else None,
-                        'listing_start_time': start_time,
-                        'listing_end_time': end_time,
-                        'source': 'trading_api',
-                        'variation_skus': variation_skus
-                    }
-                    all_items.append(normalized)
-                    items_in_page += 1
-
-                except Exception as e:
-                    # Collect failed item details
-                    try:
-                        failed_id_elem = item_elem.find('ebay:ItemID', ns)
-                        failed_title_elem = item_elem.find('ebay:Title', ns)
-                        failed_sku_elem = item_elem.find('ebay:SKU', ns)
-
-                        failed_id = failed_id_elem.text if failed_id_elem is not None else None
-                        failed_title = failed_title_elem.text if failed_title_elem is not None else None
-                        failed_sku = failed_sku_elem.text if failed_sku_elem is not None else None
-
-                        log_inv(f"❌ Error parsing item ID={failed_id or 'Unknown'}, Title={failed_title[:50] if failed_title else 'Unknown'}: {str(e)}")
-
-                        # Collect failed item data
-                        if collect_failures:
-                            import traceback
-                            failed_items.append({
-                                'ebay_listing_id': failed_id,
-                                'ebay_title': failed_title,
-                                'ebay_sku': failed_sku,
-                                'error_type': 'parsing_error',
-                                'error_message': str(e),
-                                'raw_data': ET.tostring(item_elem, encoding='unicode')[:5000],  # Store raw XML (limit to 5KB)
-                                'traceback': traceback.format_exc()[:2000]
-                            })
-                    except Exception as inner_e:
-                        log_inv(f"❌ Error parsing item (couldn't extract ID/title): {str(e)}")
-                        log_inv(f"❌ Additional error during failure collection: {str(inner_e)}")
-                        if collect_failures:
-                            failed_items.append({
-                                'ebay_listing_id': None,
-                                'ebay_title': None,
-                                'ebay_sku': None,
-                                'error_type': 'critical_parsing_error',
-                                'error_message': f"Primary: {str(e)}, Secondary: {str(inner_e)}",
-                                'raw_data': None,
-                                'traceback': None
-                            })
-                    continue
-
-            log_inv(f"✓ Parsed {items_in_page} items from page {page_number}")
-
-        except Exception as e:
-            log_inv(f"Error processing Trading API response: {str(e)}")
-            terminated_early = True
-            terminate_reason = "processing_error"
-            break
-
-        # Move to next page
-        meta['pages_fetched'] = page_number
-        page_number += 1
+    def _collect_page(page):
+        nonlocal terminated_early, terminate_reason
+        if page['rate_limited']:
+            meta['rate_limited'] = True
+        if page['error']:
+            if not terminated_early:
+                terminated_early = True
+                terminate_reason = page['error']
+            return
+        if not page['info'].get('has_item_array'):
+            log_inv(f"No ItemArray found in response (page {page['page_number']})")
+            return
+        all_items.extend(page['items'])
+        failed_items.extend(page['failed'])
+        meta['pages_fetched'] += 1
+        log_inv(f"✓ Parsed {len(page['items'])} items from page {page['page_number']}")
+
+    # Page 1 tells us how many pages there are
+    first_page = _fetch_page(1)
+    first_info = first_page['info']
+    if not first_page['error']:
+        if first_info.get('total_pages') is not None:
+            total_pages = first_info['total_pages']
+        if first_info.get('total_entries') is not None:
+            total_entries = first_info['total_entries']
+            log_inv(f"Total listings available: {total_entries} across {total_pages} page(s)")
+            meta['expected_total'] = total_entries
+            meta['pages_expected'] = total_pages
+    _collect_page(first_page)
+
+    # Remaining pages concurrently (bounded), only as many as max_items needs
+    pages_needed = min(total_pages, max(1, -(-max_items // entries_per_page)))
+    remaining_pages = list(range(2, pages_needed + 1))
+    if remaining_pages and not terminated_early and first_info.get('has_item_array'):
+        workers = max(1, min(TRADING_PAGE_WORKERS, len(remaining_pages)))
+        log_inv(f"Fetching {len(remaining_pages)} remaining page(s) with {workers} worker(s)")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for page in pool.map(_fetch_page, remaining_pages):
+                _collect_page(page)
 
     # Final summary
     log_inv(f"=" * 60)
     log_inv(f"Trading API Summary:")
-    log_inv(f"  eBay reported: {total_entries if 'total_entries' in locals() else 'Unknown'} total active listings")
+    log_inv(f"  eBay reported: {total_entries if total_entries is not None else 'Unknown'} total active listings")
     log_inv(f"  Successfully fetched: {len(all_items)} items")
     log_inv(f"  Failed to parse: {len(failed_items)} items")
     meta['fetched'] = len(all_items)
     meta['failed'] = len(failed_items)
     if meta.get('pages_expected') is None:
-        meta['pages_expected'] = total_pages if 'total_pages' in locals() else None
+        meta['pages_expected'] = total_pages
 
-    if 'total_entries' in locals():
+    if total_entries is not None:
         expected_total = total_entries
         actual_total = len(all_items) + len(failed_items)
 
@@ -1570,14 +1712,28 @@ def get_active_listings_trading_api(
     if meta.get('expected_total') is None:
         meta['is_complete'] = False
 
+    all_items = all_items[:max_items]
+    store_snapshot(
+        KIND_TRADING,
+        user_id,
+        {'items': all_items, 'failed': failed_items, 'meta': meta},
+        max_items,
+        meta['is_complete'] and not meta['rate_limited'] and not meta['incomplete_reason']
+    )
+
+    return _trading_listings_result(all_items, failed_items, meta, collect_failures, return_meta)
+
+
+def _trading_listings_result(items, failed_items, meta, collect_failures, return_meta):
+    """Shape get_active_listings_trading_api() output for its flags."""
     if collect_failures:
         if return_meta:
-            return all_items[:max_items], failed_items, meta
-        return all_items[:max_items], failed_items
+            return items, failed_items, meta
+        return items, failed_items
     else:
         if return_meta:
-            return all_items[:max_items], meta
-        return all_items[:max_items]
+            return items, meta
+        return items
 
 
 def get_listings_from_fulfillment_api(user_id, max_items=1000):
@@ -1982,7 +2138,7 @@ def parse_ebay_inventory_item(ebay_item, process_images=True):
         }
 
 
-def sync_location_to_ebay_sku(user_id, ebay_listing_id, location_code):
+def sync_location_to_ebay_sku(user_id, ebay_listing_id, location_code, session=None):
     """
     Sync Qventory location code to eBay Custom SKU field using Trading API
 
@@ -1990,6 +2146,7 @@ def sync_location_to_ebay_sku(user_id, ebay_listing_id, location_code):
         user_id: Qventory user ID
         ebay_listing_id: eBay Item ID
         location_code: Location code from Qventory (e.g., "A1-B2-S3-C4")
+        session: Optional requests.Session to reuse connections across a batch
 
     Returns:
         bool: True if successful, False otherwise
@@ -2030,7 +2187,7 @@ def sync_location_to_ebay_sku(user_id, ebay_listing_id, location_code):
     }
 
     try:
-        response = requests.post(trading_url, data=xml_request, headers=headers, timeout=30)
+        response = (session or requests).post(trading_url, data=xml_request, headers=headers, timeout=30)
         log_inv(f"Sync response status: {response.status_code}")
 
         if response.status_code != 200:
@@ -2236,10 +2393,14 @@ def _normalize_trading_item_to_offer(item):
     }
 
 
-def fetch_active_listings_snapshot(user_id, limit=200, max_pages=50, max_items=5000):
+def fetch_active_listings_snapshot(user_id, limit=200, max_pages=50, max_items=5000, max_age_seconds=None):
     """
     Fetch a complete snapshot of active listings using Offers API + Trading fallback.
 
+    Complete snapshots are stored per user (see ebay_listing_snapshot); pass
+    max_age_seconds to reuse one fetched within that window instead of
+    downloading the store again.
+
     Returns:
         dict: {
             'success': bool,
@@ -2247,9 +2408,16 @@ def fetch_active_listings_snapshot(user_id, limit=200, max_pages=50, max_items=5
             'total': int,
             'sources': list[str],
             'can_mark_inactive': bool,
+            'fetched_at': datetime,
+            'cached': bool,
             'error': str (optional)
         }
     """
+    cached = load_snapshot(KIND_ACTIVE, user_id, max_age_seconds, max_items=max_items)
+    if cached:
+        data, fetched_at = cached
+        return dict(data, fetched_at=fetched_at, cached=True)
+
     offers = []
     total_from_api = None
     offset = 0
@@ -2334,7 +2502,7 @@ def fetch_active_listings_snapshot(user_id, limit=200, max_pages=50, max_items=5
         if offer:
             deduped.append(offer)
 
-    return {
+    snapshot = {
         'success': True,
         'offers': deduped,
         'total': total_from_api or len(deduped),
@@ -2346,6 +2514,8 @@ def fetch_active_listings_snapshot(user_id, limit=200, max_pages=50, max_items=5
             and not trading_incomplete_reason
         )
     }
+    fetched_at = store_snapshot(KIND_ACTIVE, user_id, snapshot, max_items, snapshot['can_mark_inactive'])
+    return dict(snapshot, fetched_at=fetched_at, cached=False)
 
 
 def fetch_shipping_fulfillment_details(user_id, fulfillment_href):
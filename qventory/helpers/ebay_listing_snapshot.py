@@ -0,0 +1,199 @@
+"""
+eBay active-listings snapshot store
+
+Several tasks (reconciliation, active sync, purge, reactivation, image
+backfill) and the /sync-ebay-inventory route each download a seller's full
+active store, often within minutes of each other. Complete snapshots are kept
+zlib-compressed in Redis per user together with their fetch time, so callers
+that pass an acceptable staleness (max_age_seconds) can reuse a recent one
+instead of paging through GetMyeBaySelling again.
+
+Only complete snapshots are stored. When Redis is not reachable every caller
+simply fetches fresh data.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+from .redis_client import get_redis, mark_redis_down
+
+SNAPSHOT_TTL_SECONDS = int(os.environ.get('EBAY_SNAPSHOT_TTL', '3600'))  # Hard upper bound on any reuse
+
+# Staleness callers accept. Anything that flips is_active (either way) stays
+# short and skips items changed since the snapshot; read-only lookups (image
+# fallbacks) can use older data.
+SNAPSHOT_MAX_AGE_INACTIVATE = int(os.environ.get('EBAY_SNAPSHOT_MAX_AGE', '300'))
+SNAPSHOT_MAX_AGE_MANUAL = 60  # User-triggered sync: only collapses repeated clicks
+SNAPSHOT_MAX_AGE_LOOKUP = 1800
+
+KIND_ACTIVE = 'active'  # fetch_active_listings_snapshot() result
+KIND_TRADING = 'trading'  # get_active_listings_trading_api() items + meta
+
+_KEY_PREFIX = 'qventory:ebay_snapshot'
+_KINDS = (KIND_ACTIVE, KIND_TRADING)
+
+
+def log_snapshot(msg):
+    """Helper for logging"""
+    print(f"[EBAY_SNAPSHOT] {msg}", file=sys.stderr, flush=True)
+
+
+def _key(kind, user_id):
+    return f"{_KEY_PREFIX}:{kind}:{user_id}"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {'__dt__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _json_object_hook(obj):
+    if len(obj) == 1:
+        if '__dt__' in obj:
+            return datetime.fromisoformat(obj['__dt__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def encode_snapshot(payload):
+    """Serialize a snapshot payload to compressed bytes."""
+    raw = json.dumps(payload, default=_json_default, separators=(',', ':'))
+    return zlib.compress(raw.encode('utf-8'), 6)
+
+
+def decode_snapshot(blob):
+    """Inverse of encode_snapshot()."""
+    return json.loads(zlib.decompress(blob).decode('utf-8'), object_hook=_json_object_hook)
+
+
+def store_snapshot(kind, user_id, data, max_items, is_complete):
+    """
+    Store a freshly fetched snapshot for the user.
+
+    Incomplete snapshots are never stored: a partial store must not be reused
+    to decide which listings disappeared.
+
+    Returns:
+        datetime: fetched_at recorded for the snapshot
+    """
+    fetched_ts = time.time()
+    fetched_at = datetime.utcfromtimestamp(fetched_ts)
+    if not is_complete:
+        return fetched_at
+
+    client = get_redis()
+    if client is None:
+        return fetched_at
+
+    payload = {
+        'fetched_at': fetched_ts,
+        'is_complete': True,
+        'max_items': max_items,
+        'data': data,
+    }
+    try:
+        blob = encode_snapshot(payload)
+        client.set(_key(kind, user_id), blob, ex=SNAPSHOT_TTL_SECONDS)
+        log_snapshot(f"Stored {kind} snapshot for user {user_id} ({len(blob) // 1024} KB)")
+    except Exception as exc:
+        mark_redis_down(exc)
+    return fetched_at
+
+
+def load_snapshot(kind, user_id, max_age_seconds, max_items=None):
+    """
+    Return (data, fetched_at) for a recent complete snapshot, or None.
+
+    Args:
+        kind: KIND_ACTIVE or KIND_TRADING
+        user_id: Qventory user ID
+        max_age_seconds: Oldest snapshot the caller accepts; falsy disables reuse
+        max_items: Item cap the caller needs covered
+    """
+    if not max_age_seconds:
+        return None
+
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        blob = client.get(_key(kind, user_id))
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
+    if not blob:
+        return None
+
+    try:
+        payload = decode_snapshot(blob)
+    except Exception as exc:
+        log_snapshot(f"⚠ Ignoring unreadable {kind} snapshot for user {user_id}: {exc}")
+        return None
+
+    if not payload.get('is_complete'):
+        return None
+
+    age = time.time() - float(payload.get('fetched_at') or 0)
+    if age < 0 or age > max_age_seconds:
+        return None
+
+    # A snapshot fetched with a smaller cap only covers larger requests when
+    # the whole store fit under that cap.
+    stored_cap = payload.get('max_items')
+    if max_items and stored_cap and stored_cap < max_items:
+        if _snapshot_size(kind, payload.get('data')) >= stored_cap:
+            return None
+
+    fetched_at = datetime.utcfromtimestamp(float(payload['fetched_at']))
+    log_snapshot(f"Reusing {kind} snapshot for user {user_id} ({int(age)}s old)")
+    return payload.get('data'), fetched_at
+
+
+def _snapshot_size(kind, data):
+    data = data or {}
+    if kind == KIND_ACTIVE:
+        return len(data.get('offers') or [])
+    return len(data.get('items') or [])
+
+
+def invalidate_snapshots(user_id):
+    """Drop all stored snapshots for a user (account disconnected)."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(*[_key(kind, user_id) for kind in _KINDS])
+    except Exception as exc:
+        mark_redis_down(exc)
+
+
+def changed_since_snapshot(item, snapshot):
+    """
+    True if the item was created or modified after a reused snapshot was fetched.
+
+    An older snapshot says nothing about what happened since: absence does not
+    mean a newly published/relisted listing ended, and presence does not mean
+    a listing that sold or ended since is still live. Callers must not change
+    is_active for such items in either direction.
+    """
+    if not snapshot or not snapshot.get('cached'):
+        return False
+    fetched_at = snapshot.get('fetched_at')
+    if not fetched_at:
+        return False
+    for field in ('created_at', 'updated_at', 'sold_at'):
+        stamp = getattr(item, field, None)
+        if stamp and stamp >= fetched_at:
+            return True
+    return False
@@ -38,6 +38,13 @@ def _normalize_identifier(value) -> str:
     return str(value).strip()
 
 
+def record_phase_timing(timings: dict, phase: str, started: float) -> float:
+    """Add milliseconds elapsed since `started` to timings[phase]; return a new start mark."""
+    now = time.monotonic()
+    timings[phase] = timings.get(phase, 0) + int((now - started) * 1000)
+    return now
+
+
 def is_probable_listing_id(value: str) -> bool:
     """
     Heuristic check for eBay listing IDs used by legacy Trading API paths.
@@ -1396,7 +1403,45 @@ def check_active_returns(user_id: int, sku: str) -> dict:
     }
 
 
-def validate_offer_for_relist(user_id: int, offer_id: str, rule) -> dict:
+def _check_sale_safety(user_id: int, sku: str, rule, sale_snapshot=None) -> str:
+    """
+    Run the recent-order and active-return checks for a rule.
+
+    Uses the scheduler's prefetched RelistSaleSnapshot when it covers the SKU,
+    otherwise falls back to the single-SKU queries.
+
+    Returns:
+        str: skip reason if a check failed, None otherwise
+    """
+    if not sku:
+        return None
+
+    if rule.min_hours_since_last_order:
+        order_check = None
+        if sale_snapshot is not None:
+            order_check = sale_snapshot.recent_orders(user_id, sku, rule.min_hours_since_last_order)
+        if order_check is None:
+            order_check = check_recent_orders(user_id, sku, rule.min_hours_since_last_order)
+
+        if order_check['has_recent_orders']:
+            log_relist(f"  ⊘ Validation failed: {order_check['order_count']} recent orders")
+            return f"{order_check['order_count']} orders in last {rule.min_hours_since_last_order}h"
+
+    if rule.check_active_returns:
+        return_check = None
+        if sale_snapshot is not None:
+            return_check = sale_snapshot.active_returns(user_id, sku)
+        if return_check is None:
+            return_check = check_active_returns(user_id, sku)
+
+        if return_check['has_active_returns']:
+            log_relist(f"  ⊘ Validation failed: Active returns")
+            return f"{return_check['return_count']} active returns"
+
+    return None
+
+
+def validate_offer_for_relist(user_id: int, offer_id: str, rule, sale_snapshot=None) -> dict:
     """
     Run all safety checks before relisting (Inventory API version)
 
@@ -1404,6 +1449,7 @@ def validate_offer_for_relist(user_id: int, offer_id: str, rule) -> dict:
         user_id: Qventory user ID
         offer_id: eBay offer ID
         rule: AutoRelistRule object with safety settings
+        sale_snapshot: Optional RelistSaleSnapshot prefetched by the scheduler
 
     Returns:
         dict: {
@@ -1436,31 +1482,13 @@ def validate_offer_for_relist(user_id: int, offer_id: str, rule) -> dict:
                 'skip_reason': 'Zero quantity available'
             }
 
-    # 3. Check recent orders
-    if rule.min_hours_since_last_order and sku:
-        order_check = check_recent_orders(
-            user_id,
-            sku,
-            rule.min_hours_since_last_order
-        )
-
-        if order_check['has_recent_orders']:
-            log_relist(f"  ⊘ Validation failed: {order_check['order_count']} recent orders")
-            return {
-                'valid': False,
-                'skip_reason': f"{order_check['order_count']} orders in last {rule.min_hours_since_last_order}h"
-            }
-
-    # 4. Check active returns
-    if rule.check_active_returns and sku:
-        return_check = check_active_returns(user_id, sku)
-
-        if return_check['has_active_returns']:
-            log_relist(f"  ⊘ Validation failed: Active returns")
-            return {
-                'valid': False,
-                'skip_reason': f"{return_check['return_count']} active returns"
-            }
+    # 3-4. Check recent orders and active returns
+    skip_reason = _check_sale_safety(user_id, sku, rule, sale_snapshot)
+    if skip_reason:
+        return {
+            'valid': False,
+            'skip_reason': skip_reason
+        }
 
     # All checks passed
     log_relist(f"  ✓ Validation passed")
@@ -1470,7 +1498,7 @@ def validate_offer_for_relist(user_id: int, offer_id: str, rule) -> dict:
     }
 
 
-def validate_item_for_relist_trading_api(user_id: int, item_id: str, rule) -> dict:
+def validate_item_for_relist_trading_api(user_id: int, item_id: str, rule, sale_snapshot=None) -> dict:
     """
     Run all safety checks before relisting (Trading API version)
 
@@ -1478,6 +1506,7 @@ def validate_item_for_relist_trading_api(user_id: int, item_id: str, rule) -> di
         user_id: Qventory user ID
         item_id: eBay Item ID
         rule: AutoRelistRule object with safety settings
+        sale_snapshot: Optional RelistSaleSnapshot prefetched by the scheduler
 
     Returns:
         dict: {
@@ -1510,31 +1539,13 @@ def validate_item_for_relist_trading_api(user_id: int, item_id: str, rule) -> di
                 'skip_reason': 'Zero quantity available'
             }
 
-    # 3. Check recent orders
-    if rule.min_hours_since_last_order and sku:
-        order_check = check_recent_orders(
-            user_id,
-            sku,
-            rule.min_hours_since_last_order
-        )
-
-        if order_check['has_recent_orders']:
-            log_relist(f"  ⊘ Validation failed: {order_check['order_count']} recent orders")
-            return {
-                'valid': False,
-                'skip_reason': f"{order_check['order_count']} orders in last {rule.min_hours_since_last_order}h"
-            }
-
-    # 4. Check active returns
-    if rule.check_active_returns and sku:
-        return_check = check_active_returns(user_id, sku)
-
-        if return_check['has_active_returns']:
-            log_relist(f"  ⊘ Validation failed: Active returns")
-            return {
-                'valid': False,
-                'skip_reason': f"{return_check['return_count']} active returns"
-            }
+    # 3-4. Check recent orders and active returns
+    skip_reason = _check_sale_safety(user_id, sku, rule, sale_snapshot)
+    if skip_reason:
+        return {
+            'valid': False,
+            'skip_reason': skip_reason
+        }
 
     # All checks passed
     log_relist(f"  ✓ Validation passed")
@@ -1544,7 +1555,7 @@ def validate_item_for_relist_trading_api(user_id: int, item_id: str, rule) -> di
     }
 
 
-def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
+def execute_relist(user_id: int, rule, apply_changes=False, sale_snapshot=None) -> dict:
     """
     Execute complete relist cycle
 
@@ -1555,6 +1566,7 @@ def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
         user_id: Qventory user ID
         rule: AutoRelistRule object
         apply_changes: If True, apply pending_changes before publish
+        sale_snapshot: Optional RelistSaleSnapshot used for the safety checks
 
     Returns:
         dict: {
@@ -1563,9 +1575,11 @@ def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
             'error': str (if failed),
             'skip_reason': str (if skipped),
             'old_listing_id': str,
-            'details': dict with API responses
+            'details': dict with API responses,
+            'timings': dict of per-phase durations in ms
         }
     """
+    started = time.monotonic()
     current_offer_id = _normalize_identifier(getattr(rule, 'offer_id', None))
     if not current_offer_id:
         return {
@@ -1582,6 +1596,7 @@ def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
         )
         rule.offer_id = resolved_offer_id
         current_offer_id = resolved_offer_id
+    resolve_ms = int((time.monotonic() - started) * 1000)
 
     # Determine which API to use
     # Inventory API if we have a valid offer ID, otherwise fallback to Trading.
@@ -1595,9 +1610,11 @@ def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
     log_relist(f"Mode: {rule.mode}, Apply changes: {apply_changes}")
 
     if use_trading_api:
-        result = execute_relist_trading_api(user_id, rule, apply_changes)
+        result = execute_relist_trading_api(user_id, rule, apply_changes, sale_snapshot)
     else:
-        result = execute_relist_inventory_api(user_id, rule, apply_changes)
+        result = execute_relist_inventory_api(user_id, rule, apply_changes, sale_snapshot)
+
+    result.setdefault('timings', {})['resolve_offer'] = resolve_ms
 
     if resolved_offer_id:
         result.setdefault('resolved_offer_id', resolved_offer_id)
@@ -1611,7 +1628,7 @@ def execute_relist(user_id: int, rule, apply_changes=False) -> dict:
     return result
 
 
-def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dict:
+def execute_relist_inventory_api(user_id: int, rule, apply_changes=False, sale_snapshot=None) -> dict:
     """
     Execute relist using Inventory API: withdraw -> [update] -> publish
 
@@ -1619,6 +1636,7 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
         user_id: Qventory user ID
         rule: AutoRelistRule object
         apply_changes: If True, apply pending_changes before publish
+        sale_snapshot: Optional RelistSaleSnapshot used for the safety checks
 
     Returns:
         dict with success status and details
@@ -1627,11 +1645,15 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
 
     result = {
         'success': False,
-        'details': {}
+        'details': {},
+        'timings': {}
     }
+    timings = result['timings']
+    mark = time.monotonic()
 
     # Step 1: Validate
-    validation = validate_offer_for_relist(user_id, rule.offer_id, rule)
+    validation = validate_offer_for_relist(user_id, rule.offer_id, rule, sale_snapshot)
+    mark = record_phase_timing(timings, 'validate', mark)
 
     if not validation['valid']:
         log_relist(f"  ⊘ Validation failed: {validation['skip_reason']}")
@@ -1652,6 +1674,7 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
     log_relist(f"  → Step 1/3: Withdrawing offer...")
     withdraw_result = withdraw_offer(user_id, rule.offer_id)
     result['details']['withdraw'] = withdraw_result
+    mark = record_phase_timing(timings, 'withdraw', mark)
 
     if not withdraw_result['success']:
         log_relist(f"  ✗ Withdraw failed: {withdraw_result.get('error')}")
@@ -1662,11 +1685,13 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
     delay = rule.withdraw_publish_delay_seconds or 30
     log_relist(f"  ⏱ Waiting {delay} seconds...")
     time.sleep(delay)
+    mark = record_phase_timing(timings, 'wait', mark)
 
     # Ensure the old listing is ended to avoid duplicates
     if old_listing_id:
         end_result = end_item_trading_api(user_id, old_listing_id, reason='NotAvailable')
         result['details']['end_item'] = end_result
+        mark = record_phase_timing(timings, 'end_item', mark)
         if not end_result.get('success'):
             error_msg = str(end_result.get('error', '')).lower()
             if 'already' not in error_msg:
@@ -1722,11 +1747,13 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
         # Small delay after updates
         log_relist(f"  ⏱ Waiting 5 seconds after updates...")
         time.sleep(5)
+        mark = record_phase_timing(timings, 'update', mark)
 
     # Step 4: Publish
     log_relist(f"  → Step 3/3: Publishing offer...")
     publish_result = publish_offer(user_id, rule.offer_id)
     result['details']['publish'] = publish_result
+    mark = record_phase_timing(timings, 'publish', mark)
 
     if not publish_result['success']:
         log_relist(f"  ✗ Publish failed: {publish_result.get('error')}")
@@ -1759,7 +1786,7 @@ def execute_relist_inventory_api(user_id: int, rule, apply_changes=False) -> dic
     return result
 
 
-def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
+def execute_relist_trading_api(user_id: int, rule, apply_changes=False, sale_snapshot=None) -> dict:
     """
     Execute relist using Trading API: EndItem -> RelistItem
 
@@ -1767,6 +1794,7 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
         user_id: Qventory user ID
         rule: AutoRelistRule object
         apply_changes: If True, apply pending_changes in RelistItem call
+        sale_snapshot: Optional RelistSaleSnapshot used for the safety checks
 
     Returns:
         dict with success status and details
@@ -1778,15 +1806,19 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
     result = {
         'success': False,
         'details': {},
-        'old_listing_id': item_id
+        'old_listing_id': item_id,
+        'timings': {}
     }
+    timings = result['timings']
+    mark = time.monotonic()
 
     idempotent_result = _idempotent_relist_result(user_id, item_id)
     if idempotent_result:
         return idempotent_result
 
     # Step 1: Validate
-    validation = validate_item_for_relist_trading_api(user_id, item_id, rule)
+    validation = validate_item_for_relist_trading_api(user_id, item_id, rule, sale_snapshot)
+    mark = record_phase_timing(timings, 'validate', mark)
 
     if not validation['valid']:
         log_relist(f"  ⊘ Validation failed: {validation['skip_reason']}")
@@ -1799,6 +1831,7 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
     log_relist(f"  → Step 1/2: Ending item...")
     end_result = end_item_trading_api(user_id, item_id, reason='NotAvailable')
     result['details']['end_item'] = end_result
+    mark = record_phase_timing(timings, 'end_item', mark)
 
     if not end_result['success']:
         error_msg = str(end_result.get('error', '')).lower()
@@ -1817,6 +1850,7 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
     delay = rule.withdraw_publish_delay_seconds or 30
     log_relist(f"  ⏱ Waiting {delay} seconds for eBay to process EndItem...")
     time.sleep(delay)
+    mark = record_phase_timing(timings, 'wait', mark)
 
     # CRITICAL: Verify item is actually ended before attempting relist
     # eBay may take time to process EndItem, and RelistItem will fail if item is still active
@@ -1854,6 +1888,8 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
             log_relist(f"  ✗ Item still showing as '{final_status}' after {max_verification_attempts} attempts")
             log_relist(f"  ⚠ Proceeding with relist anyway - eBay may reject if still active")
 
+    mark = record_phase_timing(timings, 'verify_ended', mark)
+
     # Step 3: Relist Item (with optional changes)
     log_relist(f"  → Step 2/2: Relisting item...")
     log_relist(f"  DEBUG: apply_changes={apply_changes}, rule.pending_changes={rule.pending_changes}")
@@ -1866,6 +1902,7 @@ def execute_relist_trading_api(user_id: int, rule, apply_changes=False) -> dict:
 
     relist_result = relist_item_trading_api(user_id, item_id, changes)
     result['details']['relist_item'] = relist_result
+    mark = record_phase_timing(timings, 'relist_item', mark)
 
     if not relist_result['success']:
         log_relist(f"  ✗ RelistItem failed: {relist_result.get('error')}")
@@ -1963,6 +2000,192 @@ def check_item_sold_in_fulfillment(user_id: int, listing_id: str) -> bool:
         return False
 
 
+RELIST_SNAPSHOT_MAX_AGE_SECONDS = 600  # Older snapshots fall back to live queries
+RELIST_RETURN_LOOKBACK_DAYS = 30
+
+
+class RelistSaleSnapshot:
+    """
+    Sold / recent-order / active-return state for a batch of relist rules.
+
+    Built once per scheduler run by prefetch_relist_sale_snapshot() so the
+    per-rule loop does not query the items and sales tables for every rule.
+    Lookups outside the prefetched keys (or after the snapshot goes stale)
+    return None and callers fall back to the single-rule checks.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.utcnow()
+        self.identifiers = set()        # (user_id, listing/offer id) that were looked up
+        self.sold_identifiers = set()   # subset found sold locally or in sales
+        self.skus = set()               # (user_id, sku) that were looked up
+        self.order_window_hours = 0
+        self.order_times = {}           # (user_id, sku) -> [sold_at, ...]
+        self.return_counts = {}         # (user_id, sku) -> count
+        self.item_ids_by_sku = {}       # (user_id, sku) -> item id
+        self.item_ids_by_listing = {}   # (user_id, ebay_listing_id) -> item id
+
+    def is_stale(self) -> bool:
+        return (datetime.utcnow() - self.now).total_seconds() > RELIST_SNAPSHOT_MAX_AGE_SECONDS
+
+    def is_sold(self, user_id: int, listing_id: str):
+        """True/False if the identifier was prefetched, None otherwise."""
+        key = (user_id, _normalize_identifier(listing_id))
+        if key not in self.identifiers or self.is_stale():
+            return None
+        return key in self.sold_identifiers
+
+    def recent_orders(self, user_id: int, sku: str, hours: int):
+        """Same shape as check_recent_orders(), or None if not prefetched."""
+        key = (user_id, sku)
+        if key not in self.skus or hours > self.order_window_hours or self.is_stale():
+            return None
+        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        count = sum(1 for sold_at in self.order_times.get(key, ()) if sold_at >= cutoff)
+        return {
+            'has_recent_orders': count > 0,
+            'order_count': count
+        }
+
+    def active_returns(self, user_id: int, sku: str):
+        """Same shape as check_active_returns(), or None if not prefetched."""
+        key = (user_id, sku)
+        if key not in self.skus or self.is_stale():
+            return None
+        count = self.return_counts.get(key, 0)
+        return {
+            'has_active_returns': count > 0,
+            'return_count': count
+        }
+
+    def item_id_for(self, user_id: int, sku: str = None, listing_id: str = None):
+        """Local item id matched by SKU first, then by eBay listing ID."""
+        if sku and (user_id, sku) in self.item_ids_by_sku:
+            return self.item_ids_by_sku[(user_id, sku)]
+        listing_id = _normalize_identifier(listing_id)
+        if listing_id:
+            return self.item_ids_by_listing.get((user_id, listing_id))
+        return None
+
+
+def prefetch_relist_sale_snapshot(rules) -> RelistSaleSnapshot:
+    """
+    Resolve sale-related state for all due relist rules in a few set-based queries.
+
+    Queries (each matching one indexed column with IN, no cross-column OR):
+    1. Local items by SKU / eBay listing ID (history linking + local sold_at)
+    2. Sales by sale_ebay_listing_id / marketplace_order_id / ebay_transaction_id (UNION ALL)
+    3. Recent sales per SKU within the widest min_hours_since_last_order
+    4. Returned/refunded sales per SKU in the last 30 days
+
+    Args:
+        rules: Iterable of AutoRelistRule objects
+
+    Returns:
+        RelistSaleSnapshot
+    """
+    from qventory.models.item import Item
+    from qventory.models.sale import Sale
+    from qventory.extensions import db
+    from sqlalchemy import func, or_, select, union_all
+
+    snapshot = RelistSaleSnapshot()
+    rules = list(rules or [])
+    if not rules:
+        return snapshot
+
+    for rule in rules:
+        for identifier in (rule.listing_id, rule.offer_id):
+            identifier = _normalize_identifier(identifier)
+            if identifier:
+                snapshot.identifiers.add((rule.user_id, identifier))
+        if rule.sku:
+            snapshot.skus.add((rule.user_id, rule.sku))
+        if rule.min_hours_since_last_order:
+            snapshot.order_window_hours = max(snapshot.order_window_hours, rule.min_hours_since_last_order)
+
+    user_ids = {rule.user_id for rule in rules}
+    identifiers = {identifier for _, identifier in snapshot.identifiers}
+    skus = {sku for _, sku in snapshot.skus}
+
+    # 1. Local items (IN on user-scoped unique columns)
+    item_filters = []
+    if skus:
+        item_filters.append(Item.sku.in_(skus))
+    if identifiers:
+        item_filters.append(Item.ebay_listing_id.in_(identifiers))
+    if item_filters:
+        item_rows = db.session.query(
+            Item.id, Item.user_id, Item.sku, Item.ebay_listing_id, Item.sold_at
+        ).filter(
+            Item.user_id.in_(user_ids),
+            or_(*item_filters)
+        ).all()
+        for item_id, user_id, sku, listing_id, sold_at in item_rows:
+            if (user_id, sku) in snapshot.skus:
+                snapshot.item_ids_by_sku.setdefault((user_id, sku), item_id)
+            listing_key = (user_id, _normalize_identifier(listing_id))
+            if listing_key in snapshot.identifiers:
+                snapshot.item_ids_by_listing.setdefault(listing_key, item_id)
+                if sold_at:
+                    snapshot.sold_identifiers.add(listing_key)
+
+    # 2. Sales referencing any identifier - one branch per indexed column
+    if identifiers:
+        sold_filter = or_(
+            Sale.sold_at.isnot(None),
+            Sale.delivered_at.isnot(None),
+            Sale.shipped_at.isnot(None)
+        )
+        branches = [
+            select(Sale.user_id, column.label('identifier')).where(
+                Sale.user_id.in_(user_ids),
+                column.in_(identifiers),
+                sold_filter
+            )
+            for column in (Sale.sale_ebay_listing_id, Sale.marketplace_order_id, Sale.ebay_transaction_id)
+        ]
+        for user_id, identifier in db.session.execute(union_all(*branches)).all():
+            key = (user_id, _normalize_identifier(identifier))
+            if key in snapshot.identifiers:
+                snapshot.sold_identifiers.add(key)
+
+    # 3. Recent orders per SKU
+    if skus and snapshot.order_window_hours:
+        order_cutoff = snapshot.now - timedelta(hours=snapshot.order_window_hours)
+        order_rows = db.session.query(Sale.user_id, Sale.item_sku, Sale.sold_at).filter(
+            Sale.user_id.in_(user_ids),
+            Sale.item_sku.in_(skus),
+            Sale.sold_at >= order_cutoff
+        ).all()
+        for user_id, sku, sold_at in order_rows:
+            if (user_id, sku) in snapshot.skus:
+                snapshot.order_times.setdefault((user_id, sku), []).append(sold_at)
+
+    # 4. Active returns per SKU
+    if skus and any(rule.check_active_returns for rule in rules):
+        return_cutoff = snapshot.now - timedelta(days=RELIST_RETURN_LOOKBACK_DAYS)
+        return_rows = db.session.query(
+            Sale.user_id, Sale.item_sku, func.count(Sale.id)
+        ).filter(
+            Sale.user_id.in_(user_ids),
+            Sale.item_sku.in_(skus),
+            Sale.status.in_(['returned', 'refunded']),
+            Sale.updated_at >= return_cutoff
+        ).group_by(Sale.user_id, Sale.item_sku).all()
+        for user_id, sku, count in return_rows:
+            if (user_id, sku) in snapshot.skus:
+                snapshot.return_counts[(user_id, sku)] = count
+
+    log_relist(
+        f"Prefetched sale status for {len(rules)} rules: "
+        f"{len(snapshot.sold_identifiers)} sold identifiers, "
+        f"{len(snapshot.order_times)} SKUs with recent orders, "
+        f"{len(snapshot.return_counts)} SKUs with active returns"
+    )
+    return snapshot
+
+
 def get_new_listing_id_from_offer(user_id: int, offer_id: str) -> str:
     """
     Get the current listing ID from an offer
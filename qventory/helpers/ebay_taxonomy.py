@@ -3,6 +3,7 @@ from datetime import datetime
 from ..extensions import db
 from ..models.ebay_category import EbayCategory
 from .ebay_oauth import EbayOAuth
+from .ebay_fees import invalidate_fee_rule_cache
 
 
 def _flatten_tree(node, parent_id=None, path=None, level=0, tree_id=None, tree_version=None, out=None):
@@ -101,6 +102,7 @@ def sync_ebay_categories(marketplace_id="EBAY_US"):
             created += 1
 
     db.session.commit()
+    invalidate_fee_rule_cache()
     return {
         "tree_id": tree_id,
         "tree_version": tree_version,
@@ -0,0 +1,171 @@
+"""
+eBay access token cache
+
+get_user_access_token() runs before nearly every eBay API call. This module
+keeps decrypted access tokens in process memory per user and shares the
+*encrypted* token across workers through Redis, so most calls skip both the
+MarketplaceCredential query and the Fernet decrypt.
+
+Token refreshes are serialized per user with a Redis lock; when Redis is not
+reachable, callers fall back to a row lock on the credential.
+"""
+import os
+import sys
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from .redis_client import get_redis, mark_redis_down
+
+TOKEN_CACHE_MAX_AGE_SECONDS = int(os.environ.get('EBAY_TOKEN_CACHE_MAX_AGE', '600'))  # Bound staleness after disconnects
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)  # Refresh tokens expiring within this window
+TOKEN_REFRESH_LOCK_TIMEOUT = 60  # Seconds a refresh lock is held at most
+TOKEN_REFRESH_LOCK_WAIT = 20  # Seconds to wait for another worker's refresh
+
+_KEY_PREFIX = 'qventory:ebay_token'
+
+_local_cache = {}  # user_id -> (access_token, expires_at, cached_at monotonic)
+_local_lock = threading.Lock()
+
+
+def log_token(msg):
+    """Helper for logging"""
+    print(f"[EBAY_TOKEN] {msg}", file=sys.stderr, flush=True)
+
+
+def _is_fresh(expires_at):
+    return expires_at is not None and expires_at - TOKEN_REFRESH_MARGIN > datetime.utcnow()
+
+
+def token_needs_refresh(credential) -> bool:
+    """True if the credential's access token is expired or about to expire."""
+    return bool(credential.token_expires_at) and not _is_fresh(credential.token_expires_at)
+
+
+def get_cached_access_token(user_id):
+    """
+    Return a cached, still-valid access token for the user, or None.
+
+    Checks process memory first, then Redis (decrypting once per process).
+    """
+    now = time.monotonic()
+    with _local_lock:
+        entry = _local_cache.get(user_id)
+    if entry:
+        token, expires_at, cached_at = entry
+        if (expires_at is None or _is_fresh(expires_at)) and now - cached_at < TOKEN_CACHE_MAX_AGE_SECONDS:
+            return token
+        with _local_lock:
+            _local_cache.pop(user_id, None)
+
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        raw = client.get(f"{_KEY_PREFIX}:{user_id}")
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
+    if not raw:
+        return None
+
+    try:
+        from qventory.models.marketplace_credential import MarketplaceCredential
+
+        payload = json.loads(raw)
+        expires_at = datetime.fromisoformat(payload['expires_at']) if payload.get('expires_at') else None
+        if expires_at is not None and not _is_fresh(expires_at):
+            return None
+        token = MarketplaceCredential().decrypt_field(payload['token'])
+    except Exception as exc:
+        log_token(f"⚠ Ignoring unreadable cached token for user {user_id}: {exc}")
+        return None
+
+    with _local_lock:
+        _local_cache[user_id] = (token, expires_at, time.monotonic())
+    return token
+
+
+def cache_access_token(credential, access_token):
+    """Cache a credential's decrypted access token locally and in Redis."""
+    if not access_token:
+        return
+
+    user_id = credential.user_id
+    expires_at = credential.token_expires_at
+    with _local_lock:
+        _local_cache[user_id] = (access_token, expires_at, time.monotonic())
+
+    client = get_redis()
+    if client is None or not credential.access_token:
+        return
+
+    if expires_at is not None:
+        ttl = int((expires_at - TOKEN_REFRESH_MARGIN - datetime.utcnow()).total_seconds())
+    else:
+        ttl = TOKEN_CACHE_MAX_AGE_SECONDS
+    if ttl <= 0:
+        return
+
+    payload = json.dumps({
+        'token': credential.access_token,  # Encrypted at rest, same as the DB column
+        'expires_at': expires_at.isoformat() if expires_at else None,
+    })
+    try:
+        client.set(f"{_KEY_PREFIX}:{user_id}", payload, ex=ttl)
+    except Exception as exc:
+        mark_redis_down(exc)
+
+
+def invalidate_access_token(user_id):
+    """Drop cached tokens for a user (token replaced, account disconnected)."""
+    with _local_lock:
+        _local_cache.pop(user_id, None)
+
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(f"{_KEY_PREFIX}:{user_id}")
+    except Exception as exc:
+        mark_redis_down(exc)
+
+
+@contextmanager
+def token_refresh_lock(user_id):
+    """
+    Serialize token refreshes for a user across workers.
+
+    Yields:
+        True if the Redis lock is held, False if waiting timed out,
+        None if Redis is unavailable (caller should lock the credential row)
+    """
+    client = get_redis()
+    if client is None:
+        yield None
+        return
+
+    lock = client.lock(
+        f"{_KEY_PREFIX}:refresh:{user_id}",
+        timeout=TOKEN_REFRESH_LOCK_TIMEOUT,
+        blocking_timeout=TOKEN_REFRESH_LOCK_WAIT,
+    )
+    try:
+        acquired = lock.acquire()
+    except Exception as exc:
+        mark_redis_down(exc)
+        yield None
+        return
+
+    try:
+        yield bool(acquired)
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except Exception:
+                # Lock expired while refreshing - nothing to release
+                pass
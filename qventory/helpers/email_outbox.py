@@ -0,0 +1,172 @@
+"""
+Email outbox
+
+send_email() stores messages in the email_outbox table and schedules the
+deliver_email_outbox task; request handlers never talk to the mail server.
+The task claims due rows (a lease, so a crashed worker's rows are retried),
+sends them over a single SMTP connection per batch, and reschedules failures
+with exponential backoff. Permanent rejections (5xx for a recipient/message)
+are not retried.
+"""
+import os
+import smtplib
+import sys
+import time
+from datetime import datetime, timedelta
+
+from qventory.extensions import db
+from qventory.helpers.email_sender import build_email_message, open_smtp, smtp_config
+from qventory.models.email_outbox import EmailOutbox
+
+EMAIL_BATCH_SIZE = int(os.environ.get("EMAIL_BATCH_SIZE", "50"))  # Messages per SMTP connection
+EMAIL_MAX_BATCHES_PER_RUN = 20
+EMAIL_SEND_LEASE = timedelta(minutes=5)  # Claimed rows are retried if not settled by then
+EMAIL_DISPATCH_COUNTDOWN = 2  # Seconds; a burst of enqueues shares one delivery task
+EMAIL_OUTBOX_RETENTION = timedelta(days=30)  # Sent rows (bodies already cleared) are purged after this
+
+_last_dispatch = 0.0
+
+
+def log_email_outbox(msg):
+    """Helper for logging"""
+    print(f"[EMAIL_OUTBOX] {msg}", file=sys.stderr, flush=True)
+
+
+def enqueue_email(to_email, subject, html_body, text_body=None, dedup_key=None, dedup_window=None):
+    """
+    Store an outgoing email and schedule delivery.
+
+    With dedup_key, the email is dropped when a row with the same key is still
+    queued, or (with dedup_window) was queued within the window and did not fail.
+
+    Returns:
+        (success: bool, error_message: str|None)
+    """
+    if dedup_key:
+        query = EmailOutbox.query.filter(
+            EmailOutbox.dedup_key == dedup_key,
+            EmailOutbox.status != EmailOutbox.STATUS_FAILED,
+        )
+        if dedup_window is not None:
+            query = query.filter(EmailOutbox.created_at >= datetime.utcnow() - dedup_window)
+        else:
+            query = query.filter(EmailOutbox.status.in_([EmailOutbox.STATUS_PENDING, EmailOutbox.STATUS_SENDING]))
+        if query.first() is not None:
+            return True, None
+
+    email = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        dedup_key=dedup_key,
+    )
+    db.session.add(email)
+    db.session.commit()
+
+    _dispatch_delivery(email.id)
+    return True, None
+
+
+def _dispatch_delivery(email_id):
+    """
+    Schedule deliver_email_outbox, at most once per countdown per process.
+
+    If the broker is unreachable the message is delivered inline so
+    verification and reset codes still go out.
+    """
+    global _last_dispatch
+    if time.monotonic() - _last_dispatch < EMAIL_DISPATCH_COUNTDOWN:
+        return
+    try:
+        from qventory.tasks import deliver_email_outbox
+
+        deliver_email_outbox.apply_async(countdown=EMAIL_DISPATCH_COUNTDOWN)
+        _last_dispatch = time.monotonic()
+    except Exception as exc:
+        log_email_outbox(f"⚠ Could not queue delivery task, sending email {email_id} inline: {exc}")
+        deliver_due_emails(ids=[email_id])
+
+
+def _claim_due_emails(limit, ids=None):
+    now = datetime.utcnow()
+    query = EmailOutbox.query.filter(
+        EmailOutbox.status.in_([EmailOutbox.STATUS_PENDING, EmailOutbox.STATUS_SENDING]),
+        EmailOutbox.next_attempt_at <= now,
+    )
+    if ids is not None:
+        query = query.filter(EmailOutbox.id.in_(ids))
+    rows = (
+        query.order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for row in rows:
+        row.status = EmailOutbox.STATUS_SENDING
+        row.attempts = (row.attempts or 0) + 1
+        row.next_attempt_at = now + EMAIL_SEND_LEASE
+    db.session.commit()
+    return rows
+
+
+def _is_permanent(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def deliver_due_emails(limit=None, ids=None):
+    """
+    Send one batch of due emails over a single SMTP connection.
+
+    Returns:
+        dict: {'claimed', 'sent', 'retrying', 'failed'} or {'error': str} when
+              email is not configured
+    """
+    config = smtp_config()
+    if config is None:
+        return {'error': 'not_configured'}
+
+    rows = _claim_due_emails(limit or EMAIL_BATCH_SIZE, ids=ids)
+    counts = {'claimed': len(rows), 'sent': 0, 'retrying': 0, 'failed': 0}
+    if not rows:
+        return counts
+
+    def settle(row, exc):
+        row.mark_attempt_failed(exc, permanent=_is_permanent(exc))
+        counts['failed' if row.status == EmailOutbox.STATUS_FAILED else 'retrying'] += 1
+
+    unsent = list(rows)
+    try:
+        with open_smtp(config) as server:
+            while unsent:
+                row = unsent[0]
+                message = build_email_message(config, row.to_email, row.subject, row.html_body, row.text_body)
+                try:
+                    server.sendmail(config["from_email"], [row.to_email], message.as_string())
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as exc:
+                    settle(row, exc)
+                else:
+                    row.mark_sent()
+                    counts['sent'] += 1
+                unsent.pop(0)
+    except Exception as exc:
+        # Connection-level failure: everything not yet settled is retried later
+        log_email_outbox(f"⚠ SMTP batch failed after {counts['sent']} sent: {exc}")
+        for row in unsent:
+            settle(row, exc)
+
+    db.session.commit()
+    return counts
+
+
+def purge_sent_emails(now=None):
+    """Delete emails sent longer ago than the retention window; returns the row count."""
+    cutoff = (now or datetime.utcnow()) - EMAIL_OUTBOX_RETENTION
+    deleted = EmailOutbox.query.filter(
+        EmailOutbox.status == EmailOutbox.STATUS_SENT,
+        EmailOutbox.sent_at < cutoff,
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
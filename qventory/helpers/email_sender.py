@@ -1,76 +1,106 @@
 """
 Email sending helper for Qventory
 Supports verification codes and password reset emails
+
+send_email() only queues messages (see helpers/email_outbox.py); delivery
+happens in a Celery task.
 """
 import os
 import smtplib
+from datetime import timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from flask import url_for
 
+PLAN_LIMIT_EMAIL_WINDOW = timedelta(hours=24)  # At most one plan-limit email per address per day
+
 
-def send_email(to_email, subject, html_body, text_body=None):
+def smtp_config():
     """
-    Send an email using SMTP configuration from environment variables.
+    SMTP configuration from environment variables, or None when email is not set up.
 
-    Required environment variables:
+    Environment variables:
     - SMTP_HOST: SMTP server hostname (e.g., smtp.gmail.com)
     - SMTP_PORT: SMTP server port (e.g., 587 for TLS, 465 for SSL)
-    - SMTP_USER: SMTP username (email address)
-    - SMTP_PASSWORD: SMTP password or app-specific password
+    - SMTP_USER / SMTP_PASSWORD: login credentials (optional for a local debugging server)
     - SMTP_FROM_EMAIL: Email address to send from (defaults to SMTP_USER)
     - SMTP_FROM_NAME: Name to display as sender (defaults to "Qventory")
-
-    Returns:
-        (success: bool, error_message: str|None)
+    - SMTP_STARTTLS: set to 0 to skip STARTTLS on non-SSL ports (local debugging server)
     """
-    # Get SMTP configuration
     smtp_host = os.environ.get("SMTP_HOST")
-    smtp_port = int(os.environ.get("SMTP_PORT", "587"))
     smtp_user = os.environ.get("SMTP_USER")
-    smtp_password = os.environ.get("SMTP_PASSWORD")
     from_email = os.environ.get("SMTP_FROM_EMAIL", smtp_user)
-    from_name = os.environ.get("SMTP_FROM_NAME", "Qventory")
+    if not smtp_host or not from_email:
+        return None
+
+    return {
+        "host": smtp_host,
+        "port": int(os.environ.get("SMTP_PORT", "587")),
+        "user": smtp_user,
+        "password": os.environ.get("SMTP_PASSWORD"),
+        "from_email": from_email,
+        "from_name": os.environ.get("SMTP_FROM_NAME", "Qventory"),
+        "starttls": os.environ.get("SMTP_STARTTLS", "1").lower() not in ("0", "false", "no"),
+    }
+
+
+def build_email_message(config, to_email, subject, html_body, text_body=None):
+    """MIME message with optional plain-text and HTML parts"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{config['from_name']} <{config['from_email']}>"
+    msg['To'] = to_email
+
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain'))
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
+def open_smtp(config, timeout=30):
+    """
+    Connected (and logged in) SMTP client; use as a context manager.
+
+    Uses SMTP_SSL for port 465, SMTP + STARTTLS otherwise (unless disabled).
+    """
+    if config["port"] == 465:
+        server = smtplib.SMTP_SSL(config["host"], config["port"], timeout=timeout)
+    else:
+        server = smtplib.SMTP(config["host"], config["port"], timeout=timeout)
+    try:
+        if config["port"] != 465 and config["starttls"]:
+            server.starttls()
+        if config["user"] and config["password"]:
+            server.login(config["user"], config["password"])
+    except Exception:
+        server.close()
+        raise
+    return server
+
 
-    # Validate configuration
-    if not all([smtp_host, smtp_user, smtp_password]):
+def send_email(to_email, subject, html_body, text_body=None, dedup_key=None, dedup_window=None):
+    """
+    Queue an email for delivery. Request handlers never wait on SMTP: the
+    message is stored in the email outbox and sent by the deliver_email_outbox
+    Celery task, which batches messages over one connection and retries.
+
+    Args:
+        dedup_key: optional key; another email with the same key that is still
+                   queued (or was queued within dedup_window) suppresses this one
+        dedup_window: timedelta for dedup_key
+
+    Returns:
+        (success: bool, error_message: str|None)
+    """
+    if smtp_config() is None:
         return False, "Email not configured. Please contact support."
 
+    from qventory.helpers.email_outbox import enqueue_email
+
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{from_name} <{from_email}>"
-        msg['To'] = to_email
-
-        # Add text and HTML parts
-        if text_body:
-            part1 = MIMEText(text_body, 'plain')
-            msg.attach(part1)
-
-        part2 = MIMEText(html_body, 'html')
-        msg.attach(part2)
-
-        # Send email
-        # Use SMTP_SSL for port 465, SMTP + starttls for ports 587/2525
-        if smtp_port == 465:
-            with smtplib.SMTP_SSL(smtp_host, smtp_port) as server:
-                server.login(smtp_user, smtp_password)
-                server.sendmail(from_email, to_email, msg.as_string())
-        else:
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_password)
-                server.sendmail(from_email, to_email, msg.as_string())
-
-        return True, None
-
-    except smtplib.SMTPAuthenticationError:
-        return False, "Email authentication failed. Please contact support."
-    except smtplib.SMTPException as e:
-        return False, f"Failed to send email: {str(e)}"
+        return enqueue_email(to_email, subject, html_body, text_body, dedup_key=dedup_key, dedup_window=dedup_window)
     except Exception as e:
-        return False, f"Unexpected error sending email: {str(e)}"
+        return False, f"Unexpected error queueing email: {str(e)}"
 
 
 def send_verification_email(to_email, code, username):
@@ -286,7 +316,11 @@ If you believe this is a mistake, reply to this email and we'll help you.
 ---
 © 2025 Qventory. All rights reserved.
     """
-    return send_email(to_email, subject, html_body, text_body)
+    return send_email(
+        to_email, subject, html_body, text_body,
+        dedup_key=f"plan_limit:{to_email.lower()}",
+        dedup_window=PLAN_LIMIT_EMAIL_WINDOW,
+    )
 
 
 def send_welcome_verified_email(to_email, username):
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Optional
+import hashlib
+import json
+import random
 import re
+import threading
+import time
 import markdown2
 
 from qventory.extensions import db
 from qventory.models.help_article import HelpArticle
+from qventory.models.system_setting import SystemSetting
+
+HELP_SEED_CHECKSUM_KEY = "help_articles_seed_checksum"
+RECOMMENDED_ARTICLES_TTL = 300  # Seconds a worker reuses its list of published articles
+
+_recommended_lock = threading.Lock()
+_recommended_cache: Dict[str, object] = {"expires": 0.0, "articles": []}
 
 
 HELP_ARTICLES: List[Dict[str, object]] = [
@@ -340,12 +352,28 @@ Settings is where you configure the core behavior of Qventory.
 ]
 
 
-def seed_help_articles() -> int:
+def help_articles_checksum() -> str:
+    raw = json.dumps(HELP_ARTICLES, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def seed_help_articles(force: bool = False) -> int:
+    """
+    Create built-in articles that are missing (existing ones are left as edited).
+
+    Runs at startup; skipped with a single lookup when the built-in content
+    has not changed since the last seed (checksum in system_settings).
+    """
+    checksum = help_articles_checksum()
+    setting = db.session.get(SystemSetting, HELP_SEED_CHECKSUM_KEY)
+    if not force and setting is not None and setting.value_str == checksum:
+        return 0
+
+    existing = {slug for (slug,) in db.session.query(HelpArticle.slug).all()}
     created = 0
     for article in HELP_ARTICLES:
         slug = article["slug"]
-        existing = HelpArticle.query.filter_by(slug=slug).first()
-        if existing:
+        if slug in existing:
             continue
         record = HelpArticle(
             slug=slug,
@@ -357,11 +385,44 @@ def seed_help_articles() -> int:
         )
         db.session.add(record)
         created += 1
+
+    if setting is None:
+        setting = SystemSetting(key=HELP_SEED_CHECKSUM_KEY)
+        db.session.add(setting)
+    setting.value_str = checksum
+    db.session.commit()
     if created:
-        db.session.commit()
+        invalidate_recommended_articles()
     return created
 
 
+def pick_recommended_article(rng=random) -> Optional[Dict[str, Optional[str]]]:
+    """
+    A random published article ({slug, title, summary}) for the dashboard card.
+
+    Each worker keeps the published list for RECOMMENDED_ARTICLES_TTL seconds
+    and picks from it in Python instead of ORDER BY random() per page view.
+    """
+    now = time.monotonic()
+    with _recommended_lock:
+        if now >= _recommended_cache["expires"]:
+            rows = db.session.query(HelpArticle.slug, HelpArticle.title, HelpArticle.summary)\
+                .filter(HelpArticle.is_published.is_(True))\
+                .all()
+            _recommended_cache["articles"] = [
+                {"slug": slug, "title": title, "summary": summary} for slug, title, summary in rows
+            ]
+            _recommended_cache["expires"] = now + RECOMMENDED_ARTICLES_TTL
+        articles = _recommended_cache["articles"]
+    return rng.choice(articles) if articles else None
+
+
+def invalidate_recommended_articles() -> None:
+    """Drop this worker's cached list (others refresh within the TTL)."""
+    with _recommended_lock:
+        _recommended_cache["expires"] = 0.0
+
+
 def render_help_markdown(body_md: str) -> str:
     def replace_placeholder(match: re.Match[str]) -> str:
         label = match.group(1).strip()
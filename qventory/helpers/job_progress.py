@@ -0,0 +1,140 @@
+"""
+Background job progress channel
+
+Workers publish each BackgroundJob's state to Redis whenever they record
+progress, so status polling (/api/jobs) and the inventory SSE stream read a
+single small key instead of querying Postgres. Keys:
+
+    qventory:job:<id>          JSON {'user_id', 'job': job.to_dict()}
+    qventory:job:<id>:cancel   set when the user asks to cancel
+    qventory:user_jobs:<uid>   set of the user's in-flight job ids
+
+All keys expire after JOB_STATE_TTL_SECONDS. When Redis is not reachable
+readers return None and callers fall back to the database.
+"""
+import json
+
+from .redis_client import get_redis, mark_redis_down
+
+JOB_STATE_TTL_SECONDS = 3600
+
+_KEY_PREFIX = 'qventory'
+
+
+def _job_key(job_id):
+    return f"{_KEY_PREFIX}:job:{job_id}"
+
+
+def _cancel_key(job_id):
+    return f"{_KEY_PREFIX}:job:{job_id}:cancel"
+
+
+def _user_jobs_key(user_id):
+    return f"{_KEY_PREFIX}:user_jobs:{user_id}"
+
+
+def publish_job_state(job):
+    """Write the job's current state to Redis (best effort)."""
+    client = get_redis()
+    if client is None or not getattr(job, 'id', None):
+        return False
+
+    payload = json.dumps({'user_id': job.user_id, 'job': job.to_dict()})
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.set(_job_key(job.id), payload, ex=JOB_STATE_TTL_SECONDS)
+        if job.is_active:
+            pipe.sadd(_user_jobs_key(job.user_id), job.id)
+            pipe.expire(_user_jobs_key(job.user_id), JOB_STATE_TTL_SECONDS)
+        else:
+            pipe.srem(_user_jobs_key(job.user_id), job.id)
+        pipe.execute()
+        return True
+    except Exception as exc:
+        mark_redis_down(exc)
+        return False
+
+
+def read_job_state(job_id, user_id):
+    """
+    Published state of one job owned by user_id.
+
+    Returns:
+        dict (job.to_dict() shape) or None when unknown / Redis unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(_job_key(job_id))
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
+    if not raw:
+        return None
+    try:
+        payload = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if payload.get('user_id') != user_id:
+        return None
+    return payload.get('job')
+
+
+def read_active_job_states(user_id):
+    """
+    Published states of the user's in-flight jobs.
+
+    Returns:
+        list of dicts, or None when Redis is unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        job_ids = sorted(int(job_id) for job_id in client.smembers(_user_jobs_key(user_id)))
+        if not job_ids:
+            return []
+        raw_states = client.mget([_job_key(job_id) for job_id in job_ids])
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
+
+    states = []
+    for raw in raw_states:
+        if not raw:
+            continue
+        try:
+            payload = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        if payload.get('user_id') == user_id and payload.get('job'):
+            states.append(payload['job'])
+    return states
+
+
+def signal_job_cancel(job_id):
+    """Flag a running job for cancellation (workers check between batches)."""
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        client.set(_cancel_key(job_id), '1', ex=JOB_STATE_TTL_SECONDS)
+        return True
+    except Exception as exc:
+        mark_redis_down(exc)
+        return False
+
+
+def job_cancel_signalled(job_id):
+    """
+    True/False when Redis answers, None when it is unavailable (check the DB).
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return bool(client.exists(_cancel_key(job_id)))
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
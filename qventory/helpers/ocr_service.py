@@ -79,6 +79,10 @@ class OCRService:
         """
         result = OCRResult()
 
+        if not image_url:
+            result.error = "No receipt image provided"
+            return result
+
         try:
             if self.provider == 'openai_vision':
                 result = self._extract_openai_vision(image_url)
@@ -98,6 +102,15 @@ class OCRService:
 
         return result
 
+    @staticmethod
+    def _download_image(image_url: str) -> bytes:
+        """Download image bytes for the providers that need them locally."""
+        import requests
+
+        response = requests.get(image_url, timeout=30)
+        response.raise_for_status()
+        return response.content
+
     def _extract_openai_vision(self, image_url: str) -> OCRResult:
         """
         Extract receipt data using OpenAI GPT-4 Vision API.
@@ -261,15 +274,11 @@ If you cannot extract a field with confidence, use null. Extract as much as poss
 
         try:
             from google.cloud import vision
-            import io
-            import requests
 
             client = vision.ImageAnnotatorClient()
 
             # Download image
-            response = requests.get(image_url)
-            response.raise_for_status()
-            image_content = response.content
+            image_content = self._download_image(image_url)
 
             # Perform OCR
             image = vision.Image(content=image_content)
@@ -312,13 +321,10 @@ If you cannot extract a field with confidence, use null. Extract as much as poss
         try:
             import pytesseract
             from PIL import Image
-            import requests
             import io
 
             # Download image
-            response = requests.get(image_url)
-            response.raise_for_status()
-            image = Image.open(io.BytesIO(response.content))
+            image = Image.open(io.BytesIO(self._download_image(image_url)))
 
             # Perform OCR with confidence data
             ocr_data = pytesseract.image_to_data(
@@ -0,0 +1,166 @@
+"""
+Batch eBay profit calculation
+
+Prices a whole haul in one request: rows are parsed into columns, the fee
+rule for each distinct category is resolved once from the cached rule table
+(no live eBay calls), and profit / ROI / markup / break-even are computed
+for every row in a single pass.
+"""
+from .ebay_fees import resolve_fee_rule
+
+MAX_BATCH_ROWS = 500
+
+
+def _to_float(value, default=0.0):
+    if value in (None, ""):
+        return default
+    return float(value)
+
+
+def format_ebay_profit_report(
+    item_name,
+    category_path,
+    fee_breakdown,
+    profit,
+    roi,
+    markup,
+    net_sale,
+    ads_fee_rate,
+    shipping_cost,
+    breakeven,
+):
+    """Plain-text summary stored with a ProfitCalculatorReport."""
+    fee_lines = []
+    for fee in fee_breakdown.get("fees", [])[:6]:
+        fee_lines.append(f"- {fee['name']}: ${fee['amount']:.2f}")
+    fee_block = "\n".join(fee_lines) if fee_lines else "Fees calculated from eBay fee rules."
+
+    return "\n".join([
+        f"🧾 Item: {item_name or 'Unnamed'}",
+        "🏪 Marketplace: eBay",
+        f"📁 Category: {category_path or 'Unselected'}",
+        f"💰 Profit: ${profit:.2f}",
+        f"🔄 ROI: {roi:.2f}%",
+        f"📊 Markup: {markup:.2f}%",
+        f"📦 Net Sale: ${net_sale:.2f}",
+        f"💸 eBay Fees (estimated): ${fee_breakdown['marketplace_fee']:.2f}",
+        f"📣 Ads Fee ({ads_fee_rate:.2f}%): ${fee_breakdown['ads_fee']:.2f}",
+        f"🚚 Shipping Cost: ${shipping_cost:.2f}",
+        f"🧮 Break-even Price: ${breakeven:.2f}",
+        f"📚 Fee Breakdown:\n{fee_block}",
+    ])
+
+
+def calculate_ebay_profit_batch(rows, has_store=False, top_rated=False, include_fixed_fee=False, ads_fee_rate=0.0):
+    """
+    Compute eBay profit figures for many candidate items.
+
+    Args:
+        rows: list of dicts with buy_price, resale_price and optional
+              shipping_cost, category_id, category_path, item_name
+        has_store, top_rated, include_fixed_fee, ads_fee_rate: seller settings
+              applied to every row
+
+    Returns:
+        tuple: (results, errors) where results are dicts in input order
+               (each with its 'index') and errors are {'index', 'error'}
+    """
+    indexes, names, paths, categories, buys, resales, shippings = [], [], [], [], [], [], []
+    errors = []
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"index": index, "error": "Row must be an object"})
+            continue
+        try:
+            buy_price = _to_float(row.get("buy_price"))
+            resale_price = _to_float(row.get("resale_price"))
+            shipping_cost = _to_float(row.get("shipping_cost"))
+        except (TypeError, ValueError):
+            errors.append({"index": index, "error": "Invalid price inputs."})
+            continue
+        if buy_price <= 0 or resale_price <= 0:
+            errors.append({"index": index, "error": "Invalid price inputs."})
+            continue
+
+        indexes.append(index)
+        names.append((row.get("item_name") or "").strip())
+        paths.append(row.get("category_path"))
+        categories.append(str(row.get("category_id")) if row.get("category_id") else None)
+        buys.append(buy_price)
+        resales.append(resale_price)
+        shippings.append(shipping_cost)
+
+    rules = {category_id: resolve_fee_rule(category_id) for category_id in set(categories)}
+    missing = {category_id for category_id, rule in rules.items() if rule is None}
+    rates = {
+        category_id: rule.resolve_rate(has_store=has_store, top_rated=top_rated)
+        for category_id, rule in rules.items() if rule is not None
+    }
+    fixed_fees = {
+        category_id: (rule.fixed_fee if include_fixed_fee else 0.0)
+        for category_id, rule in rules.items() if rule is not None
+    }
+    ads_ratio = ads_fee_rate / 100
+
+    results = []
+    for index, name, path, category_id, buy, resale, shipping in zip(
+        indexes, names, paths, categories, buys, resales, shippings
+    ):
+        if category_id in missing:
+            errors.append({"index": index, "error": "Missing eBay fee rules. Please seed default fees."})
+            continue
+
+        rate = rates[category_id]
+        fixed_fee = fixed_fees[category_id]
+        fee_base = resale + shipping
+        marketplace_fee = fee_base * (rate / 100)
+        ads_fee = resale * ads_ratio
+        total_fees = marketplace_fee + fixed_fee + ads_fee
+        net_sale = resale - total_fees - shipping
+        profit = net_sale - buy
+        denom = 1 - ((rate + ads_fee_rate) / 100)
+
+        results.append({
+            "index": index,
+            "item_name": name,
+            "category_id": category_id,
+            "category_path": path,
+            "buy_price": buy,
+            "resale_price": resale,
+            "shipping_cost": shipping,
+            "fee_breakdown": {
+                "fee_rate_percent": round(rate, 4),
+                "fee_base": round(fee_base, 2),
+                "marketplace_fee": round(marketplace_fee, 2),
+                "fixed_fee": round(fixed_fee, 2),
+                "ads_fee": round(ads_fee, 2),
+                "total_fees": round(total_fees, 2),
+                "source": "ebay_fee_rules",
+            },
+            "total_fees": round(total_fees, 2),
+            "net_sale": round(net_sale, 2),
+            "profit": round(profit, 2),
+            "roi": round(profit / buy * 100, 2),
+            "markup": round((resale - buy) / buy * 100, 2),
+            "breakeven": round((buy + shipping + fixed_fee) / denom, 2) if denom > 0 else 0,
+        })
+
+    errors.sort(key=lambda error: error["index"])
+    return results, errors
+
+
+def summarize_profit_batch(results):
+    """Totals for a priced haul."""
+    total_buy = sum(result["buy_price"] for result in results)
+    total_resale = sum(result["resale_price"] for result in results)
+    total_profit = sum(result["profit"] for result in results)
+    return {
+        "count": len(results),
+        "total_buy": round(total_buy, 2),
+        "total_resale": round(total_resale, 2),
+        "total_fees": round(sum(result["total_fees"] for result in results), 2),
+        "total_profit": round(total_profit, 2),
+        "roi": round(total_profit / total_buy * 100, 2) if total_buy else 0,
+        "profitable": sum(1 for result in results if result["profit"] > 0),
+    }
@@ -0,0 +1,292 @@
+"""
+SQL query instrumentation
+
+SQLAlchemy engine events count every statement and its time against the
+current unit of work: a Flask request (labelled "GET main.inventory_active")
+or a Celery task (labelled "task qventory.tasks.import_ebay_inventory").
+When a unit finishes:
+
+- statements slower than SQL_SLOW_QUERY_MS are logged with the unit's label
+- statement shapes (SQL with literals/placeholders collapsed) that repeat at
+  least SQL_N_PLUS_ONE_THRESHOLD times are logged as likely N+1 patterns
+- per-label totals (runs, statements, DB time) are added to a Redis hash and
+  noteworthy units are pushed to a short Redis list, so the admin logs API can
+  show web and worker numbers together (per-process fallback without Redis)
+
+In debug mode responses carry X-SQL-Queries / X-SQL-Time-Ms / X-SQL-N-Plus-One.
+Set SQL_QUERY_STATS=0 to disable.
+"""
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .redis_client import get_redis, mark_redis_down
+
+QUERY_STATS_ENABLED = os.environ.get('SQL_QUERY_STATS', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', '500'))
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', '10'))
+REPORT_MIN_QUERIES = int(os.environ.get('SQL_REPORT_MIN_QUERIES', '50'))  # Units with more are always reported
+RECENT_UNITS_LIMIT = 200
+
+_TOTALS_KEY = 'qventory:query_stats:totals'
+_RECENT_KEY = 'qventory:query_stats:recent'
+
+_current = ContextVar('qventory_query_stats', default=None)
+
+
+_local_totals = {}
+_local_recent = deque(maxlen=RECENT_UNITS_LIMIT)
+
+
+def log_query_stats(msg):
+    """Helper for logging"""
+    print(f"[SQL_STATS] {msg}", file=sys.stderr, flush=True)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|(?<![:\w]):\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def statement_shape(statement):
+    """SQL with literals and bind parameters collapsed, so per-row repeats compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    shape = _VALUE_LIST.sub("(?)", shape)
+    return shape[:500]
+
+
+class QueryStats:
+    """Statements issued by one request or task"""
+
+    __slots__ = ('label', 'started', 'count', 'total_ms', 'shapes', 'slow')
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = Counter()
+        self.slow = []
+
+    def record(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if elapsed_ms >= SLOW_QUERY_MS:
+            self.slow.append((round(elapsed_ms, 1), shape))
+
+    def repeated_shapes(self, threshold=None):
+        threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def summary(self):
+        return {
+            'label': self.label,
+            'queries': self.count,
+            'db_ms': round(self.total_ms, 1),
+            'duration_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'n_plus_one': [{'count': count, 'sql': shape} for shape, count in self.repeated_shapes()[:5]],
+            'slow': [{'ms': ms, 'sql': shape} for ms, shape in self.slow[:5]],
+            'at': datetime.utcnow().isoformat(),
+        }
+
+
+def start_query_stats(label):
+    """Begin counting statements for a request/task; returns a token for finish_query_stats."""
+    if not QUERY_STATS_ENABLED:
+        return None
+    return _current.set(QueryStats(label))
+
+
+def current_query_stats():
+    return _current.get()
+
+
+def finish_query_stats(token=None):
+    """Stop counting, log slow statements / N+1 shapes and publish the unit's totals."""
+    stats = _current.get()
+    if token is not None:
+        _current.reset(token)
+    else:
+        _current.set(None)
+    if stats is None:
+        return None
+
+    summary = stats.summary()
+    for entry in summary['slow']:
+        log_query_stats(f"⚠ Slow query {entry['ms']}ms [{stats.label}]: {entry['sql'][:300]}")
+    for entry in summary['n_plus_one']:
+        log_query_stats(f"⚠ Possible N+1 [{stats.label}]: {entry['count']}x {entry['sql'][:300]}")
+
+    if stats.count:
+        _publish(summary)
+    return summary
+
+
+def _publish(summary):
+    label = summary['label']
+    noteworthy = summary['n_plus_one'] or summary['slow'] or summary['queries'] >= REPORT_MIN_QUERIES
+    increments = {
+        f'{label}|runs': 1,
+        f'{label}|queries': summary['queries'],
+        f'{label}|db_us': int(summary['db_ms'] * 1000),
+    }
+
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for field, amount in increments.items():
+                pipe.hincrby(_TOTALS_KEY, field, amount)
+            if noteworthy:
+                pipe.lpush(_RECENT_KEY, json.dumps(summary))
+                pipe.ltrim(_RECENT_KEY, 0, RECENT_UNITS_LIMIT - 1)
+            pipe.execute()
+            return
+        except Exception as exc:
+            mark_redis_down(exc)
+
+    for field, amount in increments.items():
+        _local_totals[field] = _local_totals.get(field, 0) + amount
+    if noteworthy:
+        _local_recent.appendleft(summary)
+
+
+def read_query_stats(limit=50):
+    """
+    Totals per label (sorted by statements per run) and recent noteworthy units.
+
+    Returns:
+        dict: {'source': 'redis'|'process', 'labels': [...], 'recent': [...]}
+    """
+    client = get_redis()
+    source = 'process'
+    raw_totals, recent = dict(_local_totals), list(_local_recent)[:limit]
+    if client is not None:
+        try:
+            raw_totals = {
+                field.decode(): int(value) for field, value in client.hgetall(_TOTALS_KEY).items()
+            }
+            recent = [json.loads(item) for item in client.lrange(_RECENT_KEY, 0, limit - 1)]
+            source = 'redis'
+        except Exception as exc:
+            mark_redis_down(exc)
+
+    by_label = {}
+    for field, value in raw_totals.items():
+        label, _, metric = field.rpartition('|')
+        by_label.setdefault(label, {'label': label, 'runs': 0, 'queries': 0, 'db_us': 0})[metric] = value
+
+    labels = []
+    for entry in by_label.values():
+        runs = entry['runs'] or 1
+        labels.append({
+            'label': entry['label'],
+            'runs': entry['runs'],
+            'queries': entry['queries'],
+            'db_ms': round(entry['db_us'] / 1000, 1),
+            'avg_queries': round(entry['queries'] / runs, 1),
+            'avg_db_ms': round(entry['db_us'] / 1000 / runs, 2),
+        })
+    labels.sort(key=lambda entry: entry['avg_queries'], reverse=True)
+    return {'source': source, 'labels': labels[:limit], 'recent': recent}
+
+
+def reset_query_stats():
+    """Clear the shared totals and recent list."""
+    _local_totals.clear()
+    _local_recent.clear()
+    client = get_redis()
+    if client is not None:
+        try:
+            client.delete(_TOTALS_KEY, _RECENT_KEY)
+        except Exception as exc:
+            mark_redis_down(exc)
+
+
+# The start time lives on the statement's execution context, not the pooled
+# connection, so a statement that raises leaves nothing behind.
+_STARTED_ATTR = '_query_stats_started'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        setattr(context, _STARTED_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, _STARTED_ATTR, None)
+    if stats is None or started is None:
+        return
+    stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def register_query_stats(app=None):
+    """
+    Hook statement counting into every engine (idempotent) and, given an app,
+    wrap its requests. Celery tasks are wrapped by register_celery_query_stats.
+    """
+    if not QUERY_STATS_ENABLED:
+        return
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    if app is None:
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_query_stats():
+        g.query_stats_token = start_query_stats(f"{request.method} {request.endpoint or 'unmatched'}")
+
+    @app.after_request
+    def _query_stats_headers(response):
+        stats = current_query_stats()
+        if app.debug and stats is not None:
+            response.headers['X-SQL-Queries'] = str(stats.count)
+            response.headers['X-SQL-Time-Ms'] = f"{stats.total_ms:.1f}"
+            response.headers['X-SQL-N-Plus-One'] = str(len(stats.repeated_shapes()))
+        return response
+
+    @app.teardown_request
+    def _finish_request_query_stats(exc=None):
+        token = g.pop('query_stats_token', None)
+        if token is not None:
+            finish_query_stats(token)
+
+
+def register_celery_query_stats():
+    """Count statements per Celery task run (task_prerun / task_postrun signals)."""
+    if not QUERY_STATS_ENABLED:
+        return
+    from celery.signals import task_postrun, task_prerun
+
+    register_query_stats()
+    task_prerun.connect(_start_task_query_stats, weak=False)
+    task_postrun.connect(_finish_task_query_stats, weak=False)
+
+
+def _start_task_query_stats(sender=None, task=None, **kwargs):
+    start_query_stats(f"task {getattr(task or sender, 'name', 'unknown')}")
+
+
+def _finish_task_query_stats(sender=None, task=None, **kwargs):
+    finish_query_stats()
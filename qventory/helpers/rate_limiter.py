@@ -0,0 +1,160 @@
+"""
+Shared request rate limiter
+
+Sliding-window counter (current + previous fixed window, weighted by overlap)
+kept in Redis so every gunicorn worker enforces the same budget. Each check is
+a single Lua call touching two keys, and keys expire after two windows.
+
+When Redis is not reachable the same algorithm runs in process memory (per
+worker) so endpoints stay protected, just less precisely.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from .redis_client import get_redis, mark_redis_down
+
+LOCAL_MAX_KEYS = 10000  # Prune the in-process fallback beyond this many keys
+
+_KEY_PREFIX = 'qventory:ratelimit'
+
+# KEYS: current window, previous window
+# ARGV: limit, window_ms, elapsed_ms in current window
+# Returns {allowed, current_count, previous_count}; only counts allowed hits.
+_SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local weighted = previous * (window - elapsed) / window + current
+if weighted + 1 > limit then
+  return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+  redis.call('PEXPIRE', KEYS[1], window * 2)
+end
+return {1, current, previous}
+"""
+
+_redis_script = None
+
+_local_windows = {}  # key -> [window_index, current_count, previous_count]
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # Seconds until the next call would be allowed (0 when allowed)
+    reset_after: int  # Seconds until the current window rolls over
+
+
+def _get_redis_script():
+    """Return the registered Lua script, or None while Redis is unavailable."""
+    global _redis_script
+    client = get_redis()
+    if client is None:
+        return None
+    if _redis_script is None:
+        _redis_script = client.register_script(_SLIDING_WINDOW_LUA)
+    return _redis_script
+
+
+def _retry_after_seconds(limit, window, elapsed, current, previous):
+    """Time until the weighted count drops enough to admit one more call."""
+    budget = limit - 1
+    remaining_in_window = window - elapsed
+    if current <= budget:
+        if previous <= 0:
+            return 0.0
+        # previous * (remaining_in_window - t) / window + current <= budget
+        return max(0.0, remaining_in_window - (budget - current) * window / previous)
+    # Current window alone is over budget: wait for it to become the previous one
+    if current <= 0:
+        return remaining_in_window
+    return remaining_in_window + max(0.0, window * (1 - budget / current))
+
+
+def _build_result(allowed, limit, window, elapsed, current, previous):
+    weighted = previous * (window - elapsed) / window + current
+    remaining = max(0, limit - math.ceil(weighted))
+    retry_after = 0 if allowed else max(1, math.ceil(_retry_after_seconds(limit, window, elapsed, current, previous)))
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=remaining,
+        retry_after=retry_after,
+        reset_after=max(1, math.ceil(window - elapsed)),
+    )
+
+
+def _check_local(key, limit, window, window_index, elapsed):
+    with _local_lock:
+        if len(_local_windows) > LOCAL_MAX_KEYS:
+            for stale_key in [k for k, v in _local_windows.items() if v[0] < window_index - 1]:
+                del _local_windows[stale_key]
+
+        entry = _local_windows.get(key)
+        if entry is None or entry[0] < window_index - 1:
+            entry = [window_index, 0, 0]
+        elif entry[0] == window_index - 1:
+            entry = [window_index, 0, entry[1]]
+        _local_windows[key] = entry
+
+        _, current, previous = entry
+        weighted = previous * (window - elapsed) / window + current
+        allowed = weighted + 1 <= limit
+        if allowed:
+            entry[1] = current = current + 1
+    return allowed, current, previous
+
+
+def check_rate_limit(key: str, limit: int, window_seconds: int) -> RateLimitResult:
+    """
+    Count one call against `key` and report whether it is allowed.
+
+    Args:
+        key: Bucket name, e.g. "publish:42"
+        limit: Calls allowed per sliding window
+        window_seconds: Window length
+    """
+    window = float(window_seconds)
+    now = time.time()
+    window_index = int(now // window)
+    elapsed = now - window_index * window
+
+    script = _get_redis_script()
+    if script is not None:
+        try:
+            allowed, current, previous = script(
+                keys=[
+                    f"{_KEY_PREFIX}:{key}:{window_index}",
+                    f"{_KEY_PREFIX}:{key}:{window_index - 1}",
+                ],
+                args=[limit, int(window * 1000), int(elapsed * 1000)],
+            )
+            return _build_result(bool(allowed), limit, window, elapsed, int(current), int(previous))
+        except Exception as exc:
+            mark_redis_down(exc)
+
+    allowed, current, previous = _check_local(key, limit, window, window_index, elapsed)
+    return _build_result(allowed, limit, window, elapsed, current, previous)
+
+
+def rate_limit_headers(result: RateLimitResult) -> dict:
+    """Standard headers describing a rate limit decision."""
+    headers = {
+        'X-RateLimit-Limit': str(result.limit),
+        'X-RateLimit-Remaining': str(result.remaining),
+        'X-RateLimit-Reset': str(result.reset_after),
+    }
+    if not result.allowed:
+        headers['Retry-After'] = str(result.retry_after)
+    return headers
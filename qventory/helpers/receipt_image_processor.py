@@ -7,9 +7,12 @@ Handles:
 - Thumbnail generation
 - Image cleanup/deletion
 """
+import io
 import os
 import logging
-from typing import Dict, Optional, Tuple
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from werkzeug.datastructures import FileStorage
 import cloudinary
 import cloudinary.uploader
@@ -34,6 +37,8 @@ if CLOUDINARY_ENABLED:
 
 # Limits
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BATCH_FILES = 50  # Receipts per batch upload request
+BATCH_UPLOAD_WORKERS = int(os.environ.get('RECEIPT_UPLOAD_WORKERS', '6'))  # Concurrent Cloudinary uploads
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp', 'heic', 'heif'}
 ALLOWED_MIME_TYPES = {
     'image/jpeg',
@@ -139,16 +144,63 @@ class ReceiptImageProcessor:
             logger.error(result['error'])
             return result
 
-        try:
-            # Generate public_id
-            timestamp = int(os.times().elapsed * 1000)
-            public_id_suffix = f"receipt_{receipt_id}" if receipt_id else f"temp_{timestamp}"
-            public_id = f"{self.folder}/{public_id_suffix}"
+        # Generate public_id (random when the receipt row does not exist yet)
+        public_id_suffix = f"receipt_{receipt_id}" if receipt_id else f"receipt_{uuid.uuid4().hex[:16]}"
+
+        return self._upload_to_cloudinary(file, public_id_suffix, result)
+
+    def upload_receipts_batch(self, uploads: List[Dict]) -> List[Dict[str, any]]:
+        """
+        Upload many receipt images to Cloudinary concurrently.
+
+        Uploads run on a bounded thread pool (BATCH_UPLOAD_WORKERS) since each
+        call is network-bound. Files must already be validated and read into
+        memory; receipt rows do not exist yet, so public IDs use a random suffix.
+
+        Args:
+            uploads: List of dicts with 'data' (bytes) and 'filename'
+
+        Returns:
+            List of upload result dicts (same shape as upload_receipt),
+            in the same order as uploads
+        """
+        if not uploads:
+            return []
+
+        if not CLOUDINARY_ENABLED:
+            error = "Cloudinary not configured. Check environment variables."
+            logger.error(error)
+            return [
+                {'success': False, 'url': None, 'thumbnail_url': None, 'public_id': None, 'error': error}
+                for _ in uploads
+            ]
+
+        def _upload_one(upload):
+            result = {
+                'success': False,
+                'url': None,
+                'thumbnail_url': None,
+                'public_id': None,
+                'error': None
+            }
+            public_id_suffix = f"receipt_{uuid.uuid4().hex[:16]}"
+            return self._upload_to_cloudinary(io.BytesIO(upload['data']), public_id_suffix, result)
+
+        max_workers = max(1, min(BATCH_UPLOAD_WORKERS, len(uploads)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_upload_one, uploads))
 
+        uploaded = sum(1 for r in results if r['success'])
+        logger.info(f"Batch receipt upload for user {self.user_id}: {uploaded}/{len(uploads)} uploaded")
+        return results
+
+    def _upload_to_cloudinary(self, source, public_id_suffix: str, result: Dict) -> Dict[str, any]:
+        """Upload a file-like object to Cloudinary and fill in result."""
+        try:
             # Upload to Cloudinary with transformations
             # Force JPEG format to ensure HEIC images work on all browsers
             upload_result = cloudinary.uploader.upload(
-                file,
+                source,
                 folder=self.folder,
                 public_id=public_id_suffix,
                 resource_type='image',
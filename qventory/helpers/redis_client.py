@@ -0,0 +1,58 @@
+"""
+Shared Redis client
+
+Redis is an optional accelerator for several helpers (eBay token cache,
+listing snapshots, rate limiter, job progress, user status versions, Thrift
+Radar cache, query stats). They all share this one client (one connection
+pool) and one circuit breaker: after any Redis error, get_redis() returns
+None for REDIS_RETRY_SECONDS so every caller takes its fallback path instead
+of paying a socket timeout per call.
+"""
+import os
+import sys
+import threading
+import time
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_SOCKET_TIMEOUT = 1  # Seconds; callers fall back rather than wait on Redis
+REDIS_CONNECT_TIMEOUT = 0.5
+REDIS_RETRY_SECONDS = 60  # Back-off after Redis errors
+
+_client = None
+_client_lock = threading.Lock()
+_disabled_until = 0.0
+
+
+def log_redis(msg):
+    """Helper for logging"""
+    print(f"[REDIS] {msg}", file=sys.stderr, flush=True)
+
+
+def get_redis():
+    """Return the shared Redis client, or None while Redis is unavailable."""
+    global _client
+    if time.monotonic() < _disabled_until:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                try:
+                    import redis
+                    _client = redis.Redis.from_url(
+                        REDIS_URL,
+                        socket_timeout=REDIS_SOCKET_TIMEOUT,
+                        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                    )
+                except Exception as exc:
+                    mark_redis_down(exc)
+                    return None
+    return _client
+
+
+def mark_redis_down(exc):
+    """Disable Redis for every caller for REDIS_RETRY_SECONDS."""
+    global _disabled_until
+    was_up = time.monotonic() >= _disabled_until
+    _disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+    if was_up:
+        log_redis(f"⚠ Redis unavailable, using fallbacks for {REDIS_RETRY_SECONDS}s: {exc}")
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache for rendered labels (QR PNGs and label PDFs)
+
+A render is keyed by a hash of everything that determines its bytes (kind,
+codes, links, text, layout version), so the key doubles as a strong ETag and
+never needs invalidating: changing any input produces a new key. Rendered
+files live on local disk under the app directory (not the tmp dir, which may
+be private per service or wiped on reboot), so the web app can serve renders
+made by Celery workers on the same host; old files are pruned by age and
+total size. Requests carrying a matching If-None-Match get
+a 304 without rendering or reading anything.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from flask import make_response, request, send_file
+
+# Bump when label layouts change so old renders are not served
+RENDER_CACHE_VERSION = 1
+# Shared by the web app and Celery workers (both run from the app directory)
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RENDER_CACHE_DIR = os.environ.get(
+    "QVENTORY_RENDER_CACHE_DIR",
+    os.path.join(_APP_ROOT, "var", "render-cache"),
+)
+RENDER_CACHE_TTL_SECONDS = 7 * 86400
+RENDER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+RENDER_CACHE_PRUNE_INTERVAL = 600  # Seconds between prune passes per process
+
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def log_render_cache(msg):
+    """Helper for logging"""
+    print(f"[RENDER_CACHE] {msg}", file=sys.stderr, flush=True)
+
+
+def render_key(kind, *parts):
+    """Stable hex key for a render of `kind` from JSON-serializable parts."""
+    payload = json.dumps([RENDER_CACHE_VERSION, kind, parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key, suffix):
+    return os.path.join(RENDER_CACHE_DIR, key[:2], f"{key}{suffix}")
+
+
+def cached_render_path(key, suffix=""):
+    """Path of an existing render for key, or None."""
+    path = _cache_path(key, suffix)
+    return path if os.path.exists(path) else None
+
+
+def load_or_render(key, render, suffix=""):
+    """
+    Path of the cached render for key, calling render() on a miss. render may
+    return bytes or a binary file object (copied in blocks, then closed).
+    Writes are atomic, so concurrent workers may render the same key but never
+    serve a partial file.
+    """
+    path = cached_render_path(key, suffix)
+    if path:
+        return path
+
+    path = _cache_path(key, suffix)
+    data = render()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".render-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            if isinstance(data, (bytes, bytearray)):
+                fh.write(data)
+            else:
+                with data:
+                    shutil.copyfileobj(data, fh)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _maybe_prune()
+    return path
+
+
+def _maybe_prune():
+    global _last_prune
+    if time.monotonic() - _last_prune < RENDER_CACHE_PRUNE_INTERVAL:
+        return
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_prune = time.monotonic()
+        prune_render_cache()
+    finally:
+        _prune_lock.release()
+
+
+def prune_render_cache(now=None):
+    """Delete renders older than the TTL, then the oldest ones over the size cap."""
+    now = now or time.time()
+    entries = []
+    for root, _dirs, files in os.walk(RENDER_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > RENDER_CACHE_TTL_SECONDS:
+                _remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= RENDER_CACHE_MAX_BYTES:
+            break
+        _remove(path)
+        total -= size
+        removed += 1
+    if removed:
+        log_render_cache(f"Pruned {removed} render(s) over the {RENDER_CACHE_MAX_BYTES} byte cap")
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def send_cached_render(kind, parts, render, mimetype, suffix="", **send_kwargs):
+    """
+    Flask response for a cached render with ETag / If-None-Match support.
+
+    Args:
+        kind, parts: cache key inputs (see render_key)
+        render: callable returning the rendered bytes on a cache miss
+        send_kwargs: passed to send_file (as_attachment, download_name, ...)
+    """
+    key = render_key(kind, *parts)
+    if request.if_none_match.contains(key):
+        response = make_response("", 304)
+        response.set_etag(key)
+    else:
+        path = load_or_render(key, render, suffix=suffix)
+        response = send_file(path, mimetype=mimetype, etag=key, conditional=True, max_age=0, **send_kwargs)
+    response.cache_control.private = True
+    response.cache_control.public = False
+    response.cache_control.max_age = 0
+    return response
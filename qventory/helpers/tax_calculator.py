@@ -2,9 +2,9 @@
 Tax Calculator Helper Module
 Advanced tax calculations for Schedule C and quarterly estimated taxes
 """
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
-from sqlalchemy import func, and_, or_, extract
+from sqlalchemy import func, and_, or_, case
 from qventory.models.sale import Sale
 from qventory.models.expense import Expense
 from qventory.models.item import Item
@@ -13,10 +13,57 @@ from qventory.models.tax_report import TaxReport
 from qventory.extensions import db
 
 
+# Sale statuses that count toward COGS
+COGS_SALE_STATUSES = ('paid', 'shipped', 'completed', 'delivered')
+
+# Max example rows returned for sales missing a cost basis (the report only
+# shows the first 10; missing_count still counts all of them)
+MISSING_COST_DETAILS_LIMIT = 50
+
+# Open-period reports are recomputed when data changed, and at least this often
+TAX_REPORT_REFRESH_SECONDS = 3600
+
+
+def get_period_bounds(tax_year, quarter=None):
+    """Return (start_date, end_date) for a tax year or quarter"""
+    if quarter:
+        # Quarterly ranges
+        quarters = {
+            1: (date(tax_year, 1, 1), date(tax_year, 3, 31)),
+            2: (date(tax_year, 4, 1), date(tax_year, 6, 30)),
+            3: (date(tax_year, 7, 1), date(tax_year, 9, 30)),
+            4: (date(tax_year, 10, 1), date(tax_year, 12, 31)),
+        }
+        return quarters.get(quarter)
+    # Full year
+    return (date(tax_year, 1, 1), date(tax_year, 12, 31))
+
+
+def _sum_if(condition, column):
+    """SUM(column) over rows matching condition (0 when none)"""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def _count_if(condition):
+    """COUNT of rows matching condition"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _money(value):
+    """Normalize a SQL aggregate (float/Decimal/None) to a 2-decimal float"""
+    if value is None:
+        return 0.0
+    return float(Decimal(str(value)).quantize(Decimal('0.01')))
+
+
 class TaxCalculator:
     """
     Main tax calculation engine for Qventory
     Superior to Flipwise with automatic COGS, multi-marketplace, and AI-powered insights
+
+    All figures come from SQL aggregates: one grouped pass over sales, one over
+    items and one over expenses per period, cached on the instance so a full
+    report costs a constant number of queries regardless of data volume.
     """
 
     def __init__(self, user_id, tax_year=None, quarter=None):
@@ -24,110 +71,142 @@ class TaxCalculator:
         self.tax_year = tax_year or datetime.now().year
         self.quarter = quarter
         self.start_date, self.end_date = self._get_date_range()
+        self._sales_rows = None
+        self._items_totals = None
+        self._missing_cost_details = None
 
     def _get_date_range(self):
         """Calculate date range based on year and quarter"""
-        if self.quarter:
-            # Quarterly ranges
-            quarters = {
-                1: (date(self.tax_year, 1, 1), date(self.tax_year, 3, 31)),
-                2: (date(self.tax_year, 4, 1), date(self.tax_year, 6, 30)),
-                3: (date(self.tax_year, 7, 1), date(self.tax_year, 9, 30)),
-                4: (date(self.tax_year, 10, 1), date(self.tax_year, 12, 31)),
-            }
-            return quarters.get(self.quarter)
-        else:
-            # Full year
-            return (date(self.tax_year, 1, 1), date(self.tax_year, 12, 31))
+        return get_period_bounds(self.tax_year, self.quarter)
 
-    def calculate_gross_sales_revenue(self):
+    def _sales_aggregates(self):
         """
-        Calculate gross sales revenue (excluding refunds/returns)
-        Broken down by marketplace
+        Single pass over the period's sales, grouped by (marketplace, carrier).
+        Every sales-based figure in the report is folded from these rows.
         """
-        sales = Sale.query.filter(
+        if self._sales_rows is not None:
+            return self._sales_rows
+
+        revenue_sale = Sale.status.notin_(['cancelled', 'refunded'])
+        fee_sale = Sale.status.notin_(['cancelled'])
+        cogs_sale = Sale.status.in_(COGS_SALE_STATUSES)
+        has_cost = Sale.item_cost > 0
+
+        self._sales_rows = db.session.query(
+            Sale.marketplace.label('marketplace'),
+            Sale.carrier.label('carrier'),
+            _sum_if(revenue_sale, Sale.sold_price).label('revenue'),
+            _count_if(revenue_sale).label('revenue_count'),
+            _sum_if(revenue_sale, Sale.marketplace_fee).label('revenue_fees'),
+            _sum_if(revenue_sale, Sale.shipping_charged).label('shipping_revenue'),
+            _sum_if(Sale.status == 'refunded', Sale.refund_amount).label('refund_amount'),
+            _count_if(Sale.status == 'refunded').label('refund_count'),
+            _sum_if(Sale.status == 'returned', Sale.sold_price).label('return_amount'),
+            _count_if(Sale.status == 'returned').label('return_count'),
+            _sum_if(and_(cogs_sale, has_cost), Sale.item_cost).label('cogs'),
+            _count_if(and_(cogs_sale, has_cost)).label('cogs_count'),
+            _count_if(and_(cogs_sale, or_(Sale.item_cost.is_(None), Sale.item_cost <= 0))).label('cogs_missing'),
+            _count_if(fee_sale).label('fee_count'),
+            _sum_if(fee_sale, Sale.marketplace_fee).label('marketplace_fees'),
+            _sum_if(fee_sale, Sale.payment_processing_fee).label('payment_fees'),
+            _sum_if(fee_sale, Sale.ad_fee).label('ad_fees'),
+            _sum_if(fee_sale, Sale.other_fees).label('other_fees'),
+            func.coalesce(func.sum(Sale.shipping_cost), 0).label('shipping_cost'),
+            func.count(Sale.id).label('sales_count'),
+        ).filter(
             Sale.user_id == self.user_id,
             Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status.notin_(['cancelled', 'refunded'])
-        ).all()
+            Sale.sold_at <= self.end_date
+        ).group_by(Sale.marketplace, Sale.carrier).all()
+
+        return self._sales_rows
+
+    def _items_aggregates(self):
+        """Single pass over the user's items for inventory values and data checks"""
+        if self._items_totals is not None:
+            return self._items_totals
+
+        year_start = date(self.tax_year, 1, 1)
+        year_end = date(self.tax_year, 12, 31)
+        value = func.coalesce(Item.item_cost, 0) * func.coalesce(Item.quantity, 0)
+
+        row = db.session.query(
+            # Opening inventory (items existing on Jan 1)
+            _sum_if(and_(
+                Item.purchased_at < year_start,
+                or_(Item.sold_at.is_(None), Item.sold_at >= year_start)
+            ), value).label('opening'),
+            # Closing inventory (items existing on Dec 31)
+            _sum_if(or_(Item.sold_at.is_(None), Item.sold_at > year_end), value).label('closing'),
+            # Inventory purchased during period
+            _sum_if(and_(
+                Item.purchased_at >= self.start_date,
+                Item.purchased_at <= self.end_date
+            ), value).label('purchased'),
+            _count_if(and_(Item.sold_at.is_(None), Item.purchased_at.is_(None))).label('active_no_date'),
+            _count_if(or_(Item.item_cost.is_(None), Item.item_cost == 0)).label('no_cost'),
+        ).filter(Item.user_id == self.user_id).one()
+
+        self._items_totals = {
+            'opening': _money(row.opening),
+            'closing': _money(row.closing),
+            'purchased': _money(row.purchased),
+            'active_no_date': int(row.active_no_date or 0),
+            'no_cost': int(row.no_cost or 0),
+        }
+        return self._items_totals
 
+    def calculate_gross_sales_revenue(self):
+        """
+        Calculate gross sales revenue (excluding refunds/returns)
+        Broken down by marketplace
+        """
         total_revenue = Decimal('0.00')
         marketplace_breakdown = {}
         total_count = 0
 
-        for sale in sales:
-            amount = Decimal(str(sale.sold_price)) if sale.sold_price else Decimal('0.00')
-            total_revenue += amount
-            total_count += 1
+        for row in self._sales_aggregates():
+            if not row.revenue_count:
+                continue
 
-            # Marketplace breakdown
-            marketplace = sale.marketplace or 'other'
-            if marketplace not in marketplace_breakdown:
-                marketplace_breakdown[marketplace] = {
-                    'revenue': Decimal('0.00'),
-                    'count': 0,
-                    'fees': Decimal('0.00')
-                }
-
-            marketplace_breakdown[marketplace]['revenue'] += amount
-            marketplace_breakdown[marketplace]['count'] += 1
+            revenue = Decimal(str(row.revenue))
+            total_revenue += revenue
+            total_count += int(row.revenue_count)
 
-            if sale.marketplace_fee:
-                marketplace_breakdown[marketplace]['fees'] += Decimal(str(sale.marketplace_fee))
+            # Marketplace breakdown
+            marketplace = row.marketplace or 'other'
+            entry = marketplace_breakdown.setdefault(marketplace, {
+                'revenue': Decimal('0.00'),
+                'count': 0,
+                'fees': Decimal('0.00')
+            })
+            entry['revenue'] += revenue
+            entry['count'] += int(row.revenue_count)
+            entry['fees'] += Decimal(str(row.revenue_fees))
 
         return {
-            'total': float(total_revenue),
+            'total': _money(total_revenue),
             'count': total_count,
             'by_marketplace': {k: {
-                'revenue': float(v['revenue']),
+                'revenue': _money(v['revenue']),
                 'count': v['count'],
-                'fees': float(v['fees'])
+                'fees': _money(v['fees'])
             } for k, v in marketplace_breakdown.items()}
         }
 
     def calculate_shipping_revenue(self):
         """Calculate shipping charges collected from buyers"""
-        result = db.session.query(
-            func.sum(Sale.shipping_charged)
-        ).filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status.notin_(['cancelled', 'refunded'])
-        ).scalar()
-
-        return float(result) if result else 0.0
+        return _money(sum(Decimal(str(row.shipping_revenue)) for row in self._sales_aggregates()))
 
     def calculate_refunds_returns(self):
         """Calculate total refunds and returns (revenue deduction)"""
-        # Refunded sales
-        refunds = db.session.query(
-            func.sum(Sale.refund_amount),
-            func.count(Sale.id)
-        ).filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status == 'refunded'
-        ).first()
-
-        total_refund_amount = float(refunds[0]) if refunds[0] else 0.0
-        refund_count = refunds[1] if refunds[1] else 0
+        rows = self._sales_aggregates()
 
-        # Returned items
-        returns = db.session.query(
-            func.sum(Sale.sold_price),
-            func.count(Sale.id)
-        ).filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status == 'returned'
-        ).first()
+        total_refund_amount = _money(sum(Decimal(str(row.refund_amount)) for row in rows))
+        refund_count = sum(int(row.refund_count) for row in rows)
 
-        total_return_amount = float(returns[0]) if returns[0] else 0.0
-        return_count = returns[1] if returns[1] else 0
+        total_return_amount = _money(sum(Decimal(str(row.return_amount)) for row in rows))
+        return_count = sum(int(row.return_count) for row in rows)
 
         return {
             'refunds': {
@@ -141,39 +220,43 @@ class TaxCalculator:
             'total': total_refund_amount + total_return_amount
         }
 
+    def _missing_cost_sales(self):
+        """First sales (by id, capped) that are missing a cost basis"""
+        if self._missing_cost_details is not None:
+            return self._missing_cost_details
+
+        sales = db.session.query(
+            Sale.id, Sale.item_title, Sale.sold_price, Sale.sold_at
+        ).filter(
+            Sale.user_id == self.user_id,
+            Sale.sold_at >= self.start_date,
+            Sale.sold_at <= self.end_date,
+            Sale.status.in_(COGS_SALE_STATUSES),
+            or_(Sale.item_cost.is_(None), Sale.item_cost <= 0)
+        ).order_by(Sale.id).limit(MISSING_COST_DETAILS_LIMIT).all()
+
+        self._missing_cost_details = [{
+            'sale_id': sale.id,
+            'item_title': sale.item_title,
+            'sold_price': float(sale.sold_price) if sale.sold_price else 0.0,
+            'sold_at': sale.sold_at.isoformat() if sale.sold_at else None
+        } for sale in sales]
+        return self._missing_cost_details
+
     def calculate_cogs(self):
         """
         Calculate Cost of Goods Sold (COGS)
         IMPROVEMENT OVER FLIPWISE: Automatically calculated from item_cost
         """
-        # Get all sold items in period
-        sales = Sale.query.filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status.in_(['paid', 'shipped', 'completed', 'delivered'])
-        ).all()
-
-        total_cogs = Decimal('0.00')
-        items_with_cost = 0
-        items_missing_cost = 0
-        missing_cost_details = []
-
-        for sale in sales:
-            if sale.item_cost and sale.item_cost > 0:
-                total_cogs += Decimal(str(sale.item_cost))
-                items_with_cost += 1
-            else:
-                items_missing_cost += 1
-                missing_cost_details.append({
-                    'sale_id': sale.id,
-                    'item_title': sale.item_title,
-                    'sold_price': float(sale.sold_price) if sale.sold_price else 0.0,
-                    'sold_at': sale.sold_at.isoformat() if sale.sold_at else None
-                })
+        rows = self._sales_aggregates()
+
+        total_cogs = sum(Decimal(str(row.cogs)) for row in rows)
+        items_with_cost = sum(int(row.cogs_count) for row in rows)
+        items_missing_cost = sum(int(row.cogs_missing) for row in rows)
+        missing_cost_details = self._missing_cost_sales() if items_missing_cost else []
 
         return {
-            'total': float(total_cogs),
+            'total': _money(total_cogs),
             'items_count': items_with_cost,
             'missing_count': items_missing_cost,
             'missing_details': missing_cost_details,
@@ -185,54 +268,11 @@ class TaxCalculator:
         Calculate opening and closing inventory values
         Opening = Jan 1, Closing = Dec 31
         """
-        # Opening inventory (items existing on Jan 1)
-        opening_items = Item.query.filter(
-            Item.user_id == self.user_id,
-            Item.purchased_at < date(self.tax_year, 1, 1),
-            or_(
-                Item.sold_at.is_(None),  # Not sold yet
-                Item.sold_at >= date(self.tax_year, 1, 1)  # Sold during/after this year
-            )
-        ).all()
-
-        opening_value = sum(
-            (Decimal(str(item.item_cost)) * item.quantity)
-            for item in opening_items
-            if item.item_cost and item.quantity
-        )
-
-        # Closing inventory (items existing on Dec 31)
-        closing_items = Item.query.filter(
-            Item.user_id == self.user_id,
-            or_(
-                Item.sold_at.is_(None),  # Still in inventory
-                Item.sold_at > date(self.tax_year, 12, 31)  # Sold after year end
-            )
-        ).all()
-
-        closing_value = sum(
-            (Decimal(str(item.item_cost)) * item.quantity)
-            for item in closing_items
-            if item.item_cost and item.quantity
-        )
-
-        # Inventory purchased during year
-        purchased_items = Item.query.filter(
-            Item.user_id == self.user_id,
-            Item.purchased_at >= self.start_date,
-            Item.purchased_at <= self.end_date
-        ).all()
-
-        purchased_value = sum(
-            (Decimal(str(item.item_cost)) * item.quantity)
-            for item in purchased_items
-            if item.item_cost and item.quantity
-        )
-
+        totals = self._items_aggregates()
         return {
-            'opening': float(opening_value),
-            'closing': float(closing_value),
-            'purchased': float(purchased_value)
+            'opening': totals['opening'],
+            'closing': totals['closing'],
+            'purchased': totals['purchased']
         }
 
     def calculate_marketplace_fees(self):
@@ -240,94 +280,58 @@ class TaxCalculator:
         Calculate marketplace fees breakdown by type
         IMPROVEMENT: Detailed breakdown by fee type
         """
-        sales = Sale.query.filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.status.notin_(['cancelled'])
-        ).all()
-
-        total_marketplace_fees = Decimal('0.00')
-        total_payment_fees = Decimal('0.00')
-        total_ad_fees = Decimal('0.00')
-        total_other_fees = Decimal('0.00')
-
+        fee_fields = ('final_value_fees', 'payment_processing', 'ad_fees', 'other_fees')
+        totals = {field: Decimal('0.00') for field in fee_fields}
         marketplace_breakdown = {}
 
-        for sale in sales:
-            marketplace = sale.marketplace or 'other'
-
-            if marketplace not in marketplace_breakdown:
-                marketplace_breakdown[marketplace] = {
-                    'final_value_fees': Decimal('0.00'),
-                    'payment_processing': Decimal('0.00'),
-                    'ad_fees': Decimal('0.00'),
-                    'other_fees': Decimal('0.00')
-                }
-
-            if sale.marketplace_fee:
-                fee = Decimal(str(sale.marketplace_fee))
-                total_marketplace_fees += fee
-                marketplace_breakdown[marketplace]['final_value_fees'] += fee
-
-            if sale.payment_processing_fee:
-                fee = Decimal(str(sale.payment_processing_fee))
-                total_payment_fees += fee
-                marketplace_breakdown[marketplace]['payment_processing'] += fee
-
-            if sale.ad_fee:
-                fee = Decimal(str(sale.ad_fee))
-                total_ad_fees += fee
-                marketplace_breakdown[marketplace]['ad_fees'] += fee
-
-            if sale.other_fees:
-                fee = Decimal(str(sale.other_fees))
-                total_other_fees += fee
-                marketplace_breakdown[marketplace]['other_fees'] += fee
+        for row in self._sales_aggregates():
+            if not row.fee_count:
+                continue
+
+            marketplace = row.marketplace or 'other'
+            entry = marketplace_breakdown.setdefault(
+                marketplace, {field: Decimal('0.00') for field in fee_fields}
+            )
+            amounts = {
+                'final_value_fees': Decimal(str(row.marketplace_fees)),
+                'payment_processing': Decimal(str(row.payment_fees)),
+                'ad_fees': Decimal(str(row.ad_fees)),
+                'other_fees': Decimal(str(row.other_fees)),
+            }
+            for field, amount in amounts.items():
+                entry[field] += amount
+                totals[field] += amount
 
         return {
-            'total': float(total_marketplace_fees),
-            'payment_processing': float(total_payment_fees),
-            'ad_fees': float(total_ad_fees),
-            'other_fees': float(total_other_fees),
+            'total': _money(totals['final_value_fees']),
+            'payment_processing': _money(totals['payment_processing']),
+            'ad_fees': _money(totals['ad_fees']),
+            'other_fees': _money(totals['other_fees']),
             'by_marketplace': {k: {
-                'final_value_fees': float(v['final_value_fees']),
-                'payment_processing': float(v['payment_processing']),
-                'ad_fees': float(v['ad_fees']),
-                'other_fees': float(v['other_fees'])
+                field: _money(v[field]) for field in fee_fields
             } for k, v in marketplace_breakdown.items()}
         }
 
     def calculate_shipping_costs(self):
         """Calculate shipping costs (expense)"""
-        result = db.session.query(
-            func.sum(Sale.shipping_cost)
-        ).filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date
-        ).scalar()
-
-        total_shipping = float(result) if result else 0.0
+        rows = self._sales_aggregates()
+        total_shipping = _money(sum(Decimal(str(row.shipping_cost)) for row in rows))
 
         # Break down by carrier if data available
-        carrier_breakdown = db.session.query(
-            Sale.carrier,
-            func.sum(Sale.shipping_cost),
-            func.count(Sale.id)
-        ).filter(
-            Sale.user_id == self.user_id,
-            Sale.sold_at >= self.start_date,
-            Sale.sold_at <= self.end_date,
-            Sale.carrier.isnot(None)
-        ).group_by(Sale.carrier).all()
+        carrier_breakdown = {}
+        for row in rows:
+            if row.carrier is None:
+                continue
+            entry = carrier_breakdown.setdefault(row.carrier, {'cost': Decimal('0.00'), 'count': 0})
+            entry['cost'] += Decimal(str(row.shipping_cost))
+            entry['count'] += int(row.sales_count)
 
         return {
             'total': total_shipping,
             'by_carrier': {
-                carrier: {'cost': float(cost), 'count': count}
-                for carrier, cost, count in carrier_breakdown
-            } if carrier_breakdown else {}
+                carrier: {'cost': _money(v['cost']), 'count': v['count']}
+                for carrier, v in carrier_breakdown.items()
+            }
         }
 
     def calculate_business_expenses(self):
@@ -335,29 +339,32 @@ class TaxCalculator:
         Calculate business expenses by category
         All expense data comes from the Expense model (already includes processed receipt data)
         """
-        # Get all expenses from Expense model
-        expenses = Expense.query.filter(
+        rows = db.session.query(
+            Expense.category,
+            func.coalesce(func.sum(Expense.amount), 0),
+            func.count(Expense.id)
+        ).filter(
             Expense.user_id == self.user_id,
             Expense.expense_date >= self.start_date,
             Expense.expense_date <= self.end_date
-        ).all()
+        ).group_by(Expense.category).all()
 
         total_expenses = Decimal('0.00')
         category_breakdown = {}
+        expense_count = 0
 
-        for expense in expenses:
-            amount = Decimal(str(expense.amount))
+        for category, amount, count in rows:
+            amount = Decimal(str(amount))
             total_expenses += amount
+            expense_count += int(count)
 
-            category = expense.category or 'Uncategorized'
-            if category not in category_breakdown:
-                category_breakdown[category] = Decimal('0.00')
-            category_breakdown[category] += amount
+            category = category or 'Uncategorized'
+            category_breakdown[category] = category_breakdown.get(category, Decimal('0.00')) + amount
 
         return {
-            'total': float(total_expenses),
-            'by_category': {k: float(v) for k, v in category_breakdown.items()},
-            'count': len(expenses)
+            'total': _money(total_expenses),
+            'by_category': {k: _money(v) for k, v in category_breakdown.items()},
+            'count': expense_count
         }
 
     def calculate_estimated_taxes(self, net_profit, filing_status='single'):
@@ -488,12 +495,9 @@ class TaxCalculator:
                 'action': 'Associate receipt items with inventory or expenses'
             })
 
-        # Check for active items without purchase date
-        active_no_date = Item.query.filter(
-            Item.user_id == self.user_id,
-            Item.sold_at.is_(None),
-            Item.purchased_at.is_(None)
-        ).count()
+        # Check for active items without purchase date / items without cost
+        item_totals = self._items_aggregates()
+        active_no_date = item_totals['active_no_date']
 
         if active_no_date > 0:
             warnings.append({
@@ -503,11 +507,7 @@ class TaxCalculator:
                 'action': 'Add purchase dates to track inventory properly'
             })
 
-        # Check for items without cost
-        items_no_cost = Item.query.filter(
-            Item.user_id == self.user_id,
-            or_(Item.item_cost.is_(None), Item.item_cost == 0)
-        ).count()
+        items_no_cost = item_totals['no_cost']
 
         if items_no_cost > 0:
             warnings.append({
@@ -610,10 +610,70 @@ class TaxCalculator:
         }
 
 
+def is_period_closed(tax_year, quarter=None, today=None):
+    """True once the tax year/quarter has ended"""
+    _, end_date = get_period_bounds(tax_year, quarter)
+    return (today or datetime.utcnow().date()) > end_date
+
+
+def _data_changed_since(user_id, since, start_date, end_date):
+    """Cheap EXISTS probe: did any sale, item or expense feeding the report change?"""
+    sales_changed = db.session.query(Sale.id).filter(
+        Sale.user_id == user_id,
+        Sale.sold_at >= start_date,
+        Sale.updated_at > since
+    ).exists()
+    items_changed = db.session.query(Item.id).filter(
+        Item.user_id == user_id,
+        Item.updated_at > since
+    ).exists()
+    expenses_changed = db.session.query(Expense.id).filter(
+        Expense.user_id == user_id,
+        Expense.expense_date >= start_date,
+        Expense.expense_date <= end_date,
+        Expense.updated_at > since
+    ).exists()
+    return bool(db.session.query(or_(sales_changed, items_changed, expenses_changed)).scalar())
+
+
+def is_report_snapshot_current(report, now=None):
+    """
+    Decide whether a stored TaxReport can be served without recomputing.
+
+    - Finalized reports are never recomputed implicitly.
+    - Closed periods: a report computed after the period ended is an immutable
+      materialized snapshot.
+    - Open (current) period: recomputed only when source data changed since the
+      last computation, with a TAX_REPORT_REFRESH_SECONDS safety net for writes
+      that bypass the ORM's updated_at.
+    """
+    if report.status == 'finalized':
+        return True
+
+    computed_at = report.last_updated_at or report.generated_at
+    if not computed_at:
+        return False
+
+    now = now or datetime.utcnow()
+    start_date, end_date = get_period_bounds(report.tax_year, report.quarter)
+
+    if is_period_closed(report.tax_year, report.quarter, today=now.date()):
+        return computed_at.date() > end_date
+
+    if now - computed_at > timedelta(seconds=TAX_REPORT_REFRESH_SECONDS):
+        return False
+
+    return not _data_changed_since(report.user_id, computed_at, start_date, end_date)
+
+
 def get_or_create_tax_report(user_id, tax_year, quarter=None, regenerate=False):
     """
     Get existing tax report or create new one
 
+    Stored reports are reused while is_report_snapshot_current() holds, so
+    closed periods are served from their snapshot and the current period is
+    only recomputed after its data changes.
+
     Args:
         user_id: User ID
         tax_year: Tax year
@@ -633,10 +693,12 @@ def get_or_create_tax_report(user_id, tax_year, quarter=None, regenerate=False):
         quarter=quarter
     ).first()
 
-    if existing and not regenerate:
+    if existing and not regenerate and is_report_snapshot_current(existing):
         return existing
 
-    # Generate new report
+    # Generate new report (timestamp taken first so changes made while
+    # computing are picked up by the next freshness check)
+    computed_at = datetime.utcnow()
     calculator = TaxCalculator(user_id, tax_year, quarter)
     report_data = calculator.generate_full_report()
 
@@ -696,7 +758,7 @@ def get_or_create_tax_report(user_id, tax_year, quarter=None, regenerate=False):
     report.data_completeness_score = report_data['validation']['completeness_score']
     report.missing_costs_count = report_data['cogs']['missing_count']
 
-    report.last_updated_at = datetime.utcnow()
+    report.last_updated_at = computed_at
 
     db.session.commit()
 
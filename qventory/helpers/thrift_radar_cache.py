@@ -0,0 +1,141 @@
+"""
+Thrift Radar lookup cache
+
+Geocodes (ZIP / city query -> center) and nearby-place results (rounded
+center + radius + search term -> places) are cached in Redis so every worker
+shares them; while Redis is unavailable a small per-process TTL cache is used
+instead. Place lookups that miss the cache are fetched concurrently with a
+bounded thread pool, so a multi-category search costs about one external
+round-trip. Fetchers are passed in by the caller, which keeps this module free
+of HTTP code and easy to exercise offline.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .redis_client import get_redis, mark_redis_down
+
+GEOCODE_TTL_SECONDS = 30 * 86400
+PLACES_TTL_SECONDS = 6 * 3600
+PLACES_FETCH_WORKERS = 8
+CENTER_PRECISION = 2  # Decimal places kept for cache keys (~1 km)
+LOCAL_CACHE_MAX_ENTRIES = 2048
+
+_KEY_PREFIX = 'qventory:thrift_radar'
+
+
+_local_cache = {}
+_local_lock = threading.Lock()
+
+
+def geocode_cache_key(query):
+    normalized = " ".join(str(query or "").lower().split())
+    return f"{_KEY_PREFIX}:geo:{normalized}"
+
+
+def places_cache_key(lat, lng, radius_meters, term):
+    normalized = " ".join(str(term or "").lower().split())
+    return (
+        f"{_KEY_PREFIX}:places:{round(float(lat), CENTER_PRECISION)}:"
+        f"{round(float(lng), CENTER_PRECISION)}:{int(radius_meters)}:{normalized}"
+    )
+
+
+def _cache_get_many(keys):
+    """Cached values for keys (missing ones omitted)."""
+    found = {}
+    client = get_redis()
+    if client is not None:
+        try:
+            for key, raw in zip(keys, client.mget(keys)):
+                if raw is not None:
+                    found[key] = json.loads(raw)
+            return found
+        except Exception as exc:
+            mark_redis_down(exc)
+
+    now = time.monotonic()
+    with _local_lock:
+        for key in keys:
+            entry = _local_cache.get(key)
+            if entry and entry[0] > now:
+                found[key] = entry[1]
+    return found
+
+
+def _cache_set_many(values, ttl):
+    if not values:
+        return
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.set(key, json.dumps(value), ex=ttl)
+            pipe.execute()
+            return
+        except Exception as exc:
+            mark_redis_down(exc)
+
+    expires_at = time.monotonic() + ttl
+    with _local_lock:
+        if len(_local_cache) + len(values) > LOCAL_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            for key in [key for key, entry in _local_cache.items() if entry[0] <= now]:
+                del _local_cache[key]
+            if len(_local_cache) + len(values) > LOCAL_CACHE_MAX_ENTRIES:
+                _local_cache.clear()
+        for key, value in values.items():
+            _local_cache[key] = (expires_at, value)
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local_cache.clear()
+
+
+def cached_geocode(query, fetch, ttl=GEOCODE_TTL_SECONDS):
+    """
+    Geocode through the cache. fetch(query) returns a center dict or None;
+    misses (None) are not cached so a typo does not stick for a month.
+    """
+    key = geocode_cache_key(query)
+    cached = _cache_get_many([key])
+    if key in cached:
+        return cached[key]
+    center = fetch(query)
+    if center:
+        _cache_set_many({key: center}, ttl)
+    return center
+
+
+def cached_places(lat, lng, radius_meters, terms, fetch, ttl=PLACES_TTL_SECONDS, max_workers=PLACES_FETCH_WORKERS):
+    """
+    Nearby places for several search terms around one center.
+
+    Args:
+        terms: search terms (duplicates are fetched once)
+        fetch: fetch(term) -> list of places, called for cache misses only,
+               concurrently on up to max_workers threads
+
+    Returns:
+        dict: term -> list of places
+    """
+    terms = list(dict.fromkeys(terms))
+    keys = {term: places_cache_key(lat, lng, radius_meters, term) for term in terms}
+    cached = _cache_get_many(list(keys.values()))
+
+    results = {term: cached[key] for term, key in keys.items() if key in cached}
+    missing = [term for term in terms if term not in results]
+    if missing:
+        workers = max(1, min(max_workers, len(missing)))
+        if workers == 1:
+            fetched = [fetch(term) for term in missing]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fetched = list(pool.map(fetch, missing))
+        results.update(zip(missing, fetched))
+        _cache_set_many({keys[term]: results[term] for term in missing}, ttl)
+
+    return results
@@ -0,0 +1,187 @@
+"""
+Per-user status channel
+
+Every user has a version counter in Redis (qventory:user_status:<uid>) that is
+bumped whenever one of the rows behind the header badges changes for them:
+notifications, reports, import jobs and background jobs. Publishing is done by
+SQLAlchemy session events, so Notification.create_notification, report status
+updates, ImportJob progress and BackgroundJob progress all push changes without
+calling anything explicitly. Bulk Query.update()/delete() calls on those tables
+are picked up by a do_orm_execute hook; only raw SQL has to call
+bump_user_status() itself.
+
+/api/status compares the client's version with the counter and only builds a
+snapshot when it moved, so an idle tab costs one Redis GET per poll. When
+Redis is unreachable the endpoint falls back to plain snapshots.
+"""
+import os
+import time
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BindParameter
+
+from .redis_client import get_redis, mark_redis_down
+
+STATUS_VERSION_TTL_SECONDS = 86400
+
+# How long /api/status may hold a request open waiting for a change. Keep this
+# at 0 on sync gunicorn workers: every held poll pins a worker.
+STATUS_LONG_POLL_SECONDS = int(os.environ.get('STATUS_LONG_POLL_SECONDS', '0'))
+STATUS_POLL_INTERVAL = 10  # Seconds clients wait between short polls
+STATUS_WAIT_STEP = 1.0  # Seconds between version checks while long-polling
+
+STATUS_TABLES = ('notifications', 'reports', 'import_jobs', 'background_jobs')
+
+_KEY_PREFIX = 'qventory'
+_PENDING_KEY = 'qventory_status_users'
+
+
+def _status_key(user_id):
+    return f"{_KEY_PREFIX}:user_status:{user_id}"
+
+
+def _seed_value():
+    # Counters start from the clock so a key that expired and was recreated
+    # never hands out a version a client has already seen.
+    return int(time.time() * 1000)
+
+
+def current_status_version(user_id):
+    """
+    The user's status version.
+
+    Returns:
+        str, or None when Redis is unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    key = _status_key(user_id)
+    try:
+        raw = client.get(key)
+        if raw is None:
+            client.set(key, _seed_value(), nx=True, ex=STATUS_VERSION_TTL_SECONDS)
+            raw = client.get(key)
+    except Exception as exc:
+        mark_redis_down(exc)
+        return None
+    if raw is None:
+        return None
+    return raw.decode() if isinstance(raw, bytes) else str(raw)
+
+
+def bump_user_status(user_ids):
+    """Advance the status version of one or more users (best effort)."""
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    user_ids = sorted({user_id for user_id in user_ids if user_id})
+    if not user_ids:
+        return False
+    client = get_redis()
+    if client is None:
+        return False
+    try:
+        pipe = client.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = _status_key(user_id)
+            pipe.set(key, _seed_value(), nx=True, ex=STATUS_VERSION_TTL_SECONDS)
+            pipe.incr(key)
+            pipe.expire(key, STATUS_VERSION_TTL_SECONDS)
+        pipe.execute()
+        return True
+    except Exception as exc:
+        mark_redis_down(exc)
+        return False
+
+
+def wait_for_status_change(user_id, since, timeout):
+    """
+    Block until the user's version differs from `since` or timeout passes.
+
+    Returns:
+        str: the new version, or `since` when nothing changed in time
+        None: Redis became unavailable
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        version = current_status_version(user_id)
+        if version is None or version != since:
+            return version
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return since
+        time.sleep(min(STATUS_WAIT_STEP, remaining))
+
+
+def _collect_status_users(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(instance, '__tablename__', None) in STATUS_TABLES:
+            user_id = getattr(instance, 'user_id', None)
+            if user_id:
+                pending.add(user_id)
+
+
+def _user_ids_from_criteria(table, whereclause):
+    """
+    User ids pinned by a top-level `user_id == x` or `user_id IN (...)` criterion.
+
+    Returns:
+        set, or None when the criteria don't say which users are affected
+    """
+    if whereclause is None:
+        return None
+    clauses = whereclause.clauses if getattr(whereclause, 'operator', None) is operators.and_ else [whereclause]
+    for clause in clauses:
+        column, value = getattr(clause, 'left', None), getattr(clause, 'right', None)
+        if getattr(column, 'name', None) != 'user_id' or getattr(getattr(column, 'table', None), 'name', None) != table.name:
+            continue
+        if not isinstance(value, BindParameter):
+            continue
+        if clause.operator is operators.eq:
+            return {value.value}
+        if clause.operator is operators.in_op:
+            return set(value.value or [])
+    return None
+
+
+def _collect_bulk_status_users(orm_execute_state):
+    """Bulk UPDATE/DELETE skips the flush events: note the users it touches."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.bind_mapper, 'local_table', None)
+    if table is None or table.name not in STATUS_TABLES or 'user_id' not in table.c:
+        return
+
+    whereclause = orm_execute_state.statement.whereclause
+    user_ids = _user_ids_from_criteria(table, whereclause)
+    if user_ids is None:
+        query = select(table.c.user_id).distinct()
+        if whereclause is not None:
+            query = query.where(whereclause)
+        user_ids = set(orm_execute_state.session.execute(query).scalars())
+
+    pending = orm_execute_state.session.info.setdefault(_PENDING_KEY, set())
+    pending.update(user_id for user_id in user_ids if user_id)
+
+
+def _publish_status_users(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bump_user_status(pending)
+
+
+def _discard_status_users(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_user_status_publishers():
+    """Hook the status channel into every SQLAlchemy session (idempotent)."""
+    if event.contains(Session, 'after_flush', _collect_status_users):
+        return
+    event.listen(Session, 'after_flush', _collect_status_users)
+    event.listen(Session, 'do_orm_execute', _collect_bulk_status_users)
+    event.listen(Session, 'after_commit', _publish_status_users)
+    event.listen(Session, 'after_rollback', _discard_status_users)
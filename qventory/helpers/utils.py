@@ -1,4 +1,5 @@
-import datetime, random, string, io
+import datetime, random, string, os, tempfile
+from functools import lru_cache, partial
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
 from qrcode.constants import ERROR_CORRECT_L
@@ -217,17 +218,26 @@ def _make_qr_pil(link: str, target_side_pt: float, dpi: int = 300, *, border: in
     bordes pequeños y corrección L para mayor nitidez.
     """
     target_px = max(64, int(round(target_side_pt * dpi / 72.0)))
+    base = _qr_base_image(link or "", border).convert("RGB")
+    img = base.resize((target_px, target_px), Image.NEAREST)
+    return img
+
+
+@lru_cache(maxsize=1024)
+def _qr_base_image(link: str, border: int):
+    """
+    QR 1-bit sin escalar, cacheado por link: reimprimir etiquetas o armar
+    PDFs grandes no vuelve a codificar el mismo QR. No modificar el resultado.
+    """
     qr = qrcode.QRCode(
         version=None,
         error_correction=ERROR_CORRECT_L,
         box_size=10,
         border=border,
     )
-    qr.add_data(link or "")
+    qr.add_data(link)
     qr.make(fit=True)
-    base = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    img = base.resize((target_px, target_px), Image.NEAREST)
-    return img
+    return qr.make_image(fill_color="black", back_color="white").convert("1")
 
 # =========================
 #   Etiqueta individual QR (PIL) 40x30mm
@@ -307,67 +317,151 @@ def qr_label_image(code, human_text, link, qr_px=None, *, dpi=300):
 #   PDF batch 40x30mm
 # =========================
 
-def build_qr_batch_pdf(codes, settings, make_link, *, dpi=300):
-    LABEL_W_PT = mm_to_pt(40.0)
-    LABEL_H_PT = mm_to_pt(30.0)
+QR_BATCH_CHUNK_SIZE = 200          # Etiquetas rasterizadas por tanda (acota memoria)
+QR_BATCH_POOL_MIN = 64             # Por debajo de esto no vale la pena levantar procesos
+QR_BATCH_WORKERS = int(os.environ.get("QR_BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))  # Solo el job en background
+QR_BATCH_SPOOL_BYTES = 8 * 1024 * 1024  # El PDF pasa a disco al superar esto
+QR_BATCH_SYNC_LIMIT = int(os.environ.get("QR_BATCH_SYNC_LIMIT", "500"))  # Más etiquetas -> background job
 
-    GAP = mm_to_pt(2.0)
-    TEXT_FONT = "Helvetica-Bold"
 
-    buf = io.BytesIO()
-    c = rl_canvas.Canvas(buf, pagesize=(LABEL_W_PT, LABEL_H_PT))
-    c.setAuthor("Qventory")
-    c.setTitle("QR Labels 40x30mm")
+def _qr_raster(link, target_px, border=2):
+    """
+    QR en escala de grises (modo L) de target_px, como bytes crudos. Es
+    top-level para poder correr en un pool de procesos: codificar QR es
+    CPU puro en Python y no escala con threads.
+    """
+    base = _qr_base_image(link or "", border)
+    return base.resize((target_px, target_px), Image.NEAREST).convert("L").tobytes()
 
-    for i, code in enumerate(codes):
-        if i > 0:
-            c.showPage()
 
-        x0 = 0
-        y0 = 0
+def _qr_raster_pool(workers):
+    """
+    Pool de procesos de billiard: a diferencia de multiprocessing /
+    ProcessPoolExecutor, puede crear hijos desde un worker prefork de
+    Celery (que es daemon). None si no se puede levantar.
+    """
+    try:
+        import billiard
+        return billiard.Pool(processes=workers)
+    except Exception as exc:
+        current_app.logger.warning("QR batch pool unavailable, rendering serially: %s", exc)
+        return None
 
-        inner_w = LABEL_W_PT
-        inner_h = LABEL_H_PT
-        qr_side = mm_to_pt(18.0)
-        x_qr = 0
-        y_qr = (inner_h - qr_side) / 2.0
-        text_x = x_qr + qr_side + GAP
-        text_w = (x0 + inner_w) - text_x
 
-        link = make_link(code)
-        qr_img = _make_qr_pil(link, target_side_pt=qr_side, dpi=dpi, border=2)
+def _qr_raster_chunks(links, target_px, *, workers=1, chunk_size=None):
+    """
+    Genera listas de imágenes PIL (una por link) tanda por tanda.
 
-        c.drawImage(
-            ImageReader(qr_img),
-            x_qr,
-            y_qr,
-            width=qr_side,
-            height=qr_side,
-            preserveAspectRatio=True,
-            mask='auto'
-        )
+    Por defecto es serial (requests web). El job en background pasa
+    workers > 1: los QR se rasterizan en un pool y los resultados llegan en
+    orden mientras se dibuja la tanda actual; si el pool falla, lo que
+    falta se hace en serie.
+    """
+    chunk_size = chunk_size or QR_BATCH_CHUNK_SIZE
 
-        label_text = "Location:"
-        code_text = code or ""
+    def _images(rasters):
+        return [Image.frombytes("L", (target_px, target_px), raw) for raw in rasters]
 
-        label_font = 10.0
-        code_font = 16.0
+    pool = None
+    if workers > 1 and len(links) >= QR_BATCH_POOL_MIN:
+        pool = _qr_raster_pool(workers)
 
-        while label_font > 7.0 and c.stringWidth(label_text, TEXT_FONT, label_font) > text_w:
-            label_font -= 0.5
+    if pool is None:
+        for i in range(0, len(links), chunk_size):
+            yield _images(_qr_raster(link, target_px) for link in links[i:i + chunk_size])
+        return
 
-        while code_font > 10.0 and c.stringWidth(code_text, TEXT_FONT, code_font) > text_w:
-            code_font -= 0.5
+    done = 0
+    try:
+        rasters = pool.imap(partial(_qr_raster, target_px=target_px), links, chunksize=16)
+        chunk = []
+        try:
+            for raw in rasters:
+                chunk.append(raw)
+                if len(chunk) == chunk_size:
+                    done += len(chunk)
+                    yield _images(chunk)
+                    chunk = []
+        except Exception as exc:
+            current_app.logger.warning("QR batch pool failed, rendering serially: %s", exc)
+            for i in range(done, len(links), chunk_size):
+                yield _images(_qr_raster(link, target_px) for link in links[i:i + chunk_size])
+            return
+        if chunk:
+            yield _images(chunk)
+    finally:
+        pool.terminate()
+
+
+def build_qr_batch_pdf(codes, settings, make_link, *, dpi=300, workers=1, progress=None):
+    """
+    PDF de etiquetas 40x30mm, una por página.
 
-        total_text_h = label_font + 4 + code_font
-        text_top = y_qr + (qr_side / 2.0) + (total_text_h / 2.0)
+    Los QR se rasterizan en tandas (en un pool si workers > 1) y el PDF se
+    escribe a un SpooledTemporaryFile, que pasa a disco si crece. Devuelve el
+    archivo posicionado al inicio; progress(hechas, total) se llama por tanda.
+    """
+    LABEL_W_PT = mm_to_pt(40.0)
+    LABEL_H_PT = mm_to_pt(30.0)
 
-        c.setFont(TEXT_FONT, label_font)
-        c.drawString(text_x, text_top - label_font, label_text)
+    GAP = mm_to_pt(2.0)
+    TEXT_FONT = "Helvetica-Bold"
 
-        c.setFont(TEXT_FONT, code_font)
-        c.drawString(text_x, text_top - label_font - 4 - code_font, code_text)
+    codes = list(codes)
+    out = tempfile.SpooledTemporaryFile(max_size=QR_BATCH_SPOOL_BYTES)
+    c = rl_canvas.Canvas(out, pagesize=(LABEL_W_PT, LABEL_H_PT))
+    c.setAuthor("Qventory")
+    c.setTitle("QR Labels 40x30mm")
+
+    qr_side = mm_to_pt(18.0)
+    qr_px = max(64, int(round(qr_side * dpi / 72.0)))
+    x_qr = 0
+    y_qr = (LABEL_H_PT - qr_side) / 2.0
+    text_x = x_qr + qr_side + GAP
+    text_w = LABEL_W_PT - text_x
+
+    links = [make_link(code) for code in codes]
+    done = 0
+    for images in _qr_raster_chunks(links, qr_px, workers=workers):
+        for qr_img in images:
+            code = codes[done]
+            if done > 0:
+                c.showPage()
+            done += 1
+
+            c.drawImage(
+                ImageReader(qr_img),
+                x_qr,
+                y_qr,
+                width=qr_side,
+                height=qr_side,
+                preserveAspectRatio=True,
+                mask='auto'
+            )
+
+            label_text = "Location:"
+            code_text = code or ""
+
+            label_font = 10.0
+            code_font = 16.0
+
+            while label_font > 7.0 and c.stringWidth(label_text, TEXT_FONT, label_font) > text_w:
+                label_font -= 0.5
+
+            while code_font > 10.0 and c.stringWidth(code_text, TEXT_FONT, code_font) > text_w:
+                code_font -= 0.5
+
+            total_text_h = label_font + 4 + code_font
+            text_top = y_qr + (qr_side / 2.0) + (total_text_h / 2.0)
+
+            c.setFont(TEXT_FONT, label_font)
+            c.drawString(text_x, text_top - label_font, label_text)
+
+            c.setFont(TEXT_FONT, code_font)
+            c.drawString(text_x, text_top - label_font - 4 - code_font, code_text)
+        if progress:
+            progress(done, len(codes))
 
     c.save()
-    buf.seek(0)
-    return buf
+    out.seek(0)
+    return out
@@ -10,10 +10,12 @@ from .support import SupportTicket, SupportMessage, SupportAttachment
 from .report import Report
 from .ai_token import AITokenConfig, AITokenUsage
 from .import_job import ImportJob
+from .background_job import BackgroundJob
 from .failed_import import FailedImport
 from .expense import Expense
 from .auto_relist_rule import AutoRelistRule, AutoRelistHistory
 from .email_verification import EmailVerification
+from .email_outbox import EmailOutbox
 from .pending_registration import PendingRegistration
 from .receipt import Receipt
 from .receipt_item import ReceiptItem
@@ -52,11 +54,13 @@ __all__ = [
     'AITokenUsage',
     'SystemSetting',
     'ImportJob',
+    'BackgroundJob',
     'FailedImport',
     'Expense',
     'AutoRelistRule',
     'AutoRelistHistory',
     'EmailVerification',
+    'EmailOutbox',
     'PendingRegistration',
     'Receipt',
     'ReceiptItem',
@@ -0,0 +1,125 @@
+"""
+BackgroundJob Model - Track user-triggered background work (eBay syncs, bulk revisions, label PDFs)
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from qventory.extensions import db
+
+
+class BackgroundJob(db.Model):
+    """Track long-running jobs started from the UI and executed by Celery"""
+    __tablename__ = 'background_jobs'
+
+    TYPE_EBAY_INVENTORY_SYNC = 'ebay_inventory_sync'
+    TYPE_EBAY_LOCATION_SYNC = 'ebay_location_sync'
+    TYPE_EBAY_FULFILLMENT_SYNC = 'ebay_fulfillment_sync'
+    TYPE_QR_BATCH_PDF = 'qr_batch_pdf'
+
+    ACTIVE_STATUSES = ('pending', 'processing')
+    STALE_AFTER = timedelta(hours=6)  # Active rows older than this are treated as abandoned
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+
+    job_type = db.Column(db.String(50), nullable=False, index=True)
+    celery_task_id = db.Column(db.String(255), index=True)
+    status = db.Column(db.String(20), default='pending', nullable=False, index=True)
+    # Status: pending, processing, completed, failed, cancelled
+    dedup_key = db.Column(db.String(64), index=True)  # Identical in-flight jobs share a key
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+
+    params = db.Column(db.JSON)  # Input captured at enqueue time (item IDs, options)
+    result = db.Column(db.JSON)  # Summary written on completion
+
+    # Progress tracking
+    total_items = db.Column(db.Integer, default=0)
+    processed_items = db.Column(db.Integer, default=0)
+    succeeded_count = db.Column(db.Integer, default=0)
+    failed_count = db.Column(db.Integer, default=0)
+    skipped_count = db.Column(db.Integer, default=0)
+
+    error_message = db.Column(db.Text)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+
+    user = db.relationship('User', backref=db.backref('background_jobs', lazy='dynamic'))
+
+    __table_args__ = (
+        db.Index('idx_background_jobs_user_type_status', 'user_id', 'job_type', 'status'),
+    )
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.id} {self.job_type} user={self.user_id} status={self.status}>'
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+    def to_dict(self):
+        """Serialize to JSON"""
+        total = self.total_items or 0
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'total_items': total,
+            'processed_items': self.processed_items or 0,
+            'succeeded_count': self.succeeded_count or 0,
+            'failed_count': self.failed_count or 0,
+            'skipped_count': self.skipped_count or 0,
+            'result': self.result,
+            'error_message': self.error_message,
+            'cancel_requested': bool(self.cancel_requested),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'progress_percent': int((self.processed_items or 0) / total * 100) if total > 0 else 0
+        }
+
+    def mark_processing(self, total_items=None):
+        self.status = 'processing'
+        self.started_at = self.started_at or datetime.utcnow()
+        if total_items is not None:
+            self.total_items = total_items
+
+    def mark_completed(self, result=None):
+        self.status = 'completed'
+        self.result = result
+        self.completed_at = datetime.utcnow()
+
+    def mark_failed(self, error):
+        self.status = 'failed'
+        self.error_message = str(error)[:2000]
+        self.completed_at = datetime.utcnow()
+
+    def mark_cancelled(self):
+        self.status = 'cancelled'
+        self.cancel_requested = True
+        self.completed_at = datetime.utcnow()
+
+    @staticmethod
+    def make_dedup_key(job_type, params=None):
+        """Stable key for 'the same job': type plus canonical params"""
+        raw = json.dumps({'type': job_type, 'params': params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:64]
+
+    @staticmethod
+    def active_query(user_id):
+        """In-flight jobs for a user, ignoring rows abandoned by a dead worker"""
+        return BackgroundJob.query.filter(
+            BackgroundJob.user_id == user_id,
+            BackgroundJob.status.in_(BackgroundJob.ACTIVE_STATUSES),
+            BackgroundJob.created_at >= datetime.utcnow() - BackgroundJob.STALE_AFTER
+        )
+
+    @staticmethod
+    def find_active(user_id, job_type, dedup_key=None):
+        """Return the user's in-flight job of this type (and dedup key), if any"""
+        query = BackgroundJob.active_query(user_id).filter(BackgroundJob.job_type == job_type)
+        if dedup_key is not None:
+            query = query.filter(BackgroundJob.dedup_key == dedup_key)
+        return query.order_by(BackgroundJob.created_at.desc()).first()
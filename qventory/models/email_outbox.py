@@ -0,0 +1,61 @@
+"""
+EmailOutbox Model - Outgoing emails queued by request handlers and tasks
+"""
+from datetime import datetime, timedelta
+from qventory.extensions import db
+
+
+class EmailOutbox(db.Model):
+    """
+    One outgoing email. Senders only insert rows; the deliver_email_outbox
+    task sends due rows in batches over a shared SMTP connection.
+    """
+    __tablename__ = 'email_outbox'
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'  # Claimed by a worker until next_attempt_at (lease)
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+
+    MAX_ATTEMPTS = 6
+    RETRY_BASE = timedelta(minutes=1)
+    RETRY_MAX = timedelta(hours=1)
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(255), nullable=False, index=True)
+    subject = db.Column(db.String(500), nullable=False)
+    html_body = db.Column(db.Text)  # Bodies hold codes and reset links: cleared once sent
+    text_body = db.Column(db.Text)
+
+    dedup_key = db.Column(db.String(128), index=True)  # Same key within its window is sent once
+    status = db.Column(db.String(20), default=STATUS_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} to={self.to_email} status={self.status}>'
+
+    def mark_sent(self):
+        self.status = self.STATUS_SENT
+        self.sent_at = datetime.utcnow()
+        self.last_error = None
+        self.html_body = None
+        self.text_body = None
+
+    def mark_attempt_failed(self, error, permanent=False):
+        """Record a failed delivery; schedules a retry with exponential backoff."""
+        self.last_error = str(error)[:2000]
+        if permanent or self.attempts >= self.MAX_ATTEMPTS:
+            self.status = self.STATUS_FAILED
+            return
+        delay = min(self.RETRY_BASE * (2 ** max(self.attempts - 1, 0)), self.RETRY_MAX)
+        self.status = self.STATUS_PENDING
+        self.next_attempt_at = datetime.utcnow() + delay
@@ -97,6 +97,10 @@ class MarketplaceCredential(db.Model):
 
     def set_access_token(self, value):
         self.access_token = self.encrypt_field(value)
+        if self.user_id and self.marketplace in (None, 'ebay'):
+            # Drop the old token from the eBay token cache
+            from ..helpers.ebay_token_cache import invalidate_access_token
+            invalidate_access_token(self.user_id)
 
     def get_access_token(self):
         return self.decrypt_field(self.access_token)
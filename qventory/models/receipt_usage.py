@@ -119,6 +119,75 @@ class ReceiptUsage(db.Model):
         # No limits set - unlimited
         return True, "Unlimited", 0, None
 
+    @staticmethod
+    def reserve_ocr_slots(user, plan_limits, requested: int, lock: bool = True) -> tuple[int, str, int, int]:
+        """
+        Reserve AI OCR capacity for one or more receipts in one step.
+
+        Locks the user row so concurrent uploads for the same user serialize,
+        and counts receipts already queued for OCR (pending/processing, usage not
+        yet recorded) against the limit. The lock is held until the caller
+        commits, so create the Receipt rows in the same transaction. A receipt
+        holds its slot while pending/processing without an ocr_error_message;
+        setting one (or status 'failed') releases it.
+
+        With lock=False nothing is reserved; use it to preview remaining quota.
+
+        Returns:
+            (granted, message, used, limit)
+            - granted: int - how many of the requested receipts may be OCR'd
+            - message: str - explanation message
+            - used: int - usage plus in-flight receipts before this batch
+            - limit: int - the limit (or None for unlimited)
+        """
+        from .receipt import Receipt
+        from .user import User
+
+        requested = max(0, int(requested or 0))
+
+        if user.is_god_mode:
+            return requested, "God mode - unlimited", 0, None
+
+        if plan_limits.max_receipt_ocr_per_day is not None:
+            limit = plan_limits.max_receipt_ocr_per_day
+            period_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            period_label = "today"
+        elif plan_limits.max_receipt_ocr_per_month is not None:
+            limit = plan_limits.max_receipt_ocr_per_month
+            period_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            period_label = "this month"
+        else:
+            return requested, "Unlimited", 0, None
+
+        if lock:
+            # Serialize quota checks per user (no-op on SQLite)
+            db.session.query(User.id).filter(User.id == user.id).with_for_update().first()
+
+        used = db.session.query(func.count(ReceiptUsage.id)).filter(
+            ReceiptUsage.user_id == user.id,
+            ReceiptUsage.processed_at >= period_start
+        ).scalar() or 0
+
+        in_flight = db.session.query(func.count(Receipt.id)).filter(
+            Receipt.user_id == user.id,
+            Receipt.status.in_(('pending', 'processing')),
+            Receipt.ocr_error_message.is_(None),
+            Receipt.uploaded_at >= period_start
+        ).scalar() or 0
+
+        committed = used + in_flight
+        granted = max(0, min(requested, limit - committed))
+
+        if granted < requested:
+            message = (
+                f"OCR limit reached. {committed}/{limit} AI OCR receipts used or queued {period_label}; "
+                f"{requested - granted} receipt(s) saved without OCR."
+            )
+        else:
+            message = f"OK - {committed + granted}/{limit} used {period_label}"
+
+        return granted, message, committed, limit
+
     @staticmethod
     def record_usage(user_id: int, receipt_id: int, plan: str, provider: str = 'openai_vision', cost: float = None):
         """Record that a receipt was processed with AI OCR"""
@@ -76,6 +76,14 @@ class Sale(db.Model):
     # Relaciones
     item = db.relationship("Item", backref="sales")
 
+    # Indices para deteccion de ventas del auto-relist (lookups por usuario + SKU / IDs de eBay)
+    __table_args__ = (
+        db.Index('idx_sales_user_item_sku_sold_at', 'user_id', 'item_sku', 'sold_at'),
+        db.Index('idx_sales_user_sale_listing_id', 'user_id', 'sale_ebay_listing_id'),
+        db.Index('idx_sales_user_marketplace_order_id', 'user_id', 'marketplace_order_id'),
+        db.Index('idx_sales_user_ebay_transaction_id', 'user_id', 'ebay_transaction_id'),
+    )
+
     @property
     def image_pending(self):
         return (
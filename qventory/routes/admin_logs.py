@@ -290,3 +290,30 @@ def get_task_details(task_id):
             )
         }
     }), 200
+
+
+@admin_logs_bp.route('/api/sql-stats', methods=['GET'])
+@require_admin
+def get_sql_stats():
+    """
+    SQL statements per route / Celery task and recent N+1 or slow units
+    Collected by helpers/query_stats.py in web and worker processes
+    """
+    from qventory.helpers.query_stats import read_query_stats
+
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    stats = read_query_stats(limit=limit)
+    stats['timestamp'] = datetime.utcnow().isoformat()
+    return jsonify(stats), 200
+
+
+@admin_logs_bp.route('/api/sql-stats/reset', methods=['POST'])
+@require_admin
+def reset_sql_stats():
+    """
+    Clear collected SQL stats (e.g. before measuring a change)
+    """
+    from qventory.helpers.query_stats import reset_query_stats
+
+    reset_query_stats()
+    return jsonify({'ok': True}), 200
@@ -14,6 +14,8 @@ import xml.etree.ElementTree as ET
 
 from qventory.extensions import db
 from qventory.models.marketplace_credential import MarketplaceCredential
+from qventory.helpers.ebay_token_cache import invalidate_access_token
+from qventory.helpers.ebay_listing_snapshot import invalidate_snapshots
 
 ebay_auth_bp = Blueprint('ebay_auth', __name__, url_prefix='/settings/ebay')
 
@@ -331,6 +333,8 @@ def disconnect():
             # Delete the credential
             db.session.delete(credential)
             db.session.commit()
+            invalidate_access_token(current_user.id)
+            invalidate_snapshots(current_user.id)
             log("Credential deleted successfully")
             flash('eBay account disconnected successfully.', 'success')
         else:
@@ -10,9 +10,22 @@ import cloudinary.uploader
 from ..extensions import db
 from ..models.ebay_listing_draft import EbayListingDraft
 from ..models.ebay_category import EbayCategory
-from ..routes.permissions import require_plan_feature, require_feature_flag
+from ..routes.permissions import (
+    rate_limited_response,
+    require_plan_feature,
+    require_feature_flag,
+    require_rate_limit,
+)
 from ..helpers.ebay_specifics_cache import get_category_specifics, get_category_condition_options
-from ..helpers.ebay_image_upload import create_ebay_upload_session, upload_ebay_image_from_url
+from ..helpers.ebay_image_upload import create_ebay_upload_session
+from ..helpers.ebay_draft_images import (
+    PUBLISH_RETRY_AFTER_SECONDS,
+    carry_over_ebay_upload_state,
+    count_in_flight_uploads,
+    draft_image_source_url,
+    ensure_draft_images_on_ebay,
+    has_pending_ebay_uploads,
+)
 from ..helpers.ebay_listing_publish import (
     create_or_replace_inventory_item,
     create_offer,
@@ -25,8 +38,6 @@ from ..models.marketplace_credential import MarketplaceCredential
 
 ebay_list_bp = Blueprint("ebay_list", __name__)
 
-_rate_limits = {}
-
 
 def _cloudinary_configured() -> bool:
     cloud_name = os.environ.get("CLOUDINARY_CLOUD_NAME")
@@ -75,17 +86,6 @@ def _cleanup_draft_cloudinary_images(draft: EbayListingDraft):
         draft.images_json = images
 
 
-def _rate_limit(key: str, limit: int, window_seconds: int) -> bool:
-    now = datetime.utcnow().timestamp()
-    bucket = _rate_limits.get(key, [])
-    bucket = [t for t in bucket if now - t < window_seconds]
-    if len(bucket) >= limit:
-        _rate_limits[key] = bucket
-        return False
-    bucket.append(now)
-    _rate_limits[key] = bucket
-    return True
-
 ALLOWED_DESCRIPTION_TAGS = [
     "p", "br", "strong", "em", "ul", "ol", "li", "b", "i", "u",
     "h1", "h2", "h3", "h4", "blockquote", "span"
@@ -111,6 +111,8 @@ ALLOWED_CONDITION_IDS = {
 ALLOWED_LISTING_FORMATS = {"FIXED_PRICE", "AUCTION"}
 AI_SCENARIO = "ai_research"
 MAX_DRAFT_IMAGES = 24
+PUBLISH_RATE_LIMIT = 5  # Publish attempts per user per window
+PUBLISH_RATE_WINDOW_SECONDS = 300
 
 
 def _sanitize_html(html: str | None) -> str | None:
@@ -136,52 +138,24 @@ def _draft_images(draft: EbayListingDraft):
     return draft.images_json or []
 
 
-def _draft_image_source_url(image_entry: dict):
-    return (
-        image_entry.get("cloudinary_url")
-        or image_entry.get("image_url")
-        or image_entry.get("url")
-        or image_entry.get("ebay_image_url")
-    )
-
-
-def _ensure_draft_images_uploaded_to_ebay(draft: EbayListingDraft):
-    images = _draft_images(draft)
-    uploaded = []
-    changed = False
-
-    for index, image_entry in enumerate(images):
-        ebay_url = image_entry.get("ebay_image_url")
-        if ebay_url:
-            uploaded.append(ebay_url)
-            continue
-
-        source_url = _draft_image_source_url(image_entry)
-        if not source_url:
-            return {"success": False, "error": f"missing_image_source:{index + 1}"}
-
-        result = upload_ebay_image_from_url(
-            current_user.id,
-            source_url,
-            image_entry.get("filename") or f"draft-{draft.id}-{index + 1}.jpg",
-        )
-        if not result.get("success") or not result.get("image_url"):
-            return {
-                "success": False,
-                "error": result.get("error") or "upload_failed",
-                "image_index": index,
-            }
+def _queue_draft_image_upload(draft: EbayListingDraft):
+    """Start pushing newly attached images to eBay so publish does not wait on them."""
+    if not has_pending_ebay_uploads(_draft_images(draft)):
+        return False
+    from ..tasks import queue_draft_image_upload
+    return queue_draft_image_upload(draft)
 
-        image_entry["ebay_image_url"] = result.get("image_url")
-        image_entry["ebay_image_location"] = result.get("location")
-        uploaded.append(result.get("image_url"))
-        changed = True
 
-    if changed:
-        draft.images_json = images
-        db.session.commit()
-
-    return {"success": True, "image_urls": uploaded}
+def _uploads_pending_response(in_flight):
+    """409 asking the client to retry publish once background image uploads settle."""
+    response = jsonify({
+        "ok": False,
+        "error": "uploads_pending",
+        "in_flight": in_flight,
+        "retry_after": PUBLISH_RETRY_AFTER_SECONDS,
+    })
+    response.headers["Retry-After"] = str(PUBLISH_RETRY_AFTER_SECONDS)
+    return response, 409
 
 
 def _package_weight_ounces(package_details: dict | None) -> float:
@@ -512,7 +486,7 @@ def update_draft(draft_id):
                 }
                 for public_id in old_public_ids - new_public_ids:
                     _delete_cloudinary_public_id(public_id)
-                draft.images_json = value
+                draft.images_json = carry_over_ebay_upload_state(_draft_images(draft), value)
         elif key == "package_details":
             draft.package_details_json = value if isinstance(value, dict) else {}
         elif key == "listing_format":
@@ -527,6 +501,8 @@ def update_draft(draft_id):
             setattr(draft, key, value)
 
     db.session.commit()
+    if "images" in payload:
+        _queue_draft_image_upload(draft)
     return jsonify({"ok": True, "draft": draft.to_dict()})
 
 
@@ -546,6 +522,7 @@ def validate_draft(draft_id):
 @login_required
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
+@require_rate_limit("ai_listing", limit=20, window_seconds=60)
 def ai_optimize_title(draft_id):
     draft = _draft_or_404(draft_id)
     if not draft:
@@ -589,6 +566,7 @@ def ai_optimize_title(draft_id):
 @login_required
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
+@require_rate_limit("ai_listing", limit=20, window_seconds=60)
 def ai_generate_description(draft_id):
     draft = _draft_or_404(draft_id)
     if not draft:
@@ -604,7 +582,7 @@ def ai_generate_description(draft_id):
     image_url = None
     images = _draft_images(draft)
     if images:
-        image_url = _draft_image_source_url(images[0])
+        image_url = draft_image_source_url(images[0])
 
     prompt = (
         "Create or optimize an enriched eBay item description from this listing context. "
@@ -649,6 +627,7 @@ def ai_generate_description(draft_id):
 @login_required
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
+@require_rate_limit("ai_listing", limit=20, window_seconds=60)
 def ai_fill_specifics(draft_id):
     draft = _draft_or_404(draft_id)
     if not draft:
@@ -704,8 +683,6 @@ def ai_fill_specifics(draft_id):
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
 def publish_draft(draft_id):
-    if not _rate_limit(f"publish:{current_user.id}", limit=5, window_seconds=300):
-        return jsonify({"ok": False, "error": "rate_limited"}), 429
     draft = _draft_or_404(draft_id)
     if not draft:
         return jsonify({"ok": False, "error": "not_found"}), 404
@@ -722,8 +699,19 @@ def publish_draft(draft_id):
     if not ebay_cred:
         return jsonify({"ok": False, "error": "ebay_not_connected"}), 400
 
-    images = _draft_images(draft)
-    image_upload_result = _ensure_draft_images_uploaded_to_ebay(draft)
+    # Checked before the rate limit so waiting on background uploads costs no publish attempt
+    in_flight = count_in_flight_uploads(_draft_images(draft))
+    if in_flight:
+        return _uploads_pending_response(in_flight)
+
+    limited = rate_limited_response("publish", PUBLISH_RATE_LIMIT, PUBLISH_RATE_WINDOW_SECONDS)
+    if limited is not None:
+        return limited
+
+    image_upload_result = ensure_draft_images_on_ebay(draft, current_user.id)
+    if image_upload_result.get("pending"):
+        # A background upload claimed images in the meantime
+        return _uploads_pending_response(image_upload_result.get("in_flight"))
     if not image_upload_result.get("success"):
         draft.status = "FAILED"
         draft.last_error = image_upload_result.get("error")
@@ -888,9 +876,8 @@ def delete_draft(draft_id):
 @login_required
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
+@require_rate_limit("upload", limit=20, window_seconds=60)
 def get_upload_token():
-    if not _rate_limit(f"upload:{current_user.id}", limit=20, window_seconds=60):
-        return jsonify({"ok": False, "error": "rate_limited"}), 429
     payload = request.get_json(silent=True) or {}
     draft_id = payload.get("draft_id")
     draft = _draft_or_404(int(draft_id)) if draft_id else None
@@ -919,9 +906,8 @@ def get_upload_token():
 @login_required
 @require_feature_flag("FEATURE_EBAY_LISTING_CREATE_ENABLED")
 @require_plan_feature("create_listings")
+@require_rate_limit("upload", limit=20, window_seconds=60)
 def upload_image():
-    if not _rate_limit(f"upload:{current_user.id}", limit=20, window_seconds=60):
-        return jsonify({"ok": False, "error": "rate_limited"}), 429
 
     draft_id = request.form.get("draft_id")
     draft = _draft_or_404(int(draft_id)) if draft_id else None
@@ -981,6 +967,7 @@ def upload_image():
         "image_url": result.get("secure_url") or result.get("url"),
         "ebay_image_url": None,
         "ebay_image_location": None,
+        "ebay_upload_status": "pending",
         "is_main": len(images) == 0,
         "replaced_cloudinary": bool(is_replacement and existing_public_id),
     }
@@ -994,6 +981,7 @@ def upload_image():
         images.append(image_entry)
     draft.images_json = images
     db.session.commit()
+    _queue_draft_image_upload(draft)
 
     return jsonify({"ok": True, "draft": draft.to_dict(), "image": image_entry})
 
@@ -1020,6 +1008,7 @@ def confirm_upload():
     images.append(image_entry)
     draft.images_json = images
     db.session.commit()
+    _queue_draft_image_upload(draft)
     return jsonify({"ok": True, "draft": draft.to_dict()})
 
 
@@ -52,13 +52,27 @@ from ..models.inventory_source import (
     ThriftRadarSavedSearch,
 )
 from ..models.support import SupportTicket, SupportMessage, SupportAttachment
-from ..helpers.help_center import seed_help_articles, render_help_markdown
+from ..helpers.help_center import (
+    invalidate_recommended_articles,
+    pick_recommended_article,
+    render_help_markdown,
+    seed_help_articles,
+)
 from ..helpers import (
     get_or_create_settings, generate_sku, compose_location_code,
     parse_location_code, parse_values, human_from_code, qr_label_image
 )
 from ..helpers.ebay_relist import end_item_trading_api
+from ..helpers.thrift_radar_cache import cached_geocode, cached_places
+from ..helpers.render_cache import send_cached_render
 from . import main_bp
+from .permissions import require_rate_limit
+from ..helpers.admin_user_queries import (
+    USER_SORTS,
+    fetch_admin_user_page,
+    fetch_admin_user_summary,
+    invalidate_admin_user_summary,
+)
 from ..helpers.inventory_queries import (
     fetch_active_items,
     fetch_inactive_by_user_items,
@@ -77,7 +91,6 @@ from ..models.receipt_item import ReceiptItem
 from ..models.auto_relist_rule import AutoRelistRule, AutoRelistHistory
 from ..models.ebay_category import EbayCategory
 from ..models.profit_calculator_report import ProfitCalculatorReport
-from ..models.ebay_fee_rule import EbayFeeRule
 from ..models.retired_item import RetiredItem
 from ..models.ebay_feedback import EbayFeedback
 
@@ -940,7 +953,6 @@ def _reactivate_items_after_upgrade(user_id: int) -> int:
 @main_bp.route("/help")
 @login_required
 def help_center_index():
-    seed_help_articles()
     articles = HelpArticle.query.filter_by(is_published=True)\
         .order_by(HelpArticle.display_order.asc(), HelpArticle.title.asc())\
         .all()
@@ -950,7 +962,6 @@ def help_center_index():
 @main_bp.route("/help/<slug>")
 @login_required
 def help_center_article(slug):
-    seed_help_articles()
     article = HelpArticle.query.filter_by(slug=slug, is_published=True).first_or_404()
     rendered = render_help_markdown(article.body_md)
     articles = HelpArticle.query.filter_by(is_published=True)\
@@ -1305,6 +1316,10 @@ def _thrift_radar_headers():
 
 
 def _geocode_us_zip(zip_code: str):
+    return cached_geocode(f"nominatim postalcode {zip_code}", lambda _query: _fetch_us_zip_geocode(zip_code))
+
+
+def _fetch_us_zip_geocode(zip_code: str):
     response = requests.get(
         "https://nominatim.openstreetmap.org/search",
         params={
@@ -1653,12 +1668,12 @@ def _resolve_thrift_search_center(payload):
         city = (payload.get("city") or "").strip()
         if len(city) < 2:
             return None, "city", "Enter a U.S. city."
-        return _google_geocode_location(f"{city}, United States"), "city", None
+        return cached_geocode(f"{city}, United States", _google_geocode_location), "city", None
 
     zip_code = _validate_us_zip_code(payload.get("zip_code") or "")
     if not zip_code:
         return None, "zip", "Thrift Radar currently supports U.S. ZIP Codes only."
-    return _google_geocode_location(f"{zip_code}, United States"), "zip", None
+    return cached_geocode(f"{zip_code}, United States", _google_geocode_location), "zip", None
 
 
 def _search_thrift_radar_google(payload, keywords):
@@ -1670,14 +1685,32 @@ def _search_thrift_radar_google(payload, keywords):
         return None, [], search_mode, "Could not find that location in the U.S.", radius_meters, radius_miles
 
     keyword_options = _thrift_radar_keywords(active_only=True)
+    terms_by_slug = {
+        slug: keyword_options[slug].get("keywords") or [keyword_options[slug].get("label") or slug]
+        for slug in keywords
+        if keyword_options.get(slug)
+    }
+    app = current_app._get_current_object()
+
+    def fetch_term(term):
+        # Runs on a pool thread: the fetcher logs through current_app
+        with app.app_context():
+            return _google_fetch_places(center["lat"], center["lng"], term, radius_meters)
+
+    places_by_term = cached_places(
+        center["lat"],
+        center["lng"],
+        radius_meters,
+        [term for terms in terms_by_slug.values() for term in terms],
+        fetch_term,
+    )
+
     results = []
     seen = set()
-    for slug in keywords:
-        option = keyword_options.get(slug)
-        if not option:
-            continue
-        for term in option.get("keywords") or [option.get("label") or slug]:
-            for place in _google_fetch_places(center["lat"], center["lng"], term, radius_meters):
+    for slug, terms in terms_by_slug.items():
+        option = keyword_options[slug]
+        for term in terms:
+            for place in places_by_term.get(term) or []:
                 place_id = place.get("place_id")
                 if not place_id or place_id in seen:
                     continue
@@ -1724,6 +1757,7 @@ def thrift_radar_city_suggestions():
 
 @main_bp.route("/inventory-sources/thrift-radar/search", methods=["POST"])
 @login_required
+@require_rate_limit("thrift_radar_search", limit=10, window_seconds=60)
 def thrift_radar_search():
     _require_thrift_radar_access()
     started_at = time.monotonic()
@@ -2534,6 +2568,9 @@ def inventory_stream():
     Server-Sent Events stream for inventory updates
     DEPRECATED: Causes database "idle in transaction" issues
     Use /api/inventory/count with polling instead
+
+    Also emits {'type': 'job', 'job': {...}} events for the user's background
+    jobs, read from the Redis progress channel (no DB polling).
     """
     # IMPORTANT: Capture user_id AND app BEFORE entering the generator
     # current_user and current_app are only available in the request context
@@ -2543,6 +2580,28 @@ def inventory_stream():
     def generate(uid, flask_app):
         import json
         from sqlalchemy import text
+        from qventory.helpers.job_progress import read_active_job_states, read_job_state
+
+        job_states = {}
+
+        def job_events():
+            states = read_active_job_states(uid)
+            if states is None:
+                return
+            current = {state['id']: state for state in states}
+            # Jobs that left the active set: emit their final state once
+            for job_id in set(job_states) - set(current):
+                final = read_job_state(job_id, uid)
+                if final:
+                    current[job_id] = final
+            for job_id, state in current.items():
+                if job_states.get(job_id) != state:
+                    yield f"data: {json.dumps({'type': 'job', 'job': state})}\n\n"
+            job_states.clear()
+            job_states.update({
+                job_id: state for job_id, state in current.items()
+                if state.get('status') in ('pending', 'processing')
+            })
 
         # Use the captured Flask app to create context
         with flask_app.app_context():
@@ -2560,6 +2619,7 @@ def inventory_stream():
                 db.session.remove()  # Completely close session to avoid idle in transaction
 
             yield f"data: {json.dumps({'count': initial_count, 'type': 'initial'})}\n\n"
+            yield from job_events()
 
             # Keep connection alive and check for changes every 5 seconds
             last_count = initial_count
@@ -2580,12 +2640,14 @@ def inventory_stream():
                     finally:
                         db.session.remove()  # Completely close session to avoid idle in transaction
 
+                    job_updates = list(job_events())
                     if current_count != last_count:
                         yield f"data: {json.dumps({'count': current_count, 'type': 'update'})}\n\n"
                         last_count = current_count
-                    else:
+                    elif not job_updates:
                         # Send heartbeat to keep connection alive
                         yield f": heartbeat\n\n"
+                    yield from job_updates
 
                 except Exception as e:
                     flask_app.logger.error(f"SSE error: {str(e)}")
@@ -2704,10 +2766,7 @@ def dashboard():
     recently_sold = fetch_recently_sold_items(db.session, user_id=current_user.id, limit=5)
     recent_fulfillment = fetch_recent_fulfillment(db.session, user_id=current_user.id, limit=10)
     pending_tasks = fetch_pending_tasks(db.session, user_id=current_user.id)
-    seed_help_articles()
-    recommended_article = HelpArticle.query.filter_by(is_published=True)\
-        .order_by(func.random())\
-        .first()
+    recommended_article = pick_recommended_article()
 
     # Plan usage info
     plan_limits = current_user.get_plan_limits()
@@ -3344,6 +3403,7 @@ def feedback_respond():
 
 @main_bp.route("/feedback/ai-draft", methods=["POST"])
 @login_required
+@require_rate_limit("feedback_ai_draft", limit=20, window_seconds=60)
 def feedback_ai_draft():
     data = request.get_json() or {}
     feedback_id = data.get("feedback_id")
@@ -3949,14 +4009,24 @@ def debug_ebay_order():
 @main_bp.route("/fulfillment/sync-ebay-orders", methods=["POST"])
 @login_required
 def sync_ebay_orders():
-    """Sync orders from eBay Fulfillment API"""
-    from qventory.tasks import sync_ebay_fulfillment_tracking_user
+    """Sync orders from eBay Fulfillment API (BackgroundJob; poll /api/jobs/<job_id>)"""
+    from qventory.models.background_job import BackgroundJob
+    from qventory.tasks import start_background_job
 
     try:
-        task = sync_ebay_fulfillment_tracking_user.delay(current_user.id)
+        started = start_background_job(current_user.id, BackgroundJob.TYPE_EBAY_FULFILLMENT_SYNC)
+        if not started['success']:
+            return jsonify({
+                'success': False,
+                'error': started['error']
+            }), 429 if started['error_code'] == 'too_many_jobs' else 503
+
+        job = started['job']
         return jsonify({
             'success': True,
-            'task_id': str(task.id)
+            'job_id': job.id,
+            'task_id': job.celery_task_id,
+            'job': job.to_dict()
         })
 
     except Exception as e:
@@ -3971,7 +4041,7 @@ def sync_ebay_orders():
 @main_bp.route("/fulfillment/sync-ebay-orders/status/<task_id>", methods=["GET"])
 @login_required
 def sync_ebay_orders_status(task_id):
-    """Check status for fulfillment sync task."""
+    """Check status for fulfillment sync task (kept for older clients; use /api/jobs/<job_id>)."""
     from qventory.celery_app import celery
 
     result = celery.AsyncResult(task_id)
@@ -4517,11 +4587,11 @@ def import_ebay():
 @login_required
 def sync_ebay_inventory():
     """
-    Sync existing active inventory with eBay
-    Updates prices, status, and other details for items already in database
+    Sync existing active inventory with eBay (ASYNC via Celery)
+    Queues a BackgroundJob that updates prices, status, and other details for
+    items already in database; poll /api/jobs/<job_id> for progress
     """
     from qventory.models.marketplace_credential import MarketplaceCredential
-    from qventory.helpers.ebay_inventory import fetch_active_listings_snapshot
 
     # Check eBay connection
     ebay_cred = MarketplaceCredential.query.filter_by(
@@ -4571,128 +4641,41 @@ def sync_ebay_inventory():
                 }), 403
 
     try:
-        # Get all items with eBay listing IDs
-        items_query = Item.query.filter(
-            Item.user_id == current_user.id,
-            Item.ebay_listing_id.isnot(None),
-            Item.is_active.is_(True),
-            Item.inactive_by_user.is_(False)
-        )
+        from qventory.models.background_job import BackgroundJob
+        from qventory.tasks import start_background_job
 
-        # Limit sync to plan limits (only for non-god users)
+        item_limit = None
         if not current_user.is_god_mode and plan_limits.max_items is not None:
-            # Only sync up to the plan limit
-            items_to_sync = items_query.limit(plan_limits.max_items).all()
-        else:
-            items_to_sync = items_query.all()
-
-        if not items_to_sync:
-            return jsonify({
-                'success': True,
-                'message': 'No items with eBay listings to sync',
-                'updated': 0
-            })
-
-        print(f"[SYNC_INVENTORY] Found {len(items_to_sync)} items to sync", file=sys.stderr)
-
-        # Fetch current data from eBay (Offers + Trading snapshot)
-        result = fetch_active_listings_snapshot(current_user.id)
+            item_limit = plan_limits.max_items
 
-        if not result['success']:
+        started = start_background_job(
+            current_user.id,
+            BackgroundJob.TYPE_EBAY_INVENTORY_SYNC,
+            params={'item_limit': item_limit}
+        )
+        if not started['success']:
             return jsonify({
                 'success': False,
-                'error': result.get('error', 'Failed to fetch eBay data')
-            }), 400
-
-        offers_by_listing = {
-            offer.get('ebay_listing_id'): offer
-            for offer in result['offers']
-            if offer.get('ebay_listing_id')
-        }
-        can_mark_inactive = result.get('can_mark_inactive', False)
-        sources = ', '.join(result.get('sources', [])) or 'unknown'
-        print(f"[SYNC_INVENTORY] Sources: {sources} | offers: {len(result.get('offers', []))} | can_mark_inactive={can_mark_inactive}", file=sys.stderr)
-
-        # Update each item
-        updated_count = 0
-        deleted_count = 0
-        skipped_inactive = 0
-
-        for item in items_to_sync:
-            offer_data = None
-
-            if item.ebay_listing_id and item.ebay_listing_id in offers_by_listing:
-                offer_data = offers_by_listing[item.ebay_listing_id]
-
-            if offer_data:
-                # Item still exists on eBay - update it
-
-                # Update price if changed
-                if offer_data.get('item_price') and offer_data['item_price'] != item.item_price:
-                    item.item_price = offer_data['item_price']
-                    updated_count += 1
-
-                # Update eBay URL if needed
-                if offer_data.get('ebay_url') and not item.ebay_url:
-                    item.ebay_url = offer_data['ebay_url']
-
-                # Update offer ID if needed
-                if offer_data.get('ebay_offer_id'):
-                    item.ebay_offer_id = offer_data['ebay_offer_id']
-
-                # Backfill listing ID / SKU when missing locally
-                if not item.ebay_listing_id and offer_data.get('ebay_listing_id'):
-                    listing_id = str(offer_data['ebay_listing_id'])
-                    with db.session.no_autoflush:
-                        existing = Item.query.filter(
-                            Item.user_id == current_user.id,
-                            Item.ebay_listing_id == listing_id,
-                            Item.id != item.id
-                        ).first()
-                    if existing:
-                        print(
-                            f"[SYNC_INVENTORY] Skipping listing_id {listing_id} for item {item.id}: "
-                            f"already on item {existing.id}",
-                            file=sys.stderr
-                        )
-                    else:
-                        item.ebay_listing_id = listing_id
-                if not item.ebay_sku and offer_data.get('ebay_sku'):
-                    item.ebay_sku = offer_data['ebay_sku']
-
-                # Update listing status (reactivate if present and active)
-                listing_status = str(offer_data.get('listing_status', 'ACTIVE')).upper()
-                active_statuses = {'PUBLISHED', 'ACTIVE', 'IN_PROGRESS', 'SCHEDULED', 'ON_HOLD', 'LIVE'}
-                if listing_status in active_statuses or not listing_status:
-                    if not item.is_active:
-                        item.is_active = True
-            else:
-                if can_mark_inactive:
-                    # SOFT DELETE: Item no longer exists on eBay (sold/removed) - mark as inactive
-                    print(f"[SYNC_INVENTORY] Item no longer on eBay, marking inactive: {item.title} (ID: {item.id}, eBay: {item.ebay_listing_id})", file=sys.stderr)
-                    if item.is_active:
-                        item.is_active = False
-                        try:
-                            from qventory.helpers.link_bio import remove_featured_items_for_user
-                            remove_featured_items_for_user(current_user.id, [item.id])
-                        except Exception:
-                            pass
-                        deleted_count += 1
-                else:
-                    skipped_inactive += 1
+                'error': started['error']
+            }), 429 if started['error_code'] == 'too_many_jobs' else 503
 
-        db.session.commit()
+        job = started['job']
+        if started['existing']:
+            return jsonify({
+                'success': True,
+                'message': 'An inventory sync is already running.',
+                'job_id': job.id,
+                'job': job.to_dict()
+            }), 202
 
-        print(f"[SYNC_INVENTORY] Updated {updated_count} items, marked {deleted_count} items as inactive (skipped inactive: {skipped_inactive})", file=sys.stderr)
+        print(f"[SYNC_INVENTORY] Queued job {job.id} for user {current_user.id}", file=sys.stderr)
 
         return jsonify({
             'success': True,
-            'message': f'Synced {len(items_to_sync)} items: {updated_count} updated, {deleted_count} marked inactive (sold/inactive on eBay)',
-            'total': len(items_to_sync),
-            'updated': updated_count,
-            'deleted': deleted_count,
-            'inactive_skipped': skipped_inactive
-        })
+            'message': 'Inventory sync started. Prices and statuses will update in the background.',
+            'job_id': job.id,
+            'job': job.to_dict()
+        }), 202
 
     except Exception as e:
         db.session.rollback()
@@ -4768,6 +4751,57 @@ def import_job_status(job_id):
     return jsonify({"ok": True, "job": job.to_dict()})
 
 
+@main_bp.route("/api/jobs")
+@login_required
+def background_jobs_active():
+    """List the current user's in-flight background jobs (Redis first, DB fallback)"""
+    from qventory.helpers.job_progress import read_active_job_states
+    from qventory.models.background_job import BackgroundJob
+
+    states = read_active_job_states(current_user.id)
+    if states is None:
+        jobs = BackgroundJob.active_query(current_user.id).order_by(BackgroundJob.created_at.asc()).all()
+        states = [job.to_dict() for job in jobs]
+
+    return jsonify({"ok": True, "jobs": states})
+
+
+@main_bp.route("/api/jobs/<int:job_id>")
+@login_required
+def background_job_status(job_id):
+    """Get status/progress of a background job (Redis first, DB fallback)"""
+    from qventory.helpers.job_progress import read_job_state
+    from qventory.models.background_job import BackgroundJob
+
+    state = read_job_state(job_id, current_user.id)
+    if state is not None:
+        return jsonify({"ok": True, "job": state})
+
+    job = BackgroundJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+
+    if not job:
+        return jsonify({"ok": False, "error": "Job not found"}), 404
+
+    return jsonify({"ok": True, "job": job.to_dict()})
+
+
+@main_bp.route("/api/jobs/<int:job_id>/cancel", methods=["POST"])
+@login_required
+def background_job_cancel(job_id):
+    """Cancel a pending or running background job"""
+    from qventory.models.background_job import BackgroundJob
+    from qventory.tasks import request_background_job_cancel
+
+    job = BackgroundJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+
+    if not job:
+        return jsonify({"ok": False, "error": "Job not found"}), 404
+    if not request_background_job_cancel(job):
+        return jsonify({"ok": False, "error": f"Job already {job.status}", "job": job.to_dict()}), 409
+
+    return jsonify({"ok": True, "job": job.to_dict()})
+
+
 # Failed imports management
 @main_bp.route("/import/failed")
 @login_required
@@ -6234,7 +6268,7 @@ def bulk_assign_location():
 
         # Update items
         updated_count = 0
-        synced_count = 0
+        sync_item_ids = []
 
         for item in items:
             item.location_A = A
@@ -6246,21 +6280,24 @@ def bulk_assign_location():
 
             # Sync to eBay if requested and item has eBay listing
             if sync_to_ebay and item.ebay_listing_id and location_code:
-                from qventory.helpers.ebay_inventory import sync_location_to_ebay_sku
-                success = sync_location_to_ebay_sku(current_user.id, item.ebay_listing_id, location_code)
-                if success:
-                    synced_count += 1
+                sync_item_ids.append(item.id)
 
         db.session.commit()
 
         message = f"Successfully updated location for {updated_count} item(s)"
-        if sync_to_ebay and synced_count > 0:
-            message += f" and synced {synced_count} to eBay"
+        job = None
+        if sync_item_ids:
+            job = _queue_ebay_location_sync(sync_item_ids)
+            if job and job.is_active:
+                message += f". Syncing {len(sync_item_ids)} to eBay in the background"
+            else:
+                message += ", but the eBay sync could not be started"
 
         return jsonify({
             "ok": True,
             "updated_count": updated_count,
-            "synced_count": synced_count,
+            "queued_sync_count": len(sync_item_ids) if job and job.is_active else 0,
+            "job_id": job.id if job else None,
             "message": message
         })
 
@@ -7215,12 +7252,26 @@ def save_bulk_price_update_rules():
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
+def _queue_ebay_location_sync(item_ids):
+    """Create (or reuse) a BackgroundJob pushing location codes to eBay Custom SKU"""
+    from qventory.models.background_job import BackgroundJob
+    from qventory.tasks import start_background_job
+
+    started = start_background_job(
+        current_user.id,
+        BackgroundJob.TYPE_EBAY_LOCATION_SYNC,
+        params={'item_ids': sorted(set(item_ids))}
+    )
+    return started['job']
+
+
 @main_bp.route("/items/bulk_sync_to_ebay", methods=["POST"])
 @login_required
 def bulk_sync_to_ebay():
     """
-    Bulk sync items location to eBay Custom SKU
+    Bulk sync items location to eBay Custom SKU (ASYNC via Celery)
     Expects JSON: {"item_ids": [1, 2, 3, ...]}
+    Returns a job_id; poll /api/jobs/<job_id> for progress
     """
     try:
         data = request.get_json()
@@ -7231,26 +7282,28 @@ def bulk_sync_to_ebay():
         if len(item_ids) == 0:
             return jsonify({"ok": False, "error": "No items selected"}), 400
 
-        # Get items
-        items = Item.query.filter(
-            Item.id.in_(item_ids),
-            Item.user_id == current_user.id
-        ).all()
-
-        from qventory.helpers.ebay_inventory import sync_location_to_ebay_sku
+        syncable_ids = [
+            item_id for (item_id,) in Item.query.with_entities(Item.id).filter(
+                Item.id.in_(item_ids),
+                Item.user_id == current_user.id,
+                Item.ebay_listing_id.isnot(None),
+                Item.location_code.isnot(None),
+                Item.location_code != ''
+            ).all()
+        ]
+        if not syncable_ids:
+            return jsonify({"ok": False, "error": "None of the selected items have an eBay listing and location code"}), 400
 
-        synced_count = 0
-        for item in items:
-            if item.ebay_listing_id and item.location_code:
-                success = sync_location_to_ebay_sku(current_user.id, item.ebay_listing_id, item.location_code)
-                if success:
-                    synced_count += 1
+        job = _queue_ebay_location_sync(syncable_ids)
+        if not job or not job.is_active:
+            return jsonify({"ok": False, "error": "Could not start the eBay sync. Please try again in a minute."}), 503
 
         return jsonify({
             "ok": True,
-            "synced_count": synced_count,
-            "message": f"Successfully synced {synced_count} item(s)"
-        })
+            "queued_count": len(syncable_ids),
+            "job_id": job.id,
+            "message": f"Syncing {len(syncable_ids)} item(s) to eBay in the background"
+        }), 202
 
     except Exception as e:
         print(f"[BULK_SYNC] Error: {str(e)}", file=sys.stderr)
@@ -8386,13 +8439,7 @@ def qr_batch():
         flash("No codes generated. Please provide at least one value.", "error")
         return redirect(url_for("main.qr_batch"))
 
-    from ..helpers.utils import build_qr_batch_pdf
-    pdf_buf = build_qr_batch_pdf(
-        combos, s,
-        lambda code: url_for("main.public_view_location",
-                             username=current_user.username, code=code, _external=True)
-    )
-    return send_file(pdf_buf, mimetype="application/pdf", as_attachment=True, download_name="qr_labels.pdf")
+    return _send_qr_batch_pdf(combos, s)
 
 
 @main_bp.route("/qr/batch/print-selected", methods=["POST"])
@@ -8405,17 +8452,90 @@ def qr_batch_print_selected():
         flash("Select at least one location to print.", "error")
         return redirect(url_for("main.qr_batch"))
 
-    from ..helpers.utils import build_qr_batch_pdf
-    pdf_buf = build_qr_batch_pdf(
-        codes, s,
-        lambda code: url_for(
-            "main.public_view_location",
-            username=current_user.username,
-            code=code,
-            _external=True
-        )
+    return _send_qr_batch_pdf(codes, s)
+
+
+def _send_qr_batch_pdf(codes, settings):
+    """
+    Batch label PDF, rendered once per distinct (codes, links) set.
+
+    Selections over QR_BATCH_SYNC_LIMIT that are not cached yet are rendered by
+    a background job; the user gets a notification with the download link.
+    """
+    from ..helpers.render_cache import cached_render_path, render_key
+    from ..helpers.utils import QR_BATCH_SYNC_LIMIT, build_qr_batch_pdf
+
+    links = {
+        code: url_for("main.public_view_location", username=current_user.username, code=code, _external=True)
+        for code in codes
+    }
+    pairs = [[code, links[code]] for code in codes]
+
+    if len(pairs) > QR_BATCH_SYNC_LIMIT and not cached_render_path(render_key("qr_batch_pdf", pairs), ".pdf"):
+        from qventory.models.background_job import BackgroundJob
+        from qventory.tasks import start_background_job
+
+        started = start_background_job(current_user.id, BackgroundJob.TYPE_QR_BATCH_PDF, params={"labels": pairs})
+        if not started["success"]:
+            flash(started["error"], "error")
+        else:
+            flash(
+                f"Building {len(pairs)} labels in the background. "
+                "You'll get a notification with the download link when the PDF is ready.",
+                "info",
+            )
+        return redirect(url_for("main.qr_batch"))
+
+    return send_cached_render(
+        "qr_batch_pdf",
+        [pairs],
+        lambda: build_qr_batch_pdf(codes, settings, links.get),
+        "application/pdf",
+        suffix=".pdf",
+        as_attachment=True,
+        download_name="qr_labels.pdf",
+    )
+
+
+@main_bp.route("/qr/batch/jobs/<int:job_id>/download")
+@login_required
+def qr_batch_job_download(job_id):
+    """Download the PDF built by a QR batch job (rebuilt in the background if the cache was pruned)."""
+    from qventory.models.background_job import BackgroundJob
+    from qventory.tasks import start_background_job
+    from ..helpers.render_cache import cached_render_path, render_key
+
+    job = BackgroundJob.query.filter_by(
+        id=job_id, user_id=current_user.id, job_type=BackgroundJob.TYPE_QR_BATCH_PDF
+    ).first_or_404()
+    if job.status != "completed":
+        flash("Those labels are not ready yet." if job.is_active else f"That label job {job.status}.", "info")
+        return redirect(url_for("main.qr_batch"))
+
+    pairs = [[code, link] for code, link in (job.params or {}).get("labels") or []]
+    path = cached_render_path(render_key("qr_batch_pdf", pairs), ".pdf")
+    if not path:
+        # Large batches are never rendered in the request; rebuild in a worker
+        started = start_background_job(current_user.id, BackgroundJob.TYPE_QR_BATCH_PDF, params={"labels": pairs})
+        if not started["success"]:
+            flash(started["error"], "error")
+        else:
+            flash(
+                "That PDF has expired, so it's being rebuilt in the background. "
+                "You'll get a notification with the new download link.",
+                "info",
+            )
+        return redirect(url_for("main.qr_batch"))
+
+    return send_cached_render(
+        "qr_batch_pdf",
+        [pairs],
+        lambda: open(path, "rb"),
+        "application/pdf",
+        suffix=".pdf",
+        as_attachment=True,
+        download_name="qr_labels.pdf",
     )
-    return send_file(pdf_buf, mimetype="application/pdf", as_attachment=True, download_name="qr_labels.pdf")
 
 
 @main_bp.route("/qr/location/print/<code>")
@@ -8428,10 +8548,12 @@ def qr_location_print(code):
         code=code,
         _external=True
     )
-    pdf_bytes = _build_location_label_pdf(code, link)
-    return send_file(
-        io.BytesIO(pdf_bytes),
-        mimetype="application/pdf",
+    return send_cached_render(
+        "location_label_pdf",
+        [code, link],
+        lambda: _build_location_label_pdf(code, link),
+        "application/pdf",
+        suffix=".pdf",
         as_attachment=False,
         download_name=f"qr_{code}.pdf"
     )
@@ -8503,11 +8625,13 @@ def qr_for_location(username, code):
     human = " • ".join(segments) if segments else "Location"
 
     link = url_for("main.public_view_location", username=username, code=code, _external=True)
-    img = qr_label_image(code, human, link, qr_px=300)
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return send_file(buf, mimetype="image/png")
+
+    def render_png():
+        buf = io.BytesIO()
+        qr_label_image(code, human, link, qr_px=300).save(buf, format="PNG")
+        return buf.getvalue()
+
+    return send_cached_render("location_qr_png", [code, human, link, 300], render_png, "image/png", suffix=".png")
 
 # ---------------------- eBay Deletion Auth ----------------------
 
@@ -8806,10 +8930,12 @@ def print_item(item_id):
 def print_item_pdf(item_id):
     it = Item.query.filter_by(id=item_id, user_id=current_user.id).first_or_404()
     s = get_or_create_settings(current_user)
-    pdf_bytes = _build_item_label_pdf(it, s)
-    return send_file(
-        io.BytesIO(pdf_bytes),
-        mimetype="application/pdf",
+    return send_cached_render(
+        "item_label_pdf",
+        [it.sku or "", it.title or ""],
+        lambda: _build_item_label_pdf(it, s),
+        "application/pdf",
+        suffix=".pdf",
         as_attachment=False,
         download_name=f"label_{it.sku}.pdf",
     )
@@ -8916,6 +9042,7 @@ def admin_help_center_new():
         )
         db.session.add(article)
         db.session.commit()
+        invalidate_recommended_articles()
         flash("Help article created.", "ok")
         return redirect(url_for("main.admin_help_center_edit", article_id=article.id))
 
@@ -8958,6 +9085,7 @@ def admin_help_center_edit(article_id):
         article.display_order = display_order
         article.is_published = is_published
         db.session.commit()
+        invalidate_recommended_articles()
 
         flash("Help article updated.", "ok")
         return redirect(url_for("main.admin_help_center_edit", article_id=article.id))
@@ -9324,94 +9452,20 @@ def admin_inventory_sources_upload_image():
         return jsonify({"ok": False, "error": str(e)}), 502
 
 
-def _admin_user_stats():
-    """Build admin user rows without triggering per-user subscription queries."""
-    from qventory.models.marketplace_credential import MarketplaceCredential
-
-    users = User.query.all()
-    user_ids = [user.id for user in users]
-
-    subscriptions = (
-        Subscription.query.filter(Subscription.user_id.in_(user_ids)).all()
-        if user_ids
-        else []
-    )
-    subscription_map = {sub.user_id: sub for sub in subscriptions}
-
-    item_count_map = {}
-    missing_cost_count_map = {}
-    if user_ids:
-        item_filters = (
-            Item.user_id.in_(user_ids),
-            Item.is_active.is_(True),
-            Item.inactive_by_user.is_(False),
-        )
-        item_count_map = {
-            user_id: count
-            for user_id, count in (
-                db.session.query(Item.user_id, func.count(Item.id))
-                .filter(*item_filters)
-                .group_by(Item.user_id)
-                .all()
-            )
-        }
-        missing_cost_count_map = {
-            user_id: count
-            for user_id, count in (
-                db.session.query(Item.user_id, func.count(Item.id))
-                .filter(*item_filters, Item.item_cost.is_(None))
-                .group_by(Item.user_id)
-                .all()
-            )
-        }
-
-    ebay_connected_ids = set()
-    if user_ids:
-        ebay_connected_ids = {
-            cred.user_id
-            for cred in MarketplaceCredential.query.filter(
-                MarketplaceCredential.user_id.in_(user_ids),
-                MarketplaceCredential.marketplace == "ebay",
-                MarketplaceCredential.is_active.is_(True),
-            ).all()
-        }
-
-    user_stats = []
-    for user in users:
-        item_count = item_count_map.get(user.id, 0)
-        missing_cost_count = missing_cost_count_map.get(user.id, 0)
-        subscription = subscription_map.get(user.id)
-        subscription_plan = (subscription.plan if subscription else "free")
-        subscription_status = (subscription.status if subscription else "active")
-        user_stats.append({
-            'user': user,
-            'item_count': item_count,
-            'missing_cost_count': missing_cost_count,
-            'has_inventory': item_count > 0,
-            'subscription_plan': subscription_plan,
-            'subscription_status': subscription_status,
-            'connected_store': user.id in ebay_connected_ids
-        })
-
-    # Sort by item count descending
-    user_stats.sort(key=lambda x: x['item_count'], reverse=True)
-    return user_stats
-
-
 @main_bp.route("/admin/dashboard")
 @require_admin
 def admin_dashboard():
     """Admin dashboard - task controls and high-level account totals."""
     from qventory.models.system_setting import SystemSetting
 
-    user_stats = _admin_user_stats()
+    summary = fetch_admin_user_summary(db.session)
     heuristic_days = SystemSetting.get_int('delivery_heuristic_days', 7)
     trial_days = SystemSetting.get_int('stripe_trial_days', 10)
     return render_template(
         "admin_dashboard.html",
-        total_users=len(user_stats),
-        users_with_inventory=sum(1 for stat in user_stats if stat["has_inventory"]),
-        total_items=sum(stat["item_count"] for stat in user_stats),
+        total_users=summary["total_users"],
+        users_with_inventory=summary["users_with_inventory"],
+        total_items=summary["total_items"],
         heuristic_days=heuristic_days,
         trial_days=trial_days
     )
@@ -9420,54 +9474,33 @@ def admin_dashboard():
 @main_bp.route("/admin/users")
 @require_admin
 def admin_users():
-    """Admin user list with quick segments."""
+    """Admin user list with quick segments (filtered, sorted and paginated in SQL)."""
     active_filter = (request.args.get("filter") or "all").strip().lower()
-    now = datetime.utcnow()
-    cutoff_30 = now - timedelta(days=30)
-    cutoff_7 = now - timedelta(days=7)
-    paid_plans = {"early_adopter", "premium", "plus", "pro", "enterprise", "god"}
-
-    all_user_stats = _admin_user_stats()
-    paid_count = sum(
-        1 for stat in all_user_stats
-        if stat["subscription_plan"] in paid_plans and stat["subscription_status"] == "active"
-    )
-    new_30_count = sum(
-        1 for stat in all_user_stats
-        if stat["user"].created_at and stat["user"].created_at >= cutoff_30
-    )
-    new_7_count = sum(
-        1 for stat in all_user_stats
-        if stat["user"].created_at and stat["user"].created_at >= cutoff_7
-    )
+    search = (request.args.get("q") or "").strip()
+    sort = (request.args.get("sort") or "items").strip().lower()
 
-    if active_filter == "paid":
-        user_stats = [
-            stat for stat in all_user_stats
-            if stat["subscription_plan"] in paid_plans and stat["subscription_status"] == "active"
-        ]
-    elif active_filter == "new30":
-        user_stats = [
-            stat for stat in all_user_stats
-            if stat["user"].created_at and stat["user"].created_at >= cutoff_30
-        ]
-    elif active_filter == "new7":
-        user_stats = [
-            stat for stat in all_user_stats
-            if stat["user"].created_at and stat["user"].created_at >= cutoff_7
-        ]
-    else:
-        active_filter = "all"
-        user_stats = all_user_stats
+    page = fetch_admin_user_page(
+        db.session,
+        filter_key=active_filter,
+        search=search,
+        sort=sort,
+        cursor=request.args.get("after"),
+    )
+    summary = fetch_admin_user_summary(db.session)
 
     return render_template(
         "admin_users.html",
-        user_stats=user_stats,
-        total_users=len(all_user_stats),
-        paid_count=paid_count,
-        new_30_count=new_30_count,
-        new_7_count=new_7_count,
-        active_filter=active_filter,
+        user_stats=page.rows,
+        next_cursor=page.next_cursor,
+        is_first_page=not request.args.get("after"),
+        search=search,
+        sort=page.sort,
+        sort_options=USER_SORTS,
+        total_users=summary["total_users"],
+        paid_count=summary["paid_count"],
+        new_30_count=summary["new_30_count"],
+        new_7_count=summary["new_7_count"],
+        active_filter=page.filter_key,
     )
 
 
@@ -9691,6 +9724,7 @@ def admin_delete_user(user_id):
     try:
         _delete_user_data(user_id)
         db.session.commit()
+        invalidate_admin_user_summary()
 
         flash(f"User '{username}' and all their data deleted successfully", "ok")
     except Exception as e:
@@ -9735,6 +9769,7 @@ def admin_bulk_delete_users():
             if user_id in existing_ids:
                 _delete_user_data(user_id)
         db.session.commit()
+        invalidate_admin_user_summary()
 
         details = f" Deleted: {', '.join(usernames[:8])}"
         if len(usernames) > 8:
@@ -9782,6 +9817,7 @@ def admin_create_user():
         )
         db.session.add(new_user)
         db.session.commit()
+        invalidate_admin_user_summary()
 
         flash(f"User '{username}' created successfully", "ok")
         return redirect(url_for('main.admin_dashboard'))
@@ -10534,11 +10570,8 @@ def api_ebay_fee_estimate():
     except ValueError:
         return jsonify({"ok": False, "error": "Invalid price inputs"}), 400
 
-    rule = None
-    if category_id:
-        rule = EbayFeeRule.query.filter_by(category_id=category_id).first()
-    if not rule:
-        rule = EbayFeeRule.query.filter_by(category_id=None).first()
+    from ..helpers.ebay_fees import resolve_fee_rule
+    rule = resolve_fee_rule(category_id)
     if rule:
         rate = rule.resolve_rate(has_store=has_store, top_rated=top_rated)
         response = {"ok": True, "fee_rate_percent": rate}
@@ -10589,6 +10622,7 @@ def api_profit_calculator_calc():
     if marketplace == "ebay":
         from ..helpers.ebay_fees import estimate_ebay_fees
         from ..helpers.ebay_fee_live import get_live_fee_estimate
+        from ..helpers.profit_batch import format_ebay_profit_report
         has_store = bool(payload.get("has_store"))
         top_rated = bool(payload.get("top_rated"))
         include_fixed_fee = bool(payload.get("include_fixed_fee"))
@@ -10631,25 +10665,18 @@ def api_profit_calculator_calc():
         denom = 1 - ((fee_breakdown["fee_rate_percent"] + ads_fee_rate) / 100)
         breakeven = ((buy_price + shipping_cost + fee_breakdown.get("fixed_fee", 0)) / denom) if denom > 0 else 0
 
-        fee_lines = []
-        for fee in fee_breakdown.get("fees", [])[:6]:
-            fee_lines.append(f"- {fee['name']}: ${fee['amount']:.2f}")
-        fee_block = "\n".join(fee_lines) if fee_lines else "Fees calculated from eBay fee rules."
-
-        output_text = "\n".join([
-            f"🧾 Item: {item_name or 'Unnamed'}",
-            f"🏪 Marketplace: eBay",
-            f"📁 Category: {category_path or 'Unselected'}",
-            f"💰 Profit: ${profit:.2f}",
-            f"🔄 ROI: {roi:.2f}%",
-            f"📊 Markup: {markup:.2f}%",
-            f"📦 Net Sale: ${net_sale:.2f}",
-            f"💸 eBay Fees (estimated): ${fee_breakdown['marketplace_fee']:.2f}",
-            f"📣 Ads Fee ({ads_fee_rate:.2f}%): ${fee_breakdown['ads_fee']:.2f}",
-            f"🚚 Shipping Cost: ${shipping_cost:.2f}",
-            f"🧮 Break-even Price: ${breakeven:.2f}",
-            f"📚 Fee Breakdown:\n{fee_block}",
-        ])
+        output_text = format_ebay_profit_report(
+            item_name,
+            category_path,
+            fee_breakdown,
+            profit=profit,
+            roi=roi,
+            markup=markup,
+            net_sale=net_sale,
+            ads_fee_rate=ads_fee_rate,
+            shipping_cost=shipping_cost,
+            breakeven=breakeven,
+        )
     else:
         return jsonify({"ok": False, "error": "Unsupported marketplace for API calc."}), 400
 
@@ -10686,6 +10713,100 @@ def api_profit_calculator_calc():
     })
 
 
+@main_bp.route("/api/profit-calculator/batch", methods=["POST"])
+@login_required
+def api_profit_calculator_batch():
+    """
+    Price many candidate items at once from cached eBay fee rules.
+
+    Body: {"items": [{buy_price, resale_price, shipping_cost?, category_id?,
+    category_path?, item_name?}, ...], has_store?, top_rated?,
+    include_fixed_fee?, ads_fee_rate?, persist?}
+    """
+    from ..helpers.profit_batch import (
+        MAX_BATCH_ROWS,
+        calculate_ebay_profit_batch,
+        format_ebay_profit_report,
+        summarize_profit_batch,
+    )
+
+    payload = request.get_json(silent=True) or {}
+    marketplace = (payload.get("marketplace") or "ebay").strip().lower()
+    if marketplace != "ebay":
+        return jsonify({"ok": False, "error": "Unsupported marketplace for API calc."}), 400
+
+    rows = payload.get("items")
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"ok": False, "error": "Provide a non-empty items list."}), 400
+    if len(rows) > MAX_BATCH_ROWS:
+        return jsonify({"ok": False, "error": f"At most {MAX_BATCH_ROWS} items per batch."}), 400
+
+    has_store = bool(payload.get("has_store"))
+    top_rated = bool(payload.get("top_rated"))
+    include_fixed_fee = bool(payload.get("include_fixed_fee"))
+    try:
+        ads_fee_rate = float(payload.get("ads_fee_rate") or 0)
+    except (TypeError, ValueError):
+        return jsonify({"ok": False, "error": "Invalid ads fee rate."}), 400
+
+    results, errors = calculate_ebay_profit_batch(
+        rows,
+        has_store=has_store,
+        top_rated=top_rated,
+        include_fixed_fee=include_fixed_fee,
+        ads_fee_rate=ads_fee_rate,
+    )
+
+    if payload.get("persist") and results:
+        reports = []
+        for result in results:
+            output_text = format_ebay_profit_report(
+                result["item_name"],
+                result["category_path"],
+                result["fee_breakdown"],
+                profit=result["profit"],
+                roi=result["roi"],
+                markup=result["markup"],
+                net_sale=result["net_sale"],
+                ads_fee_rate=ads_fee_rate,
+                shipping_cost=result["shipping_cost"],
+                breakeven=result["breakeven"],
+            )
+            reports.append(ProfitCalculatorReport(
+                user_id=current_user.id,
+                marketplace=marketplace,
+                item_name=result["item_name"],
+                category_id=result["category_id"],
+                category_path=result["category_path"],
+                buy_price=result["buy_price"],
+                resale_price=result["resale_price"],
+                shipping_cost=result["shipping_cost"],
+                has_store=has_store,
+                top_rated=top_rated,
+                include_fixed_fee=include_fixed_fee,
+                ads_fee_rate=ads_fee_rate,
+                fee_breakdown=result["fee_breakdown"],
+                total_fees=result["total_fees"],
+                net_sale=result["net_sale"],
+                profit=result["profit"],
+                roi=result["roi"],
+                markup=result["markup"],
+                breakeven=result["breakeven"],
+                output_text=output_text,
+            ))
+        db.session.add_all(reports)
+        db.session.commit()
+        for result, report in zip(results, reports):
+            result["report_id"] = report.id
+
+    return jsonify({
+        "ok": True,
+        "results": results,
+        "errors": errors,
+        "summary": summarize_profit_batch(results),
+    })
+
+
 @main_bp.route("/api/profit-calculator/reports")
 @login_required
 def api_profit_calculator_reports():
@@ -10881,6 +11002,7 @@ def ai_research():
 
 @main_bp.route("/api/ai-research", methods=["POST"])
 @login_required
+@require_rate_limit("ai_research", limit=10, window_seconds=60)
 def api_ai_research():
     """
     AI-powered eBay market research using OpenAI API
@@ -11111,6 +11233,118 @@ CRITICAL RULES:
 
 # ==================== NOTIFICATIONS API ====================
 
+def _user_status_snapshot(user_id):
+    """Badge counts and job states shown in the page header"""
+    from qventory.helpers.job_progress import read_active_job_states
+    from qventory.models.background_job import BackgroundJob
+    from qventory.models.import_job import ImportJob
+    from qventory.models.notification import Notification
+    from qventory.models.report import Report
+
+    unread = Notification.query.filter_by(user_id=user_id, is_read=False)
+    notifications = unread.order_by(Notification.created_at.desc()).limit(10).all()
+    unread_count = unread.count()
+    pickup_unread_count = unread.filter(Notification.source == "pickup").count()
+
+    import_job = ImportJob.query.filter_by(user_id=user_id).filter(
+        ImportJob.status.in_(['pending', 'processing'])
+    ).order_by(ImportJob.created_at.desc()).first()
+    recent_import = None
+    if not import_job:
+        recent_import = ImportJob.query.filter_by(user_id=user_id).filter(
+            ImportJob.status == 'completed',
+            ImportJob.completed_at >= datetime.utcnow() - timedelta(seconds=30)
+        ).order_by(ImportJob.completed_at.desc()).first()
+
+    jobs = read_active_job_states(user_id)
+    if jobs is None:
+        jobs = [
+            job.to_dict()
+            for job in BackgroundJob.active_query(user_id).order_by(BackgroundJob.created_at.asc()).all()
+        ]
+
+    return {
+        "notifications": [n.to_dict() for n in notifications],
+        "unread_count": unread_count,
+        "pickup_unread_count": pickup_unread_count,
+        "reports_unread_count": Report.get_unread_count(user_id),
+        "import": {
+            "has_active": import_job is not None,
+            "job": import_job.to_dict() if import_job else None,
+            "recent_completion": recent_import.to_dict() if recent_import else None,
+        },
+        "jobs": jobs,
+    }
+
+
+@main_bp.route("/api/status")
+@login_required
+def user_status():
+    """
+    Consolidated header status: notifications, badge counts, import and
+    background jobs in one response.
+
+    Clients pass back the last version they saw (?since= or If-None-Match)
+    and get 304 until it changes; with ?wait=N the request is held up to
+    STATUS_LONG_POLL_SECONDS waiting for a change. X-Status-Poll-After tells
+    the client how long to wait before the next request.
+    """
+    from qventory.helpers.user_status import (
+        STATUS_LONG_POLL_SECONDS, STATUS_POLL_INTERVAL,
+        current_status_version, wait_for_status_change,
+    )
+
+    user_id = current_user.id
+    since = request.args.get("since") or None
+    try:
+        wait = max(0, min(int(request.args.get("wait", 0)), STATUS_LONG_POLL_SECONDS))
+    except (TypeError, ValueError):
+        wait = 0
+
+    def unchanged(version):
+        return version is not None and (
+            since == version or request.if_none_match.contains_weak(version)
+        )
+
+    def not_modified(version, poll_after):
+        response = make_response("", 304)
+        response.set_etag(version, weak=True)
+        response.headers["X-Status-Poll-After"] = str(poll_after)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    poll_after = 0 if STATUS_LONG_POLL_SECONDS else STATUS_POLL_INTERVAL
+    version = current_status_version(user_id)
+    if unchanged(version):
+        if not wait:
+            return not_modified(version, poll_after)
+        # Don't hold a pooled connection (or an open transaction) while waiting
+        db.session.close()
+        version = wait_for_status_change(user_id, version, wait)
+        if unchanged(version):
+            return not_modified(version, poll_after)
+
+    try:
+        snapshot = _user_status_snapshot(user_id)
+    except Exception as e:
+        print(f"[STATUS] snapshot error: {e}", file=sys.stderr)
+        return jsonify({"ok": False, "error": "status_unavailable"}), 500
+
+    if version is None:
+        # Redis is down: version the payload itself and fall back to short polls
+        poll_after = STATUS_POLL_INTERVAL
+        digest = json.dumps(snapshot, sort_keys=True, default=str).encode("utf-8")
+        version = "h" + hashlib.sha1(digest).hexdigest()[:16]
+        if unchanged(version):
+            return not_modified(version, poll_after)
+
+    response = jsonify({"ok": True, "version": version, **snapshot})
+    response.set_etag(version, weak=True)
+    response.headers["X-Status-Poll-After"] = str(poll_after)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @main_bp.route("/api/notifications/unread")
 @login_required
 def get_unread_notifications():
@@ -2,6 +2,8 @@ from functools import wraps
 from flask import current_app, jsonify, request, Response
 from flask_login import current_user
 
+from qventory.helpers.rate_limiter import check_rate_limit, rate_limit_headers
+
 
 def require_role(role_name: str):
     """Require a specific role (case-insensitive). Returns 403 JSON or plain response."""
@@ -68,3 +70,42 @@ def require_plan_feature(feature_name: str):
         return wrapper
 
     return decorator
+
+
+def require_rate_limit(scope: str, limit: int, window_seconds: int):
+    """
+    Per-user rate limit shared by all workers (Redis sliding window).
+
+    Returns 429 JSON with Retry-After / X-RateLimit-* headers when exceeded.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            limited = rate_limited_response(scope, limit, window_seconds)
+            if limited is not None:
+                return limited
+            return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def rate_limited_response(scope: str, limit: int, window_seconds: int):
+    """
+    Spend one call of the per-user limit; the 429 response when exceeded, else None.
+
+    For views that must answer some requests (e.g. "try again shortly") without
+    spending a call; everything else uses @require_rate_limit.
+    """
+    if current_user.is_authenticated:
+        identity = current_user.id
+    else:
+        identity = f"ip:{request.remote_addr or 'unknown'}"
+    result = check_rate_limit(f"{scope}:{identity}", limit, window_seconds)
+    if result.allowed:
+        return None
+    response = jsonify({"ok": False, "error": "rate_limited", "retry_after": result.retry_after})
+    response.status_code = 429
+    response.headers.update(rate_limit_headers(result))
+    return response
@@ -3,6 +3,7 @@ Receipts blueprint for receipt upload, OCR processing, and item association.
 
 Routes:
 - GET/POST /receipts/upload - Upload new receipt
+- POST /receipts/upload-batch - Upload many receipts at once (JSON)
 - GET /receipts - List all receipts (history)
 - GET /receipts/<id> - View receipt details and associate items
 - POST /receipts/<id>/associate - Associate receipt item with inventory/expense
@@ -12,6 +13,7 @@ Routes:
 - POST /receipts/<id>/discard - Mark receipt as discarded
 - DELETE /receipts/<id> - Delete receipt
 - GET /api/receipts/<id>/items - Get receipt items as JSON
+- GET /api/receipts/<id>/status - Get OCR processing status as JSON (polled by the UI)
 """
 import logging
 from datetime import datetime
@@ -27,7 +29,6 @@ from qventory.models.receipt_usage import ReceiptUsage
 from qventory.models.item import Item
 from qventory.models.expense import Expense
 from qventory.helpers.receipt_image_processor import ReceiptImageProcessor
-from qventory.helpers.ocr_service import get_ocr_service
 
 logger = logging.getLogger(__name__)
 
@@ -37,16 +38,18 @@ receipts_bp = Blueprint('receipts', __name__, url_prefix='/receipts')
 @receipts_bp.route('/upload', methods=['GET', 'POST'])
 @login_required
 def upload():
-    """Upload new receipt and trigger OCR processing."""
+    """Upload new receipt and queue OCR processing in the background."""
     if request.method == 'GET':
         # Get user's OCR usage stats
         plan_limits = current_user.get_plan_limits()
         subscription = current_user.get_subscription()
 
-        can_process, limit_message, used, limit = ReceiptUsage.can_process_receipt(current_user, plan_limits)
+        granted, limit_message, used, limit = ReceiptUsage.reserve_ocr_slots(
+            current_user, plan_limits, 1, lock=False
+        )
 
         usage_stats = {
-            'can_process': can_process,
+            'can_process': granted > 0,
             'message': limit_message,
             'used': used,
             'limit': limit,
@@ -84,125 +87,57 @@ def upload():
             logger.error("Cloudinary not configured - missing environment variables")
             return redirect(request.url)
 
-        # Create receipt record first (without image)
-        receipt = Receipt(
-            user_id=current_user.id,
-            image_url='',  # Will update after upload
-            image_public_id='',
-            original_filename=secure_filename(file.filename),
-            file_size=0,
-            status='pending'
-        )
-        db.session.add(receipt)
-        db.session.flush()  # Get receipt.id
+        file.seek(0, 2)
+        file_size = file.tell()
+        file.seek(0)
 
-        # Upload to Cloudinary
-        upload_result = processor.upload_receipt(file, receipt_id=receipt.id)
+        # Upload before opening the transaction so the quota lock is held briefly
+        upload_result = processor.upload_receipt(file)
 
         if not upload_result['success']:
-            db.session.rollback()
             flash(f"Upload failed: {upload_result['error']}", 'error')
             logger.error(f"Cloudinary upload failed: {upload_result['error']}")
             return redirect(request.url)
 
-        # Update receipt with image info
-        receipt.image_url = upload_result['url']
-        receipt.thumbnail_url = upload_result['thumbnail_url']
-        receipt.image_public_id = upload_result['public_id']
-
-        # Get file size (file might have been read, so reset first)
+        # Reserve the OCR slot and create the receipt in one transaction, so
+        # concurrent uploads (and queued OCR jobs) cannot exceed the plan quota
+        plan_limits = current_user.get_plan_limits()
         try:
-            file.seek(0, 2)  # Seek to end
-            receipt.file_size = file.tell()
-            file.seek(0)  # Reset to beginning
+            granted, limit_message, used, limit = ReceiptUsage.reserve_ocr_slots(current_user, plan_limits, 1)
+            receipt = Receipt(
+                user_id=current_user.id,
+                image_url=upload_result['url'],
+                thumbnail_url=upload_result['thumbnail_url'],
+                image_public_id=upload_result['public_id'],
+                original_filename=secure_filename(file.filename),
+                file_size=file_size,
+                status='pending',
+                ocr_error_message=None if granted else limit_message
+            )
+            db.session.add(receipt)
+            db.session.commit()
         except Exception:
-            # If seek fails, file size is not critical
-            receipt.file_size = 0
-
-        db.session.commit()
+            db.session.rollback()
+            processor.delete_receipt(upload_result['public_id'])
+            raise
         logger.info(f"Receipt {receipt.id} uploaded by user {current_user.id}")
 
-        # Check plan limits before processing OCR
-        subscription = current_user.get_subscription()
-        plan_limits = current_user.get_plan_limits()
-
-        # Check if user can process receipt with AI OCR
-        can_process, limit_message, used, limit = ReceiptUsage.can_process_receipt(current_user, plan_limits)
-
-        if not can_process:
-            # User hit their limit - save receipt without OCR processing
-            receipt.status = 'pending'
-            receipt.ocr_error_message = limit_message
-            db.session.commit()
+        if not granted:
+            # User hit their limit - receipt is saved without OCR processing
             flash(f'Receipt uploaded but OCR limit reached: {limit_message}. Upgrade your plan for more AI OCR processing.', 'warning')
             logger.warning(f"User {current_user.id} hit OCR limit: {limit_message}")
             return redirect(url_for('receipts.view_receipt', receipt_id=receipt.id))
 
-        # Trigger OCR processing
-        try:
-            receipt.status = 'processing'
-            db.session.commit()
-
-            # Process OCR
-            ocr_service = get_ocr_service()
-            logger.info(f"Starting OCR processing for receipt {receipt.id} with provider: {ocr_service.provider}")
-            ocr_result = ocr_service.extract_receipt_data(receipt.image_url)
-
-            # Update receipt with OCR results
-            receipt.ocr_provider = ocr_service.provider
-            receipt.ocr_raw_text = ocr_result.raw_text
-            receipt.ocr_confidence = ocr_result.confidence
-            receipt.ocr_processed_at = datetime.utcnow()
-
-            if ocr_result.error:
-                receipt.status = 'failed'
-                receipt.ocr_error_message = ocr_result.error
-                logger.error(f"OCR failed for receipt {receipt.id}: {ocr_result.error}")
-                flash(f'OCR processing failed: {ocr_result.error}', 'warning')
-            else:
-                receipt.status = 'extracted'
-                receipt.merchant_name = ocr_result.merchant_name
-                receipt.receipt_date = ocr_result.receipt_date
-                receipt.receipt_number = ocr_result.receipt_number
-                receipt.subtotal = ocr_result.subtotal
-                receipt.tax_amount = ocr_result.tax_amount
-                receipt.total_amount = ocr_result.total_amount
-
-                logger.info(f"OCR extracted {len(ocr_result.line_items)} items from receipt {receipt.id}")
-
-                # Create receipt items
-                for item_data in ocr_result.line_items:
-                    receipt_item = ReceiptItem(
-                        receipt_id=receipt.id,
-                        line_number=item_data.get('line_number'),
-                        description=item_data.get('description'),
-                        quantity=item_data.get('quantity'),
-                        unit_price=item_data.get('unit_price'),
-                        total_price=item_data.get('total_price'),
-                        ocr_confidence=item_data.get('confidence')
-                    )
-                    db.session.add(receipt_item)
-                    logger.debug(f"Added receipt item: {receipt_item.description}")
-
-                # Record OCR usage
-                ReceiptUsage.record_usage(
-                    user_id=current_user.id,
-                    receipt_id=receipt.id,
-                    plan=subscription.plan,
-                    provider=ocr_service.provider
-                )
-
-                flash(f'Receipt uploaded successfully! Extracted {len(ocr_result.line_items)} items. ({used + 1}/{limit or "unlimited"} AI OCR used this {"day" if plan_limits.max_receipt_ocr_per_day else "month"}).', 'success')
-                logger.info(f"Receipt {receipt.id} processing completed successfully")
-
-            db.session.commit()
-
-        except Exception as e:
-            logger.exception(f"OCR processing failed for receipt {receipt.id}: {e}")
+        # Hand OCR off to the receipts worker queue; the review page polls status
+        from qventory.tasks import queue_receipt_ocr
+        if queue_receipt_ocr(receipt):
+            flash('Receipt uploaded! AI is extracting items now.', 'success')
+        else:
+            # Setting an error releases the reserved slot
             receipt.status = 'failed'
-            receipt.ocr_error_message = str(e)
+            receipt.ocr_error_message = 'Could not queue OCR processing'
             db.session.commit()
-            flash('Receipt uploaded but OCR processing failed. You can retry later.', 'warning')
+            flash('Receipt uploaded but OCR processing could not be started. You can retry later.', 'warning')
 
         # Redirect to review page
         return redirect(url_for('receipts.view_receipt', receipt_id=receipt.id))
@@ -214,6 +149,133 @@ def upload():
         return redirect(request.url)
 
 
+@receipts_bp.route('/upload-batch', methods=['POST'])
+@login_required
+def upload_batch():
+    """
+    Upload many receipts at once (e.g. a whole thrift haul).
+
+    Files are validated, uploaded to Cloudinary concurrently, saved as Receipt
+    rows in one transaction and queued for OCR in bulk. The OCR quota is
+    reserved for the whole batch up front; receipts beyond the quota are saved
+    without OCR, like single uploads that hit the limit.
+    """
+    from qventory.helpers.receipt_image_processor import CLOUDINARY_ENABLED, MAX_BATCH_FILES
+    from qventory.tasks import queue_receipt_ocr_batch
+
+    files = [f for f in request.files.getlist('receipt_images') if f and f.filename]
+    if not files:
+        return jsonify({'success': False, 'error': 'No files uploaded'}), 400
+
+    if len(files) > MAX_BATCH_FILES:
+        return jsonify({
+            'success': False,
+            'error': f'Too many files. Maximum {MAX_BATCH_FILES} receipts per batch.'
+        }), 400
+
+    if not CLOUDINARY_ENABLED:
+        logger.error("Cloudinary not configured - missing environment variables")
+        return jsonify({
+            'success': False,
+            'error': 'Receipt upload is not configured. Please contact administrator to set up Cloudinary.'
+        }), 503
+
+    processor = ReceiptImageProcessor(user_id=current_user.id)
+
+    # Validate and read everything into memory before touching Cloudinary
+    results = []
+    uploads = []
+    for file in files:
+        entry = {'filename': file.filename, 'success': False, 'receipt_id': None, 'error': None}
+        results.append(entry)
+        is_valid, error = processor.validate_file(file)
+        if not is_valid:
+            entry['error'] = error
+            continue
+        uploads.append({
+            'entry': entry,
+            'data': file.read(),
+            'filename': secure_filename(file.filename),
+        })
+
+    upload_results = processor.upload_receipts_batch(uploads)
+
+    uploaded = []
+    try:
+        for upload, upload_result in zip(uploads, upload_results):
+            if not upload_result['success']:
+                upload['entry']['error'] = upload_result['error']
+                logger.error(f"Cloudinary upload failed: {upload_result['error']}")
+                continue
+            uploaded.append((upload, upload_result))
+
+        plan_limits = current_user.get_plan_limits()
+        granted, limit_message, used, limit = ReceiptUsage.reserve_ocr_slots(
+            current_user, plan_limits, len(uploaded)
+        )
+
+        to_queue = []
+        for idx, (upload, upload_result) in enumerate(uploaded):
+            receipt = Receipt(
+                user_id=current_user.id,
+                image_url=upload_result['url'],
+                thumbnail_url=upload_result['thumbnail_url'],
+                image_public_id=upload_result['public_id'],
+                original_filename=upload['filename'],
+                file_size=len(upload['data']),
+                status='pending',
+                ocr_error_message=None if idx < granted else limit_message
+            )
+            db.session.add(receipt)
+            if idx < granted:
+                to_queue.append(receipt)
+            upload['entry']['receipt'] = receipt
+
+        # One transaction for the whole batch (also releases the quota lock)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Batch receipt upload failed: {e}")
+        # No receipt rows were saved; don't leave their images orphaned in Cloudinary
+        for _, upload_result in uploaded:
+            processor.delete_receipt(upload_result['public_id'])
+        return jsonify({'success': False, 'error': f'Upload failed: {str(e)}'}), 500
+
+    for upload, _ in uploaded:
+        entry = upload['entry']
+        receipt = entry.pop('receipt')
+        entry['receipt_id'] = receipt.id
+        entry['success'] = True
+        entry['ocr_queued'] = receipt.ocr_error_message is None
+
+    queued = queue_receipt_ocr_batch(to_queue)
+    if to_queue and not queued:
+        for receipt in to_queue:
+            receipt.status = 'failed'
+            receipt.ocr_error_message = 'Could not queue OCR processing'
+        db.session.commit()
+        for entry in results:
+            if entry.get('ocr_queued'):
+                entry['ocr_queued'] = False
+
+    logger.info(
+        f"Batch upload by user {current_user.id}: {len(uploaded)}/{len(files)} uploaded, "
+        f"{queued} queued for OCR"
+    )
+
+    return jsonify({
+        'success': bool(uploaded),
+        'uploaded': len(uploaded),
+        'queued': queued,
+        'failed': len(files) - len(uploaded),
+        'limit_message': limit_message if granted < len(uploaded) else None,
+        'ocr_used': used,
+        'ocr_limit': limit,
+        'results': results,
+        'redirect_url': url_for('receipts.list_receipts')
+    })
+
+
 @receipts_bp.route('/')
 @login_required
 def list_receipts():
@@ -574,6 +636,25 @@ def get_receipt_items_json(receipt_id):
     })
 
 
+@receipts_bp.route('/api/<int:receipt_id>/status')
+@login_required
+def get_receipt_status_json(receipt_id):
+    """Lightweight OCR status for polling while the receipt is being processed."""
+    receipt = Receipt.query.filter_by(id=receipt_id, user_id=current_user.id).first_or_404()
+    # Pending receipts with an error message were never queued (OCR limit reached)
+    in_progress = receipt.status == 'processing' or (
+        receipt.status == 'pending' and not receipt.ocr_error_message
+    )
+
+    return jsonify({
+        'success': True,
+        'id': receipt.id,
+        'status': receipt.status,
+        'done': not in_progress,
+        'error': receipt.ocr_error_message if receipt.status == 'failed' else None
+    })
+
+
 @receipts_bp.route('/api/<int:receipt_id>/debug')
 @login_required
 def debug_receipt(receipt_id):
@@ -7,6 +7,7 @@ from flask_login import login_required, current_user
 from qventory import db
 from qventory.models.report import Report
 from qventory.models.item import Item
+from qventory.routes.permissions import require_rate_limit
 import json
 import threading
 import traceback
@@ -200,6 +201,7 @@ RESPOND WITH ONLY THIS HTML (no ```html, no explanations):
 
 @reports_bp.route("/api/ai-research-async", methods=["POST"])
 @login_required
+@require_rate_limit("ai_research", limit=10, window_seconds=60)
 def ai_research_async():
     """
     Start async AI research report generation
@@ -10,7 +10,7 @@ import csv
 import json
 import os
 from qventory.models.tax_report import TaxReport, TaxReportExport
-from qventory.helpers.tax_calculator import TaxCalculator, get_or_create_tax_report
+from qventory.helpers.tax_calculator import get_or_create_tax_report
 from qventory.extensions import db
 
 tax_reports_bp = Blueprint('tax_reports', __name__, url_prefix='/tax-reports')
@@ -45,9 +45,6 @@ def annual_report(year):
     # Get or generate report
     report = get_or_create_tax_report(current_user.id, year)
 
-    # Get calculator for additional insights
-    calculator = TaxCalculator(current_user.id, year)
-
     return render_template(
         'tax_reports/annual_report.html',
         report=report,
@@ -740,22 +737,15 @@ def multi_year_comparison(year):
     years = [year, year - 1, year - 2]
     reports_data = []
 
+    # Closed years are served from their stored snapshots; only the current
+    # year is recomputed, and only when its data changed
     for y in years:
-        report = TaxReport.query.filter_by(
-            user_id=current_user.id,
-            tax_year=y,
-            report_type='annual'
-        ).first()
-
-        if report:
+        try:
+            report = get_or_create_tax_report(current_user.id, y)
             reports_data.append(report.to_dict())
-        else:
-            # Generate if not exists
-            try:
-                new_report = get_or_create_tax_report(current_user.id, y)
-                reports_data.append(new_report.to_dict())
-            except:
-                reports_data.append(None)
+        except Exception:
+            db.session.rollback()
+            reports_data.append(None)
 
     return render_template(
         'tax_reports/comparison.html',
@@ -47,6 +47,7 @@
     not_found: 'This draft could not be found. Refresh the page and try again.',
     ebay_not_connected: 'Your eBay account is not connected. Connect eBay before publishing.',
     image_upload_failed: 'One or more images could not be uploaded. Check your images and try again.',
+    uploads_pending: 'Images are still uploading to eBay. Wait a moment and try again.',
     inventory_item_failed: 'eBay could not create the inventory item for this listing.',
     offer_failed: 'eBay could not create the offer for this listing.',
     publish_failed: 'eBay rejected the final publish step.',
@@ -1578,6 +1579,53 @@
     setPublishStatus('Draft saved.');
   });
 
+  const PUBLISH_UPLOAD_RETRIES = 3;
+  const UPLOAD_POLL_TIMEOUT_MS = 60000;
+
+  function delay(ms) {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+  }
+
+  async function draftHasUploadsInFlight() {
+    try {
+      const res = await fetch(`${config.draftBaseUrl}/${draft.id}`);
+      const data = await res.json();
+      const draftImages = (data && data.draft && data.draft.images) || [];
+      return draftImages.some((img) => img && img.ebay_upload_status === 'uploading');
+    } catch (err) {
+      return false;
+    }
+  }
+
+  // Poll the draft (not publish, which is rate limited) until background uploads settle
+  async function waitForDraftImageUploads(retryAfterSeconds) {
+    const interval = Math.max(1, retryAfterSeconds || 2) * 1000;
+    const deadline = Date.now() + UPLOAD_POLL_TIMEOUT_MS;
+    while (await draftHasUploadsInFlight()) {
+      if (Date.now() >= deadline) return;
+      setPublishStatus('Waiting for images to finish uploading to eBay...');
+      await delay(interval);
+    }
+  }
+
+  async function requestPublish() {
+    for (let attempt = 0; ; attempt += 1) {
+      await waitForDraftImageUploads();
+      setPublishStatus('Publishing listing...');
+      const res = await fetch(`${config.draftBaseUrl}/${draft.id}/publish`, {method: 'POST'});
+      let data = {};
+      try {
+        data = await res.json();
+      } catch (err) {
+        data = {ok: false, error: 'invalid_response'};
+      }
+      if (res.status !== 409 || data.error !== 'uploads_pending' || attempt >= PUBLISH_UPLOAD_RETRIES) {
+        return {res, data};
+      }
+      await delay(Math.max(1, data.retry_after || 2) * 1000);
+    }
+  }
+
   qs('#publishBtn').addEventListener('click', async () => {
     const publishBtn = qs('#publishBtn');
     publishBtn.disabled = true;
@@ -1598,13 +1646,7 @@
       }
       clearValidationHighlights();
       await saveDraft({createIfMissing: true});
-      const res = await fetch(`${config.draftBaseUrl}/${draft.id}/publish`, {method: 'POST'});
-      let data = {};
-      try {
-        data = await res.json();
-      } catch (err) {
-        data = {ok: false, error: 'invalid_response'};
-      }
+      const {res, data} = await requestPublish();
       if (res.ok && data.ok) {
         if (data.draft) {
           draft = data.draft;
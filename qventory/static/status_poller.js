@@ -0,0 +1,102 @@
+// Shared header status channel.
+// One request loop per tab against /api/status: the server answers 304 until
+// the user's status version changes (or holds the request open when long
+// polling is enabled), and says how long to wait via X-Status-Poll-After.
+// Polling pauses while the tab is hidden.
+(function () {
+  if (window.QventoryStatus) return;
+
+  const LONG_POLL_WAIT = 25;
+  const DEFAULT_POLL_AFTER = 10;
+  const MAX_BACKOFF = 60;
+
+  const listeners = [];
+  let version = null;
+  let lastStatus = null;
+  let timer = null;
+  let inFlight = false;
+  let stopped = false;
+  let failures = 0;
+
+  function schedule(seconds) {
+    clearTimeout(timer);
+    timer = null;
+    if (stopped || document.hidden) return;
+    timer = setTimeout(poll, Math.max(0, seconds) * 1000);
+  }
+
+  function pollAfter(res) {
+    const value = parseInt(res.headers.get('X-Status-Poll-After'), 10);
+    return Number.isFinite(value) ? value : DEFAULT_POLL_AFTER;
+  }
+
+  function publish(data) {
+    lastStatus = data;
+    listeners.forEach(fn => {
+      try {
+        fn(data);
+      } catch (err) {
+        console.error('Status listener error:', err);
+      }
+    });
+  }
+
+  function poll() {
+    timer = null;
+    if (inFlight || stopped || document.hidden) return;
+    inFlight = true;
+
+    const params = new URLSearchParams({ wait: LONG_POLL_WAIT });
+    if (version) params.set('since', version);
+
+    fetch('/api/status?' + params.toString(), {
+      credentials: 'same-origin',
+      headers: { 'Accept': 'application/json' }
+    })
+      .then(async res => {
+        if (res.status === 401) {
+          stopped = true;
+          return;
+        }
+        if (res.status === 304) {
+          failures = 0;
+          schedule(pollAfter(res));
+          return;
+        }
+        const contentType = (res.headers.get('content-type') || '').toLowerCase();
+        if (!res.ok || !contentType.includes('application/json')) {
+          throw new Error(`Status endpoint returned ${res.status}`);
+        }
+        const data = await res.json();
+        failures = 0;
+        if (data && data.ok) {
+          version = data.version;
+          publish(data);
+        }
+        schedule(pollAfter(res));
+      })
+      .catch(err => {
+        failures += 1;
+        console.error('Status poll error:', err);
+        schedule(Math.min(MAX_BACKOFF, DEFAULT_POLL_AFTER * failures));
+      })
+      .finally(() => {
+        inFlight = false;
+      });
+  }
+
+  document.addEventListener('visibilitychange', () => {
+    if (!document.hidden && !timer && !inFlight) poll();
+  });
+
+  window.QventoryStatus = {
+    subscribe(fn, delayMs) {
+      listeners.push(fn);
+      if (lastStatus) {
+        fn(lastStatus);
+      } else if (!timer && !inFlight) {
+        timer = setTimeout(poll, delayMs || 0);
+      }
+    }
+  };
+})();
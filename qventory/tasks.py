@@ -8,7 +8,7 @@ import sys
 import time
 from datetime import datetime, timedelta
 from sqlalchemy import func, or_
-from qventory.celery_app import celery
+from qventory.celery_app import RECEIPT_OCR_QUEUE, celery
 from qventory.extensions import db
 from qventory import create_app
 from qventory.helpers.image_guarantee import (
@@ -2126,18 +2126,33 @@ def resume_ebay_imports_after_upgrade(self):
         }
 
 
+AUTO_RELIST_QUEUE = os.environ.get('AUTO_RELIST_QUEUE', 'relist')
+AUTO_RELIST_MAX_RULES_PER_RUN = int(os.environ.get('AUTO_RELIST_MAX_RULES_PER_RUN', '200'))  # Global claims per tick
+AUTO_RELIST_MAX_RULES_PER_USER = int(os.environ.get('AUTO_RELIST_MAX_RULES_PER_USER', '20'))  # Rules per user batch
+AUTO_RELIST_PROCESSING_STALE_HOURS = 2
+
+
 @celery.task(bind=True, name='qventory.tasks.auto_relist_offers')
 def auto_relist_offers(self):
     """
     Scheduled task to process auto-relist rules
-    Runs periodically (every 15 minutes) to check for pending relists
+    Runs periodically (every 2 minutes) to check for pending relists
 
     Handles both:
     - AUTO mode: Scheduled relists based on frequency
     - MANUAL mode: User-triggered relists with optional changes
 
+    Claims due rules with an atomic 'processing' update and fans them out as
+    one process_auto_relist_batch subtask per user on the relist queue, so
+    throughput scales with the workers consuming that queue.
+
+    Caps:
+    - AUTO_RELIST_MAX_RULES_PER_RUN rules claimed per tick (global)
+    - AUTO_RELIST_MAX_RULES_PER_USER rules per user batch, and at most one
+      in-flight batch per user (protects per-user eBay rate limits)
+
     Returns:
-        dict with execution results
+        dict with dispatch results
     """
     if _is_ebay_quiet_window():
         return {'success': True, 'skipped': True, 'reason': 'quiet_window'}
@@ -2145,12 +2160,14 @@ def auto_relist_offers(self):
     app = create_app()
 
     with app.app_context():
-        from qventory.models.auto_relist_rule import AutoRelistRule, AutoRelistHistory
-        from qventory.helpers.ebay_relist import execute_relist
+        from qventory.models.auto_relist_rule import AutoRelistRule
+        from qventory.helpers.ebay_relist import record_phase_timing
         from datetime import datetime
 
         # Minimal logging to save server resources
         now = datetime.utcnow()
+        timings = {}
+        mark = time.monotonic()
 
         # DEBUG: Check all rules first
         all_enabled_rules = AutoRelistRule.query.filter(AutoRelistRule.enabled == True).all()
@@ -2166,7 +2183,7 @@ def auto_relist_offers(self):
             AutoRelistRule.enabled == True,
             AutoRelistRule.mode.in_(('auto', 'price_update')),
             AutoRelistRule.next_run_at <= now
-        ).all()
+        ).order_by(AutoRelistRule.next_run_at.asc()).all()
 
         manual_rules = AutoRelistRule.query.filter(
             AutoRelistRule.enabled == True,
@@ -2174,7 +2191,8 @@ def auto_relist_offers(self):
             AutoRelistRule.manual_trigger_requested == True
         ).all()
 
-        all_rules = scheduled_rules + manual_rules
+        # User-triggered relists first, then the most overdue scheduled ones
+        all_rules = manual_rules + scheduled_rules
 
         log_task(f"DEBUG: {len(scheduled_rules)} scheduled rules ready, {len(manual_rules)} manual rules triggered")
 
@@ -2188,451 +2206,605 @@ def auto_relist_offers(self):
                 'skipped': 0
             }
 
-        processed_count = 0
-        succeeded_count = 0
-        failed_count = 0
+        # Users with a batch still running keep it until it finishes
+        processing_stale_before = now - timedelta(hours=AUTO_RELIST_PROCESSING_STALE_HOURS)
+        busy_user_ids = {
+            user_id for (user_id,) in db.session.query(AutoRelistRule.user_id).filter(
+                AutoRelistRule.user_id.in_({rule.user_id for rule in all_rules}),
+                AutoRelistRule.last_run_status == 'processing',
+                AutoRelistRule.last_run_at >= processing_stale_before
+            ).distinct().all()
+        }
+        mark = record_phase_timing(timings, 'select', mark)
+
+        batches = {}
+        claimed_count = 0
+        deferred_count = 0
         skipped_count = 0
 
         for rule in all_rules:
-            history = None  # Initialize history outside try block
-            try:
-                # Atomically claim the rule so overlapping scheduler/manual runs do not relist it twice.
-                processing_stale_before = now - timedelta(hours=2)
-                claimed = AutoRelistRule.query.filter(
-                    AutoRelistRule.id == rule.id,
-                    AutoRelistRule.enabled == True,
-                    or_(
-                        AutoRelistRule.last_run_status.is_(None),
-                        AutoRelistRule.last_run_status != 'processing',
-                        AutoRelistRule.last_run_at.is_(None),
-                        AutoRelistRule.last_run_at < processing_stale_before,
-                    )
-                ).update(
-                    {
-                        AutoRelistRule.last_run_status: 'processing',
-                        AutoRelistRule.last_run_at: datetime.utcnow(),
-                        AutoRelistRule.updated_at: datetime.utcnow(),
-                    },
-                    synchronize_session=False
+            user_batch = batches.get(rule.user_id, [])
+            if (
+                rule.user_id in busy_user_ids
+                or claimed_count >= AUTO_RELIST_MAX_RULES_PER_RUN
+                or len(user_batch) >= AUTO_RELIST_MAX_RULES_PER_USER
+            ):
+                deferred_count += 1
+                continue
+
+            # Atomically claim the rule so overlapping scheduler/manual runs do not relist it twice.
+            claimed = AutoRelistRule.query.filter(
+                AutoRelistRule.id == rule.id,
+                AutoRelistRule.enabled == True,
+                or_(
+                    AutoRelistRule.last_run_status.is_(None),
+                    AutoRelistRule.last_run_status != 'processing',
+                    AutoRelistRule.last_run_at.is_(None),
+                    AutoRelistRule.last_run_at < processing_stale_before,
                 )
-                db.session.commit()
-                if not claimed:
-                    log_task(f"Skipping rule {rule.id}; already claimed by another relist worker")
-                    skipped_count += 1
-                    continue
+            ).update(
+                {
+                    AutoRelistRule.last_run_status: 'processing',
+                    AutoRelistRule.last_run_at: datetime.utcnow(),
+                    AutoRelistRule.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False
+            )
+            db.session.commit()
+            if not claimed:
+                log_task(f"Skipping rule {rule.id}; already claimed by another relist worker")
+                skipped_count += 1
+                continue
 
-                # Minimal logging for normal operations
-                log_task(f"Processing rule {rule.id} ({rule.mode})")
+            user_batch.append(rule.id)
+            batches[rule.user_id] = user_batch
+            claimed_count += 1
 
-                # Create history record
-                history = AutoRelistHistory(
-                    rule_id=rule.id,
-                    user_id=rule.user_id,
-                    mode=rule.mode,
-                    started_at=datetime.utcnow(),
-                    status='pending'
-                )
-                history.sku = rule.sku
-                history.old_title = rule.item_title
-                try:
-                    from qventory.models.item import Item
-                    item_match = None
-                    if rule.sku:
-                        item_match = Item.query.filter_by(user_id=rule.user_id, sku=rule.sku).first()
-                    if not item_match and rule.listing_id:
-                        item_match = Item.query.filter_by(
-                            user_id=rule.user_id,
-                            ebay_listing_id=rule.listing_id
-                        ).first()
-                    if item_match:
-                        history.item_id = item_match.id
-                except Exception as match_err:
-                    log_task(f"  ⚠ Unable to link relist history to item: {match_err}")
-                db.session.add(history)
-                db.session.commit()
+        mark = record_phase_timing(timings, 'claim', mark)
 
-                # Capture old price if available
-                if rule.current_price:
-                    history.old_price = rule.current_price
-
-                # SALE DETECTION: Check if item has been sold (auto mode only)
-                if rule.mode in ('auto', 'price_update') and (rule.listing_id or rule.offer_id):
-                    from qventory.helpers.ebay_relist import check_item_sold_in_fulfillment
-                    from qventory.models.item import Item
-
-                    listing_identifiers = [
-                        str(identifier).strip()
-                        for identifier in (rule.listing_id, rule.offer_id)
-                        if str(identifier or '').strip()
-                    ]
-                    sold_listing_id = next(
-                        (
-                            identifier for identifier in listing_identifiers
-                            if check_item_sold_in_fulfillment(rule.user_id, identifier)
-                        ),
-                        None
-                    )
+        result = {
+            'success': True,
+            'claimed': claimed_count,
+            'batches': len(batches),
+            'deferred': deferred_count,
+            'skipped': skipped_count,
+        }
 
-                    if sold_listing_id:
-                        log_task(f"✓ Item SOLD - stopping auto-relist rule {rule.id}")
-
-                        rule.enabled = False
-                        rule.last_run_status = 'stopped_sold'
-                        rule.last_run_at = datetime.utcnow()
-                        rule.last_error_message = 'Rule stopped: item was sold'
-                        rule.next_run_at = None
-
-                        item_filters = [Item.ebay_listing_id == sold_listing_id]
-                        if rule.listing_id:
-                            item_filters.append(Item.ebay_listing_id == rule.listing_id)
-                        if rule.sku:
-                            item_filters.append(Item.sku == rule.sku)
-                        sold_item = Item.query.filter(
-                            Item.user_id == rule.user_id,
-                            or_(*item_filters)
-                        ).order_by(Item.updated_at.desc()).first()
-                        if sold_item:
-                            sold_item.is_active = False
-                            if not sold_item.sold_at:
-                                sold_item.sold_at = datetime.utcnow()
-                            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-                            sold_note = (
-                                f"\n[{timestamp}] Scheduled auto relist stopped: "
-                                f"listing {sold_listing_id} was sold."
-                            )
-                            if sold_note.strip() not in (sold_item.notes or ''):
-                                sold_item.notes = (sold_item.notes or '') + sold_note
-                            history.item_id = sold_item.id
+        if batches and not _dispatch_auto_relist_batches(list(batches.values())):
+            # Broker unavailable - relist inline so claimed rules are not left in 'processing'
+            inline = {'processed': 0, 'succeeded': 0, 'failed': 0, 'skipped': 0}
+            for rule_ids in batches.values():
+                batch_result = _run_auto_relist_batch(rule_ids)
+                for key in inline:
+                    inline[key] += batch_result.get(key, 0)
+            result['inline'] = inline
 
-                        history.status = 'skipped'
-                        history.skip_reason = 'Item sold - scheduled relist stopped before end/relist'
-                        history.mark_completed()
+        record_phase_timing(timings, 'dispatch', mark)
+        result['timings'] = timings
 
-                        db.session.commit()
-                        skipped_count += 1
-                        processed_count += 1
-                        continue
+        log_task(
+            f"Auto-relist dispatch: {claimed_count} claimed in {len(batches)} user batches, "
+            f"{deferred_count} deferred, {skipped_count} skipped "
+            f"({', '.join(f'{phase}={ms}ms' for phase, ms in timings.items())})"
+        )
+        return result
 
-                # PRICE DECREASE: Calculate new price for auto mode
-                new_price_from_decrease = None
-                if rule.mode in ('auto', 'price_update') and rule.enable_price_decrease:
-                    if not rule.current_price:
-                        try:
-                            from qventory.helpers.ebay_relist import (
-                                get_item_details_trading_api,
-                                get_offer_details,
-                                is_probable_listing_id,
-                                resolve_rule_offer_id,
-                            )
 
-                            resolved_offer_id = resolve_rule_offer_id(rule.user_id, rule)
-                            if resolved_offer_id and resolved_offer_id != rule.offer_id:
-                                rule.offer_id = resolved_offer_id
-
-                            offer_id_for_price = resolved_offer_id or rule.offer_id
-                            use_trading_api = is_probable_listing_id(offer_id_for_price)
-
-                            if use_trading_api:
-                                # Use Trading API to get item price
-                                log_task(f"  Fetching current price via Trading API...")
-                                price_resp = get_item_details_trading_api(rule.user_id, offer_id_for_price)
-                                if price_resp.get('success'):
-                                    item_data = price_resp.get('item') or {}
-                                    price_value = item_data.get('price')
-                                    if price_value is not None:
-                                        try:
-                                            rule.current_price = float(price_value)
-                                            log_task(f"  ✓ Fetched current price: ${rule.current_price}")
-                                        except (TypeError, ValueError):
-                                            pass
-                            else:
-                                # Use Inventory API to get offer price
-                                log_task(f"  Fetching current price via Inventory API...")
-                                price_resp = get_offer_details(rule.user_id, offer_id_for_price)
-                                if price_resp.get('success'):
-                                    offer_data = price_resp.get('offer') or {}
-                                    price_value = (
-                                        offer_data.get('pricingSummary', {})
-                                        .get('price', {})
-                                        .get('value')
-                                    )
-                                    if price_value is not None:
-                                        try:
-                                            rule.current_price = float(price_value)
-                                            log_task(f"  ✓ Fetched current price: ${rule.current_price}")
-                                        except (TypeError, ValueError):
-                                            pass
-                        except Exception as fetch_err:
-                            log_task(f"  ⚠ Unable to refresh current price before decrease: {fetch_err}")
-
-                    new_price_from_decrease = rule.calculate_new_price()
-                    if new_price_from_decrease:
-                        log_task(f"  Price decrease: ${rule.current_price} → ${new_price_from_decrease}")
-                        history.new_price = new_price_from_decrease
-
-                if rule.mode == 'price_update':
-                    if not new_price_from_decrease:
-                        skip_reason = 'No price update needed'
-                        if rule.current_price and rule.min_price and float(rule.current_price) <= float(rule.min_price):
-                            skip_reason = 'At floor price'
-                        log_task(f"⊘ Price update skipped: {skip_reason}")
-                        rule.mark_skipped(skip_reason)
-                        if skip_reason == 'At floor price':
-                            rule.enabled = False
-                            rule.next_run_at = None
-                            rule.last_run_status = 'stopped_floor'
-                            rule.last_error_message = 'Rule stopped: floor price reached'
-                        history.status = 'skipped'
-                        history.skip_reason = skip_reason
-                        history.mark_completed()
-                        skipped_count += 1
-                        db.session.commit()
-                        processed_count += 1
-                        continue
-                    if rule.current_price and round(float(rule.current_price), 2) == round(float(new_price_from_decrease), 2):
-                        skip_reason = 'At floor price'
-                        log_task(f"⊘ Price update skipped: {skip_reason}")
-                        rule.mark_skipped(skip_reason)
-                        rule.enabled = False
-                        rule.next_run_at = None
-                        rule.last_run_status = 'stopped_floor'
-                        rule.last_error_message = 'Rule stopped: floor price reached'
-                        history.status = 'skipped'
-                        history.skip_reason = skip_reason
-                        history.mark_completed()
-                        skipped_count += 1
-                        db.session.commit()
-                        processed_count += 1
-                        continue
+def _dispatch_auto_relist_batches(batches):
+    """
+    Send claimed rule batches (one list of rule IDs per user) to the relist queue.
 
-                    from qventory.helpers.ebay_relist import update_active_listing_price
-
-                    log_task(f"  Updating active listing price only: ${rule.current_price} → ${new_price_from_decrease}")
-                    update_result = update_active_listing_price(rule.user_id, rule, new_price_from_decrease)
-                    history.changes_applied = {'price': new_price_from_decrease}
-                    history.new_price = new_price_from_decrease
-                    history.update_response = update_result
-
-                    if not update_result.get('success'):
-                        error_msg = update_result.get('error', 'Price update failed')
-                        log_task(f"✗ Price update failed: {error_msg}")
-                        rule.mark_error(error_msg)
-                        history.status = 'error'
-                        history.error_message = error_msg
-                        history.mark_completed()
-                        failed_count += 1
-                        db.session.commit()
-                        processed_count += 1
-                        continue
+    Returns True if the group was queued, False if the broker is unavailable.
+    """
+    from celery import group
 
-                    rule.current_price = new_price_from_decrease
-                    rule.last_run_status = 'success'
-                    rule.last_run_at = datetime.utcnow()
-                    rule.last_error_message = None
-                    rule.run_count += 1
-                    rule.success_count += 1
-                    rule.consecutive_errors = 0
-                    rule.calculate_next_run()
+    try:
+        group(
+            process_auto_relist_batch.s(rule_ids=rule_ids).set(queue=AUTO_RELIST_QUEUE)
+            for rule_ids in batches
+        ).apply_async()
+        return True
+    except Exception as exc:
+        log_task(f"⚠ Failed to dispatch {len(batches)} auto-relist batches: {exc}")
+        return False
 
-                    try:
-                        from qventory.models.item import Item
-                        item_query = Item.query.filter(Item.user_id == rule.user_id)
-                        item_filters = []
-                        if rule.listing_id:
-                            item_filters.append(Item.ebay_listing_id == rule.listing_id)
-                        if rule.sku:
-                            item_filters.append(Item.sku == rule.sku)
-                        if item_filters:
-                            item_match = item_query.filter(or_(*item_filters)).order_by(Item.updated_at.desc()).first()
-                            if item_match:
-                                item_match.item_price = new_price_from_decrease
-                                history.item_id = item_match.id
-                    except Exception as item_update_err:
-                        log_task(f"  ⚠ Unable to update local item price: {item_update_err}")
-
-                    history.status = 'success'
-                    history.mark_completed()
-                    succeeded_count += 1
-                    db.session.commit()
-                    processed_count += 1
-                    continue
 
-                # Execute relist (with or without changes)
-                # Check if manual mode has changes to apply
-                has_changes = (rule.pending_changes and
-                              isinstance(rule.pending_changes, dict) and
-                              len(rule.pending_changes) > 0)
-                apply_changes = rule.mode == 'manual' and has_changes
-
-                log_task(f"  DEBUG: rule.mode = {rule.mode}")
-                log_task(f"  DEBUG: rule.enable_price_decrease = {rule.enable_price_decrease}")
-                log_task(f"  DEBUG: new_price_from_decrease = {new_price_from_decrease}")
-
-                # For auto mode with price decrease, apply the price change
-                if rule.mode == 'auto' and new_price_from_decrease:
-                    apply_changes = True
-                    # Create pending_changes for price decrease
-                    if not rule.pending_changes:
-                        rule.pending_changes = {}
-                    rule.pending_changes['price'] = new_price_from_decrease
-                    history.changes_applied = {'price': new_price_from_decrease}
-                    log_task(f"  DEBUG: Set pending_changes['price'] = ${new_price_from_decrease}")
-                    log_task(f"  DEBUG: apply_changes = {apply_changes}")
-                    log_task(f"  DEBUG: rule.pending_changes = {rule.pending_changes}")
-
-                    # CRITICAL: Commit pending_changes to database before passing rule to execute_relist
-                    # SQLAlchemy JSON columns need explicit flag_modified to track changes
-                    from sqlalchemy.orm.attributes import flag_modified
-                    flag_modified(rule, 'pending_changes')
-                    db.session.commit()
-                    log_task(f"  DEBUG: Committed pending_changes to database")
+@celery.task(bind=True, name='qventory.tasks.process_auto_relist_batch')
+def process_auto_relist_batch(self, rule_ids):
+    """
+    Relist a batch of rules claimed by auto_relist_offers (all for one user).
 
-                if apply_changes and rule.pending_changes:
-                    history.changes_applied = rule.pending_changes.copy()
-                    # Capture new price if changed
-                    if 'price' in rule.pending_changes:
-                        history.new_price = rule.pending_changes['price']
-                    if 'title' in rule.pending_changes:
-                        history.new_title = rule.pending_changes['title']
+    Returns:
+        dict with execution results and per-phase timings (ms)
+    """
+    app = create_app()
 
-                # Execute relist
-                log_task(f"  DEBUG: About to call execute_relist with apply_changes={apply_changes}")
-                result = execute_relist(rule.user_id, rule, apply_changes=apply_changes)
+    with app.app_context():
+        return _run_auto_relist_batch(rule_ids)
 
-                # Check result
-                if 'skip_reason' in result:
-                    # Skipped due to safety check
-                    log_task(f"✗ Skipped: {result['skip_reason']}")
 
-                    rule.mark_skipped(result['skip_reason'])
+def _run_auto_relist_batch(rule_ids):
+    """Process claimed rules serially, sharing one prefetched sale snapshot."""
+    from qventory.models.auto_relist_rule import AutoRelistRule
+    from qventory.helpers.ebay_relist import prefetch_relist_sale_snapshot, record_phase_timing
 
-                    history.status = 'skipped'
-                    history.skip_reason = result['skip_reason']
-                    history.old_listing_id = result.get('old_listing_id')
-                    history.mark_completed()
+    started = time.monotonic()
+    timings = {}
 
-                    skipped_count += 1
+    rules_by_id = {
+        rule.id: rule
+        for rule in AutoRelistRule.query.filter(AutoRelistRule.id.in_(rule_ids)).all()
+    }
+    rules = [rules_by_id[rule_id] for rule_id in rule_ids if rule_id in rules_by_id]
 
-                elif not result['success']:
-                    # Failed
-                    error_msg = result.get('error', 'Unknown error')
-                    log_task(f"✗ Failed: {error_msg}")
+    # Resolve sold / recent-order / return state for every rule up front
+    mark = time.monotonic()
+    sale_snapshot = None
+    try:
+        sale_snapshot = prefetch_relist_sale_snapshot(rules)
+    except Exception as prefetch_err:
+        db.session.rollback()
+        log_task(f"⚠ Sale status prefetch failed, using per-rule checks: {prefetch_err}")
+    record_phase_timing(timings, 'prefetch', mark)
+
+    counts = {'succeeded': 0, 'failed': 0, 'skipped': 0}
+    for rule in rules:
+        outcome = _process_claimed_relist_rule(rule, sale_snapshot=sale_snapshot, timings=timings)
+        counts[outcome] += 1
+
+    duration_ms = int((time.monotonic() - started) * 1000)
+
+    # Log only if there were failures
+    if counts['failed'] > 0:
+        log_task(f"Auto-relist: {counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped")
+    log_task(
+        f"Auto-relist batch timings: rules={len(rules)} duration_ms={duration_ms} "
+        + " ".join(f"{phase}={ms}" for phase, ms in sorted(timings.items()))
+    )
 
-                    rule.mark_error(error_msg)
+    return {
+        'success': True,
+        'processed': len(rules),
+        'succeeded': counts['succeeded'],
+        'failed': counts['failed'],
+        'skipped': counts['skipped'],
+        'duration_ms': duration_ms,
+        'timings': timings,
+    }
 
-                    history.status = 'error'
-                    history.error_message = error_msg
-                    history.old_listing_id = result.get('old_listing_id')
-                    history.withdraw_response = result.get('details', {}).get('withdraw')
-                    history.update_response = result.get('details', {}).get('update_offer') or result.get('details', {}).get('update_inventory')
-                    history.publish_response = result.get('details', {}).get('publish')
-                    history.mark_completed()
 
-                    # Create error notification
-                    from qventory.models.notification import Notification
-                    item_title = rule.item_title or 'Item'
-                    Notification.create_notification(
+def _process_claimed_relist_rule(rule, sale_snapshot=None, timings=None):
+    """
+    Run one auto-relist rule that is already claimed ('processing').
+
+    Args:
+        rule: AutoRelistRule
+        sale_snapshot: Optional RelistSaleSnapshot for the batch
+        timings: Optional dict; per-phase durations (ms) are added to it
+
+    Returns:
+        'succeeded', 'failed' or 'skipped'
+    """
+    from qventory.models.auto_relist_rule import AutoRelistHistory
+    from qventory.helpers.ebay_relist import execute_relist, record_phase_timing
+
+    timings = {} if timings is None else timings
+    history = None  # Initialize history outside try block
+    try:
+        if not rule.enabled:
+            log_task(f"Skipping rule {rule.id}; disabled after it was claimed")
+            rule.last_run_status = 'skipped'
+            db.session.commit()
+            return 'skipped'
+
+        # Minimal logging for normal operations
+        log_task(f"Processing rule {rule.id} ({rule.mode})")
+        mark = time.monotonic()
+
+        # Create history record
+        history = AutoRelistHistory(
+            rule_id=rule.id,
+            user_id=rule.user_id,
+            mode=rule.mode,
+            started_at=datetime.utcnow(),
+            status='pending'
+        )
+        history.sku = rule.sku
+        history.old_title = rule.item_title
+        try:
+            from qventory.models.item import Item
+            if sale_snapshot is not None:
+                history.item_id = sale_snapshot.item_id_for(rule.user_id, rule.sku, rule.listing_id)
+            else:
+                item_match = None
+                if rule.sku:
+                    item_match = Item.query.filter_by(user_id=rule.user_id, sku=rule.sku).first()
+                if not item_match and rule.listing_id:
+                    item_match = Item.query.filter_by(
                         user_id=rule.user_id,
-                        type='error',
-                        title=f'Auto-relist failed',
-                        message=f'{item_title[:50]}: {error_msg}',
-                        link_url='/inventory/active',
-                        link_text='View Inventory',
-                        source='relist'
-                    )
+                        ebay_listing_id=rule.listing_id
+                    ).first()
+                if item_match:
+                    history.item_id = item_match.id
+        except Exception as match_err:
+            log_task(f"  ⚠ Unable to link relist history to item: {match_err}")
+        db.session.add(history)
+        db.session.commit()
 
-                    failed_count += 1
+        # Capture old price if available
+        if rule.current_price:
+            history.old_price = rule.current_price
 
-                else:
-                    # Success!
-                    new_listing_id = result['new_listing_id']
-                    log_task(f"✓ Success! New listing ID: {new_listing_id}")
+        mark = record_phase_timing(timings, 'prepare', mark)
 
-                    # Update current price if it was changed (do this BEFORE mark_success clears pending_changes)
-                    if apply_changes and rule.pending_changes and 'price' in rule.pending_changes:
-                        rule.current_price = rule.pending_changes['price']
+        # SALE DETECTION: Check if item has been sold (auto mode only)
+        if rule.mode in ('auto', 'price_update') and (rule.listing_id or rule.offer_id):
+            from qventory.helpers.ebay_relist import check_item_sold_in_fulfillment
+            from qventory.models.item import Item
 
+            listing_identifiers = [
+                str(identifier).strip()
+                for identifier in (rule.listing_id, rule.offer_id)
+                if str(identifier or '').strip()
+            ]
+
+            def _is_sold(identifier):
+                sold = sale_snapshot.is_sold(rule.user_id, identifier) if sale_snapshot is not None else None
+                if sold is None:
+                    sold = check_item_sold_in_fulfillment(rule.user_id, identifier)
+                return sold
+
+            sold_listing_id = next(
+                (identifier for identifier in listing_identifiers if _is_sold(identifier)),
+                None
+            )
+            mark = record_phase_timing(timings, 'sale_check', mark)
+
+            if sold_listing_id:
+                log_task(f"✓ Item SOLD - stopping auto-relist rule {rule.id}")
+
+                rule.enabled = False
+                rule.last_run_status = 'stopped_sold'
+                rule.last_run_at = datetime.utcnow()
+                rule.last_error_message = 'Rule stopped: item was sold'
+                rule.next_run_at = None
+
+                item_filters = [Item.ebay_listing_id == sold_listing_id]
+                if rule.listing_id:
+                    item_filters.append(Item.ebay_listing_id == rule.listing_id)
+                if rule.sku:
+                    item_filters.append(Item.sku == rule.sku)
+                sold_item = Item.query.filter(
+                    Item.user_id == rule.user_id,
+                    or_(*item_filters)
+                ).order_by(Item.updated_at.desc()).first()
+                if sold_item:
+                    sold_item.is_active = False
+                    if not sold_item.sold_at:
+                        sold_item.sold_at = datetime.utcnow()
+                    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+                    sold_note = (
+                        f"\n[{timestamp}] Scheduled auto relist stopped: "
+                        f"listing {sold_listing_id} was sold."
+                    )
+                    if sold_note.strip() not in (sold_item.notes or ''):
+                        sold_item.notes = (sold_item.notes or '') + sold_note
+                    history.item_id = sold_item.id
+
+                history.status = 'skipped'
+                history.skip_reason = 'Item sold - scheduled relist stopped before end/relist'
+                history.mark_completed()
+
+                db.session.commit()
+                return 'skipped'
+
+        # PRICE DECREASE: Calculate new price for auto mode
+        new_price_from_decrease = None
+        if rule.mode in ('auto', 'price_update') and rule.enable_price_decrease:
+            if not rule.current_price:
+                try:
                     from qventory.helpers.ebay_relist import (
-                        get_new_listing_id_from_offer,
+                        get_item_details_trading_api,
+                        get_offer_details,
                         is_probable_listing_id,
+                        resolve_rule_offer_id,
                     )
 
-                    new_offer_id = result.get('new_offer_id') or rule.offer_id
-                    if new_offer_id and not is_probable_listing_id(str(new_offer_id)):
-                        updated_listing_id = get_new_listing_id_from_offer(rule.user_id, str(new_offer_id))
-                        if updated_listing_id:
-                            new_listing_id = updated_listing_id
-                            log_task(f"  Updated listing ID: {new_listing_id}")
-
-                    rule.mark_success(new_listing_id, new_offer_id=new_offer_id)
-
-                    history.status = 'success'
-                    history.old_listing_id = result.get('old_listing_id')
-                    history.new_listing_id = new_listing_id
-                    history.withdraw_response = result.get('details', {}).get('withdraw')
-                    history.update_response = result.get('details', {}).get('update_offer') or result.get('details', {}).get('update_inventory')
-                    history.publish_response = result.get('details', {}).get('publish')
-                    history.mark_completed()
-
-                    # Create success notification
-                    from qventory.models.notification import Notification
-                    item_title = rule.item_title or 'Item'
-
-                    # Check if this was the first relist
-                    is_first_relist = rule.success_count == 1  # Just incremented in mark_success
-
-                    if is_first_relist:
-                        notification_title = 'First auto-relist completed! 🎉'
-                        notification_message = f'{item_title[:50]} has been relisted successfully. New listing ID: {new_listing_id}. Next relist will run automatically based on your schedule.'
+                    resolved_offer_id = resolve_rule_offer_id(rule.user_id, rule)
+                    if resolved_offer_id and resolved_offer_id != rule.offer_id:
+                        rule.offer_id = resolved_offer_id
+
+                    offer_id_for_price = resolved_offer_id or rule.offer_id
+                    use_trading_api = is_probable_listing_id(offer_id_for_price)
+
+                    if use_trading_api:
+                        # Use Trading API to get item price
+                        log_task(f"  Fetching current price via Trading API...")
+                        price_resp = get_item_details_trading_api(rule.user_id, offer_id_for_price)
+                        if price_resp.get('success'):
+                            item_data = price_resp.get('item') or {}
+                            price_value = item_data.get('price')
+                            if price_value is not None:
+                                try:
+                                    rule.current_price = float(price_value)
+                                    log_task(f"  ✓ Fetched current price: ${rule.current_price}")
+                                except (TypeError, ValueError):
+                                    pass
                     else:
-                        notification_title = 'Auto-relist successful!'
-                        notification_message = f'{item_title[:50]} was relisted with new listing ID {new_listing_id}'
+                        # Use Inventory API to get offer price
+                        log_task(f"  Fetching current price via Inventory API...")
+                        price_resp = get_offer_details(rule.user_id, offer_id_for_price)
+                        if price_resp.get('success'):
+                            offer_data = price_resp.get('offer') or {}
+                            price_value = (
+                                offer_data.get('pricingSummary', {})
+                                .get('price', {})
+                                .get('value')
+                            )
+                            if price_value is not None:
+                                try:
+                                    rule.current_price = float(price_value)
+                                    log_task(f"  ✓ Fetched current price: ${rule.current_price}")
+                                except (TypeError, ValueError):
+                                    pass
+                except Exception as fetch_err:
+                    log_task(f"  ⚠ Unable to refresh current price before decrease: {fetch_err}")
+
+            new_price_from_decrease = rule.calculate_new_price()
+            if new_price_from_decrease:
+                log_task(f"  Price decrease: ${rule.current_price} → ${new_price_from_decrease}")
+                history.new_price = new_price_from_decrease
+
+        mark = record_phase_timing(timings, 'price_lookup', mark)
+
+        if rule.mode == 'price_update':
+            if not new_price_from_decrease:
+                skip_reason = 'No price update needed'
+                if rule.current_price and rule.min_price and float(rule.current_price) <= float(rule.min_price):
+                    skip_reason = 'At floor price'
+                log_task(f"⊘ Price update skipped: {skip_reason}")
+                rule.mark_skipped(skip_reason)
+                if skip_reason == 'At floor price':
+                    rule.enabled = False
+                    rule.next_run_at = None
+                    rule.last_run_status = 'stopped_floor'
+                    rule.last_error_message = 'Rule stopped: floor price reached'
+                history.status = 'skipped'
+                history.skip_reason = skip_reason
+                history.mark_completed()
+                db.session.commit()
+                return 'skipped'
+            if rule.current_price and round(float(rule.current_price), 2) == round(float(new_price_from_decrease), 2):
+                skip_reason = 'At floor price'
+                log_task(f"⊘ Price update skipped: {skip_reason}")
+                rule.mark_skipped(skip_reason)
+                rule.enabled = False
+                rule.next_run_at = None
+                rule.last_run_status = 'stopped_floor'
+                rule.last_error_message = 'Rule stopped: floor price reached'
+                history.status = 'skipped'
+                history.skip_reason = skip_reason
+                history.mark_completed()
+                db.session.commit()
+                return 'skipped'
+
+            from qventory.helpers.ebay_relist import update_active_listing_price
+
+            log_task(f"  Updating active listing price only: ${rule.current_price} → ${new_price_from_decrease}")
+            update_result = update_active_listing_price(rule.user_id, rule, new_price_from_decrease)
+            mark = record_phase_timing(timings, 'price_update', mark)
+            history.changes_applied = {'price': new_price_from_decrease}
+            history.new_price = new_price_from_decrease
+            history.update_response = update_result
+
+            if not update_result.get('success'):
+                error_msg = update_result.get('error', 'Price update failed')
+                log_task(f"✗ Price update failed: {error_msg}")
+                rule.mark_error(error_msg)
+                history.status = 'error'
+                history.error_message = error_msg
+                history.mark_completed()
+                db.session.commit()
+                return 'failed'
 
-                    Notification.create_notification(
-                        user_id=rule.user_id,
-                        type='success',
-                        title=notification_title,
-                        message=notification_message,
-                        link_url='/inventory/active',
-                        link_text='View Inventory',
-                        source='relist'
-                    )
+            rule.current_price = new_price_from_decrease
+            rule.last_run_status = 'success'
+            rule.last_run_at = datetime.utcnow()
+            rule.last_error_message = None
+            rule.run_count += 1
+            rule.success_count += 1
+            rule.consecutive_errors = 0
+            rule.calculate_next_run()
 
-                    succeeded_count += 1
+            try:
+                from qventory.models.item import Item
+                item_query = Item.query.filter(Item.user_id == rule.user_id)
+                item_filters = []
+                if rule.listing_id:
+                    item_filters.append(Item.ebay_listing_id == rule.listing_id)
+                if rule.sku:
+                    item_filters.append(Item.sku == rule.sku)
+                if item_filters:
+                    item_match = item_query.filter(or_(*item_filters)).order_by(Item.updated_at.desc()).first()
+                    if item_match:
+                        item_match.item_price = new_price_from_decrease
+                        history.item_id = item_match.id
+            except Exception as item_update_err:
+                log_task(f"  ⚠ Unable to update local item price: {item_update_err}")
 
-                # Commit after each rule
-                db.session.commit()
-                processed_count += 1
+            history.status = 'success'
+            history.mark_completed()
+            db.session.commit()
+            return 'succeeded'
+
+        # Execute relist (with or without changes)
+        # Check if manual mode has changes to apply
+        has_changes = (rule.pending_changes and
+                      isinstance(rule.pending_changes, dict) and
+                      len(rule.pending_changes) > 0)
+        apply_changes = rule.mode == 'manual' and has_changes
+
+        log_task(f"  DEBUG: rule.mode = {rule.mode}")
+        log_task(f"  DEBUG: rule.enable_price_decrease = {rule.enable_price_decrease}")
+        log_task(f"  DEBUG: new_price_from_decrease = {new_price_from_decrease}")
+
+        # For auto mode with price decrease, apply the price change
+        if rule.mode == 'auto' and new_price_from_decrease:
+            apply_changes = True
+            # Create pending_changes for price decrease
+            if not rule.pending_changes:
+                rule.pending_changes = {}
+            rule.pending_changes['price'] = new_price_from_decrease
+            history.changes_applied = {'price': new_price_from_decrease}
+            log_task(f"  DEBUG: Set pending_changes['price'] = ${new_price_from_decrease}")
+            log_task(f"  DEBUG: apply_changes = {apply_changes}")
+            log_task(f"  DEBUG: rule.pending_changes = {rule.pending_changes}")
+
+            # CRITICAL: Commit pending_changes to database before passing rule to execute_relist
+            # SQLAlchemy JSON columns need explicit flag_modified to track changes
+            from sqlalchemy.orm.attributes import flag_modified
+            flag_modified(rule, 'pending_changes')
+            db.session.commit()
+            log_task(f"  DEBUG: Committed pending_changes to database")
+
+        if apply_changes and rule.pending_changes:
+            history.changes_applied = rule.pending_changes.copy()
+            # Capture new price if changed
+            if 'price' in rule.pending_changes:
+                history.new_price = rule.pending_changes['price']
+            if 'title' in rule.pending_changes:
+                history.new_title = rule.pending_changes['title']
+
+        # Execute relist
+        log_task(f"  DEBUG: About to call execute_relist with apply_changes={apply_changes}")
+        result = execute_relist(
+            rule.user_id, rule, apply_changes=apply_changes, sale_snapshot=sale_snapshot
+        )
+        mark = record_phase_timing(timings, 'relist', mark)
+        for phase, elapsed_ms in (result.get('timings') or {}).items():
+            timings[f'relist.{phase}'] = timings.get(f'relist.{phase}', 0) + elapsed_ms
 
-            except Exception as e:
-                log_task(f"✗ Exception during relist: {str(e)}")
-                import traceback
-                log_task(f"Traceback:\n{traceback.format_exc()}")
+        # Check result
+        if 'skip_reason' in result:
+            # Skipped due to safety check
+            log_task(f"✗ Skipped: {result['skip_reason']}")
 
-                rule.mark_error(f"Exception: {str(e)}")
+            rule.mark_skipped(result['skip_reason'])
 
-                # Only update history if it was created
-                if history:
-                    history.status = 'error'
-                    history.error_message = str(e)
-                    history.mark_completed()
+            history.status = 'skipped'
+            history.skip_reason = result['skip_reason']
+            history.old_listing_id = result.get('old_listing_id')
+            history.mark_completed()
 
-                db.session.commit()
+            outcome = 'skipped'
 
-                failed_count += 1
-                processed_count += 1
+        elif not result['success']:
+            # Failed
+            error_msg = result.get('error', 'Unknown error')
+            log_task(f"✗ Failed: {error_msg}")
 
-        # Log only if there were failures
-        if failed_count > 0:
-            log_task(f"Auto-relist: {succeeded_count} succeeded, {failed_count} failed, {skipped_count} skipped")
+            rule.mark_error(error_msg)
 
-        return {
-            'success': True,
-            'processed': processed_count,
-            'succeeded': succeeded_count,
-            'failed': failed_count,
-            'skipped': skipped_count
-        }
+            history.status = 'error'
+            history.error_message = error_msg
+            history.old_listing_id = result.get('old_listing_id')
+            history.withdraw_response = result.get('details', {}).get('withdraw')
+            history.update_response = result.get('details', {}).get('update_offer') or result.get('details', {}).get('update_inventory')
+            history.publish_response = result.get('details', {}).get('publish')
+            history.mark_completed()
+
+            # Create error notification
+            from qventory.models.notification import Notification
+            item_title = rule.item_title or 'Item'
+            Notification.create_notification(
+                user_id=rule.user_id,
+                type='error',
+                title=f'Auto-relist failed',
+                message=f'{item_title[:50]}: {error_msg}',
+                link_url='/inventory/active',
+                link_text='View Inventory',
+                source='relist'
+            )
+
+            outcome = 'failed'
+
+        else:
+            # Success!
+            new_listing_id = result['new_listing_id']
+            log_task(f"✓ Success! New listing ID: {new_listing_id}")
+
+            # Update current price if it was changed (do this BEFORE mark_success clears pending_changes)
+            if apply_changes and rule.pending_changes and 'price' in rule.pending_changes:
+                rule.current_price = rule.pending_changes['price']
+
+            from qventory.helpers.ebay_relist import (
+                get_new_listing_id_from_offer,
+                is_probable_listing_id,
+            )
+
+            new_offer_id = result.get('new_offer_id') or rule.offer_id
+            if new_offer_id and not is_probable_listing_id(str(new_offer_id)):
+                updated_listing_id = get_new_listing_id_from_offer(rule.user_id, str(new_offer_id))
+                if updated_listing_id:
+                    new_listing_id = updated_listing_id
+                    log_task(f"  Updated listing ID: {new_listing_id}")
+
+            rule.mark_success(new_listing_id, new_offer_id=new_offer_id)
+
+            history.status = 'success'
+            history.old_listing_id = result.get('old_listing_id')
+            history.new_listing_id = new_listing_id
+            history.withdraw_response = result.get('details', {}).get('withdraw')
+            history.update_response = result.get('details', {}).get('update_offer') or result.get('details', {}).get('update_inventory')
+            history.publish_response = result.get('details', {}).get('publish')
+            history.mark_completed()
+
+            # Create success notification
+            from qventory.models.notification import Notification
+            item_title = rule.item_title or 'Item'
+
+            # Check if this was the first relist
+            is_first_relist = rule.success_count == 1  # Just incremented in mark_success
+
+            if is_first_relist:
+                notification_title = 'First auto-relist completed! 🎉'
+                notification_message = f'{item_title[:50]} has been relisted successfully. New listing ID: {new_listing_id}. Next relist will run automatically based on your schedule.'
+            else:
+                notification_title = 'Auto-relist successful!'
+                notification_message = f'{item_title[:50]} was relisted with new listing ID {new_listing_id}'
+
+            Notification.create_notification(
+                user_id=rule.user_id,
+                type='success',
+                title=notification_title,
+                message=notification_message,
+                link_url='/inventory/active',
+                link_text='View Inventory',
+                source='relist'
+            )
+
+            outcome = 'succeeded'
+
+        # Commit after each rule
+        db.session.commit()
+        return outcome
+
+    except Exception as e:
+        log_task(f"✗ Exception during relist: {str(e)}")
+        import traceback
+        log_task(f"Traceback:\n{traceback.format_exc()}")
+
+        rule.mark_error(f"Exception: {str(e)}")
+
+        # Only update history if it was created
+        if history:
+            history.status = 'error'
+            history.error_message = str(e)
+            history.mark_completed()
+
+        db.session.commit()
+
+        return 'failed'
 
 
 @celery.task(bind=True, name='qventory.tasks.process_webhook_event')
@@ -4347,6 +4519,7 @@ def reconcile_user_inventory(self, user_id):
             get_listing_details_trading_api,
             parse_ebay_inventory_item
         )
+        from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_INACTIVATE, changed_since_snapshot
 
         throttle_key = f'reconcile_user_{user_id}_last_run'
         last_run_ts = SystemSetting.get_int(throttle_key)
@@ -4372,7 +4545,7 @@ def reconcile_user_inventory(self, user_id):
             SystemSetting.set_int(throttle_key, int(datetime.utcnow().timestamp()))
             return {'success': True, 'items': 0}
 
-        snapshot = fetch_active_listings_snapshot(user_id)
+        snapshot = fetch_active_listings_snapshot(user_id, max_age_seconds=SNAPSHOT_MAX_AGE_INACTIVATE)
         if not snapshot['success']:
             log_task(f"[RECONCILE] User {user_id}: snapshot failed — {snapshot.get('error')}")
             return {'success': False, 'error': snapshot.get('error')}
@@ -4403,8 +4576,8 @@ def reconcile_user_inventory(self, user_id):
         for item in items_to_sync:
             offer = offers_by_listing.get(item.ebay_listing_id)
             if offer:
-                # Reactivate if was inactive
-                if not item.is_active:
+                # Reactivate if was inactive (unless it changed after a reused snapshot)
+                if not item.is_active and not changed_since_snapshot(item, snapshot):
                     if reactivation_remaining is not None and reactivation_remaining <= 0:
                         skipped_reactivation_limit += 1
                     else:
@@ -4421,7 +4594,7 @@ def reconcile_user_inventory(self, user_id):
                     if offer.get('ebay_offer_id'):
                         item.ebay_offer_id = offer['ebay_offer_id']
             else:
-                if can_mark_inactive and item.is_active:
+                if can_mark_inactive and item.is_active and not changed_since_snapshot(item, snapshot):
                     item.is_active = False
                     timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
                     item.notes = (item.notes or '') + f"\n[{timestamp}] Marked inactive by reconciliation (not in eBay snapshot)"
@@ -4617,6 +4790,7 @@ def sync_ebay_active_inventory_auto(self):
     with app.app_context():
         from qventory.models.item import Item
         from qventory.helpers.ebay_inventory import fetch_active_listings_snapshot
+        from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_INACTIVATE, changed_since_snapshot
         from sqlalchemy import or_
         
         log_task("=== Auto-sync active inventory ===")
@@ -4658,7 +4832,7 @@ def sync_ebay_active_inventory_auto(self):
                     log_task(f"    No items to sync")
                     continue
                 
-                snapshot = fetch_active_listings_snapshot(user.id)
+                snapshot = fetch_active_listings_snapshot(user.id, max_age_seconds=SNAPSHOT_MAX_AGE_INACTIVATE)
 
                 if not snapshot['success']:
                     log_task(f"    ✗ Failed to fetch eBay data: {snapshot.get('error')}")
@@ -4700,7 +4874,7 @@ def sync_ebay_active_inventory_auto(self):
                         offer_data = offers_by_listing[item.ebay_listing_id]
 
                     if offer_data:
-                        if not item.is_active:
+                        if not item.is_active and not changed_since_snapshot(item, snapshot):
                             item.is_active = True
                             updated_count += 1
 
@@ -4714,7 +4888,7 @@ def sync_ebay_active_inventory_auto(self):
                         # Listing still present in active snapshot; keep active.
                     else:
                         # Only mark items inactive if we are confident we fetched the full offer set
-                        if can_mark_inactive:
+                        if can_mark_inactive and not changed_since_snapshot(item, snapshot):
                             # SOFT DELETE: Item no longer on eBay (sold/removed) - mark as inactive
                             # Don't mark as sold_at here - that will be set by sync_ebay_sold_orders_auto
                             if item.is_active:
@@ -5423,117 +5597,162 @@ def sync_ebay_fulfillment_tracking_user(self, user_id):
             }
 
 
+def _newest_row_date(current, rows, field):
+    dates = [row[field] for row in rows if row.get(field)]
+    if current:
+        dates.append(current)
+    return max(dates) if dates else None
+
+
+def _ebay_payout_row(user_id, payout, now):
+    payout_id = payout.get('payoutId') or payout.get('payout_id')
+    payout_date = _parse_ebay_datetime(
+        payout.get('payoutDate') or payout.get('payoutDateTime') or payout.get('payoutDateTimeGMT')
+    )
+    status = payout.get('payoutStatus') or payout.get('status')
+    amount = payout.get('amount') or payout.get('payoutAmount') or {}
+    fee = payout.get('payoutFee') or payout.get('fee') or {}
+    currency = amount.get('currency') or fee.get('currency')
+    gross_value = float(amount.get('value', 0) or 0)
+    fee_value = float(fee.get('value', 0) or 0)
+
+    external_id = payout_id or _build_external_id(
+        "payout",
+        [payout_date, gross_value, fee_value, status]
+    )
+    return {
+        'user_id': user_id,
+        'external_id': external_id,
+        'payout_id': payout_id,
+        'payout_date': payout_date,
+        'status': status,
+        'gross_amount': gross_value,
+        'fee_amount': fee_value,
+        'net_amount': gross_value - fee_value,
+        'currency': currency,
+        'raw_json': payout,
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def _ebay_finance_transaction_row(user_id, txn, now):
+    txn_id = txn.get('transactionId') or txn.get('adjustmentId')
+    txn_date = _parse_ebay_datetime(
+        txn.get('transactionDate') or txn.get('creationDate')
+    )
+    txn_type = (txn.get('transactionType') or txn.get('type') or '').upper()
+    amount = txn.get('amount') or {}
+    currency = amount.get('currency')
+    value = float(amount.get('value', 0) or 0)
+    order_id = txn.get('orderId')
+    reference_id = txn.get('referenceId')
+    ref_order_ids, ref_line_ids, ref_all_ids = extract_finance_reference_ids(txn)
+    if not order_id and ref_order_ids:
+        order_id = next(iter(ref_order_ids))
+    if not reference_id and ref_all_ids:
+        reference_id = next(iter(ref_all_ids))
+
+    external_id = txn_id or _build_external_id(
+        "txn",
+        [txn_date, txn_type, value, order_id, reference_id]
+    )
+    return {
+        'user_id': user_id,
+        'external_id': external_id,
+        'transaction_id': txn_id,
+        'transaction_date': txn_date,
+        'transaction_type': txn_type,
+        'amount': value,
+        'currency': currency,
+        'order_id': order_id,
+        'reference_id': reference_id,
+        'raw_json': txn,
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+EBAY_PAYOUT_UPSERT_COLUMNS = (
+    'payout_id', 'payout_date', 'status', 'gross_amount', 'fee_amount',
+    'net_amount', 'currency', 'raw_json', 'updated_at',
+)
+EBAY_FINANCE_TX_UPSERT_COLUMNS = (
+    'transaction_id', 'transaction_date', 'transaction_type', 'amount',
+    'currency', 'order_id', 'reference_id', 'raw_json', 'updated_at',
+)
+
+
 @celery.task(bind=True, name='qventory.tasks.sync_ebay_finances_user')
-def sync_ebay_finances_user(self, user_id, days_back=120):
+def sync_ebay_finances_user(self, user_id, days_back=120, incremental=True):
+    """
+    Sync eBay payouts and finance transactions for one user.
+
+    Incremental runs only request the window since the user's last successful
+    sync (minus a short overlap), capped at days_back. Pass incremental=False
+    to re-read the whole days_back window (backfills / recalculations).
+    Each API page is written with one INSERT ... ON CONFLICT statement.
+    """
     app = create_app()
     with app.app_context():
         from qventory.models.ebay_finance import EbayPayout, EbayFinanceTransaction
         from qventory.helpers.ebay_finances import (
-            fetch_all_ebay_payouts,
-            fetch_all_ebay_transactions
+            finance_sync_start,
+            finance_synced_until,
+            iter_ebay_payout_pages,
+            iter_ebay_transaction_pages,
+            set_finance_sync_watermark,
+            upsert_finance_rows
         )
 
         log_task(f"=== Syncing eBay finances for user {user_id} ===")
-        if days_back is None:
-            start_date = datetime.utcnow() - timedelta(days=1825)  # eBay max: 5 years
-        else:
-            start_date = datetime.utcnow() - timedelta(days=min(days_back, 1825))
         end_date = datetime.utcnow()
-
-        payouts_result = fetch_all_ebay_payouts(user_id, start_date, end_date, limit=200)
-        if not payouts_result.get('success'):
-            return {'success': False, 'error': payouts_result.get('error')}
-
-        transactions_result = fetch_all_ebay_transactions(user_id, start_date, end_date, limit=200)
-        if not transactions_result.get('success'):
-            return {'success': False, 'error': transactions_result.get('error')}
+        start_date = finance_sync_start(user_id, days_back, incremental=incremental, now=end_date)
+        log_task(f"  Window: {start_date.isoformat()} -> {end_date.isoformat()} (incremental={incremental})")
 
         payouts_created = 0
         payouts_updated = 0
-        for payout in payouts_result.get('payouts', []):
-            payout_id = payout.get('payoutId') or payout.get('payout_id')
-            payout_date = _parse_ebay_datetime(
-                payout.get('payoutDate') or payout.get('payoutDateTime') or payout.get('payoutDateTimeGMT')
-            )
-            status = payout.get('payoutStatus') or payout.get('status')
-            amount = payout.get('amount') or payout.get('payoutAmount') or {}
-            fee = payout.get('payoutFee') or payout.get('fee') or {}
-            currency = amount.get('currency') or fee.get('currency')
-            gross_value = float(amount.get('value', 0) or 0)
-            fee_value = float(fee.get('value', 0) or 0)
-            net_value = gross_value - fee_value
-
-            external_id = payout_id or _build_external_id(
-                "payout",
-                [payout_date, gross_value, fee_value, status]
-            )
-
-            existing = EbayPayout.query.filter_by(
-                user_id=user_id,
-                external_id=external_id
-            ).first()
-            if existing:
-                record = existing
-                payouts_updated += 1
-            else:
-                record = EbayPayout(user_id=user_id, external_id=external_id)
-                payouts_created += 1
-
-            record.payout_id = payout_id
-            record.payout_date = payout_date
-            record.status = status
-            record.gross_amount = gross_value
-            record.fee_amount = fee_value
-            record.net_amount = net_value
-            record.currency = currency
-            record.raw_json = payout
-            db.session.add(record)
+        payouts_truncated = False
+        newest_payout = None
+        for page in iter_ebay_payout_pages(user_id, start_date, end_date, limit=200):
+            if not page.get('success'):
+                db.session.rollback()
+                return {'success': False, 'error': page.get('error')}
+            rows = [_ebay_payout_row(user_id, payout, end_date) for payout in page.get('payouts', [])]
+            created, updated = upsert_finance_rows(db.session, EbayPayout, rows, EBAY_PAYOUT_UPSERT_COLUMNS)
+            payouts_created += created
+            payouts_updated += updated
+            payouts_truncated = bool(page.get('truncated'))
+            newest_payout = _newest_row_date(newest_payout, rows, 'payout_date')
 
         tx_created = 0
         tx_updated = 0
-        for txn in transactions_result.get('transactions', []):
-            txn_id = txn.get('transactionId') or txn.get('adjustmentId')
-            txn_date = _parse_ebay_datetime(
-                txn.get('transactionDate') or txn.get('creationDate')
+        tx_truncated = False
+        newest_tx = None
+        for page in iter_ebay_transaction_pages(user_id, start_date, end_date, limit=200):
+            if not page.get('success'):
+                db.session.rollback()
+                return {'success': False, 'error': page.get('error')}
+            rows = [_ebay_finance_transaction_row(user_id, txn, end_date) for txn in page.get('transactions', [])]
+            created, updated = upsert_finance_rows(
+                db.session, EbayFinanceTransaction, rows, EBAY_FINANCE_TX_UPSERT_COLUMNS
             )
-            txn_type = (txn.get('transactionType') or txn.get('type') or '').upper()
-            amount = txn.get('amount') or {}
-            currency = amount.get('currency')
-            value = float(amount.get('value', 0) or 0)
-            order_id = txn.get('orderId')
-            reference_id = txn.get('referenceId')
-            ref_order_ids, ref_line_ids, ref_all_ids = extract_finance_reference_ids(txn)
-            if not order_id and ref_order_ids:
-                order_id = next(iter(ref_order_ids))
-            if not reference_id and ref_all_ids:
-                reference_id = next(iter(ref_all_ids))
-
-            external_id = txn_id or _build_external_id(
-                "txn",
-                [txn_date, txn_type, value, order_id, reference_id]
+            tx_created += created
+            tx_updated += updated
+            tx_truncated = bool(page.get('truncated'))
+            newest_tx = _newest_row_date(newest_tx, rows, 'transaction_date')
+
+        # Don't move the watermark past rows a capped run never fetched
+        synced_until = finance_synced_until(
+            end_date, (payouts_truncated, newest_payout), (tx_truncated, newest_tx)
+        )
+        if synced_until is not None:
+            set_finance_sync_watermark(user_id, synced_until)
+        if synced_until != end_date:
+            log_task(
+                f"⚠ Page limit reached (payouts={payouts_truncated}, transactions={tx_truncated}); "
+                f"synced up to {synced_until.isoformat() if synced_until else 'previous watermark'}"
             )
-
-            existing = EbayFinanceTransaction.query.filter_by(
-                user_id=user_id,
-                external_id=external_id
-            ).first()
-            if existing:
-                record = existing
-                tx_updated += 1
-            else:
-                record = EbayFinanceTransaction(user_id=user_id, external_id=external_id)
-                tx_created += 1
-
-            record.transaction_id = txn_id
-            record.transaction_date = txn_date
-            record.transaction_type = txn_type
-            record.amount = value
-            record.currency = currency
-            record.order_id = order_id
-            record.reference_id = reference_id
-            record.raw_json = txn
-            db.session.add(record)
-
         db.session.commit()
         log_task(
             f"eBay finances sync complete: payouts +{payouts_created}/~{payouts_updated}, "
@@ -5544,7 +5763,9 @@ def sync_ebay_finances_user(self, user_id, days_back=120):
             'payouts_created': payouts_created,
             'payouts_updated': payouts_updated,
             'transactions_created': tx_created,
-            'transactions_updated': tx_updated
+            'transactions_updated': tx_updated,
+            'window_start': start_date.isoformat(),
+            'truncated': payouts_truncated or tx_truncated
         }
 
 
@@ -5913,19 +6134,25 @@ def sync_ebay_finances_global(self):
 
 
 @celery.task(bind=True, name='qventory.tasks.sync_ebay_feedback_user')
-def sync_ebay_feedback_user(self, user_id, days_back=1, max_pages=5):
+def sync_ebay_feedback_user(self, user_id, days_back=1, max_pages=5, incremental=True):
     app = create_app()
     with app.app_context():
         from qventory.helpers.ebay_feedback import sync_ebay_feedback_for_user
         from qventory.helpers.utils import get_or_create_settings
 
-        log_task(f"[FEEDBACK] Syncing feedback for user {user_id} (last {days_back} day(s))")
-        result = sync_ebay_feedback_for_user(user_id, days_back=days_back, max_pages=max_pages)
+        mode = "new feedback" if incremental else f"last {days_back} day(s)"
+        log_task(f"[FEEDBACK] Syncing feedback for user {user_id} ({mode})")
+        result = sync_ebay_feedback_for_user(
+            user_id, days_back=days_back, max_pages=max_pages, incremental=incremental
+        )
         if result.get("success"):
             s = get_or_create_settings(user_id)
             s.feedback_last_sync_at = datetime.utcnow()
             db.session.commit()
-            log_task(f"[FEEDBACK] ✓ {result.get('created', 0)} created, {result.get('updated', 0)} updated")
+            log_task(
+                f"[FEEDBACK] ✓ {result.get('created', 0)} created, {result.get('updated', 0)} updated "
+                f"({result.get('pages', 0)} page(s))"
+            )
         else:
             log_task(f"[FEEDBACK] ✗ Sync failed: {result.get('error')}")
         return result
@@ -5939,7 +6166,7 @@ def backfill_ebay_feedback_user(self, user_id, max_pages=50):
         from qventory.helpers.utils import get_or_create_settings
 
         log_task(f"[FEEDBACK] Backfilling historical feedback for user {user_id}")
-        result = sync_ebay_feedback_for_user(user_id, days_back=None, max_pages=max_pages)
+        result = sync_ebay_feedback_for_user(user_id, days_back=None, max_pages=max_pages, incremental=False)
         if result.get("success"):
             s = get_or_create_settings(user_id)
             s.feedback_last_sync_at = datetime.utcnow()
@@ -5952,14 +6179,20 @@ def backfill_ebay_feedback_user(self, user_id, max_pages=50):
 
 
 @celery.task(bind=True, name='qventory.tasks.sync_ebay_feedback_global')
-def sync_ebay_feedback_global(self):
+def sync_ebay_feedback_global(self, reply_sweep=False):
+    """
+    Daily: new feedback per user (stops at the stored cursor).
+    Weekly with reply_sweep=True: re-read the last FEEDBACK_REPLY_SWEEP_DAYS
+    to pick up replies and follow-ups on older feedback.
+    """
     app = create_app()
     with app.app_context():
+        from qventory.helpers.ebay_feedback import FEEDBACK_REPLY_SWEEP_DAYS
         from qventory.models.marketplace_credential import MarketplaceCredential
         from qventory.models.setting import Setting
         from qventory.models.user import User
 
-        log_task("=== Global eBay feedback sync (daily) ===")
+        log_task(f"=== Global eBay feedback sync ({'reply sweep' if reply_sweep else 'daily'}) ===")
 
         enabled_settings = Setting.query.filter(Setting.feedback_manager_enabled.is_(True)).all()
         if not enabled_settings:
@@ -5984,7 +6217,11 @@ def sync_ebay_feedback_global(self):
             log_task("No active eBay credentials found for Feedback Manager users")
             return {'success': True, 'users_processed': 0, 'errors': 0}
 
-        batch_users = get_user_batch(users, batch_size=50, cursor_key='sync_feedback_batch_cursor')
+        batch_users = get_user_batch(
+            users,
+            batch_size=50,
+            cursor_key='sweep_feedback_batch_cursor' if reply_sweep else 'sync_feedback_batch_cursor'
+        )
         log_task(f"Processing feedback batch of {len(batch_users)} users")
 
         users_processed = 0
@@ -5992,7 +6229,12 @@ def sync_ebay_feedback_global(self):
         for user, _cred in batch_users:
             try:
                 users_processed += 1
-                sync_ebay_feedback_user.run(user.id, days_back=1, max_pages=5)
+                if reply_sweep:
+                    sync_ebay_feedback_user.run(
+                        user.id, days_back=FEEDBACK_REPLY_SWEEP_DAYS, max_pages=5, incremental=False
+                    )
+                else:
+                    sync_ebay_feedback_user.run(user.id, days_back=1, max_pages=5)
             except Exception as exc:
                 errors += 1
                 log_task(f"[FEEDBACK] Sync failed for user {user.id}: {exc}")
@@ -6040,7 +6282,7 @@ def recalculate_ebay_analytics_global(self):
                 import_ebay_sales.run(cred.user_id, days_back=730)
                 time.sleep(2)
 
-                sync_ebay_finances_user.run(cred.user_id, days_back=730)
+                sync_ebay_finances_user.run(cred.user_id, days_back=730, incremental=False)
                 time.sleep(2)
 
                 reconcile_sales_from_finances(
@@ -6073,7 +6315,7 @@ def reconcile_user_finances(self, user_id, days_back=730):
         log_task(f"=== Reconciling finances for user {user_id} ({username}) ===")
 
         try:
-            sync_ebay_finances_user.run(user_id, days_back=days_back)
+            sync_ebay_finances_user.run(user_id, days_back=days_back, incremental=False)
             log_task(f"Finance sync complete for user {user_id}")
         except Exception as exc:
             log_task(f"Finance sync failed for user {user_id}: {exc}")
@@ -6134,7 +6376,7 @@ def backfill_shipping_costs_global(self):
                 log_task(f"Backfilling shipping costs for user {cred.user_id} ({user.username})...")
 
                 # Step 1: Sync finances (fetches SHIPPING_LABEL transactions from Finances API)
-                sync_ebay_finances_user.run(cred.user_id, days_back=730)
+                sync_ebay_finances_user.run(cred.user_id, days_back=730, incremental=False)
 
                 # Step 2: Reconcile to map fees (including shipping_label) to sales
                 # skip_fulfillment_api=True to avoid 429 rate limits from Fulfillment API
@@ -6480,6 +6722,7 @@ def sync_and_purge_inactive_items(self):
         from qventory.models.item import Item
         from qventory.models.marketplace_credential import MarketplaceCredential
         from qventory.helpers.ebay_inventory import fetch_active_listings_snapshot
+        from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_INACTIVATE, changed_since_snapshot
         from sqlalchemy import and_
 
         log_task("=== ADMIN: Starting eBay sync and purge task ===")
@@ -6508,7 +6751,7 @@ def sync_and_purge_inactive_items(self):
 
                 # Get current active listings from eBay
                 log_task(f"  Fetching active listings from eBay...")
-                snapshot = fetch_active_listings_snapshot(user.id)
+                snapshot = fetch_active_listings_snapshot(user.id, max_age_seconds=SNAPSHOT_MAX_AGE_INACTIVATE)
 
                 if not snapshot.get('success'):
                     log_task(f"  ✗ Failed to fetch eBay inventory: {snapshot.get('error')}")
@@ -6571,6 +6814,8 @@ def sync_and_purge_inactive_items(self):
                 marked_inactive = 0
                 for db_item in db_items:
                     if str(db_item.ebay_listing_id) not in active_ebay_listing_ids:
+                        if changed_since_snapshot(db_item, snapshot):
+                            continue
                         # Item no longer active on eBay
                         db_item.is_active = False
                         try:
@@ -6626,6 +6871,7 @@ def reactivate_inactive_ebay_items(self):
         from qventory.models.marketplace_credential import MarketplaceCredential
         from qventory.models.user import User
         from qventory.helpers.ebay_inventory import fetch_active_listings_snapshot
+        from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_INACTIVATE, changed_since_snapshot
 
         log_task("=== ADMIN: Reactivating inactive eBay items ===")
         credentials = MarketplaceCredential.query.filter_by(
@@ -6647,7 +6893,7 @@ def reactivate_inactive_ebay_items(self):
 
             log_task(f"[{idx}/{total_accounts}] Checking user {user.username} (ID {user.id})")
 
-            snapshot = fetch_active_listings_snapshot(user.id)
+            snapshot = fetch_active_listings_snapshot(user.id, max_age_seconds=SNAPSHOT_MAX_AGE_INACTIVATE)
             if not snapshot['success']:
                 log_task(f"  ✗ Failed to fetch eBay snapshot: {snapshot.get('error')}")
                 summary.append({
@@ -6672,7 +6918,13 @@ def reactivate_inactive_ebay_items(self):
             ).all()
 
             reactivated = 0
+            skipped_stale = 0
             for item in inactive_items:
+                if changed_since_snapshot(item, snapshot):
+                    # Sold/ended after the reused snapshot was fetched
+                    skipped_stale += 1
+                    continue
+
                 offer_data = None
                 if item.ebay_listing_id:
                     offer_data = offers_by_listing.get(str(item.ebay_listing_id))
@@ -6712,6 +6964,8 @@ def reactivate_inactive_ebay_items(self):
                 log_task(f"  ✓ Reactivated {reactivated} items")
             else:
                 log_task("  No items to reactivate")
+            if skipped_stale:
+                log_task(f"  Skipped {skipped_stale} items changed since the cached snapshot")
 
             summary.append({
                 'user_id': user.id,
@@ -7269,6 +7523,7 @@ def backfill_missing_item_images_for_user(self, user_id):
             get_listing_details_trading_api,
             parse_ebay_inventory_item,
         )
+        from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_LOOKUP
         from qventory.helpers.image_processor import download_and_upload_image
 
         user = User.query.get(user_id)
@@ -7352,7 +7607,8 @@ def backfill_missing_item_images_for_user(self, user_id):
                 active_snapshot = get_active_listings_trading_api(
                     user_id,
                     max_items=5000,
-                    collect_failures=False
+                    collect_failures=False,
+                    max_age_seconds=SNAPSHOT_MAX_AGE_LOOKUP
                 ) or []
                 for entry in active_snapshot:
                     listing_key = str(entry.get('ebay_listing_id') or '').strip()
@@ -7581,6 +7837,7 @@ def sync_ebay_category_fee_catalog_chunk(self, user_id, offset, limit, marketpla
         from qventory.models.ebay_category import EbayCategory
         from qventory.models.ebay_fee_rule import EbayFeeRule
         from qventory.helpers.ebay_fee_live import get_live_fee_estimate
+        from qventory.helpers.ebay_fees import invalidate_fee_rule_cache
         from qventory.models.system_setting import SystemSetting
 
         base_price = float(SystemSetting.get_int('ebay_fee_sync_base_price', 100) or 100)
@@ -7653,6 +7910,7 @@ def sync_ebay_category_fee_catalog_chunk(self, user_id, offset, limit, marketpla
                 errors += 1
 
         db.session.commit()
+        invalidate_fee_rule_cache()
 
         return {
             "success": True,
@@ -7663,3 +7921,711 @@ def sync_ebay_category_fee_catalog_chunk(self, user_id, offset, limit, marketpla
             "updated": updated,
             "errors": errors
         }
+
+
+# ==================== RECEIPT OCR ====================
+
+def queue_receipt_ocr(receipt):
+    """
+    Enqueue OCR extraction for an uploaded receipt.
+
+    Only ids travel through the broker; the worker reads the image from the
+    receipt's Cloudinary URL. Returns True when the task was queued.
+    """
+    if not receipt or not getattr(receipt, "id", None):
+        return False
+
+    try:
+        process_receipt_ocr.apply_async(
+            kwargs={"receipt_id": receipt.id, "user_id": receipt.user_id},
+            queue=RECEIPT_OCR_QUEUE,
+        )
+        return True
+    except Exception as exc:
+        log_task(f"⚠ Failed to queue receipt OCR receipt_id={receipt.id}: {exc}")
+        return False
+
+
+def queue_receipt_ocr_batch(receipts):
+    """
+    Enqueue OCR for many receipts as one Celery group (single producer connection).
+
+    Returns the number of receipts queued (0 if the broker is unavailable).
+    """
+    from celery import group
+
+    signatures = [
+        process_receipt_ocr.s(receipt_id=receipt.id, user_id=receipt.user_id).set(queue=RECEIPT_OCR_QUEUE)
+        for receipt in receipts
+        if receipt and getattr(receipt, "id", None)
+    ]
+    if not signatures:
+        return 0
+
+    try:
+        group(signatures).apply_async()
+        return len(signatures)
+    except Exception as exc:
+        log_task(f"⚠ Failed to queue receipt OCR batch ({len(signatures)} receipts): {exc}")
+        return 0
+
+
+@celery.task(bind=True, name="qventory.tasks.process_receipt_ocr")
+def process_receipt_ocr(self, receipt_id, user_id, **legacy_kwargs):
+    """
+    Run OCR for a receipt: pending -> processing -> extracted (or failed).
+
+    legacy_kwargs absorbs image_b64/content_type from tasks queued before
+    images were read from Cloudinary.
+    """
+    app = create_app()
+
+    with app.app_context():
+        from qventory.helpers.ocr_service import get_ocr_service
+        from qventory.models.receipt import Receipt
+        from qventory.models.receipt_item import ReceiptItem
+        from qventory.models.receipt_usage import ReceiptUsage
+        from qventory.models.user import User
+
+        receipt = Receipt.query.filter_by(id=receipt_id, user_id=user_id).first()
+        if not receipt:
+            return {"success": False, "status": "not_found", "receipt_id": receipt_id}
+
+        # Redelivered or already handled task: never OCR (and bill) twice
+        if receipt.status not in ("pending", "failed"):
+            return {"success": True, "status": "skipped", "receipt_status": receipt.status}
+
+        receipt.status = "processing"
+        receipt.ocr_error_message = None
+        db.session.commit()
+
+        try:
+            ocr_service = get_ocr_service()
+            log_task(f"Receipt OCR receipt_id={receipt.id} provider={ocr_service.provider}")
+            ocr_result = ocr_service.extract_receipt_data(receipt.image_url)
+
+            receipt.ocr_provider = ocr_service.provider
+            receipt.ocr_raw_text = ocr_result.raw_text
+            receipt.ocr_confidence = ocr_result.confidence
+            receipt.ocr_processed_at = datetime.utcnow()
+
+            if ocr_result.error:
+                receipt.status = "failed"
+                receipt.ocr_error_message = ocr_result.error
+                db.session.commit()
+                log_task(f"✗ Receipt OCR failed receipt_id={receipt.id}: {ocr_result.error}")
+                return {"success": False, "status": "failed", "error": ocr_result.error}
+
+            receipt.merchant_name = ocr_result.merchant_name
+            receipt.receipt_date = ocr_result.receipt_date
+            receipt.receipt_number = ocr_result.receipt_number
+            receipt.subtotal = ocr_result.subtotal
+            receipt.tax_amount = ocr_result.tax_amount
+            receipt.total_amount = ocr_result.total_amount
+
+            for item_data in ocr_result.line_items:
+                db.session.add(ReceiptItem(
+                    receipt_id=receipt.id,
+                    line_number=item_data.get("line_number"),
+                    description=item_data.get("description"),
+                    quantity=item_data.get("quantity"),
+                    unit_price=item_data.get("unit_price"),
+                    total_price=item_data.get("total_price"),
+                    ocr_confidence=item_data.get("confidence")
+                ))
+
+            receipt.status = "extracted"
+
+            user = db.session.get(User, user_id)
+            subscription = user.get_subscription() if user else None
+            # record_usage commits the receipt changes together with the usage row
+            ReceiptUsage.record_usage(
+                user_id=user_id,
+                receipt_id=receipt.id,
+                plan=subscription.plan if subscription else "free",
+                provider=ocr_service.provider
+            )
+
+            log_task(f"✓ Receipt OCR extracted {len(ocr_result.line_items)} items receipt_id={receipt.id}")
+            return {
+                "success": True,
+                "status": "extracted",
+                "receipt_id": receipt.id,
+                "items": len(ocr_result.line_items),
+            }
+
+        except Exception as exc:
+            db.session.rollback()
+            receipt = db.session.get(Receipt, receipt_id)
+            if receipt:
+                receipt.status = "failed"
+                receipt.ocr_error_message = str(exc)
+                db.session.commit()
+            log_task(f"✗ Receipt OCR crashed receipt_id={receipt_id}: {exc}")
+            return {"success": False, "status": "failed", "error": str(exc)}
+
+
+# ==================== EMAIL OUTBOX ====================
+
+@celery.task(bind=True, name='qventory.tasks.deliver_email_outbox')
+def deliver_email_outbox(self):
+    """
+    Send queued emails in batches (one SMTP connection per batch).
+
+    Scheduled right after send_email() queues a message, and every minute by
+    beat to pick up retries.
+    """
+    app = create_app()
+
+    with app.app_context():
+        from qventory.helpers.email_outbox import (
+            EMAIL_BATCH_SIZE, EMAIL_MAX_BATCHES_PER_RUN, deliver_due_emails, purge_sent_emails
+        )
+
+        totals = {'sent': 0, 'retrying': 0, 'failed': 0}
+        for _ in range(EMAIL_MAX_BATCHES_PER_RUN):
+            counts = deliver_due_emails()
+            if counts.get('error'):
+                return {'success': False, 'error': counts['error']}
+            for key in totals:
+                totals[key] += counts[key]
+            if counts['claimed'] < EMAIL_BATCH_SIZE:
+                break
+
+        purged = purge_sent_emails()
+        if any(totals.values()) or purged:
+            log_task(
+                f"✓ Email outbox: {totals['sent']} sent, {totals['retrying']} retrying, "
+                f"{totals['failed']} failed, {purged} purged"
+            )
+        return {'success': True, **totals, 'purged': purged}
+
+
+# ==================== USER-TRIGGERED EBAY JOBS ====================
+
+EBAY_LOCATION_SYNC_BATCH_SIZE = int(os.environ.get("EBAY_LOCATION_SYNC_BATCH_SIZE", "25"))  # Revisions per HTTP session / progress commit
+EBAY_REVISE_CALLS_PER_SECOND = float(os.environ.get("EBAY_REVISE_CALLS_PER_SECOND", "4"))  # Per-job ReviseItem rate
+INVENTORY_SYNC_PROGRESS_EVERY = 250  # Items between progress commits
+MAX_ACTIVE_JOBS_PER_USER = int(os.environ.get("MAX_ACTIVE_JOBS_PER_USER", "3"))
+
+
+class JobCancelled(Exception):
+    """Raised at a checkpoint when the user cancelled the running job"""
+
+
+def queue_background_job(job, task):
+    """
+    Dispatch the Celery task for a committed BackgroundJob row.
+
+    Returns True when queued; otherwise the job is marked failed.
+    """
+    from qventory.helpers.job_progress import publish_job_state
+
+    try:
+        async_result = task.apply_async(args=[job.id])
+    except Exception as exc:
+        log_task(f"⚠ Failed to queue {job.job_type} job {job.id}: {exc}")
+        job.mark_failed(f"Could not queue job: {exc}")
+        db.session.commit()
+        publish_job_state(job)
+        return False
+
+    job.celery_task_id = async_result.id
+    db.session.commit()
+    publish_job_state(job)
+    return True
+
+
+def _lock_user_jobs(user_id):
+    """Serialize job creation per user on the user row (no-op on SQLite)."""
+    from qventory.models.user import User
+
+    db.session.query(User.id).filter(User.id == user_id).with_for_update().first()
+
+
+def start_background_job(user_id, job_type, params=None):
+    """
+    Create and dispatch a BackgroundJob, reusing an identical in-flight job.
+
+    The dedup lookup, the per-user cap and the insert run under a lock on the
+    user row, so a double click or two tabs cannot create the same job twice.
+
+    Returns:
+        dict: {'success': True, 'job': BackgroundJob, 'existing': bool} or
+              {'success': False, 'error': str, 'error_code': str, 'job': BackgroundJob|None}
+              error_code is 'too_many_jobs' or 'queue_failed'
+    """
+    from qventory.models.background_job import BackgroundJob
+
+    task = _background_job_task(job_type)
+    dedup_key = BackgroundJob.make_dedup_key(job_type, params)
+
+    _lock_user_jobs(user_id)
+    existing = BackgroundJob.find_active(user_id, job_type, dedup_key=dedup_key)
+    if existing:
+        db.session.commit()  # Release the lock
+        return {'success': True, 'job': existing, 'existing': True}
+
+    if BackgroundJob.active_query(user_id).count() >= MAX_ACTIVE_JOBS_PER_USER:
+        db.session.commit()
+        return {
+            'success': False,
+            'job': None,
+            'error_code': 'too_many_jobs',
+            'error': f'You already have {MAX_ACTIVE_JOBS_PER_USER} background jobs running. '
+                     'Wait for one to finish or cancel it.',
+        }
+
+    job = BackgroundJob(user_id=user_id, job_type=job_type, params=params, dedup_key=dedup_key)
+    db.session.add(job)
+    db.session.commit()
+
+    if not queue_background_job(job, task):
+        return {
+            'success': False,
+            'job': job,
+            'error_code': 'queue_failed',
+            'error': 'Could not start the job. Please try again in a minute.',
+        }
+    return {'success': True, 'job': job, 'existing': False}
+
+
+def request_background_job_cancel(job):
+    """
+    Cancel a job: pending jobs stop immediately, running jobs at their next checkpoint.
+
+    Returns True when the job was still active.
+    """
+    from qventory.helpers.job_progress import publish_job_state, signal_job_cancel
+
+    if not job.is_active:
+        return False
+
+    if job.status == 'pending':
+        job.mark_cancelled()
+        if job.celery_task_id:
+            try:
+                celery.control.revoke(job.celery_task_id)
+            except Exception as exc:
+                log_task(f"⚠ Could not revoke task for job {job.id}: {exc}")
+    else:
+        job.cancel_requested = True
+    db.session.commit()
+
+    signal_job_cancel(job.id)
+    publish_job_state(job)
+    return True
+
+
+def _job_checkpoint(job):
+    """
+    Commit progress, publish it, and stop if the user cancelled the job.
+
+    Runners call this between batches.
+    """
+    from qventory.helpers.job_progress import job_cancel_signalled, publish_job_state
+
+    db.session.commit()
+    publish_job_state(job)
+
+    cancelled = job_cancel_signalled(job.id)
+    if cancelled is None:
+        db.session.refresh(job)
+        cancelled = job.cancel_requested
+    if cancelled:
+        raise JobCancelled()
+
+
+def _run_background_job(job_id, runner):
+    """Load a BackgroundJob, run it and record failures/cancellation on the row."""
+    from qventory.models.background_job import BackgroundJob
+    from qventory.helpers.job_progress import publish_job_state
+
+    job = db.session.get(BackgroundJob, job_id)
+    if not job:
+        log_task(f"✗ Background job {job_id} not found")
+        return {'success': False, 'error': 'job_not_found'}
+    if not job.is_active:
+        log_task(f"⚠ Background job {job_id} already {job.status}; skipping")
+        return {'success': False, 'error': f'job_{job.status}'}
+
+    try:
+        result = runner(job)
+    except JobCancelled:
+        db.session.rollback()
+        job = db.session.get(BackgroundJob, job_id)
+        if job:
+            job.mark_cancelled()
+            db.session.commit()
+            publish_job_state(job)
+        log_task(f"⚠ Background job {job_id} cancelled by user")
+        return {'success': False, 'error': 'cancelled'}
+    except Exception as exc:
+        db.session.rollback()
+        job = db.session.get(BackgroundJob, job_id)
+        if job:
+            job.mark_failed(exc)
+            db.session.commit()
+            publish_job_state(job)
+        log_task(f"✗ Background job {job_id} crashed: {exc}")
+        return {'success': False, 'error': str(exc)}
+
+    publish_job_state(job)
+    return result
+
+
+@celery.task(bind=True, name='qventory.tasks.sync_ebay_inventory_job')
+def sync_ebay_inventory_job(self, job_id):
+    """
+    Update a user's eBay-linked items from the active listings snapshot.
+
+    Started by /sync-ebay-inventory; progress is tracked on the BackgroundJob.
+    """
+    app = create_app()
+
+    with app.app_context():
+        return _run_background_job(job_id, _run_ebay_inventory_sync)
+
+
+def _run_ebay_inventory_sync(job):
+    from qventory.models.item import Item
+    from qventory.helpers.ebay_inventory import fetch_active_listings_snapshot
+    from qventory.helpers.ebay_listing_snapshot import SNAPSHOT_MAX_AGE_MANUAL, changed_since_snapshot
+    from qventory.helpers.link_bio import remove_featured_items_for_user
+
+    user_id = job.user_id
+    item_limit = (job.params or {}).get('item_limit')
+
+    items_query = Item.query.filter(
+        Item.user_id == user_id,
+        Item.ebay_listing_id.isnot(None),
+        Item.is_active.is_(True),
+        Item.inactive_by_user.is_(False)
+    )
+    if item_limit is not None:
+        items_query = items_query.limit(item_limit)
+    item_ids = [item_id for (item_id,) in items_query.with_entities(Item.id).all()]
+
+    job.mark_processing(total_items=len(item_ids))
+    _job_checkpoint(job)
+
+    if not item_ids:
+        job.mark_completed({'message': 'No items with eBay listings to sync', 'updated': 0})
+        db.session.commit()
+        return {'success': True, 'total': 0}
+
+    log_task(f"[SYNC_INVENTORY] Job {job.id}: syncing {len(item_ids)} items for user {user_id}")
+
+    snapshot = fetch_active_listings_snapshot(user_id, max_age_seconds=SNAPSHOT_MAX_AGE_MANUAL)
+    if not snapshot['success']:
+        job.mark_failed(snapshot.get('error') or 'Failed to fetch eBay data')
+        db.session.commit()
+        return {'success': False, 'error': job.error_message}
+
+    offers_by_listing = {
+        offer.get('ebay_listing_id'): offer
+        for offer in snapshot['offers']
+        if offer.get('ebay_listing_id')
+    }
+    can_mark_inactive = snapshot.get('can_mark_inactive', False)
+    sources = ', '.join(snapshot.get('sources', [])) or 'unknown'
+    log_task(
+        f"[SYNC_INVENTORY] Sources: {sources} | offers: {len(snapshot.get('offers', []))} "
+        f"| can_mark_inactive={can_mark_inactive}"
+    )
+
+    active_statuses = {'PUBLISHED', 'ACTIVE', 'IN_PROGRESS', 'SCHEDULED', 'ON_HOLD', 'LIVE'}
+    updated_count = 0
+    deleted_count = 0
+    skipped_inactive = 0
+    deactivated_ids = []
+
+    for start in range(0, len(item_ids), INVENTORY_SYNC_PROGRESS_EVERY):
+        chunk_ids = item_ids[start:start + INVENTORY_SYNC_PROGRESS_EVERY]
+        items = Item.query.filter(Item.id.in_(chunk_ids)).all()
+
+        for item in items:
+            offer_data = offers_by_listing.get(item.ebay_listing_id) if item.ebay_listing_id else None
+
+            if offer_data:
+                if offer_data.get('item_price') and offer_data['item_price'] != item.item_price:
+                    item.item_price = offer_data['item_price']
+                    updated_count += 1
+                if offer_data.get('ebay_url') and not item.ebay_url:
+                    item.ebay_url = offer_data['ebay_url']
+                if offer_data.get('ebay_offer_id'):
+                    item.ebay_offer_id = offer_data['ebay_offer_id']
+                if not item.ebay_sku and offer_data.get('ebay_sku'):
+                    item.ebay_sku = offer_data['ebay_sku']
+
+                listing_status = str(offer_data.get('listing_status', 'ACTIVE')).upper()
+                if (
+                    (listing_status in active_statuses or not listing_status)
+                    and not item.is_active
+                    and not changed_since_snapshot(item, snapshot)
+                ):
+                    item.is_active = True
+            elif can_mark_inactive and not changed_since_snapshot(item, snapshot):
+                # SOFT DELETE: Item no longer exists on eBay (sold/removed)
+                if item.is_active:
+                    item.is_active = False
+                    deactivated_ids.append(item.id)
+                    deleted_count += 1
+            else:
+                skipped_inactive += 1
+
+        job.processed_items = start + len(chunk_ids)
+        _job_checkpoint(job)
+
+    if deactivated_ids:
+        try:
+            remove_featured_items_for_user(user_id, deactivated_ids)
+        except Exception:
+            pass
+
+    message = (
+        f'Synced {len(item_ids)} items: {updated_count} updated, '
+        f'{deleted_count} marked inactive (sold/inactive on eBay)'
+    )
+    job.succeeded_count = updated_count
+    job.skipped_count = skipped_inactive
+    job.mark_completed({
+        'message': message,
+        'total': len(item_ids),
+        'updated': updated_count,
+        'deleted': deleted_count,
+        'inactive_skipped': skipped_inactive,
+    })
+    db.session.commit()
+
+    log_task(
+        f"[SYNC_INVENTORY] ✓ Job {job.id}: {updated_count} updated, {deleted_count} marked inactive "
+        f"(skipped inactive: {skipped_inactive})"
+    )
+    return {'success': True, 'total': len(item_ids), 'updated': updated_count, 'deleted': deleted_count}
+
+
+@celery.task(bind=True, name='qventory.tasks.sync_ebay_locations_job')
+def sync_ebay_locations_job(self, job_id):
+    """
+    Push item location codes to their eBay Custom SKU (ReviseItem), rate-limited.
+
+    Started by bulk location assignment and /items/bulk_sync_to_ebay.
+    """
+    app = create_app()
+
+    with app.app_context():
+        return _run_background_job(job_id, _run_ebay_location_sync)
+
+
+def _run_ebay_location_sync(job):
+    import requests
+    from qventory.models.item import Item
+    from qventory.helpers.ebay_inventory import sync_location_to_ebay_sku
+
+    user_id = job.user_id
+    item_ids = [int(x) for x in (job.params or {}).get('item_ids') or []]
+
+    targets = Item.query.with_entities(Item.ebay_listing_id, Item.location_code).filter(
+        Item.user_id == user_id,
+        Item.id.in_(item_ids),
+        Item.ebay_listing_id.isnot(None),
+        Item.location_code.isnot(None),
+        Item.location_code != ''
+    ).order_by(Item.id).all() if item_ids else []
+
+    job.mark_processing(total_items=len(targets))
+    job.skipped_count = len(item_ids) - len(targets)
+    _job_checkpoint(job)
+
+    log_task(f"[SYNC_LOCATIONS] Job {job.id}: {len(targets)} revisions for user {user_id}")
+
+    min_interval = 1.0 / EBAY_REVISE_CALLS_PER_SECOND if EBAY_REVISE_CALLS_PER_SECOND > 0 else 0
+    last_call = 0.0
+    succeeded = 0
+    failed = 0
+
+    for start in range(0, len(targets), EBAY_LOCATION_SYNC_BATCH_SIZE):
+        batch = targets[start:start + EBAY_LOCATION_SYNC_BATCH_SIZE]
+        with requests.Session() as session:
+            for listing_id, location_code in batch:
+                wait = min_interval - (time.monotonic() - last_call)
+                if wait > 0:
+                    time.sleep(wait)
+                last_call = time.monotonic()
+                if sync_location_to_ebay_sku(user_id, listing_id, location_code, session=session):
+                    succeeded += 1
+                else:
+                    failed += 1
+
+        job.processed_items = start + len(batch)
+        job.succeeded_count = succeeded
+        job.failed_count = failed
+        _job_checkpoint(job)
+
+    message = f"Synced {succeeded} item(s) to eBay"
+    if failed:
+        message += f" ({failed} failed)"
+    job.mark_completed({'message': message, 'synced_count': succeeded, 'failed_count': failed})
+    db.session.commit()
+
+    log_task(f"[SYNC_LOCATIONS] ✓ Job {job.id}: {succeeded} synced, {failed} failed")
+    return {'success': True, 'synced': succeeded, 'failed': failed}
+
+
+@celery.task(bind=True, name='qventory.tasks.sync_ebay_fulfillment_job')
+def sync_ebay_fulfillment_job(self, job_id):
+    """
+    Refresh a user's fulfillment orders and tracking (manual sync from /fulfillment).
+    """
+    app = create_app()
+
+    with app.app_context():
+        return _run_background_job(job_id, _run_ebay_fulfillment_sync)
+
+
+def _run_ebay_fulfillment_sync(job):
+    from qventory.helpers.fulfillment_sync import sync_fulfillment_orders
+
+    job.mark_processing()
+    _job_checkpoint(job)
+
+    data = sync_fulfillment_orders(job.user_id, limit=800) or {}
+    if data.get('success') is False:
+        job.mark_failed(data.get('error') or 'Sync failed')
+        db.session.commit()
+        return {'success': False, 'error': job.error_message}
+
+    created = data.get('orders_created', 0)
+    updated = data.get('orders_updated', 0)
+    job.total_items = job.processed_items = data.get('orders_synced', created + updated)
+    job.succeeded_count = created + updated
+    job.mark_completed({
+        'message': data.get('message') or f"Synced {created} new and updated {updated} existing orders",
+        'orders_synced': data.get('orders_synced', 0),
+        'orders_created': created,
+        'orders_updated': updated,
+    })
+    db.session.commit()
+
+    log_task(f"[FULFILLMENT_SYNC] ✓ Job {job.id}: {created} created, {updated} updated")
+    return {'success': True, 'orders_created': created, 'orders_updated': updated}
+
+
+@celery.task(bind=True, name='qventory.tasks.build_qr_batch_pdf_job')
+def build_qr_batch_pdf_job(self, job_id):
+    """
+    Render a large batch of QR location labels into the render cache.
+
+    Started by /qr/batch for selections over QR_BATCH_SYNC_LIMIT; the user is
+    notified with a download link when the PDF is ready.
+    """
+    app = create_app()
+
+    with app.app_context():
+        return _run_background_job(job_id, _run_qr_batch_pdf)
+
+
+def _run_qr_batch_pdf(job):
+    from qventory.helpers.render_cache import load_or_render, render_key
+    from qventory.helpers.utils import QR_BATCH_WORKERS, build_qr_batch_pdf
+    from qventory.models.notification import Notification
+    from qventory.models.setting import Setting
+
+    pairs = [[code, link] for code, link in (job.params or {}).get('labels') or []]
+    codes = [code for code, _ in pairs]
+    links = dict(pairs)
+    settings = Setting.query.filter_by(user_id=job.user_id).first()
+
+    job.mark_processing(total_items=len(pairs))
+    _job_checkpoint(job)
+
+    log_task(f"[QR_BATCH] Job {job.id}: rendering {len(pairs)} labels for user {job.user_id}")
+
+    def progress(done, total):
+        job.processed_items = done
+        _job_checkpoint(job)
+
+    load_or_render(
+        render_key('qr_batch_pdf', pairs),
+        lambda: build_qr_batch_pdf(codes, settings, links.get, workers=QR_BATCH_WORKERS, progress=progress),
+        suffix='.pdf',
+    )
+
+    download_url = f'/qr/batch/jobs/{job.id}/download'
+    message = f'{len(pairs)} QR labels are ready to download'
+    job.succeeded_count = len(pairs)
+    job.mark_completed({'message': message, 'labels': len(pairs), 'download_url': download_url})
+    db.session.commit()
+
+    Notification.create_notification(
+        user_id=job.user_id,
+        type='success',
+        title='QR labels ready',
+        message=message,
+        link_url=download_url,
+        link_text='Download PDF',
+        source='qr_batch',
+    )
+
+    log_task(f"[QR_BATCH] ✓ Job {job.id}: {len(pairs)} labels rendered")
+    return {'success': True, 'labels': len(pairs)}
+
+
+def _background_job_task(job_type):
+    """Celery task that executes a BackgroundJob type"""
+    from qventory.models.background_job import BackgroundJob
+
+    return {
+        BackgroundJob.TYPE_EBAY_INVENTORY_SYNC: sync_ebay_inventory_job,
+        BackgroundJob.TYPE_EBAY_LOCATION_SYNC: sync_ebay_locations_job,
+        BackgroundJob.TYPE_EBAY_FULFILLMENT_SYNC: sync_ebay_fulfillment_job,
+        BackgroundJob.TYPE_QR_BATCH_PDF: build_qr_batch_pdf_job,
+    }[job_type]
+
+
+# ==================== EBAY LISTING DRAFT IMAGES ====================
+
+DRAFT_IMAGE_UPLOAD_COUNTDOWN = 2  # Seconds; coalesces a burst of image uploads into one task
+
+
+def queue_draft_image_upload(draft):
+    """
+    Enqueue the background eBay upload for a draft's new images.
+
+    Returns True when the task was queued; publish uploads anything missed.
+    """
+    if not draft or not getattr(draft, "id", None):
+        return False
+
+    try:
+        upload_draft_images_to_ebay.apply_async(
+            kwargs={"draft_id": draft.id, "user_id": draft.user_id},
+            countdown=DRAFT_IMAGE_UPLOAD_COUNTDOWN,
+        )
+        return True
+    except Exception as exc:
+        log_task(f"⚠ Failed to queue draft image upload draft_id={draft.id}: {exc}")
+        return False
+
+
+@celery.task(bind=True, name="qventory.tasks.upload_draft_images_to_ebay")
+def upload_draft_images_to_ebay(self, draft_id, user_id):
+    """
+    Push a listing draft's images to eBay Picture Services concurrently.
+
+    Per-image status is written into the draft's images_json.
+    """
+    app = create_app()
+
+    with app.app_context():
+        from qventory.helpers.ebay_draft_images import upload_pending_draft_images
+
+        try:
+            result = upload_pending_draft_images(draft_id, user_id)
+        except Exception as exc:
+            db.session.rollback()
+            log_task(f"✗ Draft image upload crashed draft_id={draft_id}: {exc}")
+            return {"success": False, "error": str(exc)}
+
+        return {"success": True, "draft_id": draft_id, **result}
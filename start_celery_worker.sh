@@ -15,6 +15,19 @@ source ../venv/bin/activate
 # Set Flask app
 export FLASK_APP=wsgi:app
 
+# Start interactive worker (receipt OCR, relist) in the background so
+# long imports can never hold up user-facing tasks
+echo "Starting Celery interactive worker..."
+celery -A qventory.celery_app worker \
+  --detach \
+  --hostname=interactive@%h \
+  --loglevel=info \
+  --concurrency=2 \
+  --queues=receipts,relist \
+  --max-tasks-per-child=50 \
+  --logfile=/opt/qventory/logs/celery-interactive.log \
+  --pidfile=/opt/qventory/run/celery-interactive.pid
+
 # Start Celery worker
 echo "Starting Celery worker..."
 celery -A qventory.celery_app worker \
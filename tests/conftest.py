@@ -0,0 +1,28 @@
+import pytest
+from flask import Flask
+
+from qventory.extensions import db
+
+
+@pytest.fixture
+def sqlite_db(request):
+    """
+    App context bound to a fresh in-memory SQLite database.
+
+    Creates every table by default. To create only some tables, parametrize
+    indirectly with a tuple of models:
+
+        @pytest.mark.parametrize("sqlite_db", [(EmailOutbox,)], indirect=True)
+    """
+    models = getattr(request, "param", None)
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        if models is None:
+            import qventory.models  # noqa: F401  (register every table for create_all)
+            db.create_all()
+        else:
+            for model in models:
+                model.__table__.create(db.engine)
+        yield app
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from qventory.helpers import admin_user_queries
+
+
+def test_cursor_round_trips_sort_values():
+    cursor = admin_user_queries.encode_cursor(datetime(2026, 3, 4, 5, 6, 7), 42)
+
+    assert admin_user_queries.decode_cursor("created", cursor) == (datetime(2026, 3, 4, 5, 6, 7), 42)
+    assert admin_user_queries.decode_cursor("items", admin_user_queries.encode_cursor(17, 3)) == (17, 3)
+    assert admin_user_queries.decode_cursor("username", admin_user_queries.encode_cursor("bob", 9)) == ("bob", 9)
+
+
+def test_garbled_cursor_starts_from_first_page():
+    assert admin_user_queries.decode_cursor("items", None) is None
+    assert admin_user_queries.decode_cursor("items", "not-a-cursor") is None
+    assert admin_user_queries.decode_cursor("created", admin_user_queries.encode_cursor("nope", 1)) is None
+
+
+def test_summary_is_reused_until_invalidated(monkeypatch):
+    calls = []
+
+    def fake_compute(session):
+        calls.append(session)
+        return {"total_users": len(calls)}
+
+    monkeypatch.setattr(admin_user_queries, "_compute_admin_user_summary", fake_compute)
+    admin_user_queries.invalidate_admin_user_summary()
+
+    assert admin_user_queries.fetch_admin_user_summary("s")["total_users"] == 1
+    assert admin_user_queries.fetch_admin_user_summary("s")["total_users"] == 1
+    admin_user_queries.invalidate_admin_user_summary()
+    assert admin_user_queries.fetch_admin_user_summary("s")["total_users"] == 2
+    admin_user_queries.invalidate_admin_user_summary()
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from qventory.helpers import ebay_relist
+
+
+def _rule(**overrides):
+    values = dict(
+        user_id=1,
+        sku="S1",
+        listing_id="1111111111",
+        offer_id=None,
+        min_hours_since_last_order=24,
+        check_active_returns=True,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_sale_safety_uses_prefetched_snapshot(monkeypatch):
+    def fail_query(*args, **kwargs):
+        raise AssertionError("prefetched SKU should not be queried")
+
+    monkeypatch.setattr(ebay_relist, "check_recent_orders", fail_query)
+    monkeypatch.setattr(ebay_relist, "check_active_returns", fail_query)
+
+    snapshot = ebay_relist.RelistSaleSnapshot()
+    snapshot.skus.add((1, "S1"))
+    snapshot.order_window_hours = 24
+    snapshot.order_times[(1, "S1")] = [datetime.utcnow() - timedelta(hours=2)]
+
+    reason = ebay_relist._check_sale_safety(1, "S1", _rule(), snapshot)
+
+    assert reason == "1 orders in last 24h"
+
+
+def test_sale_safety_falls_back_outside_snapshot(monkeypatch):
+    calls = []
+
+    def fake_recent_orders(user_id, sku, hours):
+        calls.append(("orders", sku, hours))
+        return {"has_recent_orders": False, "order_count": 0}
+
+    def fake_active_returns(user_id, sku):
+        calls.append(("returns", sku))
+        return {"has_active_returns": True, "return_count": 2}
+
+    monkeypatch.setattr(ebay_relist, "check_recent_orders", fake_recent_orders)
+    monkeypatch.setattr(ebay_relist, "check_active_returns", fake_active_returns)
+
+    snapshot = ebay_relist.RelistSaleSnapshot()
+    snapshot.skus.add((1, "S1"))
+    snapshot.order_window_hours = 24
+
+    # eBay reported a different SKU than the rule - not prefetched
+    reason = ebay_relist._check_sale_safety(1, "OTHER", _rule(), snapshot)
+
+    assert reason == "2 active returns"
+    assert calls == [("orders", "OTHER", 24), ("returns", "OTHER")]
+
+
+def test_snapshot_lookups_return_none_when_not_covered():
+    snapshot = ebay_relist.RelistSaleSnapshot()
+    snapshot.identifiers.add((1, "1111111111"))
+    snapshot.sold_identifiers.add((1, "1111111111"))
+    snapshot.skus.add((1, "S1"))
+    snapshot.order_window_hours = 24
+
+    assert snapshot.is_sold(1, " 1111111111 ") is True
+    assert snapshot.is_sold(2, "1111111111") is None
+    assert snapshot.recent_orders(1, "S1", 48) is None
+    assert snapshot.active_returns(1, "S1") == {"has_active_returns": False, "return_count": 0}
+
+    snapshot.now = datetime.utcnow() - timedelta(seconds=ebay_relist.RELIST_SNAPSHOT_MAX_AGE_SECONDS + 1)
+    assert snapshot.is_sold(1, "1111111111") is None
+
+
+def test_dispatch_auto_relist_batches_targets_relist_queue(monkeypatch):
+    import celery
+    from qventory import tasks
+
+    sent = []
+
+    class FakeGroup:
+        def __init__(self, signatures):
+            self.signatures = list(signatures)
+
+        def apply_async(self):
+            sent.extend(self.signatures)
+
+    monkeypatch.setattr(celery, "group", FakeGroup)
+
+    assert tasks._dispatch_auto_relist_batches([[1, 2], [7]]) is True
+    assert [sig.kwargs["rule_ids"] for sig in sent] == [[1, 2], [7]]
+    assert all(sig.options["queue"] == tasks.AUTO_RELIST_QUEUE for sig in sent)
+
+
+def test_record_phase_timing_accumulates(monkeypatch):
+    clock = iter([1.5, 2.0])
+    monkeypatch.setattr(ebay_relist, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+
+    timings = {"wait": 100}
+    mark = ebay_relist.record_phase_timing(timings, "wait", 1.0)
+    ebay_relist.record_phase_timing(timings, "publish", mark)
+
+    assert timings == {"wait": 600, "publish": 500}
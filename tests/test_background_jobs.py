@@ -0,0 +1,165 @@
+from types import SimpleNamespace
+
+from qventory import tasks
+from qventory.models.background_job import BackgroundJob
+
+
+def _no_db_commit(monkeypatch):
+    commits = []
+    monkeypatch.setattr(tasks.db, "session", SimpleNamespace(commit=lambda: commits.append(True)))
+    return commits
+
+
+def test_queue_background_job_records_task_id(monkeypatch):
+    commits = _no_db_commit(monkeypatch)
+    queued = []
+
+    class DummyTask:
+        @staticmethod
+        def apply_async(args=None, **kwargs):
+            queued.append(args)
+            return SimpleNamespace(id="celery-123")
+
+    job = BackgroundJob(id=9, user_id=1, job_type=BackgroundJob.TYPE_EBAY_LOCATION_SYNC, status="pending")
+
+    assert tasks.queue_background_job(job, DummyTask) is True
+    assert queued == [[9]]
+    assert job.celery_task_id == "celery-123"
+    assert job.status == "pending"
+    assert commits
+
+
+def test_queue_background_job_marks_job_failed_when_broker_down(monkeypatch):
+    _no_db_commit(monkeypatch)
+
+    class BrokenTask:
+        @staticmethod
+        def apply_async(**kwargs):
+            raise ConnectionError("broker unreachable")
+
+    job = BackgroundJob(id=9, user_id=1, job_type=BackgroundJob.TYPE_EBAY_INVENTORY_SYNC, status="pending")
+
+    assert tasks.queue_background_job(job, BrokenTask) is False
+    assert job.status == "failed"
+    assert "broker unreachable" in job.error_message
+    assert not job.is_active
+
+
+def test_background_job_progress_percent():
+    job = BackgroundJob(
+        id=1,
+        user_id=1,
+        job_type=BackgroundJob.TYPE_EBAY_LOCATION_SYNC,
+        status="processing",
+        total_items=200,
+        processed_items=50,
+    )
+
+    payload = job.to_dict()
+
+    assert payload["progress_percent"] == 25
+    assert payload["status"] == "processing"
+
+
+def _fake_session(monkeypatch, job):
+    session = SimpleNamespace(
+        commits=[],
+        get=lambda model, job_id: job,
+        rollback=lambda: None,
+        refresh=lambda obj: None,
+    )
+    session.commit = lambda: session.commits.append(True)
+    monkeypatch.setattr(tasks.db, "session", session)
+    return session
+
+
+def test_checkpoint_cancels_running_job(monkeypatch):
+    from qventory.helpers import job_progress
+
+    published = []
+    monkeypatch.setattr(job_progress, "publish_job_state", lambda job: published.append(job.status))
+    monkeypatch.setattr(job_progress, "job_cancel_signalled", lambda job_id: True)
+    job = BackgroundJob(id=5, user_id=1, job_type=BackgroundJob.TYPE_EBAY_LOCATION_SYNC, status="pending")
+    _fake_session(monkeypatch, job)
+    processed = []
+
+    def runner(job):
+        job.mark_processing(total_items=10)
+        for index in range(10):
+            processed.append(index)
+            job.processed_items = index + 1
+            tasks._job_checkpoint(job)
+        job.mark_completed({})
+
+    result = tasks._run_background_job(5, runner)
+
+    assert result == {"success": False, "error": "cancelled"}
+    assert processed == [0]
+    assert job.status == "cancelled"
+    assert published[-1] == "cancelled"
+
+
+def test_checkpoint_falls_back_to_db_flag_without_redis(monkeypatch):
+    from qventory.helpers import job_progress
+
+    monkeypatch.setattr(job_progress, "publish_job_state", lambda job: False)
+    monkeypatch.setattr(job_progress, "job_cancel_signalled", lambda job_id: None)
+    job = BackgroundJob(id=6, user_id=1, job_type=BackgroundJob.TYPE_EBAY_INVENTORY_SYNC, status="processing")
+    job.cancel_requested = False
+    _fake_session(monkeypatch, job)
+
+    tasks._job_checkpoint(job)
+    job.cancel_requested = True
+    try:
+        tasks._job_checkpoint(job)
+    except tasks.JobCancelled:
+        pass
+    else:
+        raise AssertionError("expected JobCancelled")
+
+
+def test_start_background_job_reuses_identical_in_flight_job(monkeypatch):
+    existing = BackgroundJob(id=3, user_id=1, job_type=BackgroundJob.TYPE_EBAY_LOCATION_SYNC, status="processing")
+    calls = []
+    commits = _no_db_commit(monkeypatch)
+
+    def fake_find_active(user_id, job_type, dedup_key=None):
+        calls.append(("find", dedup_key))
+        return existing
+
+    monkeypatch.setattr(tasks, "_lock_user_jobs", lambda user_id: calls.append(("lock", user_id)))
+    monkeypatch.setattr(BackgroundJob, "find_active", staticmethod(fake_find_active))
+
+    started = tasks.start_background_job(1, BackgroundJob.TYPE_EBAY_LOCATION_SYNC, params={"item_ids": [1, 2]})
+
+    assert started == {"success": True, "job": existing, "existing": True}
+    # The dedup lookup runs under the per-user lock, which is then released
+    assert calls == [
+        ("lock", 1),
+        ("find", BackgroundJob.make_dedup_key(BackgroundJob.TYPE_EBAY_LOCATION_SYNC, {"item_ids": [1, 2]})),
+    ]
+    assert commits
+
+
+def test_start_background_job_enforces_per_user_limit(monkeypatch):
+    _no_db_commit(monkeypatch)
+    monkeypatch.setattr(tasks, "_lock_user_jobs", lambda user_id: None)
+    monkeypatch.setattr(BackgroundJob, "find_active", staticmethod(lambda *args, **kwargs: None))
+    monkeypatch.setattr(
+        BackgroundJob,
+        "active_query",
+        staticmethod(lambda user_id: SimpleNamespace(count=lambda: tasks.MAX_ACTIVE_JOBS_PER_USER)),
+    )
+
+    started = tasks.start_background_job(1, BackgroundJob.TYPE_EBAY_FULFILLMENT_SYNC)
+
+    assert started["success"] is False
+    assert started["error_code"] == "too_many_jobs"
+
+
+def test_dedup_key_ignores_param_order():
+    first = BackgroundJob.make_dedup_key("t", {"a": 1, "b": [1, 2]})
+    second = BackgroundJob.make_dedup_key("t", {"b": [1, 2], "a": 1})
+
+    assert first == second
+    assert first != BackgroundJob.make_dedup_key("other", {"a": 1, "b": [1, 2]})
@@ -0,0 +1,75 @@
+import pytest
+
+from benchmarks import datagen, harness
+from qventory.extensions import db
+from qventory.models.ebay_finance import EbayFinanceTransaction
+from qventory.models.item import Item
+from qventory.models.listing import Listing
+from qventory.models.sale import Sale
+from qventory.models.user import User
+
+
+def _snapshot():
+    return [
+        (item.sku, item.title, item.item_cost, item.is_active, item.sold_price)
+        for item in Item.query.order_by(Item.sku).all()
+    ]
+
+
+def test_generated_dataset_is_reproducible_and_removable(sqlite_db, monkeypatch):
+    monkeypatch.setattr(datagen, "INSERT_CHUNK_SIZE", 7)
+    spec = datagen.DatasetSpec(users=2, items_per_user=30, expenses_per_user=5, seed=7)
+
+    generated = datagen.generate_dataset(db.session, spec)
+
+    assert generated["counts"]["items"] == 60
+    assert datagen.find_dataset_users(db.session, spec) == generated["user_ids"]
+    sold = Item.query.filter(Item.is_active.is_(False)).all()
+    assert len(sold) == generated["counts"]["sales"] == Sale.query.count()
+    assert all(item.sold_at is not None for item in sold)
+    assert Listing.query.count() == Item.query.filter(Item.ebay_listing_id.isnot(None)).count()
+    assert EbayFinanceTransaction.query.count() == generated["counts"]["finance_transactions"]
+
+    first = _snapshot()
+    assert datagen.drop_dataset(db.session, spec) == 2
+    assert User.query.count() == Item.query.count() == Sale.query.count() == 0
+
+    datagen.generate_dataset(db.session, spec)
+    assert _snapshot() == first
+
+
+def test_compare_flags_slower_medians_and_extra_queries():
+    baseline = {"cases": {
+        "inventory.active": {"median_ms": 10.0, "queries": 2},
+        "dashboard.stats_30_days": {"median_ms": 40.0, "queries": 1},
+        "page.dashboard": {"median_ms": 1.0, "queries": 12},
+        "tax.annual_report": {"median_ms": 90.0, "queries": 5},
+    }}
+    current = {"cases": {
+        "inventory.active": {"median_ms": 14.0, "queries": 2},
+        "dashboard.stats_30_days": {"median_ms": 20.0, "queries": 1},
+        "page.dashboard": {"median_ms": 1.0, "queries": 30},
+        "inventory.sold": {"median_ms": 5.0, "queries": 2},
+        "tax.annual_report": {"error": "boom"},
+    }}
+
+    statuses = {row["case"]: row["status"] for row in harness.compare_results(current, baseline)}
+
+    assert statuses == {
+        "inventory.active": "regression",
+        "dashboard.stats_30_days": "improved",
+        "page.dashboard": "regression",
+        "inventory.sold": "new",
+        "tax.annual_report": "missing",
+    }
+
+
+def test_check_database_url_requires_scratch_postgres():
+    from benchmarks.run import check_database_url
+
+    check_database_url("postgresql://localhost/qventory_bench")
+    with pytest.raises(SystemExit):
+        check_database_url("sqlite:///app.db")
+    with pytest.raises(SystemExit):
+        check_database_url("postgresql://localhost/qventory")
+    check_database_url("postgresql://localhost/qventory", allow_any=True)
@@ -0,0 +1,78 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from qventory.helpers import ebay_draft_images
+from qventory.helpers import ebay_image_upload
+
+
+def test_carry_over_keeps_background_upload_results():
+    old_images = [
+        {"cloudinary_url": "https://c/1.jpg", "ebay_image_url": "https://i.ebayimg/1.jpg", "ebay_upload_status": "uploaded"},
+        {
+            "cloudinary_url": "https://c/2.jpg", "ebay_image_url": None, "ebay_upload_status": "uploading",
+            "ebay_upload_started_at": "2026-01-01T10:00:00", "ebay_upload_attempts": 1,
+        },
+    ]
+    # Browser copy: reordered, without the eBay URL, plus a replaced image
+    new_images = [
+        {"cloudinary_url": "https://c/2.jpg", "ebay_image_url": None},
+        {"cloudinary_url": "https://c/1.jpg", "ebay_image_url": None},
+        {"cloudinary_url": "https://c/1b.jpg", "ebay_image_url": None},
+    ]
+
+    merged = ebay_draft_images.carry_over_ebay_upload_state(old_images, new_images)
+
+    assert merged[1]["ebay_image_url"] == "https://i.ebayimg/1.jpg"
+    assert merged[1]["ebay_upload_status"] == "uploaded"
+    # The in-flight claim survives so the image is not uploaded a second time
+    assert merged[0]["ebay_image_url"] is None
+    assert merged[0]["ebay_upload_status"] == "uploading"
+    assert merged[0]["ebay_upload_started_at"] == "2026-01-01T10:00:00"
+    assert merged[0]["ebay_upload_attempts"] == 1
+    assert merged[2]["ebay_image_url"] is None
+    assert "ebay_upload_status" not in merged[2]
+
+
+def test_failed_uploads_back_off_and_stop_after_max_attempts():
+    now = datetime.utcnow()
+    backing_off = {
+        "cloudinary_url": "https://c/1.jpg", "ebay_upload_status": "failed", "ebay_upload_attempts": 1,
+        "ebay_upload_retry_at": (now + timedelta(seconds=30)).isoformat(),
+    }
+    retryable = dict(backing_off, ebay_upload_retry_at=(now - timedelta(seconds=1)).isoformat())
+    exhausted = dict(retryable, ebay_upload_attempts=ebay_draft_images.MAX_UPLOAD_ATTEMPTS)
+    in_flight = {
+        "cloudinary_url": "https://c/2.jpg", "ebay_upload_status": "uploading",
+        "ebay_upload_started_at": now.isoformat(),
+    }
+
+    assert not ebay_draft_images.has_pending_ebay_uploads([backing_off, exhausted, in_flight])
+    assert ebay_draft_images.has_pending_ebay_uploads([retryable])
+    assert ebay_draft_images.count_in_flight_uploads([backing_off, in_flight]) == 1
+
+
+def test_upload_images_concurrently_maps_results_by_source(monkeypatch):
+    seen_threads = set()
+
+    def fake_upload(user_id, image_url, filename=None, access_token=None):
+        assert access_token == "tok"
+        seen_threads.add(threading.get_ident())
+        time.sleep(0.05)
+        if "bad" in image_url:
+            return {"success": False, "error": "boom"}
+        return {"success": True, "image_url": image_url.replace("c/", "ebay/")}
+
+    monkeypatch.setattr(ebay_image_upload, "upload_ebay_image_from_url", fake_upload)
+    monkeypatch.setattr(ebay_draft_images, "DRAFT_IMAGE_UPLOAD_WORKERS", 4)
+    claims = [
+        {"source_url": f"https://c/{name}.jpg", "filename": f"{name}.jpg"}
+        for name in ("a", "bad", "c", "d")
+    ]
+
+    results = ebay_draft_images.upload_images_concurrently(5, claims, access_token="tok")
+
+    assert results["https://c/a.jpg"]["image_url"] == "https://ebay/a.jpg"
+    assert results["https://c/bad.jpg"]["success"] is False
+    assert len(results) == 4
+    assert len(seen_threads) > 1
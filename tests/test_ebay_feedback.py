@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from qventory.extensions import db
+from qventory.helpers import ebay_feedback
+from qventory.models.ebay_feedback import EbayFeedback
+
+
+def _feedback(feedback_id, comment_time, responded=False, response_text=None):
+    return {
+        "feedback_id": feedback_id,
+        "comment_type": "Positive",
+        "comment_text": "Great seller",
+        "comment_time": comment_time,
+        "commenting_user": "buyer",
+        "responded": responded,
+        "response_text": response_text,
+        "response_type": "Reply" if responded else None,
+    }
+
+
+@pytest.mark.parametrize("sqlite_db", [(EbayFeedback,)], indirect=True)
+def test_upsert_keeps_responses_sent_from_qventory(sqlite_db):
+    now = datetime(2026, 5, 1)
+    session = db.session
+    rows = [ebay_feedback._feedback_row(1, _feedback(fid, now), now) for fid in ("F1", "F2")]
+    assert ebay_feedback.upsert_feedback_rows(session, rows) == (2, 0)
+    session.query(EbayFeedback).filter_by(feedback_id="F1").update({
+        "responded": True, "response_text": "Thanks!", "response_source": "qventory",
+    })
+
+    rows = [
+        ebay_feedback._feedback_row(1, _feedback("F1", now, True, "eBay copy"), now),
+        ebay_feedback._feedback_row(1, _feedback("F2", now, True, "Replied on eBay"), now),
+        ebay_feedback._feedback_row(1, _feedback("F3", now), now),
+    ]
+    assert ebay_feedback.upsert_feedback_rows(session, rows) == (1, 2)
+
+    stored = {row.feedback_id: row for row in session.query(EbayFeedback)}
+    assert (stored["F1"].response_text, stored["F1"].response_source) == ("Thanks!", "qventory")
+    assert (stored["F2"].response_text, stored["F2"].response_source) == ("Replied on eBay", "ebay")
+    assert stored["F3"].responded is False
+
+
+def test_sync_stops_paging_at_stored_cursor(monkeypatch):
+    newest_stored = datetime.utcnow() - timedelta(days=3)
+    pages = {
+        1: {"success": True, "has_more": True, "feedbacks": [
+            _feedback("NEW", datetime.utcnow()),
+            _feedback("OLD", newest_stored - timedelta(days=1)),
+        ]},
+    }
+    fetched, written = [], []
+    monkeypatch.setattr(ebay_feedback, "get_feedback_cursor", lambda user_id: newest_stored)
+    monkeypatch.setattr(
+        ebay_feedback, "fetch_feedback_page",
+        lambda user_id, page=1, entries_per_page=200: fetched.append(page) or pages[page],
+    )
+    monkeypatch.setattr(
+        ebay_feedback, "upsert_feedback_rows",
+        lambda session, rows: written.extend(row["feedback_id"] for row in rows) or (len(rows), 0),
+    )
+    monkeypatch.setattr(ebay_feedback.db, "session", SimpleNamespace(commit=lambda: None))
+
+    result = ebay_feedback.sync_ebay_feedback_for_user(1, days_back=1, max_pages=5)
+
+    # Older entries on a fetched page are still written: they may carry a new reply
+    assert fetched == [1]
+    assert written == ["NEW", "OLD"]
+    assert result["created"] == 2 and result["pages"] == 1
+
+
+def test_incremental_sync_stops_at_cursor_and_sweep_rereads_window(monkeypatch):
+    now = datetime.utcnow()
+    pages = {
+        1: {"success": True, "has_more": True, "feedbacks": [_feedback("F1", now - timedelta(hours=2))]},
+        2: {"success": True, "has_more": True, "feedbacks": [_feedback("F2", now - timedelta(days=3))]},
+        3: {"success": True, "has_more": True, "feedbacks": [_feedback("F3", now - timedelta(days=40))]},
+    }
+    fetched = []
+    monkeypatch.setattr(ebay_feedback, "get_feedback_cursor", lambda user_id: now - timedelta(minutes=5))
+    monkeypatch.setattr(
+        ebay_feedback, "fetch_feedback_page",
+        lambda user_id, page=1, entries_per_page=200: fetched.append(page) or pages[page],
+    )
+    monkeypatch.setattr(ebay_feedback, "upsert_feedback_rows", lambda session, rows: (len(rows), 0))
+    monkeypatch.setattr(ebay_feedback.db, "session", SimpleNamespace(commit=lambda: None))
+
+    # A recent cursor ends paging on the first page, regardless of days_back
+    ebay_feedback.sync_ebay_feedback_for_user(1, days_back=1, max_pages=5)
+    assert fetched == [1]
+
+    # The reply sweep ignores the cursor and re-reads its bounded window
+    fetched.clear()
+    ebay_feedback.sync_ebay_feedback_for_user(
+        1, days_back=ebay_feedback.FEEDBACK_REPLY_SWEEP_DAYS, max_pages=5, incremental=False
+    )
+    assert fetched == [1, 2, 3]
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from qventory.helpers import ebay_fee_live
+from qventory.helpers import ebay_fees
+from qventory.helpers.ebay_fees import FeeRule
+
+
+def _rule(category_id, rate):
+    return FeeRule(category_id=category_id, standard_rate=rate, store_rate=None, top_rated_discount=10.0, fixed_fee=0.30)
+
+
+def _use_table(monkeypatch, rules, parents):
+    loads = []
+
+    def fake_load():
+        loads.append(True)
+        return ebay_fees._FeeRuleTable(
+            rules={rule.category_id: rule for rule in rules},
+            parents=parents,
+            loaded_at=ebay_fees.time.monotonic(),
+        )
+
+    monkeypatch.setattr(ebay_fees, "_load_table", fake_load)
+    ebay_fees.invalidate_fee_rule_cache()
+    return loads
+
+
+def test_resolve_fee_rule_walks_category_ancestry(monkeypatch):
+    loads = _use_table(
+        monkeypatch,
+        rules=[_rule(None, 13.25), _rule("100", 15.0)],
+        parents={"300": "200", "200": "100", "900": "800"},
+    )
+
+    assert ebay_fees.resolve_fee_rule("300").category_id == "100"
+    assert ebay_fees.resolve_fee_rule("900").category_id is None
+    assert ebay_fees.resolve_fee_rule(None).category_id is None
+    assert ebay_fees.resolve_fee_rule("300").standard_rate == 15.0
+    assert len(loads) == 1
+
+
+def test_estimate_ebay_fees_computes_any_price_locally(monkeypatch):
+    _use_table(monkeypatch, rules=[_rule(None, 10.0)], parents={})
+
+    breakdown = ebay_fees.estimate_ebay_fees("555", 42.5, 7.5, top_rated=True, include_fixed_fee=True)
+
+    assert breakdown["fee_rate_percent"] == 9.0
+    assert breakdown["marketplace_fee"] == 4.5
+    assert breakdown["total_fees"] == 4.8
+    assert breakdown["rule_category_id"] is None
+
+
+def test_rate_snapshot_is_rescaled_for_other_prices():
+    snapshot = SimpleNamespace(
+        price=90.0,
+        shipping_cost=10.0,
+        total_fees=13.55,
+        fee_breakdown=[
+            {"name": "FinalValueFee", "amount": 13.25},
+            {"name": "FinalValueFeeFixedPerOrder", "amount": 0.30},
+        ],
+    )
+
+    estimate = ebay_fee_live._scale_snapshot(snapshot, 50.0)
+
+    assert estimate["fees"] == [
+        {"name": "FinalValueFee", "amount": 6.62},
+        {"name": "FinalValueFeeFixedPerOrder", "amount": 0.30},
+    ]
+    assert round(estimate["total_fees"], 3) == 6.925
+    assert round(estimate["fee_rate_percent"], 2) == 13.85
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from qventory.extensions import db
+from qventory.helpers import ebay_finances
+from qventory.models.ebay_finance import EbayPayout
+from qventory.models.system_setting import SystemSetting
+
+
+def _payout_row(external_id, status, now):
+    return {
+        "user_id": 1,
+        "external_id": external_id,
+        "payout_id": external_id,
+        "payout_date": now,
+        "status": status,
+        "gross_amount": 10,
+        "fee_amount": 0,
+        "net_amount": 10,
+        "currency": "USD",
+        "raw_json": {"payoutId": external_id},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+@pytest.mark.parametrize("sqlite_db", [(EbayPayout,)], indirect=True)
+def test_upsert_inserts_then_updates_in_one_statement(sqlite_db):
+    now = datetime(2026, 1, 1)
+    columns = ("status", "raw_json", "updated_at")
+    session = db.session
+
+    created, updated = ebay_finances.upsert_finance_rows(
+        session, EbayPayout,
+        [_payout_row("P1", "INITIATED", now), _payout_row("P2", "INITIATED", now)],
+        columns,
+    )
+    assert (created, updated) == (2, 0)
+
+    created, updated = ebay_finances.upsert_finance_rows(
+        session, EbayPayout,
+        [_payout_row("P1", "SUCCEEDED", now), _payout_row("P1", "SUCCEEDED", now),
+         _payout_row("P3", "INITIATED", now)],
+        columns,
+    )
+    assert (created, updated) == (1, 1)
+
+    statuses = dict(session.query(EbayPayout.external_id, EbayPayout.status))
+    assert statuses == {"P1": "SUCCEEDED", "P2": "INITIATED", "P3": "INITIATED"}
+
+
+def test_sync_window_starts_at_watermark_minus_overlap(monkeypatch):
+    now = datetime(2026, 3, 1)
+    watermark = now - timedelta(hours=6)
+    monkeypatch.setattr(ebay_finances, "get_finance_sync_watermark", lambda user_id: watermark)
+
+    start = ebay_finances.finance_sync_start(1, 120, now=now)
+    assert start == watermark - ebay_finances.FINANCE_SYNC_OVERLAP
+
+    # days_back still caps the window, and full runs ignore the watermark
+    assert ebay_finances.finance_sync_start(1, 1, now=now) == now - timedelta(days=1)
+    assert ebay_finances.finance_sync_start(1, 120, incremental=False, now=now) == now - timedelta(days=120)
+
+    monkeypatch.setattr(ebay_finances, "get_finance_sync_watermark", lambda user_id: None)
+    assert ebay_finances.finance_sync_start(1, None, now=now) == now - timedelta(days=1825)
+
+
+def test_pages_stop_after_short_or_failed_page(monkeypatch):
+    pages = [
+        {"success": True, "payouts": [{}] * 2},
+        {"success": True, "payouts": [{}]},
+        {"success": True, "payouts": [{}] * 2},
+    ]
+    calls = []
+
+    def fake_fetch(user_id, start_date, end_date, limit=200, offset=0):
+        calls.append(offset)
+        return pages[len(calls) - 1]
+
+    monkeypatch.setattr(ebay_finances, "fetch_ebay_payouts", fake_fetch)
+    result = ebay_finances.fetch_all_ebay_payouts(1, None, None, limit=2)
+
+    assert calls == [0, 2]
+    assert len(result["payouts"]) == 3
+    assert result["truncated"] is False
+
+
+def test_pages_flag_truncation_when_page_cap_is_hit(monkeypatch):
+    monkeypatch.setattr(
+        ebay_finances, "fetch_ebay_transactions",
+        lambda *args, **kwargs: {"success": True, "transactions": [{}] * 2},
+    )
+
+    pages = list(ebay_finances.iter_ebay_transaction_pages(1, None, None, limit=2, max_pages=3))
+
+    assert len(pages) == 3
+    assert [page.get("truncated", False) for page in pages] == [False, False, True]
+
+
+def test_watermark_stops_at_newest_row_of_a_truncated_stream():
+    end = datetime(2026, 3, 1)
+    newest = end - timedelta(days=20)
+
+    assert ebay_finances.finance_synced_until(end, (False, None), (False, newest)) == end
+    assert ebay_finances.finance_synced_until(end, (False, None), (True, newest)) == newest
+    assert ebay_finances.finance_synced_until(end, (True, None), (False, newest)) is None
+
+
+@pytest.mark.parametrize("sqlite_db", [(SystemSetting,)], indirect=True)
+def test_watermark_is_stored_as_iso_string(sqlite_db):
+    synced = datetime(2040, 6, 1, 12, 30)  # Past the 32-bit epoch limit
+
+    ebay_finances.set_finance_sync_watermark(7, synced)
+    db.session.commit()
+
+    setting = SystemSetting.query.get("ebay_finances_synced_7")
+    assert setting.value_str == "2040-06-01T12:30:00"
+    assert setting.value_int is None
+    assert ebay_finances.get_finance_sync_watermark(7) == synced
+
+    # Watermarks written before the switch (epoch seconds) still read back
+    setting.value_str = None
+    setting.value_int = 1767225600
+    db.session.commit()
+    assert ebay_finances.get_finance_sync_watermark(7) == datetime(2026, 1, 1)
@@ -0,0 +1,63 @@
+import re
+
+from qventory.helpers import ebay_inventory
+
+
+def _page_xml(item_ids, total_pages, total_entries, ack="Success"):
+    items = "".join(
+        f"<Item><ItemID>{item_id}</ItemID><Title>T{item_id}</Title>"
+        f"<SellingStatus><CurrentPrice>9.99</CurrentPrice></SellingStatus>"
+        f"<Quantity>1</Quantity><SKU>S{item_id}</SKU></Item>"
+        for item_id in item_ids
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<GetMyeBaySellingResponse xmlns="urn:ebay:apis:eBLBaseComponents">'
+        f"<Ack>{ack}</Ack><ActiveList><ItemArray>{items}</ItemArray>"
+        f"<PaginationResult><TotalNumberOfPages>{total_pages}</TotalNumberOfPages>"
+        f"<TotalNumberOfEntries>{total_entries}</TotalNumberOfEntries></PaginationResult>"
+        "</ActiveList></GetMyeBaySellingResponse>"
+    ).encode()
+
+
+def test_iter_trading_active_list_page_streams_items():
+    info = {}
+    results = list(ebay_inventory.iter_trading_active_list_page(_page_xml(["111", "222"], 3, 401), info))
+
+    assert [kind for kind, _ in results] == ["item", "item"]
+    assert [payload["ebay_listing_id"] for _, payload in results] == ["111", "222"]
+    assert results[0][1]["sku"] == "S111"
+    assert results[0][1]["item_price"] == 9.99
+    assert info["ack"] == "Success"
+    assert info["total_pages"] == 3
+    assert info["total_entries"] == 401
+    assert info["has_item_array"] is True
+
+
+def test_trading_pages_fetched_concurrently_in_page_order(monkeypatch):
+    requested = []
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+            self.text = content.decode()
+
+    def fake_post(url, data=None, headers=None, timeout=None):
+        page = int(re.search(r"<PageNumber>(\d+)</PageNumber>", data).group(1))
+        requested.append(page)
+        return Response(_page_xml([f"{page}00", f"{page}01"], 4, 8))
+
+    monkeypatch.setattr(ebay_inventory, "get_user_access_token", lambda user_id: "token")
+    monkeypatch.setattr(ebay_inventory.requests, "post", fake_post)
+
+    items, meta = ebay_inventory.get_active_listings_trading_api(
+        1, max_items=5000, collect_failures=False, return_meta=True
+    )
+
+    assert requested[0] == 1
+    assert sorted(requested) == [1, 2, 3, 4]
+    assert [item["ebay_listing_id"] for item in items] == ["100", "101", "200", "201", "300", "301", "400", "401"]
+    assert meta["pages_fetched"] == 4
+    assert meta["is_complete"] is True
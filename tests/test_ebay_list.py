@@ -113,7 +113,7 @@ def test_get_image_candidates_for_listing_scans_beyond_200_active_listings(monke
     def fake_details(user_id, listing_id):
         return {}
 
-    def fake_active_listings(user_id, max_items=1000, collect_failures=True):
+    def fake_active_listings(user_id, max_items=1000, collect_failures=True, max_age_seconds=None):
         items = []
         for idx in range(300):
             items.append(
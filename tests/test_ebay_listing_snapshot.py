@@ -0,0 +1,112 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from qventory.helpers import ebay_inventory
+from qventory.helpers import ebay_listing_snapshot as snapshots
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+def _use_redis(monkeypatch, client):
+    monkeypatch.setattr(snapshots, "get_redis", lambda: client)
+
+
+def _stub_offers_api(monkeypatch):
+    monkeypatch.setattr(
+        ebay_inventory,
+        "fetch_ebay_inventory_offers",
+        lambda user_id, limit=200, offset=0: {"success": False, "error": "offers_api_disabled"},
+    )
+
+
+def test_snapshot_round_trip_keeps_datetimes():
+    started = datetime(2026, 3, 1, 12, 30)
+    payload = {"offers": [{"ebay_listing_id": "1", "start_time": started}]}
+
+    decoded = snapshots.decode_snapshot(snapshots.encode_snapshot(payload))
+
+    assert decoded["offers"][0]["start_time"] == started
+
+
+def test_complete_snapshot_is_reused_within_max_age(monkeypatch):
+    client = FakeRedis()
+    _use_redis(monkeypatch, client)
+    _stub_offers_api(monkeypatch)
+    calls = []
+
+    def fake_trading(user_id, **kwargs):
+        calls.append(kwargs)
+        return [{"ebay_listing_id": "111", "item_price": 10}], {"is_complete": True}
+
+    monkeypatch.setattr(ebay_inventory, "get_active_listings_trading_api", fake_trading)
+
+    first = ebay_inventory.fetch_active_listings_snapshot(7, max_age_seconds=300)
+    second = ebay_inventory.fetch_active_listings_snapshot(7, max_age_seconds=300)
+    fresh = ebay_inventory.fetch_active_listings_snapshot(7)
+
+    assert len(calls) == 2
+    assert first["cached"] is False and fresh["cached"] is False
+    assert second["cached"] is True
+    assert second["can_mark_inactive"] is True
+    assert [o["ebay_listing_id"] for o in second["offers"]] == ["111"]
+    assert second["fetched_at"] == first["fetched_at"]
+
+
+def test_incomplete_snapshot_is_not_stored(monkeypatch):
+    client = FakeRedis()
+    _use_redis(monkeypatch, client)
+    _stub_offers_api(monkeypatch)
+    monkeypatch.setattr(
+        ebay_inventory,
+        "get_active_listings_trading_api",
+        lambda user_id, **kwargs: ([{"ebay_listing_id": "111"}], {"is_complete": False}),
+    )
+
+    result = ebay_inventory.fetch_active_listings_snapshot(7, max_age_seconds=300)
+
+    assert result["can_mark_inactive"] is False
+    assert client.store == {}
+
+
+def test_expired_or_undersized_snapshot_is_ignored(monkeypatch):
+    client = FakeRedis()
+    _use_redis(monkeypatch, client)
+    data = {"items": [{"ebay_listing_id": str(i)} for i in range(10)]}
+    snapshots.store_snapshot(snapshots.KIND_TRADING, 3, data, max_items=10, is_complete=True)
+
+    assert snapshots.load_snapshot(snapshots.KIND_TRADING, 3, 300, max_items=10) is not None
+    # The store hit the smaller cap, so it may not cover a bigger request
+    assert snapshots.load_snapshot(snapshots.KIND_TRADING, 3, 300, max_items=5000) is None
+
+    real_time = time.time
+    monkeypatch.setattr(snapshots.time, "time", lambda: real_time() + 600)
+    assert snapshots.load_snapshot(snapshots.KIND_TRADING, 3, 300, max_items=10) is None
+
+
+def test_changed_since_snapshot_protects_recent_items():
+    fetched_at = datetime.utcnow() - timedelta(minutes=3)
+    cached = {"cached": True, "fetched_at": fetched_at}
+    old_item = SimpleNamespace(created_at=fetched_at - timedelta(days=5), updated_at=fetched_at - timedelta(hours=1))
+    new_item = SimpleNamespace(created_at=fetched_at + timedelta(minutes=1), updated_at=None)
+
+    assert snapshots.changed_since_snapshot(old_item, cached) is False
+    assert snapshots.changed_since_snapshot(new_item, cached) is True
+    assert snapshots.changed_since_snapshot(new_item, dict(cached, cached=False)) is False
+    sold_item = SimpleNamespace(
+        created_at=fetched_at - timedelta(days=5), updated_at=None, sold_at=fetched_at + timedelta(seconds=30)
+    )
+    assert snapshots.changed_since_snapshot(sold_item, cached) is True
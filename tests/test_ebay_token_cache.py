@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from qventory.helpers import ebay_inventory
+from qventory.helpers import ebay_token_cache
+
+
+class FakeLock:
+    def __init__(self, events):
+        self.events = events
+
+    def acquire(self):
+        self.events.append("acquire")
+        return True
+
+    def release(self):
+        self.events.append("release")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.events = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return FakeLock(self.events)
+
+
+def _credential(user_id=1, expires_in=timedelta(hours=2), token="tok"):
+    decrypted = {"enc-tok": token}
+    return SimpleNamespace(
+        user_id=user_id,
+        access_token="enc-tok",
+        token_expires_at=datetime.utcnow() + expires_in,
+        get_access_token=lambda: decrypted["enc-tok"],
+    )
+
+
+def _reset(monkeypatch, redis_client=None):
+    monkeypatch.setattr(ebay_token_cache, "_local_cache", {})
+    monkeypatch.setattr(ebay_token_cache, "get_redis", lambda: redis_client)
+
+
+def test_cached_token_skips_credential_lookup(monkeypatch):
+    _reset(monkeypatch)
+    loads = []
+
+    def fake_load(user_id, for_update=False):
+        loads.append(user_id)
+        return _credential(user_id)
+
+    monkeypatch.setattr(ebay_inventory, "_load_active_ebay_credential", fake_load)
+
+    assert ebay_inventory.get_user_access_token(1) == "tok"
+    assert ebay_inventory.get_user_access_token(1) == "tok"
+    assert loads == [1]
+
+
+def test_expiring_token_is_refreshed_under_lock(monkeypatch):
+    redis_client = FakeRedis()
+    _reset(monkeypatch, redis_client)
+    refreshed = []
+
+    monkeypatch.setattr(
+        ebay_inventory,
+        "_load_active_ebay_credential",
+        lambda user_id, for_update=False: _credential(user_id, expires_in=timedelta(minutes=1)),
+    )
+
+    def fake_refresh(credential):
+        refreshed.append(credential.user_id)
+        redis_client.events.append("refresh")
+        return "new-tok"
+
+    monkeypatch.setattr(ebay_inventory, "_refresh_user_access_token", fake_refresh)
+
+    assert ebay_inventory.get_user_access_token(2) == "new-tok"
+    assert refreshed == [2]
+    assert redis_client.events == ["acquire", "refresh", "release"]
+
+
+def test_invalidate_drops_local_and_shared_entries(monkeypatch):
+    redis_client = FakeRedis()
+    _reset(monkeypatch, redis_client)
+
+    ebay_token_cache.cache_access_token(_credential(3), "tok")
+    assert "qventory:ebay_token:3" in redis_client.store
+    assert ebay_token_cache.get_cached_access_token(3) == "tok"
+
+    ebay_token_cache.invalidate_access_token(3)
+
+    assert ebay_token_cache.get_cached_access_token(3) is None
+    assert redis_client.store == {}
+
+
+def test_expired_entries_are_not_served(monkeypatch):
+    _reset(monkeypatch)
+    ebay_token_cache.cache_access_token(_credential(4, expires_in=timedelta(minutes=2)), "old")
+
+    assert ebay_token_cache.get_cached_access_token(4) is None
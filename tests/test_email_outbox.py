@@ -0,0 +1,110 @@
+import smtplib
+from datetime import datetime, timedelta
+
+import pytest
+
+from qventory.extensions import db
+from qventory.helpers import email_outbox, email_sender
+from qventory.models.email_outbox import EmailOutbox
+
+pytestmark = pytest.mark.parametrize("sqlite_db", [(EmailOutbox,)], indirect=True)
+
+
+class FakeSMTP:
+    def __init__(self, refuse=(), disconnect_after=None):
+        self.refuse = set(refuse)
+        self.disconnect_after = disconnect_after
+        self.sent = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def sendmail(self, from_email, to, message):
+        if self.disconnect_after is not None and len(self.sent) >= self.disconnect_after:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        if to[0] in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({to[0]: (550, b"No such user")})
+        self.sent.append((from_email, to[0]))
+
+
+@pytest.fixture
+def outbox(sqlite_db, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", "localhost")
+    monkeypatch.setenv("SMTP_FROM_EMAIL", "noreply@qventory.test")
+    dispatched = []
+    monkeypatch.setattr(email_outbox, "_dispatch_delivery", dispatched.append)
+    return dispatched
+
+
+def _use_smtp(monkeypatch, server):
+    connections = []
+    monkeypatch.setattr(email_outbox, "open_smtp", lambda config: connections.append(config) or server)
+    return connections
+
+
+def test_send_email_only_queues_and_dedupes_plan_limit_email(outbox):
+    assert email_sender.send_plan_limit_reached_email("Ana@example.com", "ana", 100) == (True, None)
+    assert email_sender.send_plan_limit_reached_email("ana@example.com", "ana", 100) == (True, None)
+    assert email_sender.send_email("ana@example.com", "Hi", "<p>Hi</p>") == (True, None)
+
+    rows = EmailOutbox.query.order_by(EmailOutbox.id).all()
+    assert len(rows) == 2 and rows[1].subject == "Hi"
+    assert rows[0].dedup_key == "plan_limit:ana@example.com"
+    assert all(row.status == EmailOutbox.STATUS_PENDING for row in rows)
+    assert outbox == [rows[0].id, rows[1].id]
+
+
+def test_send_email_reports_missing_configuration(outbox, monkeypatch):
+    monkeypatch.delenv("SMTP_HOST")
+    success, error = email_sender.send_email("ana@example.com", "Hi", "<p>Hi</p>")
+    assert success is False and "not configured" in error
+    assert EmailOutbox.query.count() == 0
+
+
+def test_batch_uses_one_connection_and_drops_refused_recipients(outbox, monkeypatch):
+    for address in ("a@example.com", "bounce@example.com", "c@example.com"):
+        email_sender.send_email(address, "Hi", "<p>Hi</p>")
+    server = FakeSMTP(refuse={"bounce@example.com"})
+    connections = _use_smtp(monkeypatch, server)
+
+    counts = email_outbox.deliver_due_emails()
+
+    assert len(connections) == 1
+    assert server.sent == [("noreply@qventory.test", "a@example.com"), ("noreply@qventory.test", "c@example.com")]
+    assert counts == {"claimed": 3, "sent": 2, "retrying": 0, "failed": 1}
+    bounced = EmailOutbox.query.filter_by(to_email="bounce@example.com").one()
+    assert bounced.status == EmailOutbox.STATUS_FAILED and "No such user" in bounced.last_error
+
+    # Sent rows don't keep verification codes / reset links around
+    sent = EmailOutbox.query.filter_by(status=EmailOutbox.STATUS_SENT).all()
+    assert len(sent) == 2 and all(row.html_body is None and row.text_body is None for row in sent)
+
+
+def test_dropped_connection_retries_the_rest_with_backoff(outbox, monkeypatch):
+    for address in ("a@example.com", "b@example.com"):
+        email_sender.send_email(address, "Hi", "<p>Hi</p>")
+    _use_smtp(monkeypatch, FakeSMTP(disconnect_after=1))
+
+    assert email_outbox.deliver_due_emails() == {"claimed": 2, "sent": 1, "retrying": 1, "failed": 0}
+
+    retry = EmailOutbox.query.filter_by(to_email="b@example.com").one()
+    assert retry.status == EmailOutbox.STATUS_PENDING and retry.attempts == 1
+    assert retry.next_attempt_at > datetime.utcnow()
+    assert email_outbox.deliver_due_emails()["claimed"] == 0
+
+
+def test_purge_measures_retention_from_sent_at(outbox):
+    now = datetime.utcnow()
+    for address, sent_days_ago in (("old@example.com", 31), ("recent@example.com", 2)):
+        email = EmailOutbox(
+            to_email=address, subject="Hi", status=EmailOutbox.STATUS_SENT,
+            next_attempt_at=now - timedelta(days=40), sent_at=now - timedelta(days=sent_days_ago),
+        )
+        db.session.add(email)
+    db.session.commit()
+
+    assert email_outbox.purge_sent_emails(now=now) == 1
+    assert [row.to_email for row in EmailOutbox.query.all()] == ["recent@example.com"]
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from qventory.extensions import db
+from qventory.helpers import help_center
+from qventory.models.help_article import HelpArticle
+from qventory.models.system_setting import SystemSetting
+
+pytestmark = pytest.mark.parametrize("sqlite_db", [(HelpArticle, SystemSetting)], indirect=True)
+
+
+@pytest.fixture
+def help_db(sqlite_db):
+    help_center.invalidate_recommended_articles()
+
+
+def test_seed_is_skipped_until_builtin_content_changes(help_db, monkeypatch):
+    assert help_center.seed_help_articles() == len(help_center.HELP_ARTICLES)
+
+    # Unchanged content: deleted articles are not recreated on every startup
+    HelpArticle.query.filter_by(slug=help_center.HELP_ARTICLES[0]["slug"]).delete()
+    db.session.commit()
+    assert help_center.seed_help_articles() == 0
+
+    new_article = {"slug": "new-guide", "title": "New guide", "body_md": "# New", "display_order": 99}
+    monkeypatch.setattr(help_center, "HELP_ARTICLES", help_center.HELP_ARTICLES + [new_article])
+    assert help_center.seed_help_articles() == 2
+    assert HelpArticle.query.count() == len(help_center.HELP_ARTICLES)
+
+
+def test_recommended_article_is_picked_from_cached_published_list(help_db):
+    db.session.add_all([
+        HelpArticle(slug="a", title="A", body_md="a", is_published=True),
+        HelpArticle(slug="draft", title="Draft", body_md="d", is_published=False),
+    ])
+    db.session.commit()
+
+    assert help_center.pick_recommended_article() == {"slug": "a", "title": "A", "summary": None}
+
+    db.session.add(HelpArticle(slug="b", title="B", body_md="b", is_published=True))
+    db.session.commit()
+    picks = {help_center.pick_recommended_article(random.Random(seed))["slug"] for seed in range(20)}
+    assert picks == {"a"}
+
+    help_center.invalidate_recommended_articles()
+    picks = {help_center.pick_recommended_article(random.Random(seed))["slug"] for seed in range(20)}
+    assert picks == {"a", "b"}
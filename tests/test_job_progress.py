@@ -0,0 +1,72 @@
+from qventory.helpers import job_progress
+from qventory.models.background_job import BackgroundJob
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(str(member).encode())
+
+    def srem(self, key, member):
+        self.sets.get(key, set()).discard(str(member).encode())
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def expire(self, key, seconds):
+        return True
+
+
+def test_published_states_feed_status_and_active_list(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(job_progress, "get_redis", lambda: fake)
+    running = BackgroundJob(id=1, user_id=7, job_type="ebay_location_sync", status="processing",
+                            total_items=10, processed_items=4)
+    done = BackgroundJob(id=2, user_id=7, job_type="ebay_inventory_sync", status="processing")
+
+    job_progress.publish_job_state(running)
+    job_progress.publish_job_state(done)
+    done.status = "completed"
+    job_progress.publish_job_state(done)
+
+    assert job_progress.read_job_state(1, 7)["progress_percent"] == 40
+    assert job_progress.read_job_state(1, 8) is None  # Other users cannot read it
+    assert [state["id"] for state in job_progress.read_active_job_states(7)] == [1]
+    assert job_progress.read_job_state(2, 7)["status"] == "completed"
+
+
+def test_cancel_signal_round_trip(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(job_progress, "get_redis", lambda: fake)
+
+    assert job_progress.job_cancel_signalled(3) is False
+    job_progress.signal_job_cancel(3)
+    assert job_progress.job_cancel_signalled(3) is True
+
+
+def test_readers_report_unavailable_redis(monkeypatch):
+    monkeypatch.setattr(job_progress, "get_redis", lambda: None)
+
+    assert job_progress.read_active_job_states(1) is None
+    assert job_progress.job_cancel_signalled(1) is None
@@ -0,0 +1,53 @@
+from qventory.helpers import profit_batch
+from qventory.helpers.ebay_fees import FeeRule
+
+
+def test_batch_resolves_each_category_once(monkeypatch):
+    lookups = []
+    rules = {
+        "1": FeeRule(category_id="1", standard_rate=10.0, store_rate=None, top_rated_discount=0, fixed_fee=0.30),
+        None: FeeRule(category_id=None, standard_rate=20.0, store_rate=None, top_rated_discount=0, fixed_fee=0.30),
+    }
+
+    def fake_resolve(category_id):
+        lookups.append(category_id)
+        return rules.get(category_id, rules[None])
+
+    monkeypatch.setattr(profit_batch, "resolve_fee_rule", fake_resolve)
+    rows = [
+        {"item_name": "Lamp", "buy_price": 5, "resale_price": 40, "shipping_cost": 10, "category_id": "1"},
+        {"item_name": "Mug", "buy_price": "2", "resale_price": "12", "category_id": 1},
+        {"item_name": "Bad", "buy_price": 0, "resale_price": 10},
+        {"item_name": "Vase", "buy_price": 4, "resale_price": 20},
+        "nope",
+    ]
+
+    results, errors = profit_batch.calculate_ebay_profit_batch(rows, include_fixed_fee=True, ads_fee_rate=5)
+
+    assert sorted(lookups, key=str) == ["1", None]
+    assert [result["index"] for result in results] == [0, 1, 3]
+    assert [error["index"] for error in errors] == [2, 4]
+
+    lamp = results[0]
+    # fees: 50 * 10% + 0.30 fixed + 40 * 5% ads = 7.30
+    assert lamp["total_fees"] == 7.3
+    assert lamp["net_sale"] == 22.7
+    assert lamp["profit"] == 17.7
+    assert lamp["roi"] == 354.0
+    assert lamp["markup"] == 700.0
+    assert lamp["breakeven"] == round(15.3 / 0.85, 2)
+    assert results[2]["fee_breakdown"]["fee_rate_percent"] == 20.0
+
+    summary = profit_batch.summarize_profit_batch(results)
+    assert summary["count"] == 3
+    assert summary["total_buy"] == 11
+
+
+def test_batch_reports_missing_fee_rules(monkeypatch):
+    monkeypatch.setattr(profit_batch, "resolve_fee_rule", lambda category_id: None)
+
+    results, errors = profit_batch.calculate_ebay_profit_batch([{"buy_price": 1, "resale_price": 5}])
+
+    assert results == []
+    assert errors[0]["index"] == 0
+    assert "fee rules" in errors[0]["error"]
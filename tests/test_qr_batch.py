@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from qventory.helpers import utils
+
+
+def _links(n):
+    return [f"https://qventory.test/u/location/A{i}" for i in range(n)]
+
+
+def test_pool_rasters_match_serial_rasters(monkeypatch):
+    monkeypatch.setattr(utils, "QR_BATCH_POOL_MIN", 1)
+    links = _links(7)
+
+    serial = [img.tobytes() for chunk in utils._qr_raster_chunks(links, 120, workers=1, chunk_size=3) for img in chunk]
+    pooled_chunks = list(utils._qr_raster_chunks(links, 120, workers=2, chunk_size=3))
+
+    assert [len(chunk) for chunk in pooled_chunks] == [3, 3, 1]
+    assert [img.tobytes() for chunk in pooled_chunks for img in chunk] == serial
+    assert pooled_chunks[0][0].mode == "L" and pooled_chunks[0][0].size == (120, 120)
+
+
+def test_broken_pool_falls_back_to_serial(monkeypatch):
+    class BrokenPool:
+        def imap(self, func, iterable, chunksize=1):
+            yield func(next(iter(iterable)))
+            raise OSError("worker died")
+
+        def terminate(self):
+            pass
+
+    warnings = []
+    monkeypatch.setattr(utils, "QR_BATCH_POOL_MIN", 1)
+    monkeypatch.setattr(utils, "_qr_raster_pool", lambda workers: BrokenPool())
+    monkeypatch.setattr(utils, "current_app", SimpleNamespace(logger=SimpleNamespace(warning=lambda *a: warnings.append(a))))
+
+    chunks = list(utils._qr_raster_chunks(_links(4), 80, workers=2, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    assert len(warnings) == 1
+
+
+def _pooled_chunk_sizes_in_child(queue):
+    utils.QR_BATCH_POOL_MIN = 1
+    utils._qr_raster_pool = lambda workers, _pool=utils._qr_raster_pool: queue.put("pool") or _pool(workers)
+    queue.put([len(chunk) for chunk in utils._qr_raster_chunks(_links(5), 80, workers=2, chunk_size=2)])
+
+
+def test_pool_runs_inside_daemonic_worker_process():
+    # Celery prefork children are daemonic; multiprocessing refuses to fork from them
+    import multiprocessing
+
+    queue = multiprocessing.Queue()
+    child = multiprocessing.Process(target=_pooled_chunk_sizes_in_child, args=(queue,), daemon=True)
+    child.start()
+    child.join(60)
+
+    assert queue.get(timeout=5) == "pool"
+    assert queue.get(timeout=5) == [2, 2, 1]
+
+
+def test_batch_pdf_has_one_page_per_code_and_reports_progress(monkeypatch):
+    monkeypatch.setattr(utils, "QR_BATCH_CHUNK_SIZE", 2)
+    codes = ["A1", "A2", "A3"]
+    progress = []
+
+    pdf = utils.build_qr_batch_pdf(codes, None, lambda code: f"https://qventory.test/{code}", workers=1,
+                                   progress=lambda done, total: progress.append((done, total)))
+    data = pdf.read()
+
+    assert data.startswith(b"%PDF")
+    assert data.count(b"/Type /Page\n") + data.count(b"/Type /Page ") == 3
+    assert progress == [(2, 3), (3, 3)]
@@ -0,0 +1,86 @@
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from qventory.helpers import query_stats
+
+
+def _engine():
+    query_stats.register_query_stats()
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, title TEXT)"))
+    return engine
+
+
+def _in_process(monkeypatch):
+    monkeypatch.setattr(query_stats, "get_redis", lambda: None)
+    query_stats.reset_query_stats()
+
+
+def test_statement_shape_collapses_literals_and_in_lists():
+    a = query_stats.statement_shape("SELECT * FROM items WHERE id IN (?, ?, ?) AND title = 'x'")
+    b = query_stats.statement_shape("SELECT *\n  FROM items WHERE id IN (%(id_1)s) AND title = 'it''s'")
+    assert a == b == "SELECT * FROM items WHERE id IN (?) AND title = ?"
+
+
+def test_repeated_statements_are_flagged_and_totals_published(monkeypatch):
+    _in_process(monkeypatch)
+    monkeypatch.setattr(query_stats, "N_PLUS_ONE_THRESHOLD", 5)
+    engine = _engine()
+
+    token = query_stats.start_query_stats("task qventory.tasks.import_ebay_inventory")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT count(*) FROM items"))
+        for item_id in range(6):
+            conn.execute(text("SELECT title FROM items WHERE id = :id"), {"id": item_id})
+    summary = query_stats.finish_query_stats(token)
+
+    assert summary["queries"] == 7
+    assert summary["n_plus_one"] == [{"count": 6, "sql": "SELECT title FROM items WHERE id = ?"}]
+    assert query_stats.current_query_stats() is None
+
+    stats = query_stats.read_query_stats()
+    assert stats["labels"][0]["label"] == "task qventory.tasks.import_ebay_inventory"
+    assert stats["labels"][0]["avg_queries"] == 7
+    assert stats["recent"][0]["n_plus_one"][0]["count"] == 6
+
+
+def test_debug_responses_carry_query_headers(monkeypatch):
+    _in_process(monkeypatch)
+    engine = _engine()
+    app = Flask(__name__)
+    query_stats.register_query_stats(app)
+
+    @app.route("/items")
+    def items():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return "ok"
+
+    app.debug = False
+    assert "X-SQL-Queries" not in app.test_client().get("/items").headers
+
+    app.debug = True
+    response = app.test_client().get("/items")
+    assert response.headers["X-SQL-Queries"] == "2"
+    assert response.headers["X-SQL-N-Plus-One"] == "0"
+    row = query_stats.read_query_stats()["labels"][0]
+    assert (row["label"], row["runs"], row["queries"], row["avg_queries"]) == ("GET items", 2, 4, 2.0)
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection(monkeypatch):
+    _in_process(monkeypatch)
+    engine = _engine()
+
+    token = query_stats.start_query_stats("route /items")
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("SELECT * FROM missing_table"))
+        except Exception:
+            conn.rollback()
+        conn.execute(text("SELECT count(*) FROM items"))
+        assert not conn.info
+    summary = query_stats.finish_query_stats(token)
+
+    assert summary["queries"] == 1
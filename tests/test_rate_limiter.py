@@ -0,0 +1,43 @@
+from qventory.helpers import rate_limiter
+
+
+def _local_only(monkeypatch, now):
+    monkeypatch.setattr(rate_limiter, "_get_redis_script", lambda: None)
+    monkeypatch.setattr(rate_limiter, "_local_windows", {})
+    clock = {"now": now}
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: clock["now"])
+    return clock
+
+
+def test_limit_is_enforced_with_retry_after(monkeypatch):
+    _local_only(monkeypatch, now=1000.0)  # Start of a 60s window
+
+    results = [rate_limiter.check_rate_limit("publish:1", 3, 60) for _ in range(4)]
+
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].remaining == 0
+    assert results[3].retry_after > 0
+    headers = rate_limiter.rate_limit_headers(results[3])
+    assert headers["Retry-After"] == str(results[3].retry_after)
+    assert headers["X-RateLimit-Limit"] == "3"
+
+
+def test_previous_window_is_weighted_by_overlap(monkeypatch):
+    clock = _local_only(monkeypatch, now=960.0)
+    for _ in range(4):
+        assert rate_limiter.check_rate_limit("ai:1", 4, 60).allowed
+
+    # Halfway into the next window half of the previous count still applies
+    clock["now"] = 1050.0
+    allowed = [rate_limiter.check_rate_limit("ai:1", 4, 60).allowed for _ in range(3)]
+    assert allowed == [True, True, False]
+
+    # Other users have their own bucket
+    assert rate_limiter.check_rate_limit("ai:2", 4, 60).allowed
+
+
+def test_retry_after_waits_for_previous_window_to_decay():
+    # 2 calls this window, 4 last window, limit 4, 30s into a 60s window:
+    # weighted = 4 * 0.5 + 2 = 4 -> one slot frees once weighted <= 3
+    wait = rate_limiter._retry_after_seconds(4, 60.0, 30.0, 2, 4)
+    assert wait == 15.0
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from qventory import tasks
+from qventory.helpers.ocr_service import OCRService
+from qventory.models.receipt import Receipt
+from qventory.models.receipt_usage import ReceiptUsage
+from qventory.models.user import User
+
+
+def test_queue_receipt_ocr_sends_only_ids(monkeypatch):
+    queued = []
+
+    class DummyTask:
+        @staticmethod
+        def apply_async(**kwargs):
+            queued.append(kwargs)
+
+    monkeypatch.setattr(tasks, "process_receipt_ocr", DummyTask)
+    receipt = SimpleNamespace(id=7, user_id=3, image_url="https://res.cloudinary.com/r.jpg")
+
+    did_queue = tasks.queue_receipt_ocr(receipt)
+
+    assert did_queue is True
+    assert queued == [{"kwargs": {"receipt_id": 7, "user_id": 3}, "queue": "receipts"}]
+
+
+def test_extract_receipt_data_requires_image():
+    result = OCRService(provider="mock").extract_receipt_data("")
+    assert result.error == "No receipt image provided"
+
+
+def test_upload_receipts_batch_keeps_order_and_isolates_failures(monkeypatch):
+    from qventory.helpers import receipt_image_processor as rip
+
+    def fake_upload(source, **kwargs):
+        data = source.read()
+        if data == b"bad":
+            raise RuntimeError("cloudinary down")
+        public_id = f"{kwargs['folder']}/{data.decode()}"
+        return {"secure_url": f"https://res.cloudinary.com/{public_id}.jpg", "public_id": public_id}
+
+    monkeypatch.setattr(rip, "CLOUDINARY_ENABLED", True)
+    monkeypatch.setattr(rip.cloudinary.uploader, "upload", fake_upload)
+    monkeypatch.setattr(rip.cloudinary.CloudinaryImage, "build_url", lambda self, **kw: f"thumb/{self.public_id}")
+
+    processor = rip.ReceiptImageProcessor(user_id=5)
+    uploads = [{"data": name, "filename": "r.jpg"} for name in (b"one", b"bad", b"three")]
+
+    results = processor.upload_receipts_batch(uploads)
+
+    assert [r["success"] for r in results] == [True, False, True]
+    assert results[0]["public_id"] == "qventory/receipts/user_5/one"
+    assert results[2]["public_id"] == "qventory/receipts/user_5/three"
+    assert "cloudinary down" in results[1]["error"]
+
+
+@pytest.mark.parametrize("sqlite_db", [(User, Receipt, ReceiptUsage)], indirect=True)
+def test_reserve_ocr_slots_counts_queued_receipts_until_released(sqlite_db):
+    from qventory.extensions import db
+
+    user = SimpleNamespace(id=1, is_god_mode=False)
+    limits = SimpleNamespace(max_receipt_ocr_per_day=2, max_receipt_ocr_per_month=None)
+
+    def add_receipt():
+        receipt = Receipt(user_id=1, image_url="u", image_public_id="p", status="pending")
+        db.session.add(receipt)
+        db.session.commit()
+        return receipt
+
+    assert ReceiptUsage.reserve_ocr_slots(user, limits, 1)[0] == 1
+    first = add_receipt()
+    add_receipt()
+    granted, _, used, limit = ReceiptUsage.reserve_ocr_slots(user, limits, 1, lock=False)
+    assert (granted, used, limit) == (0, 2, 2)
+
+    # A receipt that could not be queued gives its slot back
+    first.status = "failed"
+    first.ocr_error_message = "Could not queue OCR processing"
+    db.session.commit()
+    assert ReceiptUsage.reserve_ocr_slots(user, limits, 1)[0] == 1
@@ -0,0 +1,16 @@
+from qventory.helpers import redis_client
+
+
+def test_mark_redis_down_disables_client_for_every_caller(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(redis_client, "_client", object())
+    monkeypatch.setattr(redis_client, "_disabled_until", 0.0)
+
+    assert redis_client.get_redis() is not None
+
+    redis_client.mark_redis_down(RuntimeError("connection refused"))
+    assert redis_client.get_redis() is None
+
+    clock[0] += redis_client.REDIS_RETRY_SECONDS
+    assert redis_client.get_redis() is not None
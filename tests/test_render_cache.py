@@ -0,0 +1,56 @@
+import os
+
+from flask import Flask
+
+from qventory.helpers import render_cache
+
+
+def test_render_key_covers_every_input():
+    key = render_cache.render_key("qr_batch_pdf", [["A1", "https://x/a1"]])
+    assert key == render_cache.render_key("qr_batch_pdf", [["A1", "https://x/a1"]])
+    assert key != render_cache.render_key("qr_batch_pdf", [["A1", "https://x/a2"]])
+    assert key != render_cache.render_key("location_label_pdf", [["A1", "https://x/a1"]])
+
+
+def test_send_renders_once_and_answers_304(monkeypatch, tmp_path):
+    monkeypatch.setattr(render_cache, "RENDER_CACHE_DIR", str(tmp_path))
+    app = Flask(__name__)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return b"%PDF-1.4 label"
+
+    with app.test_request_context("/qr/location/print/A1"):
+        first = render_cache.send_cached_render("location_label_pdf", ["A1"], render, "application/pdf", suffix=".pdf")
+        first.direct_passthrough = False
+        assert first.status_code == 200
+        assert first.get_data() == b"%PDF-1.4 label"
+        assert "private" in first.headers["Cache-Control"]
+        etag = first.headers["ETag"]
+
+    with app.test_request_context("/qr/location/print/A1"):
+        again = render_cache.send_cached_render("location_label_pdf", ["A1"], render, "application/pdf", suffix=".pdf")
+        assert again.status_code == 200
+
+    with app.test_request_context("/qr/location/print/A1", headers={"If-None-Match": etag}):
+        cached = render_cache.send_cached_render("location_label_pdf", ["A1"], render, "application/pdf", suffix=".pdf")
+        assert cached.status_code == 304
+
+    assert len(renders) == 1
+
+
+def test_prune_drops_expired_then_oldest_over_cap(monkeypatch, tmp_path):
+    monkeypatch.setattr(render_cache, "RENDER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(render_cache, "RENDER_CACHE_MAX_BYTES", 10)
+    now = 1_000_000.0
+    files = {}
+    for name, age in (("expired", render_cache.RENDER_CACHE_TTL_SECONDS + 1), ("old", 100), ("new", 10)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 6)
+        os.utime(path, (now - age, now - age))
+        files[name] = path
+
+    render_cache.prune_render_cache(now=now)
+
+    assert [name for name, path in files.items() if path.exists()] == ["new"]
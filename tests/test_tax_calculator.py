@@ -0,0 +1,195 @@
+import random
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from qventory.extensions import db
+from qventory.helpers.tax_calculator import (
+    MISSING_COST_DETAILS_LIMIT,
+    TaxCalculator,
+    get_period_bounds,
+    is_period_closed,
+    is_report_snapshot_current,
+)
+
+
+def _report(**overrides):
+    data = dict(
+        user_id=1,
+        tax_year=2024,
+        quarter=None,
+        status="draft",
+        generated_at=None,
+        last_updated_at=None,
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def test_period_bounds_and_closed():
+    assert get_period_bounds(2024, 2) == (date(2024, 4, 1), date(2024, 6, 30))
+    assert is_period_closed(2024, 2, today=date(2024, 7, 1)) is True
+    assert is_period_closed(2024, None, today=date(2024, 12, 31)) is False
+
+
+def test_closed_period_snapshot_is_immutable_once_taken_after_close():
+    now = datetime(2025, 3, 1)
+    after_close = _report(last_updated_at=datetime(2025, 1, 2))
+    before_close = _report(last_updated_at=datetime(2024, 12, 30))
+
+    assert is_report_snapshot_current(after_close, now=now) is True
+    assert is_report_snapshot_current(before_close, now=now) is False
+
+
+def test_finalized_report_is_never_recomputed():
+    report = _report(tax_year=2025, status="finalized", last_updated_at=datetime(2025, 1, 2))
+    assert is_report_snapshot_current(report, now=datetime(2025, 6, 1)) is True
+
+
+def test_open_period_refreshes_after_ttl():
+    report = _report(tax_year=2025, last_updated_at=datetime(2025, 1, 2))
+    assert is_report_snapshot_current(report, now=datetime(2025, 6, 1)) is False
+
+
+def _seed_sales_and_items(user_id=1, sales=120, items=60):
+    from qventory.models.item import Item
+    from qventory.models.sale import Sale
+
+    rng = random.Random(11)
+    money = lambda low, high: rng.choice([None, 0.0, round(rng.uniform(low, high), 2)])
+    for n in range(sales):
+        db.session.add(Sale(
+            user_id=user_id,
+            marketplace=rng.choice(["ebay", "mercari", "depop"]),
+            item_title=f"Sale {n}",
+            sold_price=round(rng.uniform(1, 200), 2),
+            item_cost=money(-5, 80),
+            marketplace_fee=money(0, 20),
+            payment_processing_fee=money(0, 5),
+            ad_fee=money(0, 8),
+            other_fees=money(0, 3),
+            shipping_cost=money(0, 15),
+            shipping_charged=money(0, 15),
+            refund_amount=money(0, 50),
+            carrier=rng.choice([None, "USPS", "UPS"]),
+            status=rng.choice(["pending", "paid", "shipped", "completed", "delivered",
+                               "cancelled", "refunded", "returned"]),
+            sold_at=datetime(2024, rng.randint(1, 12), rng.randint(1, 28), 12),
+        ))
+    for n in range(items):
+        db.session.add(Item(
+            user_id=user_id,
+            title=f"Item {n}",
+            sku=f"SKU-{n}",
+            item_cost=money(1, 60),
+            quantity=rng.randint(1, 3),
+            purchased_at=rng.choice([None, date(2023, 6, 1), date(2024, 5, 1)]),
+            sold_at=rng.choice([None, datetime(2023, 12, 1), datetime(2024, 8, 1), datetime(2025, 2, 1)]),
+        ))
+    # Other users' rows must not leak into the report
+    db.session.add(Sale(user_id=user_id + 1, marketplace="ebay", item_title="Other",
+                        sold_price=999, status="paid", sold_at=datetime(2024, 3, 3)))
+    db.session.commit()
+
+
+def _row_by_row_report(user_id, start, end, tax_year):
+    """Reference figures computed the way the calculator used to: one Python pass per section"""
+    from qventory.models.item import Item
+    from qventory.models.sale import Sale
+
+    sales = [
+        sale for sale in Sale.query.filter(Sale.user_id == user_id).order_by(Sale.id).all()
+        if start <= sale.sold_at.date() <= end
+    ]
+    revenue_sales = [s for s in sales if s.status not in ("cancelled", "refunded")]
+    cogs_sales = [s for s in sales if s.status in ("paid", "shipped", "completed", "delivered")]
+    fee_sales = [s for s in sales if s.status != "cancelled"]
+
+    by_marketplace = {}
+    for sale in revenue_sales:
+        entry = by_marketplace.setdefault(sale.marketplace or "other", {"revenue": 0.0, "count": 0, "fees": 0.0})
+        entry["revenue"] += sale.sold_price or 0
+        entry["count"] += 1
+        entry["fees"] += sale.marketplace_fee or 0
+
+    missing = [s for s in cogs_sales if not (s.item_cost and s.item_cost > 0)]
+
+    def inventory_value(items):
+        return sum(item.item_cost * item.quantity for item in items if item.item_cost and item.quantity)
+
+    items = Item.query.filter(Item.user_id == user_id).all()
+    year_start, year_end = date(tax_year, 1, 1), date(tax_year, 12, 31)
+    carriers = {}
+    for sale in sales:
+        if sale.carrier is not None:
+            entry = carriers.setdefault(sale.carrier, {"cost": 0.0, "count": 0})
+            entry["cost"] += sale.shipping_cost or 0
+            entry["count"] += 1
+
+    return {
+        "revenue": {"total": sum(s.sold_price or 0 for s in revenue_sales),
+                    "count": len(revenue_sales), "by_marketplace": by_marketplace},
+        "shipping_revenue": sum(s.shipping_charged or 0 for s in revenue_sales),
+        "refunds": sum(s.refund_amount or 0 for s in sales if s.status == "refunded"),
+        "returns": sum(s.sold_price or 0 for s in sales if s.status == "returned"),
+        "cogs": sum(s.item_cost for s in cogs_sales if s.item_cost and s.item_cost > 0),
+        "missing_ids": [s.id for s in missing],
+        "fees": sum(s.marketplace_fee or 0 for s in fee_sales),
+        "ad_fees": sum(s.ad_fee or 0 for s in fee_sales),
+        "shipping_cost": sum(s.shipping_cost or 0 for s in sales),
+        "carriers": carriers,
+        "opening": inventory_value([
+            i for i in items
+            if i.purchased_at and i.purchased_at < year_start
+            and (i.sold_at is None or i.sold_at.date() >= year_start)
+        ]),
+        "closing": inventory_value([i for i in items if i.sold_at is None or i.sold_at.date() > year_end]),
+        "purchased": inventory_value([
+            i for i in items if i.purchased_at and start <= i.purchased_at <= end
+        ]),
+    }
+
+
+@pytest.mark.parametrize("quarter", [None, 2])
+def test_sql_aggregates_match_row_by_row_figures(sqlite_db, quarter):
+    _seed_sales_and_items()
+    calc = TaxCalculator(1, tax_year=2024, quarter=quarter)
+    expected = _row_by_row_report(1, calc.start_date, calc.end_date, 2024)
+    approx = lambda value: pytest.approx(value, abs=0.011)
+
+    revenue = calc.calculate_gross_sales_revenue()
+    assert revenue["total"] == approx(expected["revenue"]["total"])
+    assert revenue["count"] == expected["revenue"]["count"]
+    assert revenue["by_marketplace"].keys() == expected["revenue"]["by_marketplace"].keys()
+    for marketplace, entry in expected["revenue"]["by_marketplace"].items():
+        assert revenue["by_marketplace"][marketplace]["revenue"] == approx(entry["revenue"])
+        assert revenue["by_marketplace"][marketplace]["count"] == entry["count"]
+        assert revenue["by_marketplace"][marketplace]["fees"] == approx(entry["fees"])
+
+    assert calc.calculate_shipping_revenue() == approx(expected["shipping_revenue"])
+    refunds = calc.calculate_refunds_returns()
+    assert refunds["refunds"]["amount"] == approx(expected["refunds"])
+    assert refunds["returns"]["amount"] == approx(expected["returns"])
+
+    cogs = calc.calculate_cogs()
+    assert cogs["total"] == approx(expected["cogs"])
+    assert cogs["missing_count"] == len(expected["missing_ids"])
+    # Details are capped, but keep the old order so the examples shown are unchanged
+    assert [d["sale_id"] for d in cogs["missing_details"]] == expected["missing_ids"][:MISSING_COST_DETAILS_LIMIT]
+
+    fees = calc.calculate_marketplace_fees()
+    assert fees["total"] == approx(expected["fees"])
+    assert fees["ad_fees"] == approx(expected["ad_fees"])
+
+    shipping = calc.calculate_shipping_costs()
+    assert shipping["total"] == approx(expected["shipping_cost"])
+    assert shipping["by_carrier"].keys() == expected["carriers"].keys()
+    for carrier, entry in expected["carriers"].items():
+        assert shipping["by_carrier"][carrier]["cost"] == approx(entry["cost"])
+        assert shipping["by_carrier"][carrier]["count"] == entry["count"]
+
+    inventory = calc.calculate_inventory_values()
+    assert inventory["opening"] == approx(expected["opening"])
+    assert inventory["closing"] == approx(expected["closing"])
+    assert inventory["purchased"] == approx(expected["purchased"])
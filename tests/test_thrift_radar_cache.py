@@ -0,0 +1,65 @@
+import threading
+
+from qventory.helpers import thrift_radar_cache
+
+
+def _local_only(monkeypatch):
+    monkeypatch.setattr(thrift_radar_cache, "get_redis", lambda: None)
+    thrift_radar_cache.clear_local_cache()
+
+
+def test_places_are_fetched_concurrently_once_and_reused_nearby(monkeypatch):
+    _local_only(monkeypatch)
+    calls = []
+    threads = set()
+    lock = threading.Lock()
+
+    def fetch(term):
+        with lock:
+            calls.append(term)
+            threads.add(threading.get_ident())
+        return [{"place_id": f"{term}-1", "name": term}]
+
+    terms = ["goodwill", "thrift store", "flea market", "goodwill"]
+    first = thrift_radar_cache.cached_places(40.7128, -74.0060, 16093, terms, fetch, max_workers=3)
+    assert sorted(calls) == ["flea market", "goodwill", "thrift store"]
+    assert first["goodwill"] == [{"place_id": "goodwill-1", "name": "goodwill"}]
+
+    # A search a few hundred meters away with the same radius is served from cache
+    again = thrift_radar_cache.cached_places(40.7141, -74.0081, 16093, ["Goodwill", "flea market"], fetch)
+    assert len(calls) == 3
+    assert again["flea market"] == first["flea market"]
+
+    # A different radius is a different lookup
+    thrift_radar_cache.cached_places(40.7128, -74.0060, 8046, ["goodwill"], fetch)
+    assert len(calls) == 4
+
+
+def test_geocode_hits_are_cached_but_misses_are_not(monkeypatch):
+    _local_only(monkeypatch)
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        return {"lat": 30.27, "lng": -97.74} if query.startswith("78701") else None
+
+    assert thrift_radar_cache.cached_geocode("78701, United States", fetch)["lat"] == 30.27
+    assert thrift_radar_cache.cached_geocode("78701,  united states", fetch)["lng"] == -97.74
+    assert thrift_radar_cache.cached_geocode("00000, United States", fetch) is None
+    assert thrift_radar_cache.cached_geocode("00000, United States", fetch) is None
+    assert calls == ["78701, United States", "00000, United States", "00000, United States"]
+
+
+def test_fetch_errors_propagate_and_nothing_is_cached(monkeypatch):
+    _local_only(monkeypatch)
+
+    def failing(term):
+        raise RuntimeError("Google Places returned OVER_QUERY_LIMIT")
+
+    try:
+        thrift_radar_cache.cached_places(1.0, 2.0, 1000, ["a", "b"], failing)
+    except RuntimeError as exc:
+        assert "OVER_QUERY_LIMIT" in str(exc)
+    else:
+        raise AssertionError("expected RuntimeError")
+    assert thrift_radar_cache._cache_get_many([thrift_radar_cache.places_cache_key(1.0, 2.0, 1000, "a")]) == {}
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+from qventory.helpers import user_status
+from qventory.models.notification import Notification
+from qventory.models.item import Item
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value).encode()
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        value = int(self.values.get(key, b"0")) + 1
+        self.values[key] = str(value).encode()
+        return value
+
+    def expire(self, key, seconds):
+        return True
+
+
+def test_version_is_seeded_from_clock_and_bumped(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(user_status, "get_redis", lambda: fake)
+    monkeypatch.setattr(user_status.time, "time", lambda: 1700000000.0)
+
+    first = user_status.current_status_version(5)
+    assert first == "1700000000000"
+    assert user_status.current_status_version(5) == first
+
+    assert user_status.bump_user_status([5, 6, None])
+    assert user_status.current_status_version(5) == "1700000000001"
+    assert user_status.current_status_version(6) == "1700000000001"
+
+
+def test_commit_publishes_users_of_changed_status_rows(monkeypatch):
+    bumped = []
+    monkeypatch.setattr(user_status, "bump_user_status", lambda user_ids: bumped.append(set(user_ids)))
+    session = SimpleNamespace(
+        info={},
+        new=[Notification(user_id=3, type="info", title="Sync done"), Item(user_id=9)],
+        dirty=[],
+        deleted=[],
+    )
+
+    user_status._collect_status_users(session, None)
+    user_status._publish_status_users(session)
+    user_status._publish_status_users(session)  # Nothing left to publish
+
+    assert bumped == [{3}]
+
+    # A rolled back transaction publishes nothing
+    user_status._collect_status_users(session, None)
+    user_status._discard_status_users(session)
+    user_status._publish_status_users(session)
+    assert bumped == [{3}]
+
+
+def test_wait_returns_new_version_or_times_out(monkeypatch):
+    versions = iter(["10", "10", "11"])
+    monkeypatch.setattr(user_status, "current_status_version", lambda user_id: next(versions))
+    monkeypatch.setattr(user_status.time, "sleep", lambda seconds: None)
+    assert user_status.wait_for_status_change(1, "10", 5) == "11"
+
+    monkeypatch.setattr(user_status, "current_status_version", lambda user_id: "10")
+    assert user_status.wait_for_status_change(1, "10", 0) == "10"
+
+    monkeypatch.setattr(user_status, "current_status_version", lambda user_id: None)
+    assert user_status.wait_for_status_change(1, "10", 5) is None
+
+
+def test_bulk_updates_on_status_tables_publish_affected_users(sqlite_db, monkeypatch):
+    from qventory.extensions import db
+
+    bumped = []
+    monkeypatch.setattr(user_status, "bump_user_status", lambda user_ids: bumped.append(set(user_ids)))
+    user_status.register_user_status_publishers()
+
+    for user_id in (1, 2, 2):
+        db.session.add(Notification(user_id=user_id, type="info", title="Pickup", source="pickup"))
+    db.session.commit()
+    bumped.clear()
+
+    # user_id pinned by the criteria (pickup_upcoming / mark_all_as_read shape)
+    Notification.query.filter_by(user_id=2, source="pickup", is_read=False).update({"is_read": True})
+    db.session.commit()
+    assert bumped == [{2}]
+
+    # Criteria without user_id: affected users are looked up before the update
+    Notification.query.filter(Notification.id.in_([1, 3])).delete(synchronize_session=False)
+    db.session.commit()
+    assert bumped == [{2}, {1, 2}]
+
+    # Rolled back bulk updates publish nothing
+    Notification.query.filter_by(user_id=2).update({"is_read": False})
+    db.session.rollback()
+    Item.query.filter_by(user_id=2).update({"title": "x"})
+    db.session.commit()
+    assert bumped == [{2}, {1, 2}]